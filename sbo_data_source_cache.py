@@ -6,9 +6,29 @@
 import debug
 import debug_flags
 import re
+import sys
+import time
+from array import array
+from copy import deepcopy
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from itertools import islice
 from datetime import datetime, timedelta
 from data_source_base import DataSourceBase
 
+try:
+    # NumPy is only required by the price movement scanner.
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    # The time to live is measured on a monotonic clock, so that a step in the wall clock does not expire every Event Result.
+    from time import monotonic
+except ImportError:
+    # Python 3.2 has no monotonic clock.
+    from time import time as monotonic
+
 # Data frames.
 LIVE_DATA_FRAME = 0
 NON_LIVE_DATA_FRAME = 1
@@ -79,6 +99,41 @@ FULL_TIME_OU = 3
 HALF_TIME_HDP = 7
 HALF_TIME_OU = 9
 
+# Event Odds Grid columns, indexed by Market Display type.
+ODDS_GRID_COLUMNS = {HALF_TIME_HDP: 0, FULL_TIME_HDP: 1, HALF_TIME_OU: 2, FULL_TIME_OU: 3}
+HDP_ODDS_GRID_COLUMNS = (0, 1)
+ODDS_GRID_LINES = 3
+
+# Event Odds Grid fillers, used in place of missing cells when fetching newly created events.
+ODDS_GRID_FILLERS = ((0.0, 0.0, 0.0, 0), (0.0, 0.0, 0.0, 0), (0.0, 0.0, 0.0), (0.0, 0.0, 0.0))
+
+# Marks an odds grid cell whose Odds could not be formatted when they were received.
+ODDS_GRID_UNFORMATTABLE = "UNFORMATTABLE"
+
+# Price History columns.
+PRICE_HISTORY_PRICE_1 = 0
+PRICE_HISTORY_PRICE_2 = 1
+PRICE_HISTORY_POINT = 2
+PRICE_HISTORY_TIMESTAMP = 3
+PRICE_HISTORY_COLUMNS = 4
+
+# Price Movement Scanner value rows.
+SCANNER_PRICE_1 = 0
+SCANNER_PRICE_2 = 1
+SCANNER_POINT = 2
+SCANNER_VALUE_ROWS = 3
+
+# Price Movement Scanner key rows.
+SCANNER_EVENT_RESULT_ID = 0
+SCANNER_MARKET_DISPLAY_ID = 1
+SCANNER_LINE_NUMBER = 2
+SCANNER_KEY_ROWS = 3
+
+# Price History ring buffer indexes.
+PRICE_HISTORY_BUFFER = 0
+PRICE_HISTORY_HEAD = 1
+PRICE_HISTORY_COUNT = 2
+
 # Match Stage states.
 NOT_LIVE = 0
 FIRST_HALF = 1
@@ -110,11 +165,57 @@ FAVOURITE_TEAM = 1
 DEFAULT_EVENT_SORT_CODE = 0
 DEFAULT_SHOW_TIME = datetime(1900, 1, 1)
 DEFAULT_BETTING_AVAILABLE_IN_PLAY = 0
+DEFAULT_PRICE_HISTORY_LENGTH = 0
+DEFAULT_SCANNER_WINDOW = 1
+DEFAULT_SCANNER_CAPACITY = 1024
+DEFAULT_MEMORY_SOFT_LIMIT = None
+DEFAULT_MEMORY_HARD_LIMIT = None
+DEFAULT_TTL_FRAMES = None
+DEFAULT_TTL_SECONDS = None
+
+# Memory accounting.
+MEMORY_SAMPLE_SIZE = 32
+MEMORY_EVICTION_BATCH = 100
+
+# The minimum length of each type of record received from the SBO server, and the indexes that must hold integer IDs.
+RECORD_LAYOUTS = {
+    TOURNAMENT_DICTIONARY: (TORNAMENT_NAME + 1, (TORNAMENT_ID,)),
+    EVENT_DICTIONARY: (SHOW_TIME + 1, (EVENT_ID, EVENT_DICTIONARY_TORNAMENT_ID)),
+    EVENT_RESULT_DICTIONARY: (ODDS_COUNT + 1, (EVENT_RESULT_ID, EVENT_RESULT_DICTIONARY_EVENT_ID, EVENT_RESULT_DICTIONARY_MARKET_GROUP_ID)),
+    EVENT_RESULT_EXTRA_DICTIONARY: (INJURY_TIME + 1, (EVENT_RESULT_EXTRA_DICTIONARY_EVENT_RESULT_ID,)),
+    MARKET_GROUP_DICTIONARY: (MARKET_GROUP_NAME + 1, (MARKET_GROUP_ID,))
+}
+ODDS_DATA_ARRAY_IDS = (ODDS_DICTIONARY_EVENT_RESULT_ID, MARKET_DISPLAY_ID)
+
+# Quarantined record indexes.
+QUARANTINED_SECTION = 0
+QUARANTINED_RECORD = 1
+QUARANTINED_REASON = 2
+
+# Marks an undo log entry for a key that did not exist before the update.
+UNDO_MISSING = object()
+
+# Orphan candidates.
+ORPHAN_EVENTS = 0
+ORPHAN_TOURNAMENTS = 1
+ORPHAN_MARKET_GROUPS = 2
+
+# Last seen tracking.
+LAST_SEEN_FRAME = 0
+LAST_SEEN_TIME = 1
+TTL_SWEEP_BATCH = 100
 
 # Fetch Type.
 FETCH_CREATED_EVENTS = 0
 FETCH_MODIFIED_EVENTS = 1
 
+# Event Result Index types.
+TOURNAMENT_INDEX = 0
+MATCH_STAGE_INDEX = 1
+BETTING_AVAILABLE_IN_PLAY_INDEX = 2
+MARKET_GROUP_INDEX = 3
+NUMBER_OF_INDEXES = 4
+
 # General Constants.
 NEXT_LIST_ITEM = 0
 NON_LIVE_SUB_EVENT_PREFIX = "1"
@@ -141,6 +242,11 @@ class SboDataSourceCache(object): # pylint: disable-msg=R0902
         """Raised when trying to process unexpected data from the SBO server."""
         pass
 
+    class ScannerUnavailableError(Exception):
+
+        """Raised when the price movement scanner is enabled but NumPy is not available."""
+        pass
+
 
     @staticmethod
     def _format_event_sort_code(event_sort_code):
@@ -281,33 +387,27 @@ class SboDataSourceCache(object): # pylint: disable-msg=R0902
 
 
     @staticmethod
-    def _get_next_line_number(line_number_dictionary, event_result_id, market_display_id):
+    def _get_price_history_value(values, index):
 
-        """This private method determines the next line number for a given Event ID and Market ID.
+        """This private method returns an element of a Prices or Odds Data array as a float that can be stored in a price history buffer.
 
-        Args: line_number_dict(dictionary), event_result_id(integer), event_result_id(integer)
-        Returns: next_line_number(integer)
+        Args: values(list), index(integer)
+        Returns: price_history_value(float), eg: NaN if the value is missing or not numeric.
         Raises: None
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_next_line_number"))
-
-        # Generate a custom key unique to the event ID and market ID.
-        event_market_key = str(event_result_id) + "-" + str(market_display_id)
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_price_history_value"))
 
-        if event_market_key not in line_number_dictionary:
-            next_line_number = 1
-
-        else:
-            next_line_number = line_number_dictionary[event_market_key] + 1
+        try:
+            price_history_value = float(values[index])
 
-        # Store the current line number
-        line_number_dictionary[event_market_key] = next_line_number
+        except (TypeError, ValueError, IndexError):
+            price_history_value = float('NaN')
 
-        return next_line_number
+        return price_history_value
 
 
     # Class methods
-    def __init__(self, frame_type, sbo_id, gmt_offset):
+    def __init__(self, frame_type, sbo_id, gmt_offset, price_history_length=DEFAULT_PRICE_HISTORY_LENGTH):
 
         debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "__init__"))
 
@@ -315,6 +415,42 @@ class SboDataSourceCache(object): # pylint: disable-msg=R0902
         self.sbo_id = sbo_id
         self.timedelta_gmt_offset = timedelta(hours = gmt_offset)
 
+        # When the price history length is non-zero, the most recent prices and points of each Odds ID are kept in a fixed size ring buffer.
+        self.price_history_length = price_history_length
+        self.price_history = {}
+
+        # The price movement scanner is disabled until enable_price_movement_scanner() is called.
+        self.scanner_enabled = False
+        self.scanner_price_threshold = None
+        self.scanner_point_threshold = None
+        self.scanner_window = None
+        self.scanner_slots = {}
+        self.scanner_free_slots = []
+        self.scanner_values = None
+        self.scanner_keys = None
+        self.scanner_history = None
+        self.scanner_history_position = 0
+        self.scanner_odds_updated = set()
+        self.scanner_odds_deleted = set()
+        self.price_movements = []
+
+        # The frame number and time at which each Event Result ID was last received from the SBO server, least recently updated first.
+        self.frame_number = 0
+        self.event_result_last_seen = OrderedDict()
+
+        # Event Results that have not been received within the time to live are expired, as the SBO server does not always delete them.
+        self.ttl_frames = DEFAULT_TTL_FRAMES
+        self.ttl_seconds = DEFAULT_TTL_SECONDS
+
+        # In atomic mode, the previous value of each record changed by a cache update is kept in an undo log until the update completes.
+        self.atomic_updates = False
+        self.undo_log = None
+        self.undo_keys = None
+
+        # Memory limits, in bytes, above which the least recently updated non-live Event Results are evicted.
+        self.memory_soft_limit = DEFAULT_MEMORY_SOFT_LIMIT
+        self.memory_hard_limit = DEFAULT_MEMORY_HARD_LIMIT
+
         self.current_minutes_cache = {}
 
         self.tournament_dictionary = {}
@@ -328,1053 +464,2871 @@ class SboDataSourceCache(object): # pylint: disable-msg=R0902
         self.events_updated = {}
         self.events_deleted = []
 
+        # Records that failed validation during the last cache update, eg: (section, record, reason).
+        self.records_quarantined = []
 
-    def _get_affected_event_ids(self, tournament_id):
+        # The number of sections received in which every record failed validation, which may mean the layout of the raw data has changed.
+        self.sections_without_valid_records = 0
 
-        """This private method returns a list of Event IDs that would be affected by an update to the specified Tournament ID.
+        # The Event Result IDs that have received a value for current minutes during the current cache update.
+        self.current_minutes_just_cached = set()
 
-        Args: tournament_id(integer)
-        Returns: affected_event_ids(list)
+        # Existing Event Result IDs whose derived data changed without being reported as updated, eg: their Event arrived after them.
+        self.event_results_to_refresh = set()
+
+        # The methods that apply a single record from each section of the frame cache data.
+        self.record_appliers = {
+            TOURNAMENT_DICTIONARY: self._update_tournament_dictionary,
+            EVENT_DICTIONARY: self._update_event_dictionary,
+            EVENT_RESULT_DICTIONARY: self._update_event_result_dictionary,
+            EVENT_RESULT_EXTRA_DICTIONARY: self._receive_event_result_extras,
+            EVENT_RESULT_LIST_FOR_DELETION: self._delete_from_event_result_dictionary,
+            ODDS_DICTIONARY: self._update_odds_dictionary,
+            ODDS_LIST_FOR_DELETION: self._delete_from_odds_dictionary,
+            MARKET_GROUP_DICTIONARY: self._update_market_group_dictionary
+        }
+
+        # Reverse indexes from each record to the records that reference it, so that deletes can cascade without a full scan.
+        self.tournament_events = {}
+        self.event_event_results = {}
+        self.market_group_event_results = {}
+        self.event_result_odds = {}
+
+        # Events, Tournaments and Market Groups that lost a reference during this update, and are deleted if they are no longer referenced.
+        self.orphan_candidates = [set(), set(), set()]
+
+        # The line numbers allocated to each Event Result ID and Market Display ID, keyed by (event_result_id, market_display_id).
+        self.line_number_dictionary = {}
+
+        # A grid of formatted odds for each Event Result ID, patched as each set of Odds is updated, and the grid cell each Odds ID occupies.
+        self.event_odds_grids = {}
+        self.odds_grid_cells = {}
+
+        # Indexes of Event Result IDs, maintained on each cache update so that the cache can be queried without a full scan.
+        self.event_result_indexes = [{} for _ in range(NUMBER_OF_INDEXES)]
+        self.event_result_index_keys = {}
+
+        # The board view is a sorted list of board sort keys, eg: (tournament_name, event_sort_code, show_time, event_result_id).
+        self.board_view = []
+        self.board_sort_keys = {}
+        self.board_rows_moved = {}
+
+
+    def _get_next_line_number(self, event_result_id, market_display_id):
+
+        """This private method allocates the next free line number for a given Event Result ID and Market Display ID.
+
+        Line numbers are kept for as long as the Odds are cached, so Odds received in later updates never collide with existing lines.
+        The lowest line number released by a deletion is reused first.
+
+        Args: event_result_id(integer), market_display_id(integer)
+        Returns: next_line_number(integer)
         Raises: None
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_affected_event_ids"))
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_next_line_number"))
 
-        affected_event_ids = []
+        self._log_undo(self.line_number_dictionary, (event_result_id, market_display_id))
 
-        # If an Event references the Tournament ID that is being updated, the Event is considered to be affected by the update.
-        for event_id in self.event_dictionary:
+        allocated_line_numbers = self.line_number_dictionary.setdefault((event_result_id, market_display_id), set())
 
-            if self.event_dictionary[event_id]['tornament_id'] == tournament_id:
-                affected_event_ids.append(event_id)
+        # An Event rarely has more than three lines per market, so searching for the lowest free line number is cheap.
+        next_line_number = 1
 
-        return affected_event_ids
+        while next_line_number in allocated_line_numbers:
+            next_line_number += 1
 
+        allocated_line_numbers.add(next_line_number)
 
-    def _get_affected_event_result_ids(self, id_index, id_value):
+        return next_line_number
 
-        """This private method returns a list of Event Result IDs that would be affected by an update to the specified Event Result.
 
-        Args: id_index(string), id_value(integer)
-        Returns: affected_event_result_ids(list)
+    def _release_line_number(self, event_result_id, market_display_id, line_number):
+
+        """This private method releases a line number so that it can be reused by the next Odds for the same Event Result ID and Market Display ID.
+
+        Args: event_result_id(integer), market_display_id(integer), line_number(integer)
+        Returns: None
         Raises: None
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_affected_event_result_ids"))
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_release_line_number"))
 
-        affected_event_result_ids = []
+        event_market_key = (event_result_id, market_display_id)
+        allocated_line_numbers = self.line_number_dictionary.get(event_market_key)
 
-        # If an Event Result references the Event ID that is being updated, the Event Result is considered to be affected by the update.
-        for event_result_id in self.event_result_dictionary:
+        self._log_undo(self.line_number_dictionary, event_market_key)
 
-            if self.event_result_dictionary[event_result_id][id_index] == id_value:
-                affected_event_result_ids.append(event_result_id)
+        if allocated_line_numbers is not None:
 
-        return affected_event_result_ids
+            allocated_line_numbers.discard(line_number)
 
+            if not allocated_line_numbers:
+                del self.line_number_dictionary[event_market_key]
 
-    def _update_tournament_dictionary(self, tournament_dictionary):
 
-        """This private method updates the internal cache of tournament data.
+    def _log_undo(self, dictionary, key):
 
-        Args: tournament_dictionary(dictionary)
+        """This private method records the value of a key before it is first changed during an atomic cache update.
+
+        Only the records changed by the update are copied, so the cost is proportional to the size of the frame rather than the cache.
+
+        Args: dictionary(dictionary), key(object)
         Returns: None
         Raises: None
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_update_tournament_dictionary"))
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_log_undo"))
 
-        for tournament in tournament_dictionary:
+        if self.undo_log is None:
+            return
 
-            tournament_id = tournament[TORNAMENT_ID]
+        # Only the value before the first change is needed to roll back the update.
+        undo_key = (id(dictionary), key)
 
-            # Set a flag to indicate weather existing event details are being updated or new event details are being created.
-            if tournament_id in self.tournament_dictionary:
-                update_event_details = True
-                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Updating Tournament ID: %s" % tournament_id)
-            else:
-                update_event_details = False
-                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Creating Tournament ID: %s" % tournament_id)
+        if undo_key in self.undo_keys:
+            return
 
-            # Create or Update the dictionary with the received event details.
-            self.tournament_dictionary[tournament_id] = tournament[TORNAMENT_NAME]
+        self.undo_keys.add(undo_key)
 
-            if update_event_details:
+        if key in dictionary:
+            self.undo_log.append((dictionary, key, deepcopy(dictionary[key])))
+        else:
+            self.undo_log.append((dictionary, key, UNDO_MISSING))
 
-                # Get a list of Event IDs affected by the update of this Tournament ID.
-                affected_event_ids = self._get_affected_event_ids(tournament_id)
 
-                for event_id in affected_event_ids:
+    def _rollback_undo_log(self):
 
-                    # Get a list of Event Result IDs affected by the update of this Event ID.
-                    affected_event_result_ids = self._get_affected_event_result_ids('event_id', event_id)
+        """This private method restores every record changed by a failed atomic cache update to its previous value.
 
-                    for event_result_id in affected_event_result_ids:
+        This simple method has no arguments or returns.
+        It raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_rollback_undo_log"))
 
-                        if event_result_id not in self.events_updated:
-                            self.events_updated[event_result_id] = {}
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "Rolling back %s changes to the cache." % len(self.undo_log))
 
-                        # Set a flag to indicate that the event details for this event result have been updated.
-                        self.events_updated[event_result_id]['event_details'] = True
+        last_seen_restored = False
 
+        for dictionary, key, previous_value in reversed(self.undo_log):
 
-    def _update_event_dictionary(self, event_dictionary):
+            if previous_value is UNDO_MISSING:
+                dictionary.pop(key, None)
+            else:
+                dictionary[key] = previous_value
 
-        """This private method updates the internal cache of event data.
+            if dictionary is self.event_result_last_seen:
+                last_seen_restored = True
 
-        Args: event_dictionary(dictionary)
+        # Restored Event Results are re-inserted at the end, so put them back in the order they were last seen.
+        if last_seen_restored:
+            self.event_result_last_seen = OrderedDict(sorted(self.event_result_last_seen.items(), key=lambda item: item[1]))
+
+        # None of the changes made during the update are reported.
+        self.events_created = []
+        self.events_updated = {}
+        self.events_deleted = []
+        self.event_results_to_refresh = set()
+        self.scanner_odds_updated = set()
+        self.scanner_odds_deleted = set()
+        self.orphan_candidates = [set(), set(), set()]
+
+        self.undo_log = None
+        self.undo_keys = None
+
+
+    def _touch_event_result(self, event_result_id):
+
+        """This private method records the frame and time at which data for the given Event Result ID was last received.
+
+        Args: event_result_id(integer)
         Returns: None
         Raises: None
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_update_event_dictionary"))
-
-        for event in event_dictionary:
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_touch_event_result"))
 
-            event_id = event[EVENT_ID]
-
-            # Set a flag to indicate weather existing event details are being updated or new event details are being created.
-            if event_id in self.event_dictionary:
-                update_event_details = True
-                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Updating Event ID: %s" % event_id)
-            else:
-                update_event_details = False
-                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Creating Event ID: %s" % event_id)
+        # Odds can be received for Event Results that are not cached, these are not tracked.
+        if event_result_id in self.event_result_dictionary:
+            self._log_undo(self.event_result_last_seen, event_result_id)
+            self.event_result_last_seen[event_result_id] = (self.frame_number, monotonic())
+            self.event_result_last_seen.move_to_end(event_result_id)
 
-            # Create or Update the dictionary with the received event details.
-            self.event_dictionary[event_id] = {
-                'tornament_id': event[EVENT_DICTIONARY_TORNAMENT_ID],
-                'home_team_name': event[HOME_TEAM_NAME],
-                'away_team_name': event[AWAY_TEAM_NAME],
-                'event_sort_code': event[EVENT_SORT_CODE],
-                'show_time_type': event[SHOW_TIME_TYPE],
-                'show_time': event[SHOW_TIME]
-            }
 
-            if update_event_details:
+    def _get_affected_event_ids(self, tournament_id):
 
-                # Get a list of Event Result IDs affected by the update of this Event ID.
-                affected_event_result_ids = self._get_affected_event_result_ids('event_id', event_id)
+        """This private method returns a list of Event IDs that would be affected by an update to the specified Tournament ID.
 
-                for event_result_id in affected_event_result_ids:
+        Args: tournament_id(integer)
+        Returns: affected_event_ids(list)
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_affected_event_ids"))
 
-                    if event_result_id not in self.events_updated:
-                        self.events_updated[event_result_id] = {}
+        # If an Event references the Tournament ID that is being updated, the Event is considered to be affected by the update.
+        affected_event_ids = list(self.tournament_events.get(tournament_id, ()))
 
-                    # Set a flag to indicate that the event details for this event result have been updated.
-                    self.events_updated[event_result_id]['event_details'] = True
+        return affected_event_ids
 
 
-    def _update_event_result_dictionary(self, event_result_dictionary):
+    def _get_affected_event_result_ids(self, id_index, id_value):
 
-        """This private method updates the internal cache of event result data
+        """This private method returns a list of Event Result IDs that would be affected by an update to the specified Event Result.
 
-        Args: event_result_dictionary(dictionary)
-        Returns: None
+        Args: id_index(string), id_value(integer)
+        Returns: affected_event_result_ids(list)
         Raises: None
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_update_event_result_dictionary"))
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_affected_event_result_ids"))
 
-        for event_result in event_result_dictionary:
+        # If an Event Result references the Event ID that is being updated, the Event Result is considered to be affected by the update.
+        if id_index == 'event_id':
+            reverse_index = self.event_event_results
+        else:
+            reverse_index = self.market_group_event_results
 
-            event_result_id = event_result[EVENT_RESULT_ID]
+        affected_event_result_ids = list(reverse_index.get(id_value, ()))
 
-            # Set a flag to indicate weather existing event details are being updated or new event details are being created.
-            if event_result_id in self.event_result_dictionary:
-                update_event_details = True
-                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Updating Event Result ID: %s" % event_result_id)
-            else:
-                update_event_details = False
-                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Creating Event Result ID: %s" % event_result_id)
+        return affected_event_result_ids
 
-            # Create or Update the dictionary with the received event details.
-            self.event_result_dictionary[event_result_id] = {
-                'event_id': event_result[EVENT_RESULT_DICTIONARY_EVENT_ID],
-                'market_group_id': event_result[EVENT_RESULT_DICTIONARY_MARKET_GROUP_ID],
-                'home_score': event_result[HOME_SCORE],
-                'away_score': event_result[AWAY_SCORE],
-                'odds_count': event_result[ODDS_COUNT]
-            }
 
-            if update_event_details:
+    @staticmethod
+    def _is_id(value):
 
-                if event_result_id not in self.events_updated:
-                    self.events_updated[event_result_id] = {}
+        """This private method checks that a value can be used as an ID.
 
-                # Set a flag to indicate that the event details for this event result have been updated.
-                self.events_updated[event_result_id]['event_details'] = True
+        Args: value(object)
+        Returns: is_id(boolean)
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_is_id"))
 
-            else:
+        return isinstance(value, int) and not isinstance(value, bool)
 
-                # Add the Event Result ID to the list of events that have been created.
-                # Note: A new Event is only considered to be created once the Event Result Dictionary is updated.
-                self.events_created.append(event_result_id)
 
+    def _get_odds_record_error(self, odds, odds_ids_seen, odds_ids_deleted):
 
-    def _update_event_result_extra_dictionary(self, event_result_extra_dictionary): # pylint: disable-msg=C0103
+        """This private method checks an Odds record, returning the reason it is invalid.
 
-        """This private method updates the internal cache of event result extra data.
+        New Odds must hold a full Odds Data Array and Prices Array, whereas updates to cached Odds may hold partial arrays.
+        Cached Odds that are deleted earlier in the same update are treated as new.
 
-        Args: event_result_extra_dictionary(dictionary)
-        Returns: None
+        Args: odds(list), odds_ids_seen(set), odds_ids_deleted(set)
+        Returns: record_error(string), eg: None if the record is valid.
         Raises: None
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_update_event_result_extra_dictionary"))
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_odds_record_error"))
 
-        current_minutes_just_cached = []
+        if len(odds) <= ODDS_DATA_ARRAY:
+            return "too few elements"
 
-        if event_result_extra_dictionary is not None:
+        if not self._is_id(odds[ODDS_ID]):
+            return "invalid ID at index %s" % ODDS_ID
 
-            for event_result_extra in event_result_extra_dictionary:
+        odds_data = odds[ODDS_DATA_ARRAY]
+        prices = odds[PRICES_ARRAY] if len(odds) > PRICES_ARRAY else None
 
-                event_result_id = event_result_extra[EVENT_RESULT_EXTRA_DICTIONARY_EVENT_RESULT_ID]
+        odds_cached = odds[ODDS_ID] in self.odds_dictionary and odds[ODDS_ID] not in odds_ids_deleted
 
-                # Set a flag to indicate weather existing event details are being updated or new event details are being created.
-                if event_result_id in self.event_result_extra_dictionary:
-                    update_event_details = True
-                    debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Updating Event Result (Extra) ID: %s" % event_result_id)
-                else:
-                    update_event_details = False
-                    debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Creating Event Result (Extra) ID: %s" % event_result_id)
+        if odds_cached or odds[ODDS_ID] in odds_ids_seen:
 
-                # Create or Update the dictionary with the received event details.
-                self.event_result_extra_dictionary[event_result_id] = {
-                    'row_count': event_result_extra[ROW_COUNT],
-                    'period': event_result_extra[PERIOD],
-                    'current_minutes': event_result_extra[CURRENT_MINUTES],
-                    'total_minutes': event_result_extra[TOTAL_MINUTES],
-                    'home_red_card_count': event_result_extra[HOME_RED_CARD_COUNT],
-                    'away_red_card_count': event_result_extra[AWAY_RED_CARD_COUNT],
-                    'injury_time': event_result_extra[INJURY_TIME]
-                }
+            if odds_data is not None and not isinstance(odds_data, list):
+                return "invalid Odds Data Array"
 
-                if update_event_details:
+            # An update must hold at least the first price, as shorter Prices Arrays can not be told apart from a missing one.
+            if prices is not None and (not isinstance(prices, list) or len(prices) <= PRICE_1):
+                return "invalid Prices Array"
 
-                    if event_result_id not in self.events_updated:
-                        self.events_updated[event_result_id] = {}
+            return None
 
-                    # Set a flag to indicate that the event details for this event result have been updated.
-                    self.events_updated[event_result_id]['event_details'] = True
+        if not isinstance(odds_data, list) or len(odds_data) <= POINT:
+            return "invalid Odds Data Array"
 
-                # A new value for current minutes has just been received from the server.
-                # Cache or re-cache the start date and time of the match.
-                if event_result_id not in self.current_minutes_cache:
-                    self.current_minutes_cache[event_result_id] = {}
+        if not all(self._is_id(odds_data[index]) for index in ODDS_DATA_ARRAY_IDS):
+            return "invalid ID in Odds Data Array"
 
-                self.current_minutes_cache[event_result_id]['current_minutes'] = self.event_result_extra_dictionary[event_result_id]['current_minutes']
-                self.current_minutes_cache[event_result_id]['cache_time'] = datetime.now()
+        if not isinstance(prices, list) or len(prices) <= PRICE_2:
+            return "invalid Prices Array"
 
-                # Keep track of which events have just had their current minutes cached to save immediately calculating their new
-                # current minutes below. The start time will not have elapsed more than a minute and the calculation will be wasted.
-                current_minutes_just_cached.append(event_result_id)
+        return None
 
-        if self.event_result_extra_dictionary is not None:
 
-            for event_result_id in self.event_result_extra_dictionary:
+    def _get_record_error(self, section, record, odds_ids_seen, odds_ids_deleted):
 
-                # Any events which have not just had their current minutes cached have not received an updated current minutes from the server.
-                # In this case we need to check how long has elapsed since the cache time and update the current minutes as necessary.
-                if event_result_id not in current_minutes_just_cached:
+        """This private method checks a record against the expected layout of its section, returning the reason it is invalid.
 
-                    now = datetime.now()
-                    cached_time = self.current_minutes_cache[event_result_id]['cache_time']
-                    cached_current_minutes = self.current_minutes_cache[event_result_id]['current_minutes']
-                    current_minutes_cap = self.event_result_extra_dictionary[event_result_id]['total_minutes']
+        Args: section(integer), record(object), odds_ids_seen(set), odds_ids_deleted(set)
+        Returns: record_error(string), eg: None if the record is valid.
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_record_error"))
 
-                    # Calculate the value for current minutes, based on the time elapsed since they were cached.
-                    time_since_cache = now - cached_time
-                    elapsed_minutes = time_since_cache.total_seconds() / SECONDS_IN_A_MINUTE                        # pylint: disable-msg=E1103
-                    calculated_current_minutes = int(cached_current_minutes + elapsed_minutes)
+        # The lists for deletion hold IDs rather than records.
+        if section in (EVENT_RESULT_LIST_FOR_DELETION, ODDS_LIST_FOR_DELETION):
+            return None if self._is_id(record) else "invalid ID"
 
-                    if calculated_current_minutes > current_minutes_cap:
-                        calculated_current_minutes = current_minutes_cap
+        if not isinstance(record, (list, tuple)):
+            return "not a list"
 
-                    # In the absence of a value for current minutes from the server, use the calculated value.
-                    self.event_result_extra_dictionary[event_result_id]['current_minutes'] = calculated_current_minutes
+        if section == ODDS_DICTIONARY:
+            return self._get_odds_record_error(record, odds_ids_seen, odds_ids_deleted)
 
-                    if event_result_id not in self.events_updated:
-                        self.events_updated[event_result_id] = {}
+        minimum_length, id_indexes = RECORD_LAYOUTS[section]
 
-                    # Set a flag to indicate that the event details for this event result have been updated.
-                    self.events_updated[event_result_id]['event_details'] = True
+        if len(record) < minimum_length:
+            return "too few elements"
 
+        for id_index in id_indexes:
 
-    def _update_odds_dictionary(self, odds_dictionary):
+            if not self._is_id(record[id_index]):
+                return "invalid ID at index %s" % id_index
 
-        """This private method updates the internal cache of odds data.
+        return None
 
-        Args: odds_dictionary(dictionary)
-        Returns: None
-        Raises: None
+
+    def _validate_section(self, section, records, odds_ids_deleted=()):
+
+        """This private method validates each record in a section of the frame cache data, quarantining the invalid records.
+
+        Args: section(integer), records(list), odds_ids_deleted(set), eg: the cached Odds IDs deleted before the section is applied.
+        Returns: valid_records(list), eg: None if the section holds no data.
+        Raises:
+            SboDataSourceCache.UnexpectedDataError: If the section is not a list of records.
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_update_odds_dictionary"))
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_validate_section"))
 
-        # A temporary dictionary used only within the scope of this method to keep track of which line number each odds belongs to.
-        line_number_dictionary = {}
+        if records is None:
+            return None
 
-        for odds in odds_dictionary:
+        try:
+            records = list(records)
 
-            # This flag is required because Odds that are passed to this function do not need to be reported in the
-            # Updated Odds array if they are being added as part of a new Event.
-            # If they are isolated Odds updated then they will be reported in the Updated Odds array as normal.
-            add_to_updated_odds = False
+        except TypeError as exception_instance:
+            raise SboDataSourceCache.UnexpectedDataError("_validate_section() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
 
-            odds_id = odds[ODDS_ID]
+        valid_records = []
+        odds_ids_seen = set()
 
-            if odds_id not in self.odds_dictionary:
+        for record in records:
 
-                # Create a new dictionary entry with the received odds details.
+            record_error = self._get_record_error(section, record, odds_ids_seen, odds_ids_deleted)
 
-                # Look-up the Event Result ID that is associated with this set of Odds.
-                event_result_id = odds[ODDS_DATA_ARRAY][ODDS_DICTIONARY_EVENT_RESULT_ID]
-                market_display_id = odds[ODDS_DATA_ARRAY][MARKET_DISPLAY_ID]
+            if record_error is None:
 
-                # Store the odds with a reference to the line number they belong to which is determined from the raw order of odds.
-                line_number = self._get_next_line_number(line_number_dictionary, event_result_id, market_display_id)
+                valid_records.append(record)
 
-                # Note: The entire Odds Data Array and Prices Array are stored in cache.
-                # As the Odds type isn't checked at this stage, some odds my ultimately go unused.
-                # However, this method supports the updating of all Odds types.
-                self.odds_dictionary[odds_id] = {
-                    'odds_data': odds[ODDS_DATA_ARRAY],
-                    'prices': odds[PRICES_ARRAY],
-                    'line_number': line_number
-                }
+                if section == ODDS_DICTIONARY:
+                    odds_ids_seen.add(record[ODDS_ID])
 
-                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Creating Odds ID: %s" % odds_id)
+            else:
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "Quarantining record in section %s, %s: %s" % (section, record_error, record))
+                self.records_quarantined.append((section, record, record_error))
 
-                # Determine if this set of Odds is being added as part of a new Event.
-                # If they are not covered by the creation of an associated Event then they need to be added to the Updated Odds array.
-                if event_result_id not in self.events_created:
-                    add_to_updated_odds = True
+        # If none of the records can be read, the layout of the section may have changed, rather than a record being malformed.
+        # The rest of the frame is still applied, as a section often holds a single record.
+        if records and not valid_records:
+            debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "_validate_section() found no valid records in section %s." % section)
+            self.sections_without_valid_records += 1
 
-            else:
+        return valid_records
 
-                # Update the dictionary with the received odds details.
 
-                # All Odds Updates are automatically added to the Updated Odds array.
-                add_to_updated_odds = True
+    def _get_odds_ids_deleted(self, event_result_list_for_deletion, odds_list_for_deletion):
 
-                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Updating Odds ID: %s" % odds_id)
+        """This private method returns the cached Odds IDs that will be deleted, directly or with their Event Results, before the Odds are updated.
 
-                # Update the individual elements of the Odds Data Array and Prices Array, as SBO server updates
-                # may not contain a full copy of the array.
+        Args: event_result_list_for_deletion(list), odds_list_for_deletion(list)
+        Returns: odds_ids_deleted(set)
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_odds_ids_deleted"))
 
-                if odds[ODDS_DATA_ARRAY] is not None:
+        odds_ids_deleted = set(odds_id for odds_id in odds_list_for_deletion or () if odds_id in self.odds_dictionary)
 
-                    # The point information is not always included in an odds update.
-                    # Only attempt to update the point value if the odds data array is large enough to include it.
-                    if len(odds[ODDS_DATA_ARRAY]) > 4:
-                        if odds[ODDS_DATA_ARRAY][POINT] is not None:
-                            self.odds_dictionary[odds_id]['odds_data'][POINT] = odds[ODDS_DATA_ARRAY][POINT]
+        for event_result_id in event_result_list_for_deletion or ():
 
-                if len(odds) > 2:
-                    if odds[PRICES_ARRAY] is not None:
+            # Only the Odds of cached Event Results are deleted with them.
+            if event_result_id in self.event_result_dictionary:
+                odds_ids_deleted.update(self.event_result_odds.get(event_result_id, ()))
 
-                        if odds[PRICES_ARRAY][PRICE_1] is not None:
-                            self.odds_dictionary[odds_id]['prices'][PRICE_1] = odds[PRICES_ARRAY][PRICE_1]
+        return odds_ids_deleted
 
-                        # Price 2 is not always present in the Prices array, so check if there is more than one price.
-                        if len(odds[PRICES_ARRAY]) > 1:
-                            if odds[PRICES_ARRAY][PRICE_2] is not None:
-                                self.odds_dictionary[odds_id]['prices'][PRICE_2] = odds[PRICES_ARRAY][PRICE_2]
 
-                        # Price 3 is not always present in the Prices array, so check if there are more than two prices.
-                        # Note: The JabBlob system doesn't require the Odds type that uses Price 3.
-                        # This method supports the Price 3 parameter for possible future use.
-                        if len(odds[PRICES_ARRAY]) > 2:
-                            if odds[PRICES_ARRAY][PRICE_3] is not None:
-                                self.odds_dictionary[odds_id]['prices'][PRICE_3] = odds[PRICES_ARRAY][PRICE_3]
+    def _link_reference(self, reverse_index, parent_id, child_id):
 
-            # Add the new or updated Odds set to the Updated Odds array.
-            # If the Odds set is new, it will be associated with an existing Event.
-            if add_to_updated_odds:
+        """This private method records in a reverse index that the given child record references the given parent record.
 
-                # Look-up the Event Result ID that is associated with this set of Odds.
-                event_result_id = self.odds_dictionary[odds_id]['odds_data'][ODDS_DICTIONARY_EVENT_RESULT_ID]
+        Args: reverse_index(dictionary), parent_id(integer), child_id(integer)
+        Returns: None
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_link_reference"))
 
-                if event_result_id not in self.events_updated:
-                    self.events_updated[event_result_id] = {}
+        self._log_undo(reverse_index, parent_id)
 
-                # The updated odds list is a list of Odds IDs that have had their Odds updated.
-                if 'event_odds' not in self.events_updated[event_result_id]:
-                    updated_odds = []
-                else:
-                    updated_odds = self.events_updated[event_result_id]['event_odds']
+        if parent_id not in reverse_index:
+            reverse_index[parent_id] = set()
 
-                # Add the Odds ID to a list that indicates the odds data for this Event Result has been updated.
-                updated_odds.append(odds_id)
-                self.events_updated[event_result_id]['event_odds'] = updated_odds
+        reverse_index[parent_id].add(child_id)
 
 
-    def _update_market_group_dictionary(self, market_group_dictionary):
+    def _unlink_reference(self, reverse_index, parent_id, child_id, orphan_type):
 
-        """This private method updates the internal cache of market group data.
+        """This private method removes a reference from a reverse index, marking the parent record as a possible orphan once it has no references left.
 
-        Args: market_group_dictionary(dictionary)
+        Args: reverse_index(dictionary), parent_id(integer), child_id(integer), orphan_type(integer), eg: None if the parent is never collected.
         Returns: None
         Raises: None
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_update_market_group_dictionary"))
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_unlink_reference"))
 
-        for market_group in market_group_dictionary:
+        child_ids = reverse_index.get(parent_id)
 
-            market_group_id = market_group[MARKET_GROUP_ID]
+        if child_ids is None:
+            return
 
-            # Set a flag to indicate weather existing event details are being updated or new event details are being created.
-            if market_group_id in self.market_group_dictionary:
-                update_event_details = True
-                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Updating Market Group ID: %s" % market_group_id)
-            else:
-                update_event_details = False
-                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Creating Market Group ID: %s" % market_group_id)
+        self._log_undo(reverse_index, parent_id)
+        child_ids.discard(child_id)
 
-            # Create or Update the dictionary with the received event details.
-            self.market_group_dictionary[market_group_id] = market_group[MARKET_GROUP_NAME]
+        if not child_ids:
 
-            if update_event_details:
+            del reverse_index[parent_id]
 
-                # Get a list of Event Result IDs affected by the update of this Market Group ID.
-                affected_event_result_ids = self._get_affected_event_result_ids('market_group_id', market_group_id)
+            if orphan_type is not None:
+                self.orphan_candidates[orphan_type].add(parent_id)
 
-                for event_result_id in affected_event_result_ids:
 
-                    if event_result_id not in self.events_updated:
-                        self.events_updated[event_result_id] = {}
+    def _collect_orphans(self):
 
-                    # Set a flag to indicate that the event details for this event result have been updated.
-                    self.events_updated[event_result_id]['event_details'] = True
+        """This private method deletes the Events, Tournaments and Market Groups that are no longer referenced after losing a reference during this update.
 
+        Records that have never been referenced are kept, as the SBO server may send them before the records that reference them.
 
-    def _delete_from_event_result_dictionary(self, event_results_to_delete):
+        This simple method has no arguments or returns.
+        It raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_collect_orphans"))
 
-        """This private method deletes from the internal cache of event result data.
+        # Events are collected first, as deleting an Event can leave its Tournament without a reference.
+        for event_id in self.orphan_candidates[ORPHAN_EVENTS]:
 
-        Args: event_results_to_delete(list)
+            if event_id in self.event_dictionary and event_id not in self.event_event_results:
+
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Deleting orphaned Event ID: %s" % event_id)
+
+                self._unlink_reference(self.tournament_events, self.event_dictionary[event_id]['tornament_id'], event_id, ORPHAN_TOURNAMENTS)
+                del self.event_dictionary[event_id]
+
+        for tournament_id in self.orphan_candidates[ORPHAN_TOURNAMENTS]:
+
+            if tournament_id in self.tournament_dictionary and tournament_id not in self.tournament_events:
+
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Deleting orphaned Tournament ID: %s" % tournament_id)
+
+                del self.tournament_dictionary[tournament_id]
+
+        for market_group_id in self.orphan_candidates[ORPHAN_MARKET_GROUPS]:
+
+            if market_group_id in self.market_group_dictionary and market_group_id not in self.market_group_event_results:
+
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Deleting orphaned Market Group ID: %s" % market_group_id)
+
+                del self.market_group_dictionary[market_group_id]
+
+        self.orphan_candidates = [set(), set(), set()]
+
+
+    def _patch_event_odds_grid(self, odds_id):
+
+        """This private method formats the given Odds ID and writes it to its cell in the odds grid of the associated Event Result.
+
+        Odds of a Market Display type that is not shown in the grid, or on a line beyond the grid, are ignored.
+        If the Odds can not be formatted, the exception is stored in the cell and raised when the grid is read.
+
+        Args: odds_id(integer)
         Returns: None
         Raises: None
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_delete_from_event_result_dictionary"))
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_patch_event_odds_grid"))
 
-        for event_result_id in event_results_to_delete:
+        odds_data = self.odds_dictionary[odds_id]['odds_data']
+        prices = self.odds_dictionary[odds_id]['prices']
+        line_index = self.odds_dictionary[odds_id]['line_number'] - 1
 
-            debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Attempting to delete Event Result ID: %s" % event_result_id)
+        try:
+            column = ODDS_GRID_COLUMNS.get(odds_data[MARKET_DISPLAY_ID])
 
-            # Delete the Event Result ID from the Event Result Dictionary if the entry exists.
-            if event_result_id in self.event_result_dictionary:
+        except TypeError:
+            column = None
 
-                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Deleting Event Result: %s" % self.event_result_dictionary[event_result_id])
+        if column is None:
+            return
 
-                del self.event_result_dictionary[event_result_id]
+        if line_index >= ODDS_GRID_LINES:
+            debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "_patch_event_odds_grid() can not display Odds ID %s on line %s." % (odds_id, line_index + 1))
+            return
 
-                # Add the Event Result ID to the list of events that have been deleted.
-                # Note: An Event is only considered to be deleted once it has been removed from the Event Result Dictionary.
-                self.events_deleted.append(event_result_id)
+        try:
+            point_data = self._format_point_value(odds_data[POINT])
 
-            # Delete the Event Result ID from the Event Result Extra Dictionary if the entry exists.
-            # Note: The SBO server does not explicitly request the deletion from this dictionary, but delete anyway to keep things tidy.
-            if event_result_id in self.event_result_extra_dictionary:
+            if column in HDP_ODDS_GRID_COLUMNS:
 
-                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Deleting Event Result Extra: %s" % self.event_result_extra_dictionary[event_result_id])
+                # The HDP Odds include a parameter to represent the favourite team.
+                row = (point_data[FORMATTED_POINT], prices[PRICE_1], prices[PRICE_2], point_data[FAVOURITE_TEAM])
 
-                del self.current_minutes_cache[event_result_id]
-                del self.event_result_extra_dictionary[event_result_id]
+            else:
+                row = (point_data[FORMATTED_POINT], prices[PRICE_1], prices[PRICE_2])
 
+        except (TypeError, IndexError) as exception_instance:
+            debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "_patch_event_odds_grid() can not format Odds ID %s, %s: %s" % (odds_id, type(exception_instance).__name__, exception_instance))
+            row = ODDS_GRID_UNFORMATTABLE
 
-    def _delete_from_odds_dictionary(self, odds_to_delete):
+        event_result_id = odds_data[ODDS_DICTIONARY_EVENT_RESULT_ID]
 
-        """This private method deletes from the internal cache of odds data.
+        self._log_undo(self.event_odds_grids, event_result_id)
+        self._log_undo(self.odds_grid_cells, odds_id)
 
-        Args: odds_to_delete(list)
+        if event_result_id not in self.event_odds_grids:
+            self.event_odds_grids[event_result_id] = [[None, None, None, None] for _ in range(ODDS_GRID_LINES)]
+
+        self.event_odds_grids[event_result_id][line_index][column] = row
+        self.odds_grid_cells[odds_id] = (event_result_id, line_index, column)
+
+
+    def _clear_event_odds_grid_cell(self, odds_id):
+
+        """This private method clears the odds grid cell occupied by the given Odds ID, removing the grid once it is empty.
+
+        Args: odds_id(integer)
         Returns: None
         Raises: None
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_delete_from_odds_dictionary"))
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_clear_event_odds_grid_cell"))
 
-        for odds_id in odds_to_delete:
+        self._log_undo(self.odds_grid_cells, odds_id)
+        grid_cell = self.odds_grid_cells.pop(odds_id, None)
 
-            debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Attempting to delete Odds ID: %s" % odds_id)
+        if grid_cell is None:
+            return
 
-            # Delete the Odds ID from the Odds Dictionary if the entry exists.
-            if odds_id in self.odds_dictionary:
+        event_result_id, line_index, column = grid_cell
+        self._log_undo(self.event_odds_grids, event_result_id)
+        event_odds_grid = self.event_odds_grids[event_result_id]
+        event_odds_grid[line_index][column] = None
 
-                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Deleting Odds: %s" % self.odds_dictionary[odds_id])
+        if not any(any(line) for line in event_odds_grid):
+            del self.event_odds_grids[event_result_id]
 
-                del self.odds_dictionary[odds_id]
 
+    def _record_price_history(self, odds_id):
 
-    def _get_match_stage_details(self, event_result_id):
+        """This private method appends the current prices and point of the given Odds ID to its price history ring buffer.
 
-        """This private method uses the SBO servers Period parameter to determine the JamBlob match stage.
+        Each buffer is allocated once, at a fixed size, so recording a new entry never allocates memory.
 
-        Args: event_result_id(integer)
-        Returns: match_stage_details(tuple), eg: (match_stage, first_half_elapsed, second_half_elapsed, injury_time)
+        Args: odds_id(integer)
+        Returns: None
         Raises: None
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_match_stage_details"))
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_record_price_history"))
 
-        match_stage = None
-        first_half_elapsed = None
-        second_half_elapsed = None
-        injury_time = None
+        self._log_undo(self.price_history, odds_id)
 
-        # Some Events (usually non-live), do not have any Event Result Extra data.
-        if event_result_id not in self.event_result_extra_dictionary:
+        if odds_id not in self.price_history:
+            self.price_history[odds_id] = [array('d', [float('NaN')]) * (self.price_history_length * PRICE_HISTORY_COLUMNS), 0, 0]
 
-            debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Event Result ID %s has no Event Result Extra data." % event_result_id)
+        ring_buffer = self.price_history[odds_id]
+        prices = self.odds_dictionary[odds_id]['prices']
+        odds_data = self.odds_dictionary[odds_id]['odds_data']
 
-            match_stage = NOT_LIVE
-            first_half_elapsed = 0
-            second_half_elapsed = 0
-            injury_time = 0
+        # Each entry occupies a row of consecutive values, eg: (price_1, price_2, point, timestamp).
+        offset = ring_buffer[PRICE_HISTORY_HEAD] * PRICE_HISTORY_COLUMNS
+        buffer = ring_buffer[PRICE_HISTORY_BUFFER]
 
-            return (match_stage, first_half_elapsed, second_half_elapsed, injury_time)
+        buffer[offset + PRICE_HISTORY_PRICE_1] = self._get_price_history_value(prices, PRICE_1)
+        buffer[offset + PRICE_HISTORY_PRICE_2] = self._get_price_history_value(prices, PRICE_2)
+        buffer[offset + PRICE_HISTORY_POINT] = self._get_price_history_value(odds_data, POINT)
+        buffer[offset + PRICE_HISTORY_TIMESTAMP] = time.time()
 
-        # The match stage is a JamBlob parameter that indicates the current stage of the match.
-        # The SBO servers Period and time related parameters can be used to determine the match stage.
-        period = self.event_result_extra_dictionary[event_result_id]['period']
-        current_minutes = self.event_result_extra_dictionary[event_result_id]['current_minutes']
-        total_minutes = self.event_result_extra_dictionary[event_result_id]['total_minutes']
+        ring_buffer[PRICE_HISTORY_HEAD] = (ring_buffer[PRICE_HISTORY_HEAD] + 1) % self.price_history_length
+        ring_buffer[PRICE_HISTORY_COUNT] = min(ring_buffer[PRICE_HISTORY_COUNT] + 1, self.price_history_length)
 
-        if period == 1:
 
-            # A Period of exactly One indicates the first half of the match is in play.
-            match_stage = FIRST_HALF
-            first_half_elapsed = current_minutes
-            second_half_elapsed = None
-            injury_time = 0
+    def _allocate_scanner_slot(self, odds_id):
 
-        elif period == 5:
+        """This private method allocates the column of the price movement scanner arrays that holds the given Odds ID, growing the arrays if they are full.
 
-            # A Period of exactly Five indicates that it is half time.
-            match_stage = HALF_TIME
-            first_half_elapsed = None
-            second_half_elapsed = None
-            injury_time = 0
+        Args: odds_id(integer)
+        Returns: slot(integer)
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_allocate_scanner_slot"))
 
-        elif period == 2:
+        if not self.scanner_free_slots:
 
-            # A Period of exactly Two indicates the second half of the match is in play.
-            match_stage = SECOND_HALF
-            first_half_elapsed = None
-            second_half_elapsed = current_minutes
-            injury_time = 0
+            # Double the capacity of the arrays, filling the new columns with NaN so that they are never flagged.
+            capacity = self.scanner_values.shape[-1]
 
-        elif period > 2:
+            self.scanner_values = numpy.concatenate((self.scanner_values, numpy.full((SCANNER_VALUE_ROWS, capacity), numpy.nan)), axis=-1)
+            self.scanner_keys = numpy.concatenate((self.scanner_keys, numpy.zeros((SCANNER_KEY_ROWS, capacity), dtype=numpy.int64)), axis=-1)
+            self.scanner_history = numpy.concatenate((self.scanner_history, numpy.full((self.scanner_window, SCANNER_VALUE_ROWS, capacity), numpy.nan)), axis=-1)
 
-            # A Period of more than Two indicates that the match has gone into injury time.
-            match_stage = SECOND_HALF
-            first_half_elapsed = None
-            second_half_elapsed = current_minutes
-            injury_time = current_minutes - total_minutes
+            self.scanner_free_slots = list(range(2 * capacity - 1, capacity - 1, -1))
 
-        return (match_stage, first_half_elapsed, second_half_elapsed, injury_time)
+        slot = self.scanner_free_slots.pop()
+        self.scanner_slots[odds_id] = slot
 
+        return slot
 
-    def _format_show_time(self, show_time):
 
-        """This private method takes the show time parameter in its raw state and returns it in the required format.
+    def _update_price_movement_scanner(self):
 
-        Args: show_time(string)
-        Returns: formatted_show_time(datetime)
-        Raises: None
+        """This private method loads the Odds updated during the last cache update into the scanner arrays and flags sharp price or point movements.
+
+        The current values are compared with the values from the frame at the start of the scanner window in a single vectorised pass.
+
+        This simple method has no arguments or returns.
+        It raises no errors.
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_format_show_time"))
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_update_price_movement_scanner"))
 
-        formatted_show_time = DEFAULT_SHOW_TIME
+        for odds_id in self.scanner_odds_deleted:
 
-        try:
-            # Extract the date and time details from the raw string.
-            # eg: 02/19/2013 13:44
-            regex_match = REGEX_SHOW_TIME.match(show_time)
+            slot = self.scanner_slots.pop(odds_id, None)
 
-        except TypeError as exception_instance:
+            if slot is not None:
 
-            # Catch any TypeErrors.
-            debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "_format_show_time() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
-            return formatted_show_time
+                # Clear the column throughout the window, so that it is not compared with the values of the next Odds to use it.
+                self.scanner_values[:, slot] = numpy.nan
+                self.scanner_history[:, :, slot] = numpy.nan
+                self.scanner_free_slots.append(slot)
 
-        if not regex_match:
+        for odds_id in self.scanner_odds_updated:
 
-            debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "_format_show_time() can not extract time and date details from show time string: %s" % show_time)
-            return formatted_show_time
+            if odds_id not in self.odds_dictionary:
+                continue
 
-        # The Regular Expression will only match digits so it is safe to convert the matches to integers.
-        year = int(regex_match.group('year'))
-        month = int(regex_match.group('month'))
-        day = int(regex_match.group('day'))
-        hour = int(regex_match.group('hour'))
-        minute = int(regex_match.group('minute'))
+            slot = self.scanner_slots.get(odds_id)
 
-        try:
-            # Subtracting the GMT offset from the show time ensures all show times are displayed in GMT.
-            formatted_show_time = datetime(year, month, day, hour, minute) - self.timedelta_gmt_offset
+            if slot is None:
+                slot = self._allocate_scanner_slot(odds_id)
 
-        except (TypeError, ValueError, OverflowError) as exception_instance:
-            debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "_format_show_time() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+            odds_data = self.odds_dictionary[odds_id]['odds_data']
+            prices = self.odds_dictionary[odds_id]['prices']
 
-        return formatted_show_time
+            self.scanner_values[SCANNER_PRICE_1, slot] = self._get_price_history_value(prices, PRICE_1)
+            self.scanner_values[SCANNER_PRICE_2, slot] = self._get_price_history_value(prices, PRICE_2)
+            self.scanner_values[SCANNER_POINT, slot] = self._get_price_history_value(odds_data, POINT)
 
+            try:
+                self.scanner_keys[:, slot] = (odds_data[ODDS_DICTIONARY_EVENT_RESULT_ID], odds_data[MARKET_DISPLAY_ID], self.odds_dictionary[odds_id]['line_number'])
 
-    def _get_red_cards(self, event_result_id):
+            except (TypeError, ValueError, OverflowError) as exception_instance:
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "_update_price_movement_scanner() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
 
-        """This private method returns the number of red cards for home and away, if the given Event Result ID has Event Result Extra data.
+        self.scanner_odds_updated = set()
+        self.scanner_odds_deleted = set()
 
-        Args: event_result_id(integer)
-        Returns: red_cards(tuple), eg: (home_red_card_count, away_red_card_count)
-        Raises: None
-        """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_red_cards"))
+        # The oldest frame in the window is the one about to be overwritten. NaN values never compare as greater than the threshold.
+        baseline = self.scanner_history[self.scanner_history_position]
+        deltas = numpy.abs(self.scanner_values - baseline)
 
-        home_red_card_count = None
-        away_red_card_count = None
+        with numpy.errstate(invalid='ignore'):
+            flagged = ((deltas[SCANNER_PRICE_1] > self.scanner_price_threshold) |
+                       (deltas[SCANNER_PRICE_2] > self.scanner_price_threshold) |
+                       (deltas[SCANNER_POINT] > self.scanner_point_threshold))
 
-        # Some Events (usually non-live), do not have any Event Result Extra data.
-        if event_result_id in self.event_result_extra_dictionary:
+        flagged_keys = self.scanner_keys[:, numpy.nonzero(flagged)[0]]
+        self.price_movements = [tuple(key) for key in flagged_keys.T.tolist()]
 
-            home_red_card_count = self.event_result_extra_dictionary[event_result_id]['home_red_card_count']
-            away_red_card_count = self.event_result_extra_dictionary[event_result_id]['away_red_card_count']
+        baseline[...] = self.scanner_values
+        self.scanner_history_position = (self.scanner_history_position + 1) % self.scanner_window
 
-        return (home_red_card_count, away_red_card_count)
 
+    def _update_tournament_dictionary(self, tournament_dictionary):
 
-    def _get_tournament_name(self, event_id, event_result_id):
+        """This private method updates the internal cache of tournament data.
 
-        """This private method returns the Tournament Name for a given Tournament ID.
+        Args: tournament_dictionary(dictionary)
+        Returns: None
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_update_tournament_dictionary"))
+
+        for tournament in tournament_dictionary:
+
+            tournament_id = tournament[TORNAMENT_ID]
+
+            # Set a flag to indicate weather existing event details are being updated or new event details are being created.
+            if tournament_id in self.tournament_dictionary:
+                update_event_details = True
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Updating Tournament ID: %s" % tournament_id)
+            else:
+                update_event_details = False
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Creating Tournament ID: %s" % tournament_id)
+
+            # Create or Update the dictionary with the received event details.
+            self._log_undo(self.tournament_dictionary, tournament_id)
+            self.tournament_dictionary[tournament_id] = tournament[TORNAMENT_NAME]
+
+            if update_event_details:
+
+                # Get a list of Event IDs affected by the update of this Tournament ID.
+                affected_event_ids = self._get_affected_event_ids(tournament_id)
+
+                for event_id in affected_event_ids:
+
+                    # Get a list of Event Result IDs affected by the update of this Event ID.
+                    affected_event_result_ids = self._get_affected_event_result_ids('event_id', event_id)
+
+                    for event_result_id in affected_event_result_ids:
+
+                        if event_result_id not in self.events_updated:
+                            self.events_updated[event_result_id] = {}
+
+                        # Set a flag to indicate that the event details for this event result have been updated.
+                        self.events_updated[event_result_id]['event_details'] = True
+
+            else:
+
+                # Events may have been received before their Tournament, so their Event Results can now be placed on the board.
+                for event_id in self._get_affected_event_ids(tournament_id):
+                    self.event_results_to_refresh.update(self._get_affected_event_result_ids('event_id', event_id))
+
+
+    def _update_event_dictionary(self, event_dictionary):
+
+        """This private method updates the internal cache of event data.
+
+        Args: event_dictionary(dictionary)
+        Returns: None
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_update_event_dictionary"))
+
+        for event in event_dictionary:
+
+            event_id = event[EVENT_ID]
+
+            # Set a flag to indicate weather existing event details are being updated or new event details are being created.
+            if event_id in self.event_dictionary:
+                update_event_details = True
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Updating Event ID: %s" % event_id)
+            else:
+                update_event_details = False
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Creating Event ID: %s" % event_id)
+
+            if update_event_details:
+                self._unlink_reference(self.tournament_events, self.event_dictionary[event_id]['tornament_id'], event_id, ORPHAN_TOURNAMENTS)
+
+            self._link_reference(self.tournament_events, event[EVENT_DICTIONARY_TORNAMENT_ID], event_id)
+
+            # Create or Update the dictionary with the received event details.
+            self._log_undo(self.event_dictionary, event_id)
+            self.event_dictionary[event_id] = {
+                'tornament_id': event[EVENT_DICTIONARY_TORNAMENT_ID],
+                'home_team_name': event[HOME_TEAM_NAME],
+                'away_team_name': event[AWAY_TEAM_NAME],
+                'event_sort_code': event[EVENT_SORT_CODE],
+                'show_time_type': event[SHOW_TIME_TYPE],
+                'show_time': event[SHOW_TIME]
+            }
+
+            if update_event_details:
+
+                # Get a list of Event Result IDs affected by the update of this Event ID.
+                affected_event_result_ids = self._get_affected_event_result_ids('event_id', event_id)
+
+                for event_result_id in affected_event_result_ids:
+
+                    if event_result_id not in self.events_updated:
+                        self.events_updated[event_result_id] = {}
+
+                    # Set a flag to indicate that the event details for this event result have been updated.
+                    self.events_updated[event_result_id]['event_details'] = True
+
+            else:
+
+                # Event Results may have been received before their Event, so they must now be re-indexed.
+                self.event_results_to_refresh.update(self._get_affected_event_result_ids('event_id', event_id))
+
+
+    def _update_event_result_dictionary(self, event_result_dictionary):
+
+        """This private method updates the internal cache of event result data
+
+        Args: event_result_dictionary(dictionary)
+        Returns: None
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_update_event_result_dictionary"))
+
+        for event_result in event_result_dictionary:
+
+            event_result_id = event_result[EVENT_RESULT_ID]
+
+            # Set a flag to indicate weather existing event details are being updated or new event details are being created.
+            if event_result_id in self.event_result_dictionary:
+                update_event_details = True
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Updating Event Result ID: %s" % event_result_id)
+            else:
+                update_event_details = False
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Creating Event Result ID: %s" % event_result_id)
+
+            if update_event_details:
+                self._unlink_reference(self.event_event_results, self.event_result_dictionary[event_result_id]['event_id'], event_result_id, ORPHAN_EVENTS)
+                self._unlink_reference(self.market_group_event_results, self.event_result_dictionary[event_result_id]['market_group_id'], event_result_id, ORPHAN_MARKET_GROUPS)
+
+            self._link_reference(self.event_event_results, event_result[EVENT_RESULT_DICTIONARY_EVENT_ID], event_result_id)
+            self._link_reference(self.market_group_event_results, event_result[EVENT_RESULT_DICTIONARY_MARKET_GROUP_ID], event_result_id)
+
+            # Create or Update the dictionary with the received event details.
+            self._log_undo(self.event_result_dictionary, event_result_id)
+            self.event_result_dictionary[event_result_id] = {
+                'event_id': event_result[EVENT_RESULT_DICTIONARY_EVENT_ID],
+                'market_group_id': event_result[EVENT_RESULT_DICTIONARY_MARKET_GROUP_ID],
+                'home_score': event_result[HOME_SCORE],
+                'away_score': event_result[AWAY_SCORE],
+                'odds_count': event_result[ODDS_COUNT]
+            }
+
+            self._touch_event_result(event_result_id)
+
+            if update_event_details:
+
+                if event_result_id not in self.events_updated:
+                    self.events_updated[event_result_id] = {}
+
+                # Set a flag to indicate that the event details for this event result have been updated.
+                self.events_updated[event_result_id]['event_details'] = True
+
+            else:
+
+                # Add the Event Result ID to the list of events that have been created.
+                # Note: A new Event is only considered to be created once the Event Result Dictionary is updated.
+                self.events_created.append(event_result_id)
+
+
+    def _update_event_result_extra_dictionary(self, event_result_extra_dictionary): # pylint: disable-msg=C0103
+
+        """This private method updates the internal cache of event result extra data.
+
+        Args: event_result_extra_dictionary(dictionary)
+        Returns: None
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_update_event_result_extra_dictionary"))
+
+        if event_result_extra_dictionary is not None:
+            self._receive_event_result_extras(event_result_extra_dictionary)
+
+        self._simulate_current_minutes()
+
+
+    def _receive_event_result_extras(self, event_result_extra_dictionary):
+
+        """This private method caches the event result extra data received from the SBO server.
+
+        Args: event_result_extra_dictionary(dictionary)
+        Returns: None
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_receive_event_result_extras"))
+
+        if event_result_extra_dictionary is not None:
+
+            for event_result_extra in event_result_extra_dictionary:
+
+                event_result_id = event_result_extra[EVENT_RESULT_EXTRA_DICTIONARY_EVENT_RESULT_ID]
+
+                # Set a flag to indicate weather existing event details are being updated or new event details are being created.
+                if event_result_id in self.event_result_extra_dictionary:
+                    update_event_details = True
+                    debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Updating Event Result (Extra) ID: %s" % event_result_id)
+                else:
+                    update_event_details = False
+                    debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Creating Event Result (Extra) ID: %s" % event_result_id)
+
+                # Create or Update the dictionary with the received event details.
+                self._log_undo(self.event_result_extra_dictionary, event_result_id)
+                self._log_undo(self.current_minutes_cache, event_result_id)
+                self.event_result_extra_dictionary[event_result_id] = {
+                    'row_count': event_result_extra[ROW_COUNT],
+                    'period': event_result_extra[PERIOD],
+                    'current_minutes': event_result_extra[CURRENT_MINUTES],
+                    'total_minutes': event_result_extra[TOTAL_MINUTES],
+                    'home_red_card_count': event_result_extra[HOME_RED_CARD_COUNT],
+                    'away_red_card_count': event_result_extra[AWAY_RED_CARD_COUNT],
+                    'injury_time': event_result_extra[INJURY_TIME]
+                }
+
+                self._touch_event_result(event_result_id)
+
+                if update_event_details:
+
+                    if event_result_id not in self.events_updated:
+                        self.events_updated[event_result_id] = {}
+
+                    # Set a flag to indicate that the event details for this event result have been updated.
+                    self.events_updated[event_result_id]['event_details'] = True
+
+                else:
+
+                    # The first extras received for an Event Result give it a match stage.
+                    self.event_results_to_refresh.add(event_result_id)
+
+                # A new value for current minutes has just been received from the server.
+                # Cache or re-cache the start date and time of the match.
+                if event_result_id not in self.current_minutes_cache:
+                    self.current_minutes_cache[event_result_id] = {}
+
+                self.current_minutes_cache[event_result_id]['current_minutes'] = self.event_result_extra_dictionary[event_result_id]['current_minutes']
+                self.current_minutes_cache[event_result_id]['cache_time'] = datetime.now()
+
+                # Keep track of which events have just had their current minutes cached to save immediately calculating their new
+                # current minutes later. The start time will not have elapsed more than a minute and the calculation will be wasted.
+                self.current_minutes_just_cached.add(event_result_id)
+
+
+    def _simulate_current_minutes(self):
+
+        """This private method updates the current minutes of the events that have not received a value from the SBO server during this update.
+
+        This simple method has no arguments or returns.
+        It raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_simulate_current_minutes"))
+
+        if self.event_result_extra_dictionary is not None:
+
+            for event_result_id in self.event_result_extra_dictionary:
+
+                # Any events which have not just had their current minutes cached have not received an updated current minutes from the server.
+                # In this case we need to check how long has elapsed since the cache time and update the current minutes as necessary.
+                if event_result_id not in self.current_minutes_just_cached:
+
+                    now = datetime.now()
+                    cached_time = self.current_minutes_cache[event_result_id]['cache_time']
+                    cached_current_minutes = self.current_minutes_cache[event_result_id]['current_minutes']
+                    current_minutes_cap = self.event_result_extra_dictionary[event_result_id]['total_minutes']
+
+                    # Calculate the value for current minutes, based on the time elapsed since they were cached.
+                    time_since_cache = now - cached_time
+                    elapsed_minutes = time_since_cache.total_seconds() / SECONDS_IN_A_MINUTE                        # pylint: disable-msg=E1103
+                    calculated_current_minutes = int(cached_current_minutes + elapsed_minutes)
+
+                    if calculated_current_minutes > current_minutes_cap:
+                        calculated_current_minutes = current_minutes_cap
+
+                    # In the absence of a value for current minutes from the server, use the calculated value.
+                    self._log_undo(self.event_result_extra_dictionary, event_result_id)
+                    self.event_result_extra_dictionary[event_result_id]['current_minutes'] = calculated_current_minutes
+
+                    if event_result_id not in self.events_updated:
+                        self.events_updated[event_result_id] = {}
+
+                    # Set a flag to indicate that the event details for this event result have been updated.
+                    self.events_updated[event_result_id]['event_details'] = True
+
+
+    def _update_odds_dictionary(self, odds_dictionary):
+
+        """This private method updates the internal cache of odds data.
+
+        Args: odds_dictionary(dictionary)
+        Returns: None
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_update_odds_dictionary"))
+
+        for odds in odds_dictionary:
+
+            # This flag is required because Odds that are passed to this function do not need to be reported in the
+            # Updated Odds array if they are being added as part of a new Event.
+            # If they are isolated Odds updated then they will be reported in the Updated Odds array as normal.
+            add_to_updated_odds = False
+
+            odds_id = odds[ODDS_ID]
+            self._log_undo(self.odds_dictionary, odds_id)
+
+            if odds_id not in self.odds_dictionary:
+
+                # Create a new dictionary entry with the received odds details.
+
+                # Look-up the Event Result ID that is associated with this set of Odds.
+                event_result_id = odds[ODDS_DATA_ARRAY][ODDS_DICTIONARY_EVENT_RESULT_ID]
+                market_display_id = odds[ODDS_DATA_ARRAY][MARKET_DISPLAY_ID]
+
+                # Store the odds with a reference to the line number they belong to which is determined from the raw order of odds.
+                line_number = self._get_next_line_number(event_result_id, market_display_id)
+
+                self._link_reference(self.event_result_odds, event_result_id, odds_id)
+
+                # Note: The entire Odds Data Array and Prices Array are stored in cache.
+                # As the Odds type isn't checked at this stage, some odds my ultimately go unused.
+                # However, this method supports the updating of all Odds types.
+                self.odds_dictionary[odds_id] = {
+                    'odds_data': odds[ODDS_DATA_ARRAY],
+                    'prices': odds[PRICES_ARRAY],
+                    'line_number': line_number
+                }
+
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Creating Odds ID: %s" % odds_id)
+
+                # Determine if this set of Odds is being added as part of a new Event.
+                # If they are not covered by the creation of an associated Event then they need to be added to the Updated Odds array.
+                if event_result_id not in self.events_created:
+                    add_to_updated_odds = True
+
+            else:
+
+                # Update the dictionary with the received odds details.
+
+                # All Odds Updates are automatically added to the Updated Odds array.
+                add_to_updated_odds = True
+
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Updating Odds ID: %s" % odds_id)
+
+                # Update the individual elements of the Odds Data Array and Prices Array, as SBO server updates
+                # may not contain a full copy of the array.
+
+                if odds[ODDS_DATA_ARRAY] is not None:
+
+                    # The point information is not always included in an odds update.
+                    # Only attempt to update the point value if the odds data array is large enough to include it.
+                    if len(odds[ODDS_DATA_ARRAY]) > 4:
+                        if odds[ODDS_DATA_ARRAY][POINT] is not None:
+                            self.odds_dictionary[odds_id]['odds_data'][POINT] = odds[ODDS_DATA_ARRAY][POINT]
+
+                if len(odds) > 2:
+                    if odds[PRICES_ARRAY] is not None:
+
+                        if len(odds[PRICES_ARRAY]) > 0:
+                            if odds[PRICES_ARRAY][PRICE_1] is not None:
+                                self.odds_dictionary[odds_id]['prices'][PRICE_1] = odds[PRICES_ARRAY][PRICE_1]
+
+                        # Price 2 is not always present in the Prices array, so check if there is more than one price.
+                        if len(odds[PRICES_ARRAY]) > 1:
+                            if odds[PRICES_ARRAY][PRICE_2] is not None:
+                                self.odds_dictionary[odds_id]['prices'][PRICE_2] = odds[PRICES_ARRAY][PRICE_2]
+
+                        # Price 3 is not always present in the Prices array, so check if there are more than two prices.
+                        # Note: The JabBlob system doesn't require the Odds type that uses Price 3.
+                        # This method supports the Price 3 parameter for possible future use.
+                        if len(odds[PRICES_ARRAY]) > 2:
+                            if odds[PRICES_ARRAY][PRICE_3] is not None:
+                                self.odds_dictionary[odds_id]['prices'][PRICE_3] = odds[PRICES_ARRAY][PRICE_3]
+
+            # Write the new or updated Odds straight to their cell in the odds grid.
+            self._patch_event_odds_grid(odds_id)
+
+            self._touch_event_result(self.odds_dictionary[odds_id]['odds_data'][ODDS_DICTIONARY_EVENT_RESULT_ID])
+
+            if self.price_history_length:
+                self._record_price_history(odds_id)
+
+            if self.scanner_enabled:
+                self.scanner_odds_updated.add(odds_id)
+
+            # Add the new or updated Odds set to the Updated Odds array.
+            # If the Odds set is new, it will be associated with an existing Event.
+            if add_to_updated_odds:
+
+                # Look-up the Event Result ID that is associated with this set of Odds.
+                event_result_id = self.odds_dictionary[odds_id]['odds_data'][ODDS_DICTIONARY_EVENT_RESULT_ID]
+
+                if event_result_id not in self.events_updated:
+                    self.events_updated[event_result_id] = {}
+
+                # The updated odds list is a list of Odds IDs that have had their Odds updated.
+                if 'event_odds' not in self.events_updated[event_result_id]:
+                    updated_odds = []
+                else:
+                    updated_odds = self.events_updated[event_result_id]['event_odds']
+
+                # Add the Odds ID to a list that indicates the odds data for this Event Result has been updated.
+                updated_odds.append(odds_id)
+                self.events_updated[event_result_id]['event_odds'] = updated_odds
+
+
+    def _update_market_group_dictionary(self, market_group_dictionary):
+
+        """This private method updates the internal cache of market group data.
+
+        Args: market_group_dictionary(dictionary)
+        Returns: None
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_update_market_group_dictionary"))
+
+        for market_group in market_group_dictionary:
+
+            market_group_id = market_group[MARKET_GROUP_ID]
+
+            # Set a flag to indicate weather existing event details are being updated or new event details are being created.
+            if market_group_id in self.market_group_dictionary:
+                update_event_details = True
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Updating Market Group ID: %s" % market_group_id)
+            else:
+                update_event_details = False
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Creating Market Group ID: %s" % market_group_id)
+
+            # Create or Update the dictionary with the received event details.
+            self._log_undo(self.market_group_dictionary, market_group_id)
+            self.market_group_dictionary[market_group_id] = market_group[MARKET_GROUP_NAME]
+
+            if update_event_details:
+
+                # Get a list of Event Result IDs affected by the update of this Market Group ID.
+                affected_event_result_ids = self._get_affected_event_result_ids('market_group_id', market_group_id)
+
+                for event_result_id in affected_event_result_ids:
+
+                    if event_result_id not in self.events_updated:
+                        self.events_updated[event_result_id] = {}
+
+                    # Set a flag to indicate that the event details for this event result have been updated.
+                    self.events_updated[event_result_id]['event_details'] = True
+
+            else:
+
+                # Event Results may have been received before their Market Group, so they can now be placed on the board.
+                self.event_results_to_refresh.update(self._get_affected_event_result_ids('market_group_id', market_group_id))
+
+
+    def _delete_from_event_result_dictionary(self, event_results_to_delete):
+
+        """This private method deletes from the internal cache of event result data.
+
+        Args: event_results_to_delete(list)
+        Returns: None
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_delete_from_event_result_dictionary"))
+
+        for event_result_id in event_results_to_delete:
+
+            debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Attempting to delete Event Result ID: %s" % event_result_id)
+
+            # Delete the Event Result ID from the Event Result Dictionary if the entry exists.
+            if event_result_id in self.event_result_dictionary:
+
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Deleting Event Result: %s" % self.event_result_dictionary[event_result_id])
+
+                # The Odds of the Event Result are deleted with it, rather than waiting for the SBO server to list them for deletion.
+                self._delete_from_odds_dictionary(list(self.event_result_odds.get(event_result_id, ())))
+
+                # The Event and Market Group are collected at the end of the update if nothing else references them.
+                self._unlink_reference(self.event_event_results, self.event_result_dictionary[event_result_id]['event_id'], event_result_id, ORPHAN_EVENTS)
+                self._unlink_reference(self.market_group_event_results, self.event_result_dictionary[event_result_id]['market_group_id'], event_result_id, ORPHAN_MARKET_GROUPS)
+
+                self._log_undo(self.event_result_dictionary, event_result_id)
+                self._log_undo(self.event_result_last_seen, event_result_id)
+
+                del self.event_result_dictionary[event_result_id]
+                self.event_result_last_seen.pop(event_result_id, None)
+
+                # Add the Event Result ID to the list of events that have been deleted.
+                # Note: An Event is only considered to be deleted once it has been removed from the Event Result Dictionary.
+                self.events_deleted.append(event_result_id)
+
+            # Delete the Event Result ID from the Event Result Extra Dictionary if the entry exists.
+            # Note: The SBO server does not explicitly request the deletion from this dictionary, but delete anyway to keep things tidy.
+            if event_result_id in self.event_result_extra_dictionary:
+
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Deleting Event Result Extra: %s" % self.event_result_extra_dictionary[event_result_id])
+
+                self._log_undo(self.current_minutes_cache, event_result_id)
+                self._log_undo(self.event_result_extra_dictionary, event_result_id)
+
+                del self.current_minutes_cache[event_result_id]
+                del self.event_result_extra_dictionary[event_result_id]
+
+
+    def _delete_from_odds_dictionary(self, odds_to_delete):
+
+        """This private method deletes from the internal cache of odds data.
+
+        Args: odds_to_delete(list)
+        Returns: None
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_delete_from_odds_dictionary"))
+
+        for odds_id in odds_to_delete:
+
+            debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Attempting to delete Odds ID: %s" % odds_id)
+
+            # Delete the Odds ID from the Odds Dictionary if the entry exists.
+            if odds_id in self.odds_dictionary:
+
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Deleting Odds: %s" % self.odds_dictionary[odds_id])
+
+                self._log_undo(self.odds_dictionary, odds_id)
+                self._log_undo(self.price_history, odds_id)
+
+                odds_data = self.odds_dictionary[odds_id]['odds_data']
+
+                # Free the line number so that it can be used by new Odds for the same Event Result and market.
+                self._release_line_number(odds_data[ODDS_DICTIONARY_EVENT_RESULT_ID], odds_data[MARKET_DISPLAY_ID], self.odds_dictionary[odds_id]['line_number'])
+                self._clear_event_odds_grid_cell(odds_id)
+                self.price_history.pop(odds_id, None)
+                self._unlink_reference(self.event_result_odds, odds_data[ODDS_DICTIONARY_EVENT_RESULT_ID], odds_id, None)
+
+                if self.scanner_enabled:
+                    self.scanner_odds_updated.discard(odds_id)
+                    self.scanner_odds_deleted.add(odds_id)
+
+                del self.odds_dictionary[odds_id]
+
+
+    def _get_match_stage_details(self, event_result_id):
+
+        """This private method uses the SBO servers Period parameter to determine the JamBlob match stage.
+
+        Args: event_result_id(integer)
+        Returns: match_stage_details(tuple), eg: (match_stage, first_half_elapsed, second_half_elapsed, injury_time)
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_match_stage_details"))
+
+        match_stage = None
+        first_half_elapsed = None
+        second_half_elapsed = None
+        injury_time = None
+
+        # Some Events (usually non-live), do not have any Event Result Extra data.
+        if event_result_id not in self.event_result_extra_dictionary:
+
+            debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "Event Result ID %s has no Event Result Extra data." % event_result_id)
+
+            match_stage = NOT_LIVE
+            first_half_elapsed = 0
+            second_half_elapsed = 0
+            injury_time = 0
+
+            return (match_stage, first_half_elapsed, second_half_elapsed, injury_time)
+
+        # The match stage is a JamBlob parameter that indicates the current stage of the match.
+        # The SBO servers Period and time related parameters can be used to determine the match stage.
+        period = self.event_result_extra_dictionary[event_result_id]['period']
+        current_minutes = self.event_result_extra_dictionary[event_result_id]['current_minutes']
+        total_minutes = self.event_result_extra_dictionary[event_result_id]['total_minutes']
+
+        if period == 1:
+
+            # A Period of exactly One indicates the first half of the match is in play.
+            match_stage = FIRST_HALF
+            first_half_elapsed = current_minutes
+            second_half_elapsed = None
+            injury_time = 0
+
+        elif period == 5:
+
+            # A Period of exactly Five indicates that it is half time.
+            match_stage = HALF_TIME
+            first_half_elapsed = None
+            second_half_elapsed = None
+            injury_time = 0
+
+        elif period == 2:
+
+            # A Period of exactly Two indicates the second half of the match is in play.
+            match_stage = SECOND_HALF
+            first_half_elapsed = None
+            second_half_elapsed = current_minutes
+            injury_time = 0
+
+        elif period > 2:
+
+            # A Period of more than Two indicates that the match has gone into injury time.
+            match_stage = SECOND_HALF
+            first_half_elapsed = None
+            second_half_elapsed = current_minutes
+            injury_time = current_minutes - total_minutes
+
+        return (match_stage, first_half_elapsed, second_half_elapsed, injury_time)
+
+
+    def _format_show_time(self, show_time):
+
+        """This private method takes the show time parameter in its raw state and returns it in the required format.
+
+        Args: show_time(string)
+        Returns: formatted_show_time(datetime)
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_format_show_time"))
+
+        formatted_show_time = DEFAULT_SHOW_TIME
+
+        try:
+            # Extract the date and time details from the raw string.
+            # eg: 02/19/2013 13:44
+            regex_match = REGEX_SHOW_TIME.match(show_time)
+
+        except TypeError as exception_instance:
+
+            # Catch any TypeErrors.
+            debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "_format_show_time() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+            return formatted_show_time
+
+        if not regex_match:
+
+            debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "_format_show_time() can not extract time and date details from show time string: %s" % show_time)
+            return formatted_show_time
+
+        # The Regular Expression will only match digits so it is safe to convert the matches to integers.
+        year = int(regex_match.group('year'))
+        month = int(regex_match.group('month'))
+        day = int(regex_match.group('day'))
+        hour = int(regex_match.group('hour'))
+        minute = int(regex_match.group('minute'))
+
+        try:
+            # Subtracting the GMT offset from the show time ensures all show times are displayed in GMT.
+            formatted_show_time = datetime(year, month, day, hour, minute) - self.timedelta_gmt_offset
+
+        except (TypeError, ValueError, OverflowError) as exception_instance:
+            debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "_format_show_time() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        return formatted_show_time
+
+
+    def _get_red_cards(self, event_result_id):
+
+        """This private method returns the number of red cards for home and away, if the given Event Result ID has Event Result Extra data.
+
+        Args: event_result_id(integer)
+        Returns: red_cards(tuple), eg: (home_red_card_count, away_red_card_count)
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_red_cards"))
+
+        home_red_card_count = None
+        away_red_card_count = None
+
+        # Some Events (usually non-live), do not have any Event Result Extra data.
+        if event_result_id in self.event_result_extra_dictionary:
+
+            home_red_card_count = self.event_result_extra_dictionary[event_result_id]['home_red_card_count']
+            away_red_card_count = self.event_result_extra_dictionary[event_result_id]['away_red_card_count']
+
+        return (home_red_card_count, away_red_card_count)
+
+
+    def _get_tournament_name(self, event_id, event_result_id):
+
+        """This private method returns the Tournament Name for a given Tournament ID.
+
+        Args: event_id(integer), event_result_id(integer)
+        Returns: tournament_name(string)
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_tournament_name"))
+
+        tournament_id = self.event_dictionary[event_id]['tornament_id']
+        tournament_name = self.tournament_dictionary[tournament_id]
+
+        # Some Event Results are categorised under a special Market Group.
+        # These are identified by a non-zero Market Group ID.
+        market_group_id = self.event_result_dictionary[event_result_id]['market_group_id']
+
+        if market_group_id != 0:
+
+            # To differentiate between Event Results in a special Market Group,
+            # the Market Group Name is appended to the end of the Tournament Name.
+            market_group_name = self.market_group_dictionary[market_group_id]
+
+            try:
+                tournament_name = tournament_name + " " + MARKET_GROUP_SEPERATOR + " " + market_group_name
+
+            except TypeError as exception_instance:
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "_get_tournament_name() experienced a %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        return tournament_name
+
+
+    def _get_event_details(self, event_result_id):
+
+        """This private method looks-up all the event details in cache for a given Event Result ID and returns them in a tuple.
+
+        Args: event_result_id(integer)
+        Returns: event_details(tuple)
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_event_details"))
+
+        # Fetch the associated Event ID as it will be needed to extract many of the event details.
+        event_id = self.event_result_dictionary[event_result_id]['event_id']
+
+        # Look-up the Event Result Extra parameters required to determine the match stage details.
+        match_stage_details = self._get_match_stage_details(event_result_id)
+
+        # Use the Event Result ID to extract the following required elements from cache.
+
+        tournament_name = self._get_tournament_name(event_id, event_result_id)
+
+        event_sort_code = self._format_event_sort_code(self.event_dictionary[event_id]['event_sort_code'])
+
+        team_names = (
+            self.event_dictionary[event_id]['home_team_name'],
+            self.event_dictionary[event_id]['away_team_name']
+        )
+
+        show_time = self._format_show_time(self.event_dictionary[event_id]['show_time'])
+
+        betting_available_in_play = self._get_betting_available_in_play(self.event_dictionary[event_id]['show_time_type'])
+
+        match_time_elapsed = (
+            match_stage_details[FIRST_HALF_ELAPSED],
+            match_stage_details[SECOND_HALF_ELAPSED]
+        )
+
+        match_stage = match_stage_details[MATCH_STAGE]
+
+        favourite = FAVOURITE_NOT_USED
+
+        if event_result_id not in self.event_result_extra_dictionary:
+            # Some Events (usually non-live), do not have any Event Result Extra data.
+            injury_time = 0
+        else:
+            injury_time = self.event_result_extra_dictionary[event_result_id]['injury_time']
+
+        score = (
+            self.event_result_dictionary[event_result_id]['home_score'],
+            self.event_result_dictionary[event_result_id]['away_score']
+        )
+
+        red_cards = self._get_red_cards(event_result_id)
+
+        # Package all of the extracted elements in a tuple and return.
+        event_details = (
+            tournament_name,
+            event_sort_code,
+            team_names,
+            show_time,
+            betting_available_in_play,
+            match_time_elapsed,
+            match_stage,
+            favourite,
+            injury_time,
+            score,
+            red_cards
+        )
+
+        return event_details
+
+
+    def _get_event_odds(self, event_result_id, list_of_odds, fetch_type):
+
+        """This method reads the event odds for a given Event Result ID from its odds grid and returns them in a list.
+
+        Args: event_result_id(integer), list_of_odds(list), fetch_type(int)
+            If a list of Odds IDs is given, only the grid cells occupied by those Odds are returned.
+        Returns: event_odds(list)
+        Raises:
+            SboDataSourceCache.UnexpectedDataError: If the Odds in a grid cell could not be formatted when they were received.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_event_odds"))
+
+        if list_of_odds is None:
+
+            # Some Events do not have any Odds that are shown in the grid.
+            event_odds_grid = self.event_odds_grids.get(event_result_id)
+
+            if event_odds_grid is None:
+                event_odds_grid = [[None, None, None, None] for _ in range(ODDS_GRID_LINES)]
+
+        else:
+
+            event_odds_grid = [[None, None, None, None] for _ in range(ODDS_GRID_LINES)]
+
+            for odds_id in list_of_odds:
+
+                # Ensure that the Odds ID exists in cache, even if the Odds are not shown in the grid.
+                self.odds_dictionary[odds_id] # pylint: disable-msg=W0104
+
+                grid_cell = self.odds_grid_cells.get(odds_id)
+
+                if grid_cell is not None:
+                    cell_event_result_id, line_index, column = grid_cell
+                    event_odds_grid[line_index][column] = self.event_odds_grids[cell_event_result_id][line_index][column]
+
+        event_odds = []
+
+        # Each Event can have between One and Three rows of Odds data.
+        # The JamBlob data structure requires that Three sets are returned, regardless of the actual number of sets available.
+        for line_index, line in enumerate(event_odds_grid):
+
+            row = list(line)
+
+            # The Odds for this cell could not be formatted when they were received.
+            if ODDS_GRID_UNFORMATTABLE in row:
+                raise SboDataSourceCache.UnexpectedDataError("_get_event_odds() can not format the Odds of Event Result ID %s on line %s." % (event_result_id, line_index + 1))
+
+            # If fetching newly created events, substitute None's for mixed rows only.
+            # When there is a mixture of values and Nones, replace the None with an empty Tuple.
+            if fetch_type == FETCH_CREATED_EVENTS and any(row):
+
+                for column in range(len(row)):
+
+                    if row[column] is None:
+                        row[column] = ODDS_GRID_FILLERS[column]
+
+            event_odds.append(row)
+
+        # The Event Odds is in the form of a List of Lists.
+        return event_odds
+
+
+    def _get_sub_event_result_id(self, event_result_id):
+
+        """This method generates and returns a Sub Event Result ID from the given Event Result ID.
+
+        Args: event_result_id(integer)
+        Returns: sub_event_result_id(integer)
+        Raises: EventIndexError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_sub_event_result_id"))
+
+        if self.frame_type == LIVE_DATA_FRAME:
+
+            # The Sub Event Result ID for a Live Frame is the Event Result ID prepended with a Zero.
+            # Note: As a leading Zero doesn't change the numeric value, simply return the Event Result ID.
+            sub_event_result_id = event_result_id
+
+        else:
+
+            try:
+                # The Sub Event Result ID for a Non-Live Frame is the Event Result ID prepended with a One.
+                sub_event_result_id = int(NON_LIVE_SUB_EVENT_PREFIX + str(event_result_id))
+
+            except ValueError as exception_instance:
+                raise DataSourceBase.EventIndexError("_get_sub_event_result_id() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        return sub_event_result_id
+
+
+    def _get_event_result_index_keys(self, event_result_id):
+
+        """This private method determines the keys that the given Event Result ID should be indexed under.
+
+        Args: event_result_id(integer)
+        Returns: index_keys(tuple), eg: (tournament_id, match_stage, betting_available_in_play, market_group_id)
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_event_result_index_keys"))
+
+        event_id = self.event_result_dictionary[event_result_id]['event_id']
+        market_group_id = self.event_result_dictionary[event_result_id]['market_group_id']
+
+        # An Event Result may be received before the Event it references.
+        if event_id in self.event_dictionary:
+            tournament_id = self.event_dictionary[event_id]['tornament_id']
+            betting_available_in_play = self._get_betting_available_in_play(self.event_dictionary[event_id]['show_time_type'])
+        else:
+            tournament_id = None
+            betting_available_in_play = DEFAULT_BETTING_AVAILABLE_IN_PLAY
+
+        match_stage = self._get_match_stage_details(event_result_id)[MATCH_STAGE]
+
+        index_keys = (tournament_id, match_stage, betting_available_in_play, market_group_id)
+
+        # Ensure all of the keys can be used to index a dictionary.
+        hash(index_keys)
+
+        return index_keys
+
+
+    def _index_event_result(self, event_result_id):
+
+        """This private method adds the given Event Result ID to each index, moving it from any index entry that no longer applies.
+
+        Args: event_result_id(integer)
+        Returns: None
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_index_event_result"))
+
+        try:
+            index_keys = self._get_event_result_index_keys(event_result_id)
+
+        except (KeyError, TypeError, IndexError) as exception_instance:
+
+            # An Event Result that can not be interpreted is removed from the indexes until it is next updated.
+            debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "_index_event_result() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+            self._unindex_event_result(event_result_id)
+            return
+
+        previous_index_keys = self.event_result_index_keys.get(event_result_id)
+
+        if previous_index_keys == index_keys:
+            return
+
+        for index_type in range(NUMBER_OF_INDEXES):
+
+            index_key = index_keys[index_type]
+
+            # Only the indexes whose key has changed need to be touched.
+            if previous_index_keys is not None:
+
+                if previous_index_keys[index_type] == index_key:
+                    continue
+
+                self._discard_from_index(index_type, previous_index_keys[index_type], event_result_id)
+
+            self.event_result_indexes[index_type].setdefault(index_key, set()).add(event_result_id)
+
+        self.event_result_index_keys[event_result_id] = index_keys
+
+
+    def _unindex_event_result(self, event_result_id):
+
+        """This private method removes the given Event Result ID from every index.
+
+        Args: event_result_id(integer)
+        Returns: None
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_unindex_event_result"))
+
+        previous_index_keys = self.event_result_index_keys.pop(event_result_id, None)
+
+        if previous_index_keys is None:
+            return
+
+        for index_type in range(NUMBER_OF_INDEXES):
+            self._discard_from_index(index_type, previous_index_keys[index_type], event_result_id)
+
+
+    def _discard_from_index(self, index_type, index_key, event_result_id):
+
+        """This private method removes an Event Result ID from a single index entry, removing the entry once it is empty.
+
+        Args: index_type(integer), index_key(object), event_result_id(integer)
+        Returns: None
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_discard_from_index"))
+
+        index = self.event_result_indexes[index_type]
+
+        if index_key in index:
+
+            index[index_key].discard(event_result_id)
+
+            if not index[index_key]:
+                del index[index_key]
+
+
+    def _get_event_results_to_refresh(self):
+
+        """This private method returns the Event Result IDs whose derived data may have changed during the last cache update.
+
+        Args: None
+        Returns: event_result_ids(list)
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_event_results_to_refresh"))
+
+        event_result_ids = [event_result_id for event_result_id in self.events_created if event_result_id in self.event_result_dictionary]
+
+        # Only a change to the event details can affect the data derived from an existing Event Result.
+        for event_result_id, modified_properties in self.events_updated.items():
+
+            if 'event_details' in modified_properties and event_result_id in self.event_result_dictionary:
+                event_result_ids.append(event_result_id)
+
+        # Event Results whose Tournament, Event, Market Group or first extras arrived after them are refreshed without being reported as updated.
+        event_result_ids_seen = set(event_result_ids)
+
+        for event_result_id in self.event_results_to_refresh:
+
+            if event_result_id not in event_result_ids_seen and event_result_id in self.event_result_dictionary:
+                event_result_ids.append(event_result_id)
+
+        return event_result_ids
+
+
+    def _update_event_result_indexes(self, event_result_ids):
+
+        """This private method brings the indexes up to date with the Event Results created, updated and deleted during the last cache update.
+
+        Args: event_result_ids(list), eg: the Event Result IDs to re-index.
+        Returns: None
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_update_event_result_indexes"))
+
+        for event_result_id in self.events_deleted:
+            self._unindex_event_result(event_result_id)
+
+        for event_result_id in event_result_ids:
+            self._index_event_result(event_result_id)
+
+
+    def _get_board_sort_key(self, event_result_id):
+
+        """This private method returns the key used to order the given Event Result ID on the board.
+
+        The board is ordered by Tournament Name, then Event Sort Code, then Show Time.
+        The Event Result ID is included to make every key unique.
+
+        Args: event_result_id(integer)
+        Returns: board_sort_key(tuple), eg: (tournament_name, event_sort_code, show_time, event_result_id)
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_board_sort_key"))
+
+        event_id = self.event_result_dictionary[event_result_id]['event_id']
+
+        tournament_name = self._get_tournament_name(event_id, event_result_id)
+
+        # Every key on the board must be comparable with every other key.
+        if not isinstance(tournament_name, str):
+            raise TypeError("Tournament Name is not a string: %s" % tournament_name)
+
+        event_sort_code = self._format_event_sort_code(self.event_dictionary[event_id]['event_sort_code'])
+        show_time = self._format_show_time(self.event_dictionary[event_id]['show_time'])
+
+        return (tournament_name, event_sort_code, show_time, event_result_id)
+
+
+    def _remove_from_board(self, event_result_id):
+
+        """This private method removes the given Event Result ID from the board view.
+
+        Args: event_result_id(integer)
+        Returns: None
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_remove_from_board"))
+
+        board_sort_key = self.board_sort_keys.pop(event_result_id, None)
+
+        if board_sort_key is not None:
+
+            board_row = bisect_left(self.board_view, board_sort_key)
+
+            if board_row < len(self.board_view) and self.board_view[board_row] == board_sort_key:
+                del self.board_view[board_row]
+
+
+    def _update_board_view(self, event_result_ids):
+
+        """This private method repositions the given Event Result IDs on the board, if their sort keys have changed.
+
+        Every other row keeps its place, so there is no need to re-sort the whole board after each update.
+        An Event Result that can not be placed yet, eg: its Event has not arrived, is placed once the missing record is created.
+        The rows of existing Event Results that moved are recorded in the board rows moved dictionary.
+
+        Args: event_result_ids(list)
+        Returns: None
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_update_board_view"))
+
+        for event_result_id in self.events_deleted:
+            self._remove_from_board(event_result_id)
+
+        # Work out which sort keys have changed before touching the board, so that the previous rows are reported accurately.
+        changed_sort_keys = {}
+
+        for event_result_id in event_result_ids:
+
+            try:
+                board_sort_key = self._get_board_sort_key(event_result_id)
+
+            except (KeyError, TypeError, IndexError) as exception_instance:
+
+                # An Event Result that can not be placed is left off the board until it is next updated.
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "_update_board_view() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+                board_sort_key = None
+
+            if board_sort_key != self.board_sort_keys.get(event_result_id):
+                changed_sort_keys[event_result_id] = board_sort_key
+
+        previous_rows = {}
+
+        for event_result_id in changed_sort_keys:
+
+            if event_result_id in self.board_sort_keys:
+                previous_rows[event_result_id] = bisect_left(self.board_view, self.board_sort_keys[event_result_id])
+
+        for event_result_id, board_sort_key in changed_sort_keys.items():
+
+            self._remove_from_board(event_result_id)
+
+            if board_sort_key is None:
+                continue
+
+            try:
+                insort(self.board_view, board_sort_key)
+                self.board_sort_keys[event_result_id] = board_sort_key
+
+            except TypeError as exception_instance:
+
+                # The sort key can not be compared with the keys already on the board.
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "_update_board_view() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        # Report the rows that moved as a result of this update.
+        for event_result_id, previous_row in previous_rows.items():
+
+            current_row = self.get_board_row(event_result_id)
+
+            if current_row != previous_row:
+                self.board_rows_moved[event_result_id] = (previous_row, current_row)
+
+
+    @staticmethod
+    def _get_deep_size(value):
+
+        """This private method returns the number of bytes used by a value, including the values it contains.
+
+        Args: value(object)
+        Returns: deep_size(integer)
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_deep_size"))
+
+        deep_size = 0
+        values_seen = set()
+        values_to_size = [value]
+
+        while values_to_size:
+
+            value = values_to_size.pop()
+
+            # Shared values, such as small integers and interned strings, are only counted once.
+            if id(value) in values_seen:
+                continue
+
+            values_seen.add(id(value))
+            deep_size += sys.getsizeof(value)
+
+            if isinstance(value, dict):
+                values_to_size.extend(value.keys())
+                values_to_size.extend(value.values())
+
+            elif isinstance(value, (list, tuple, set, frozenset)):
+                values_to_size.extend(value)
+
+        return deep_size
+
+
+    def _estimate_table_size(self, table):
+
+        """This private method estimates the number of bytes used by a table from the average size of a sample of its records.
+
+        Args: table(dictionary or list)
+        Returns: table_size(tuple), eg: (records, estimated_bytes)
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_estimate_table_size"))
+
+        records = len(table)
+
+        if isinstance(table, dict):
+            sample = list(islice(table.items(), MEMORY_SAMPLE_SIZE))
+        else:
+            sample = list(islice(table, MEMORY_SAMPLE_SIZE))
+
+        estimated_bytes = sys.getsizeof(table)
+
+        if sample:
+            estimated_bytes += (sum(self._get_deep_size(record) for record in sample) * records) // len(sample)
+
+        return (records, estimated_bytes)
+
+
+    def _evict_event_results(self, target_bytes, maximum_evictions):
+
+        """This private method evicts the least recently updated non-live Event Results until the estimated cache size is within the target.
+
+        Evicted Event Results are reported as deleted, in the same way as Event Results that the SBO server lists for deletion.
+
+        Args: target_bytes(integer), maximum_evictions(integer), eg: None for no maximum.
+        Returns: None
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_evict_event_results"))
+
+        evictions = 0
+
+        while self.memory_report()['total']['bytes'] > target_bytes:
+
+            batch_size = MEMORY_EVICTION_BATCH
+
+            if maximum_evictions is not None:
+                batch_size = min(batch_size, maximum_evictions - evictions)
+
+            # Live Event Results, which have Event Result Extra data, are never evicted.
+            event_results_to_evict = []
+
+            for event_result_id in self.event_result_last_seen:
+
+                if len(event_results_to_evict) >= batch_size:
+                    break
+
+                if event_result_id not in self.event_result_extra_dictionary:
+                    event_results_to_evict.append(event_result_id)
+
+            if not event_results_to_evict:
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "_evict_event_results() has no non-live Event Results left to evict.")
+                return
+
+            debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "Memory limit exceeded, evicting Event Result IDs: %s" % event_results_to_evict)
+
+            self._delete_evicted_event_results(event_results_to_evict)
+            evictions += len(event_results_to_evict)
+
+            if maximum_evictions is not None and evictions >= maximum_evictions:
+                return
+
+
+    def _delete_evicted_event_results(self, event_results_to_evict):
+
+        """This private method deletes evicted Event Results, which cascades to their Odds, and removes them from the record of created and updated events.
+
+        Args: event_results_to_evict(list)
+        Returns: None
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_delete_evicted_event_results"))
+
+        evicted_event_result_ids = set(event_results_to_evict)
+
+        self._delete_from_event_result_dictionary(event_results_to_evict)
+
+        # An evicted Event Result is only reported as deleted.
+        self.events_created = [event_result_id for event_result_id in self.events_created if event_result_id not in evicted_event_result_ids]
+
+        for event_result_id in evicted_event_result_ids:
+            self.events_updated.pop(event_result_id, None)
+
+
+    def _sweep_expired_event_results(self):
+
+        """This private method evicts Event Results that have not been received from the SBO server within the time to live.
+
+        Event Results are tracked in the order they were last received, so the sweep stops at the first Event Result that has not expired.
+        At most one batch of Event Results is evicted per cache update, any others are evicted on the following updates.
+
+        This simple method has no arguments or returns.
+        It raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_sweep_expired_event_results"))
+
+        if self.ttl_frames is None and self.ttl_seconds is None:
+            return
+
+        current_time = monotonic()
+        event_results_to_evict = []
+
+        for event_result_id, last_seen in self.event_result_last_seen.items():
+
+            if len(event_results_to_evict) >= TTL_SWEEP_BATCH:
+                break
+
+            frames_expired = self.ttl_frames is not None and self.frame_number - last_seen[LAST_SEEN_FRAME] > self.ttl_frames
+            time_expired = self.ttl_seconds is not None and current_time - last_seen[LAST_SEEN_TIME] > self.ttl_seconds
+
+            if not (frames_expired or time_expired):
+                break
+
+            event_results_to_evict.append(event_result_id)
+
+        if event_results_to_evict:
+
+            debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "Time to live exceeded, evicting Event Result IDs: %s" % event_results_to_evict)
+
+            self._delete_evicted_event_results(event_results_to_evict)
+
+
+    def _enforce_memory_limits(self):
+
+        """This private method evicts Event Results if the estimated cache size has exceeded the memory limits.
+
+        Above the soft limit, a single batch of Event Results is evicted per cache update.
+        Above the hard limit, Event Results are evicted until the cache is back within the soft limit.
+
+        This simple method has no arguments or returns.
+        It raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_enforce_memory_limits"))
+
+        if self.memory_soft_limit is None and self.memory_hard_limit is None:
+            return
+
+        total_bytes = self.memory_report()['total']['bytes']
+
+        if self.memory_hard_limit is not None and total_bytes > self.memory_hard_limit:
+
+            # When only a hard limit is set, evict until the cache is back within it.
+            target_bytes = self.memory_soft_limit if self.memory_soft_limit is not None else self.memory_hard_limit
+            self._evict_event_results(target_bytes, None)
+
+        elif self.memory_soft_limit is not None and total_bytes > self.memory_soft_limit:
+            self._evict_event_results(self.memory_soft_limit, MEMORY_EVICTION_BATCH)
+
+
+    def clear_cache(self):
+
+        """This public method clears all cached data.
+
+        This simple method has no arguments or returns.
+        It raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "clear_cache"))
+
+        self.current_minutes_cache = {}
+
+        self.tournament_dictionary = {}
+        self.event_dictionary = {}
+        self.event_result_dictionary = {}
+        self.event_result_extra_dictionary = {}
+        self.odds_dictionary = {}
+        self.market_group_dictionary = {}
+
+        self.tournament_events = {}
+        self.event_event_results = {}
+        self.market_group_event_results = {}
+        self.event_result_odds = {}
+        self.orphan_candidates = [set(), set(), set()]
+
+        self.line_number_dictionary = {}
+
+        self.event_odds_grids = {}
+        self.odds_grid_cells = {}
+
+        self.price_history = {}
+
+        if self.scanner_enabled:
+            self.enable_price_movement_scanner(self.scanner_price_threshold, self.scanner_point_threshold, self.scanner_window)
+
+        self.event_result_last_seen = OrderedDict()
+
+        self.event_result_indexes = [{} for _ in range(NUMBER_OF_INDEXES)]
+        self.event_result_index_keys = {}
+
+        self.board_view = []
+        self.board_sort_keys = {}
+
+
+    def update_cache(self, frame_cache_data):
+
+        """This public method updates the internal data cache with the latest data received from the SBO server.
+
+        This method should be called each time data is fetched from the SBO server.
+        It will ensure that a complete up to date cache of event data is always available.
+        Note: The SBO server deals with Event Results which are equivalent to what JamBlob refers to as Matches.
+
+        Args:
+            frame_cache_data: A dictionary of RAW event data from the SBO server.
+
+        Returns:
+            During the process of updating the cache, a record is kept of which Event Results were created, updated or deleted.
+            This method returns a tuple of the three records:
+
+            (Events Created, Events Updated, Events Deleted)
+
+            The Events Created and Deleted hold a list of Event Result IDs and
+            Events Updated holds a dictionary specifying which parameters were updated.
+
+            Records that do not match their expected layout are not applied, and can be fetched with fetch_quarantined_records().
+
+        Raises:
+            UnexpectedDataError: This class is based on a known data structure for frame_cache_data.
+                This error will be raised if the structure differs to an extent that the data can not be interpreted.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "update_cache"))
+
+        self._start_update()
+
+        try:
+            # At the top level, the frame cache data is a collection of specific dictionaries.
+            tournament_dictionary = frame_cache_data[TOURNAMENT_DICTIONARY]
+            event_dictionary = frame_cache_data[EVENT_DICTIONARY]
+            event_result_dictionary = frame_cache_data[EVENT_RESULT_DICTIONARY]
+            event_result_extra_dictionary = frame_cache_data[EVENT_RESULT_EXTRA_DICTIONARY]
+            event_result_list_for_deletion = frame_cache_data[EVENT_RESULT_LIST_FOR_DELETION]
+            odds_dictionary = frame_cache_data[ODDS_DICTIONARY]
+            odds_list_for_deletion = frame_cache_data[ODDS_LIST_FOR_DELETION]
+            market_group_dictionary = frame_cache_data[MARKET_GROUP_DICTIONARY]
+
+        except (TypeError, IndexError, KeyError) as exception_instance:
+            raise SboDataSourceCache.UnexpectedDataError("update_cache() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        # Every record is validated before any are applied, so a malformed record is quarantined rather than leaving the cache half updated.
+        tournament_dictionary = self._validate_section(TOURNAMENT_DICTIONARY, tournament_dictionary)
+        event_dictionary = self._validate_section(EVENT_DICTIONARY, event_dictionary)
+        event_result_dictionary = self._validate_section(EVENT_RESULT_DICTIONARY, event_result_dictionary)
+        event_result_extra_dictionary = self._validate_section(EVENT_RESULT_EXTRA_DICTIONARY, event_result_extra_dictionary)
+        event_result_list_for_deletion = self._validate_section(EVENT_RESULT_LIST_FOR_DELETION, event_result_list_for_deletion)
+        odds_list_for_deletion = self._validate_section(ODDS_LIST_FOR_DELETION, odds_list_for_deletion)
+
+        # The deletions are applied first, so an update to Odds deleted in the same frame must hold the full record of new Odds.
+        odds_ids_deleted = self._get_odds_ids_deleted(event_result_list_for_deletion, odds_list_for_deletion)
+        odds_dictionary = self._validate_section(ODDS_DICTIONARY, odds_dictionary, odds_ids_deleted)
+        market_group_dictionary = self._validate_section(MARKET_GROUP_DICTIONARY, market_group_dictionary)
+
+        self._start_undo_log()
+
+        try:
+            try:
+                # Delete the internal data cache for any dictionaries containing data.
+
+                if event_result_list_for_deletion is not None:
+                    self._delete_from_event_result_dictionary(event_result_list_for_deletion)
+
+                if odds_list_for_deletion is not None:
+                    self._delete_from_odds_dictionary(odds_list_for_deletion)
+
+            except (TypeError, IndexError) as exception_instance:
+                raise SboDataSourceCache.UnexpectedDataError("update_cache() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+            try:
+                # Update the internal data cache for any dictionaries containing data.
+
+                if tournament_dictionary is not None:
+                    self._update_tournament_dictionary(tournament_dictionary)
+
+                if event_dictionary is not None:
+                    self._update_event_dictionary(event_dictionary)
+
+                if event_result_dictionary is not None:
+                    self._update_event_result_dictionary(event_result_dictionary)
+
+                #if event_result_extra_dictionary is not None:
+                # Update: The event result extra dictionary must now be updated regardless of data coming from the SBO server.
+                # This is so that if there is no update to the match elapsed time, it can be simulated here
+                self._update_event_result_extra_dictionary(event_result_extra_dictionary)
+
+                if odds_dictionary is not None:
+                    self._update_odds_dictionary(odds_dictionary)
+
+                if market_group_dictionary is not None:
+                    self._update_market_group_dictionary(market_group_dictionary)
+
+            except (TypeError, IndexError) as exception_instance:
+                raise SboDataSourceCache.UnexpectedDataError("update_cache() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        except Exception:
+            self.abort_update()
+            raise
+
+        return self._complete_update()
+
+
+    def _start_update(self):
+
+        """This private method resets the record of what was changed, ready for a new cache update.
+
+        This simple method has no arguments or returns.
+        It raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_start_update"))
+
+        # These will hold a record of that was changed during the update.
+        # Note: The Events Created and Deleted hold a list of Event Result IDs and
+        # Events Updated holds a dictionary specifying which parameters were updated.
+        self.events_created = []
+        self.events_updated = {}
+        self.events_deleted = []
+        self.board_rows_moved = {}
+        self.records_quarantined = []
+        self.current_minutes_just_cached = set()
+        self.event_results_to_refresh = set()
+
+        self.frame_number += 1
+
+
+    def _start_undo_log(self):
+
+        """This private method starts an undo log for the cache update, if atomic updates are enabled.
+
+        This simple method has no arguments or returns.
+        It raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_start_undo_log"))
+
+        # In atomic mode, either every change in the frame is kept or, if the update fails, the cache is rolled back to its previous state.
+        if self.atomic_updates:
+            self.undo_log = []
+            self.undo_keys = set()
+        else:
+            self.undo_log = None
+            self.undo_keys = None
+
+
+    def _complete_update(self):
+
+        """This private method brings the indexes, board view and scanner in step with the records applied during a cache update.
+
+        Args: None
+        Returns: update_result(tuple), eg: (events_created, events_updated, events_deleted)
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_complete_update"))
+
+        # The update has completed, so the undo log is no longer needed.
+        self.undo_log = None
+        self.undo_keys = None
+
+        # Evicted Event Results are reported as deleted, so expiry and the limits are enforced before the indexes and board view are refreshed.
+        self._sweep_expired_event_results()
+        self._enforce_memory_limits()
+
+        # Deleted Event Results may have left Events, Tournaments and Market Groups that are no longer referenced.
+        self._collect_orphans()
+
+        # Keep the indexes and the board view in step with the changes made during this update.
+        event_result_ids_to_refresh = self._get_event_results_to_refresh()
+
+        self._update_event_result_indexes(event_result_ids_to_refresh)
+        self._update_board_view(event_result_ids_to_refresh)
+
+        if self.scanner_enabled:
+            self._update_price_movement_scanner()
+
+        # These lists and dictionaries return a record of what was created, updated and deleted.
+        return (self.events_created, self.events_updated, self.events_deleted)
+
+
+    def fetch_event(self, event_result_id):
+
+        """This public method returns all event details for the given Event Result ID.
+
+        Args:
+            event_result_id: An ID number used to look-up an Event Result.
+
+        Returns:
+            event: A Tuple made up of an Events IDs, details and odds.
+                eg: (sub_event_result_id, sbo_event_result_id, event_details, event_odds)
+
+        Raises:
+            EventIndexError: Raised on an invalid event_result_id or
+                when the event_result_id provided does not match any record in the cache.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "fetch_event"))
+
+        # The Sub-Event Result ID is based on the Event Result ID, prefixed with the frame type.
+        sub_event_result_id = self._get_sub_event_result_id(event_result_id)
+
+        # Each data source class has a unique ID.
+        # Encode the unique ID into the Event Result ID so that its source can be identified.
+        sub_event_result_id = DataSourceBase.get_identifiable_id(self, self.sbo_id, sub_event_result_id)
+        sbo_event_result_id = DataSourceBase.get_identifiable_id(self, self.sbo_id, event_result_id)
+
+        try:
+            # Use the Event Result ID to look-up all the required Event details from cache.
+            event_details = self._get_event_details(event_result_id)
+
+            # The Odds associated with the Event Result ID are read from its odds grid, which is kept up to date as the Odds are received.
+            event_odds = self._get_event_odds(event_result_id, None, FETCH_CREATED_EVENTS)
+
+        except (KeyError, TypeError, IndexError, SboDataSourceCache.UnexpectedDataError) as exception_instance:
+            raise DataSourceBase.EventIndexError("fetch_event() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        # This tuple represents the required JamBlob match structure.
+        event = (sub_event_result_id, sbo_event_result_id, event_details, event_odds)
+
+        return event
+
+
+    def fetch_modified_event(self, event_result_id, modified_properties):
+
+        """This public method returns all modified event details for the given Event Result ID.
+
+        Args:
+            event_result_id: An ID number used to look-up an Event Result.
+            modified_properties: A dictionary of Event IDs that have had their properties modified in the last cache update.
+
+        Returns:
+            event: A Tuple made up of an Events IDs, details and odds.
+                eg: (sub_event_result_id, sbo_event_result_id, event_details, event_odds)
+
+        Raises:
+            EventIndexError: Raised on an invalid event_result_id or
+                when the event_result_id provided does not match any record in the cache.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "fetch_modified_event"))
+
+        # The Sub-Event Result ID is based on the Event Result ID, prefixed with the frame type.
+        sub_event_result_id = self._get_sub_event_result_id(event_result_id)
+
+        # Each data source class has a unique ID.
+        # Encode the unique ID into the Event Result ID so that its source can be identified.
+        sub_event_result_id = DataSourceBase.get_identifiable_id(self, self.sbo_id, sub_event_result_id)
+        sbo_event_result_id = DataSourceBase.get_identifiable_id(self, self.sbo_id, event_result_id)
+
+        # These default states will be returned if there is no entry in the dictionary to indicate they have been modified.
+        event_details = (None, None, (None, None), None, None, (None, None), None, None, None, (None, None), (None, None))
+        event_odds = [[None, None, None, None], [None, None, None, None], [None, None, None, None]]
+
+        try:
+            if 'event_details' in modified_properties:
+
+                # The dictionary will contain an 'event_details' key only if the event details have been modified.
+                # Note: The value of the key will be set to True, but it can be ignored.
+                event_details = self._get_event_details(event_result_id)
+
+        except (KeyError, TypeError, IndexError) as exception_instance:
+            raise DataSourceBase.EventIndexError("fetch_modified_event() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+            #debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "fetch_modified_event() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        try:
+            if 'event_odds' in modified_properties:
+
+                # The dictionary will contain an 'event_odds' key only if the event odds have been modified.
+                # The value of the key is a list of all the Odds IDs that have been modified.
+                modified_odds = modified_properties['event_odds']
+
+                event_odds = self._get_event_odds(event_result_id, modified_odds, FETCH_MODIFIED_EVENTS)
+
+        except (KeyError, TypeError, IndexError, SboDataSourceCache.UnexpectedDataError) as exception_instance:
+            raise DataSourceBase.EventIndexError("fetch_modified_event() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+            #debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "fetch_modified_event() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        # This tuple represents the required JabBlob match structure.
+        event = (sub_event_result_id, sbo_event_result_id, event_details, event_odds)
+
+        return event
+
+
+    def query_by_tournament(self, tournament_id):
+
+        """This public method returns the Event Result IDs that belong to the given Tournament ID.
+
+        Args:
+            tournament_id: An ID number used to look-up a Tournament.
+
+        Returns:
+            event_result_ids: A list of the matching Event Result IDs, looked-up from an index rather than a scan of the cache.
+
+        This simple method raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "query_by_tournament"))
+
+        return self.query_events(tournament_id=tournament_id)
+
+
+    def query_by_match_stage(self, match_stage):
+
+        """This public method returns the Event Result IDs that are currently at the given match stage.
+
+        Args:
+            match_stage: One of the Match Stage states, eg: NOT_LIVE, FIRST_HALF, HALF_TIME or SECOND_HALF.
+
+        Returns:
+            event_result_ids: A list of the matching Event Result IDs, looked-up from an index rather than a scan of the cache.
+
+        This simple method raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "query_by_match_stage"))
+
+        return self.query_events(match_stage=match_stage)
+
+
+    def query_by_betting_available_in_play(self, betting_available_in_play):
+
+        """This public method returns the Event Result IDs that do, or do not, allow betting in play.
+
+        Args:
+            betting_available_in_play: Either 1 or 0, as returned in the event details.
+
+        Returns:
+            event_result_ids: A list of the matching Event Result IDs, looked-up from an index rather than a scan of the cache.
+
+        This simple method raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "query_by_betting_available_in_play"))
+
+        return self.query_events(betting_available_in_play=betting_available_in_play)
+
+
+    def query_by_market_group(self, market_group_id):
+
+        """This public method returns the Event Result IDs that belong to the given Market Group ID.
+
+        Args:
+            market_group_id: An ID number used to look-up a Market Group. Zero represents Event Results in no special Market Group.
+
+        Returns:
+            event_result_ids: A list of the matching Event Result IDs, looked-up from an index rather than a scan of the cache.
+
+        This simple method raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "query_by_market_group"))
+
+        return self.query_events(market_group_id=market_group_id)
+
+
+    def query_events(self, tournament_id=None, match_stage=None, betting_available_in_play=None, market_group_id=None):
+
+        """This public method returns the Event Result IDs that match all of the given criteria.
+
+        Only the criteria that are specified are applied, eg: live matches in a tournament are found with
+        query_events(tournament_id=307, betting_available_in_play=1).
+        The smallest matching index entry is intersected with the others, so the cost depends on the size of the result.
+
+        Args:
+            tournament_id: An ID number used to look-up a Tournament.
+            match_stage: One of the Match Stage states.
+            betting_available_in_play: Either 1 or 0.
+            market_group_id: An ID number used to look-up a Market Group.
+
+        Returns:
+            event_result_ids: A list of the matching Event Result IDs.
+                If no criteria are specified, all indexed Event Result IDs are returned.
+
+        This simple method raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "query_events"))
+
+        criteria = [
+            (TOURNAMENT_INDEX, tournament_id),
+            (MATCH_STAGE_INDEX, match_stage),
+            (BETTING_AVAILABLE_IN_PLAY_INDEX, betting_available_in_play),
+            (MARKET_GROUP_INDEX, market_group_id)
+        ]
+
+        matching_sets = []
+
+        for index_type, index_key in criteria:
+
+            if index_key is None:
+                continue
+
+            try:
+                matching_set = self.event_result_indexes[index_type].get(index_key)
+
+            except TypeError:
+                # An unhashable key can never have been indexed.
+                matching_set = None
+
+            if not matching_set:
+                return []
+
+            matching_sets.append(matching_set)
+
+        if not matching_sets:
+            return list(self.event_result_index_keys)
+
+        # Intersecting from the smallest set keeps the cost proportional to the size of the result.
+        matching_sets.sort(key=len)
+
+        return list(matching_sets[0].intersection(*matching_sets[1:]))
+
+
+    def get_board_row(self, event_result_id):
+
+        """This public method returns the row that the given Event Result ID occupies on the board.
+
+        Args:
+            event_result_id: An ID number used to look-up an Event Result.
+
+        Returns:
+            board_row: A zero based row number, or None if the Event Result is not on the board.
 
-        Args: event_id(integer), event_result_id(integer)
-        Returns: tournament_name(string)
-        Raises: None
+        This simple method raises no errors.
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_tournament_name"))
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "get_board_row"))
 
-        tournament_id = self.event_dictionary[event_id]['tornament_id']
-        tournament_name = self.tournament_dictionary[tournament_id]
+        try:
+            board_sort_key = self.board_sort_keys.get(event_result_id)
 
-        # Some Event Results are categorised under a special Market Group.
-        # These are identified by a non-zero Market Group ID.
-        market_group_id = self.event_result_dictionary[event_result_id]['market_group_id']
+        except TypeError:
+            board_sort_key = None
 
-        if market_group_id != 0:
+        if board_sort_key is None:
+            return None
 
-            # To differentiate between Event Results in a special Market Group,
-            # the Market Group Name is appended to the end of the Tournament Name.
-            market_group_name = self.market_group_dictionary[market_group_id]
+        return bisect_left(self.board_view, board_sort_key)
 
-            try:
-                tournament_name = tournament_name + " " + MARKET_GROUP_SEPERATOR + " " + market_group_name
 
-            except TypeError as exception_instance:
-                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "_get_tournament_name() experienced a %s: %s" % (type(exception_instance).__name__, exception_instance))
+    def fetch_board_rows(self, start_row, end_row):
 
-        return tournament_name
+        """This public method returns the Event Result IDs on the board between the given rows.
 
+        The board is ordered by Tournament Name, then Event Sort Code, then Show Time, and is kept in order as the cache is updated.
 
-    def _get_event_details(self, event_result_id):
+        Args:
+            start_row: The zero based row to start from.
+            end_row: The row to stop before, eg: fetch_board_rows(200, 250) returns up to fifty rows.
 
-        """This private method looks-up all the event details in cache for a given Event Result ID and returns them in a tuple.
+        Returns:
+            event_result_ids: A list of Event Result IDs, in board order.
 
-        Args: event_result_id(integer)
-        Returns: event_details(tuple)
-        Raises: None
+        This simple method raises no errors.
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_event_details"))
-
-        # Fetch the associated Event ID as it will be needed to extract many of the event details.
-        event_id = self.event_result_dictionary[event_result_id]['event_id']
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "fetch_board_rows"))
 
-        # Look-up the Event Result Extra parameters required to determine the match stage details.
-        match_stage_details = self._get_match_stage_details(event_result_id)
+        return [board_sort_key[-1] for board_sort_key in self.board_view[start_row:end_row]]
 
-        # Use the Event Result ID to extract the following required elements from cache.
 
-        tournament_name = self._get_tournament_name(event_id, event_result_id)
+    def fetch_board_moves(self):
 
-        event_sort_code = self._format_event_sort_code(self.event_dictionary[event_id]['event_sort_code'])
+        """This public method returns the rows that moved on the board during the last cache update.
 
-        team_names = (
-            self.event_dictionary[event_id]['home_team_name'],
-            self.event_dictionary[event_id]['away_team_name']
-        )
+        Together with the tuple returned by update_cache(), this completes the record of what changed during the update.
+        Event Results that were created or deleted are not included, as they are already reported by update_cache().
 
-        show_time = self._format_show_time(self.event_dictionary[event_id]['show_time'])
+        Returns:
+            board_rows_moved: A dictionary of Event Result IDs, each holding a tuple of (previous_row, current_row).
+                The current row is None if the Event Result could no longer be placed on the board.
 
-        betting_available_in_play = self._get_betting_available_in_play(self.event_dictionary[event_id]['show_time_type'])
+        This simple method has no arguments and raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "fetch_board_moves"))
 
-        match_time_elapsed = (
-            match_stage_details[FIRST_HALF_ELAPSED],
-            match_stage_details[SECOND_HALF_ELAPSED]
-        )
+        return self.board_rows_moved
 
-        match_stage = match_stage_details[MATCH_STAGE]
 
-        favourite = FAVOURITE_NOT_USED
+    def fetch_price_history(self, odds_id, window=None):
 
-        if event_result_id not in self.event_result_extra_dictionary:
-            # Some Events (usually non-live), do not have any Event Result Extra data.
-            injury_time = 0
-        else:
-            injury_time = self.event_result_extra_dictionary[event_result_id]['injury_time']
+        """This public method returns the recorded price history of the given Odds ID, without copying it out of its ring buffer.
 
-        score = (
-            self.event_result_dictionary[event_result_id]['home_score'],
-            self.event_result_dictionary[event_result_id]['away_score']
-        )
+        Price history is only recorded if the cache was created with a non-zero price history length.
 
-        red_cards = self._get_red_cards(event_result_id)
+        Args:
+            odds_id: An ID number used to look-up a set of Odds.
+            window: The number of most recent entries to return. All recorded entries are returned if this is None.
 
-        # Package all of the extracted elements in a tuple and return.
-        event_details = (
-            tournament_name,
-            event_sort_code,
-            team_names,
-            show_time,
-            betting_available_in_play,
-            match_time_elapsed,
-            match_stage,
-            favourite,
-            injury_time,
-            score,
-            red_cards
-        )
+        Returns:
+            price_history: A list of up to two memoryview segments, oldest first, as the window may wrap around the ring buffer.
+                Each segment has a shape of (entries, 4) with the columns PRICE_HISTORY_PRICE_1, PRICE_HISTORY_PRICE_2,
+                PRICE_HISTORY_POINT and PRICE_HISTORY_TIMESTAMP. Missing values are recorded as NaN.
+                An empty list is returned if no history has been recorded for the Odds ID.
 
-        return event_details
+        This simple method raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "fetch_price_history"))
 
+        try:
+            ring_buffer = self.price_history.get(odds_id)
 
-    def _get_event_odds(self, list_of_odds, fetch_type):
+        except TypeError:
+            ring_buffer = None
 
-        """This method looks-up all the event odds in cache for a given list of Odds IDs and returns them in a list.
+        if ring_buffer is None:
+            return []
 
-        Args: list_of_odds(list), fetch_type(int)
-        Returns: event_odds(list)
-        Raises: None
-        """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_event_odds"))
+        count = ring_buffer[PRICE_HISTORY_COUNT]
 
-        event_odds = []
+        if window is not None:
+            count = max(0, min(count, window))
 
-        half_time_hdps = [None, None, None]
-        full_time_hdps = [None, None, None]
-        half_time_ous = [None, None, None]
-        full_time_ous = [None, None, None]
+        # The window ends at the head of the ring buffer and may wrap around to the end of the buffer.
+        end = ring_buffer[PRICE_HISTORY_HEAD]
+        start = end - count
 
-        for odds_id in list_of_odds:
+        if start >= 0:
+            entry_ranges = [(start, end)]
+        else:
+            entry_ranges = [(self.price_history_length + start, self.price_history_length), (0, end)]
 
-            # The Market Display ID determines the type of Odds and how to deal with them.
-            # Market Display IDs other than the Four types checked for will be ignored.
+        buffer_view = memoryview(ring_buffer[PRICE_HISTORY_BUFFER])
+        price_history = []
 
-            if self.odds_dictionary[odds_id]['odds_data'][MARKET_DISPLAY_ID] == HALF_TIME_HDP:
+        for entry_start, entry_end in entry_ranges:
 
-                list_position = self.odds_dictionary[odds_id]['line_number'] - 1
-                point_data = self._format_point_value(self.odds_dictionary[odds_id]['odds_data'][POINT])
-                price_1 = self.odds_dictionary[odds_id]['prices'][PRICE_1]
-                price_2 = self.odds_dictionary[odds_id]['prices'][PRICE_2]
+            if entry_end > entry_start:
+                segment = buffer_view[entry_start * PRICE_HISTORY_COLUMNS:entry_end * PRICE_HISTORY_COLUMNS]
+                price_history.append(segment.cast('B').cast('d', [entry_end - entry_start, PRICE_HISTORY_COLUMNS]))
 
-                # The HDP Odds include a parameter to represent the favourite team.
-                row = (point_data[FORMATTED_POINT], price_1, price_2, point_data[FAVOURITE_TEAM])
-                half_time_hdps[list_position] = row
+        return price_history
 
-            elif self.odds_dictionary[odds_id]['odds_data'][MARKET_DISPLAY_ID] == FULL_TIME_HDP:
 
-                list_position = self.odds_dictionary[odds_id]['line_number'] - 1
-                point_data = self._format_point_value(self.odds_dictionary[odds_id]['odds_data'][POINT])
-                price_1 = self.odds_dictionary[odds_id]['prices'][PRICE_1]
-                price_2 = self.odds_dictionary[odds_id]['prices'][PRICE_2]
+    def enable_price_movement_scanner(self, price_threshold, point_threshold, window=DEFAULT_SCANNER_WINDOW):
 
-                # The HDP Odds include a parameter to represent the favourite team.
-                row = (point_data[FORMATTED_POINT], price_1, price_2, point_data[FAVOURITE_TEAM])
-                full_time_hdps[list_position] = row
+        """This public method enables the price movement scanner, which flags sharp line moves after each cache update.
 
-            elif self.odds_dictionary[odds_id]['odds_data'][MARKET_DISPLAY_ID] == HALF_TIME_OU:
+        The prices and points of every cached set of Odds are held in NumPy arrays aligned with the Odds IDs,
+        so that all of them can be compared with their values from earlier frames in a single vectorised pass.
+        Only Odds received after the scanner is enabled are scanned.
 
-                list_position = self.odds_dictionary[odds_id]['line_number'] - 1
-                point_data = self._format_point_value(self.odds_dictionary[odds_id]['odds_data'][POINT])
-                price_1 = self.odds_dictionary[odds_id]['prices'][PRICE_1]
-                price_2 = self.odds_dictionary[odds_id]['prices'][PRICE_2]
+        Args:
+            price_threshold: A price change larger than this is flagged.
+            point_threshold: A point change larger than this is flagged.
+            window: The number of cache updates to look back over when measuring a change.
 
-                row = (point_data[FORMATTED_POINT], price_1, price_2)
-                half_time_ous[list_position] = row
+        Returns:
+            None
 
-            elif self.odds_dictionary[odds_id]['odds_data'][MARKET_DISPLAY_ID] == FULL_TIME_OU:
+        Raises:
+            ScannerUnavailableError: Raised if NumPy is not installed.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "enable_price_movement_scanner"))
 
-                list_position = self.odds_dictionary[odds_id]['line_number'] - 1
-                point_data = self._format_point_value(self.odds_dictionary[odds_id]['odds_data'][POINT])
-                price_1 = self.odds_dictionary[odds_id]['prices'][PRICE_1]
-                price_2 = self.odds_dictionary[odds_id]['prices'][PRICE_2]
+        if numpy is None:
+            raise SboDataSourceCache.ScannerUnavailableError("The price movement scanner requires NumPy.")
 
-                row = (point_data[FORMATTED_POINT], price_1, price_2)
-                full_time_ous[list_position] = row
+        self.scanner_price_threshold = price_threshold
+        self.scanner_point_threshold = point_threshold
+        self.scanner_window = max(1, int(window))
 
-        # Each Event can have between One and Three rows of Odds data.
-        # The JamBlob data structure requires that Three sets are returned, regardless of the actual number of sets available.
-        for line in range(3):
+        # Each column of the arrays holds one set of Odds.
+        self.scanner_slots = {}
+        self.scanner_free_slots = list(range(DEFAULT_SCANNER_CAPACITY - 1, -1, -1))
+        self.scanner_values = numpy.full((SCANNER_VALUE_ROWS, DEFAULT_SCANNER_CAPACITY), numpy.nan)
+        self.scanner_keys = numpy.zeros((SCANNER_KEY_ROWS, DEFAULT_SCANNER_CAPACITY), dtype=numpy.int64)
+        self.scanner_history = numpy.full((self.scanner_window, SCANNER_VALUE_ROWS, DEFAULT_SCANNER_CAPACITY), numpy.nan)
+        self.scanner_history_position = 0
+        self.scanner_odds_updated = set()
+        self.scanner_odds_deleted = set()
+        self.price_movements = []
 
-            half_time_hdp = half_time_hdps[line]
-            full_time_hdp = full_time_hdps[line]
-            half_time_ou = half_time_ous[line]
-            full_time_ou = full_time_ous[line]
+        self.scanner_enabled = True
 
-            # If fetching newly created events, substitute None's for mixed rows only.
-            if fetch_type == FETCH_CREATED_EVENTS:
 
-                # When there is a mixture of values and Nones, replace the None with an empty Tuple.
-                if not (half_time_hdp is None and full_time_hdp is None and half_time_ou is None and full_time_ou is None):
+    def fetch_price_movements(self):
 
-                    if half_time_hdp is None:
-                        half_time_hdp = (0.0, 0.0, 0.0, 0)
+        """This public method returns the sharp line moves flagged by the price movement scanner during the last cache update.
 
-                    if full_time_hdp is None:
-                        full_time_hdp = (0.0, 0.0, 0.0, 0)
+        Returns:
+            price_movements: A list of tuples, eg: (event_result_id, market_display_id, line_number).
 
-                    if half_time_ou is None:
-                        half_time_ou = (0.0, 0.0, 0.0)
+        This simple method has no arguments and raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "fetch_price_movements"))
 
-                    if full_time_ou is None:
-                        full_time_ou = (0.0, 0.0, 0.0)
+        return self.price_movements
 
-            event_odds.append([half_time_hdp, full_time_hdp, half_time_ou, full_time_ou])
 
-        # The Event Odds is in the form of a List of Lists.
-        return event_odds
+    def memory_report(self):
 
+        """This public method estimates the memory used by each table in the cache.
 
-    def _get_sub_event_result_id(self, event_result_id):
+        The size of each table is estimated from a sample of its records, so the cost of a report does not grow with the size of the cache.
 
-        """This method generates and returns a Sub Event Result ID from the given Event Result ID.
+        Returns:
+            memory_report: A dictionary of table names, each holding a dictionary of 'records' and estimated 'bytes'.
+                The 'total' entry holds the totals across all of the tables.
 
-        Args: event_result_id(integer)
-        Returns: sub_event_result_id(integer)
-        Raises: EventIndexError
+        This simple method has no arguments and raises no errors.
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "_get_sub_event_result_id"))
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "memory_report"))
 
-        if self.frame_type == LIVE_DATA_FRAME:
-
-            # The Sub Event Result ID for a Live Frame is the Event Result ID prepended with a Zero.
-            # Note: As a leading Zero doesn't change the numeric value, simply return the Event Result ID.
-            sub_event_result_id = event_result_id
-
-        else:
+        tables = [
+            ('tournaments', self.tournament_dictionary),
+            ('events', self.event_dictionary),
+            ('event_results', self.event_result_dictionary),
+            ('event_result_extras', self.event_result_extra_dictionary),
+            ('odds', self.odds_dictionary),
+            ('market_groups', self.market_group_dictionary),
+            ('current_minutes_cache', self.current_minutes_cache),
+            ('events_created', self.events_created),
+            ('events_updated', self.events_updated),
+            ('events_deleted', self.events_deleted),
+            ('tournament_events', self.tournament_events),
+            ('event_event_results', self.event_event_results),
+            ('market_group_event_results', self.market_group_event_results),
+            ('event_result_odds', self.event_result_odds),
+            ('line_numbers', self.line_number_dictionary),
+            ('event_odds_grids', self.event_odds_grids),
+            ('odds_grid_cells', self.odds_grid_cells),
+            ('price_history', self.price_history),
+            ('event_result_index_keys', self.event_result_index_keys),
+            ('board_view', self.board_view),
+            ('board_sort_keys', self.board_sort_keys),
+            ('event_result_last_seen', self.event_result_last_seen)
+        ]
 
-            try:
-                # The Sub Event Result ID for a Non-Live Frame is the Event Result ID prepended with a One.
-                sub_event_result_id = int(NON_LIVE_SUB_EVENT_PREFIX + str(event_result_id))
+        memory_report = {}
+        total_records = 0
+        total_bytes = 0
 
-            except ValueError as exception_instance:
-                raise DataSourceBase.EventIndexError("_get_sub_event_result_id() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+        for table_name, table in tables:
 
-        return sub_event_result_id
+            records, estimated_bytes = self._estimate_table_size(table)
+            memory_report[table_name] = {'records': records, 'bytes': estimated_bytes}
 
+            total_records += records
+            total_bytes += estimated_bytes
 
-    def clear_cache(self):
+        # The index entries refer to the same Event Result IDs as the index keys, so only the containers are counted.
+        index_bytes = sum(sys.getsizeof(index) + sum(sys.getsizeof(entry) for entry in index.values()) for index in self.event_result_indexes)
+        memory_report['event_result_indexes'] = {'records': sum(len(index) for index in self.event_result_indexes), 'bytes': index_bytes}
+        total_bytes += index_bytes
 
-        """This public method clears all cached data.
+        if self.scanner_enabled:
 
-        This simple method has no arguments or returns.
-        It raises no errors.
-        """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "clear_cache"))
+            scanner_bytes = self.scanner_values.nbytes + self.scanner_keys.nbytes + self.scanner_history.nbytes
+            memory_report['price_movement_scanner'] = {'records': len(self.scanner_slots), 'bytes': scanner_bytes}
+            total_bytes += scanner_bytes
 
-        self.current_minutes_cache = {}
+        memory_report['total'] = {'records': total_records, 'bytes': total_bytes}
 
-        self.tournament_dictionary = {}
-        self.event_dictionary = {}
-        self.event_result_dictionary = {}
-        self.event_result_extra_dictionary = {}
-        self.odds_dictionary = {}
-        self.market_group_dictionary = {}
+        return memory_report
 
 
-    def update_cache(self, frame_cache_data):
+    def set_memory_limits(self, soft_limit=DEFAULT_MEMORY_SOFT_LIMIT, hard_limit=DEFAULT_MEMORY_HARD_LIMIT):
 
-        """This public method updates the internal data cache with the latest data received from the SBO server.
+        """This public method sets the memory limits, checked at the end of each cache update, that trigger the eviction of Event Results.
 
-        This method should be called each time data is fetched from the SBO server.
-        It will ensure that a complete up to date cache of event data is always available.
-        Note: The SBO server deals with Event Results which are equivalent to what JamBlob refers to as Matches.
+        Above the soft limit, a batch of the least recently updated non-live Event Results is evicted on each cache update.
+        Above the hard limit, Event Results are evicted until the cache is back within the soft limit.
+        Evicted Event Results, and their Odds, are removed from the cache and reported as deleted by update_cache().
 
         Args:
-            frame_cache_data: A dictionary of RAW event data from the SBO server.
+            soft_limit: The estimated size of the cache in bytes above which eviction starts, or None for no limit.
+            hard_limit: The estimated size of the cache in bytes above which eviction is immediate, or None for no limit.
 
         Returns:
-            During the process of updating the cache, a record is kept of which Event Results were created, updated or deleted.
-            This method returns a tuple of the three records:
-
-            (Events Created, Events Updated, Events Deleted)
+            None
 
-            The Events Created and Deleted hold a list of Event Result IDs and
-            Events Updated holds a dictionary specifying which parameters were updated.
-
-        Raises:
-            UnexpectedDataError: This class is based on a known data structure for frame_cache_data.
-                This error will be raised if the structure differs to an extent that the data can not be interpreted.
+        This simple method raises no errors.
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "update_cache"))
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "set_memory_limits"))
 
-        # These will hold a record of that was changed during the update.
-        # Note: The Events Created and Deleted hold a list of Event Result IDs and
-        # Events Updated holds a dictionary specifying which parameters were updated.
-        self.events_created = []
-        self.events_updated = {}
-        self.events_deleted = []
+        self.memory_soft_limit = soft_limit
+        self.memory_hard_limit = hard_limit
 
-        try:
-            # At the top level, the frame cache data is a collection of specific dictionaries.
-            tournament_dictionary = frame_cache_data[TOURNAMENT_DICTIONARY]
-            event_dictionary = frame_cache_data[EVENT_DICTIONARY]
-            event_result_dictionary = frame_cache_data[EVENT_RESULT_DICTIONARY]
-            event_result_extra_dictionary = frame_cache_data[EVENT_RESULT_EXTRA_DICTIONARY]
-            event_result_list_for_deletion = frame_cache_data[EVENT_RESULT_LIST_FOR_DELETION]
-            odds_dictionary = frame_cache_data[ODDS_DICTIONARY]
-            odds_list_for_deletion = frame_cache_data[ODDS_LIST_FOR_DELETION]
-            market_group_dictionary = frame_cache_data[MARKET_GROUP_DICTIONARY]
 
-        except (TypeError, IndexError, KeyError) as exception_instance:
-            raise SboDataSourceCache.UnexpectedDataError("update_cache() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+    def set_time_to_live(self, ttl_frames=DEFAULT_TTL_FRAMES, ttl_seconds=DEFAULT_TTL_SECONDS):
 
-        try:
-            # Delete the internal data cache for any dictionaries containing data.
+        """This public method sets the time to live of Event Results that are no longer being received from the SBO server.
 
-            if event_result_list_for_deletion is not None:
-                self._delete_from_event_result_dictionary(event_result_list_for_deletion)
+        The SBO server does not always list Event Results for deletion when they finish.
+        An Event Result whose data has not been received for longer than either time to live is evicted, along with its Event Result Extra data and Odds.
+        Expired Event Results are evicted incrementally, at the end of each cache update, and reported as deleted by update_cache().
 
-            if odds_list_for_deletion is not None:
-                self._delete_from_odds_dictionary(odds_list_for_deletion)
+        Args:
+            ttl_frames: The number of cache updates after which an Event Result expires, or None for no limit.
+            ttl_seconds: The number of seconds after which an Event Result expires, or None for no limit.
 
-        except (TypeError, IndexError) as exception_instance:
-            raise SboDataSourceCache.UnexpectedDataError("update_cache() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+        Returns:
+            None
 
-        try:
-            # Update the internal data cache for any dictionaries containing data.
+        This simple method raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "set_time_to_live"))
 
-            if tournament_dictionary is not None:
-                self._update_tournament_dictionary(tournament_dictionary)
+        self.ttl_frames = ttl_frames
+        self.ttl_seconds = ttl_seconds
 
-            if event_dictionary is not None:
-                self._update_event_dictionary(event_dictionary)
 
-            if event_result_dictionary is not None:
-                self._update_event_result_dictionary(event_result_dictionary)
+    def fetch_quarantined_records(self):
 
-            #if event_result_extra_dictionary is not None:
-            # Update: The event result extra dictionary must now be updated regardless of data coming from the SBO server.
-            # This is so that if there is no update to the match elapsed time, it can be simulated here
-            self._update_event_result_extra_dictionary(event_result_extra_dictionary)
+        """This public method returns the records that were not applied during the last cache update because they failed validation.
 
-            if odds_dictionary is not None:
-                self._update_odds_dictionary(odds_dictionary)
+        Returns:
+            records_quarantined: A list of tuples, each holding (section, record, reason).
+                The section is the index of the record within the frame cache data, eg: ODDS_DICTIONARY.
 
-            if market_group_dictionary is not None:
-                self._update_market_group_dictionary(market_group_dictionary)
+        This simple method has no arguments and raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "fetch_quarantined_records"))
 
-        except (TypeError, IndexError) as exception_instance:
-            raise SboDataSourceCache.UnexpectedDataError("update_cache() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+        return self.records_quarantined
 
-        # These lists and dictionaries return a record of what was created, updated and deleted.
-        return (self.events_created, self.events_updated, self.events_deleted)
 
+    def set_atomic_updates(self, atomic_updates):
 
-    def fetch_event(self, event_result_id):
+        """This public method sets whether each cache update is applied atomically.
 
-        """This public method returns all event details for the given Event Result ID.
+        In atomic mode, the previous value of every record changed by a cache update is kept in an undo log.
+        If the update fails, every change is rolled back before the error is raised, leaving the cache as it was before the update.
+        Only the changed records are copied, so the cost is proportional to the size of the frame rather than the size of the cache.
 
         Args:
-            event_result_id: An ID number used to look-up an Event Result.
+            atomic_updates: True to roll back a cache update that fails, or False to leave any changes made before the failure.
 
         Returns:
-            event: A Tuple made up of an Events IDs, details and odds.
-                eg: (sub_event_result_id, sbo_event_result_id, event_details, event_odds)
+            None
 
-        Raises:
-            EventIndexError: Raised on an invalid event_result_id or
-                when the event_result_id provided does not match any record in the cache.
+        This simple method raises no errors.
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "fetch_event"))
-
-        # The Sub-Event Result ID is based on the Event Result ID, prefixed with the frame type.
-        sub_event_result_id = self._get_sub_event_result_id(event_result_id)
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "set_atomic_updates"))
 
-        # Each data source class has a unique ID.
-        # Encode the unique ID into the Event Result ID so that its source can be identified.
-        sub_event_result_id = DataSourceBase.get_identifiable_id(self, self.sbo_id, sub_event_result_id)
-        sbo_event_result_id = DataSourceBase.get_identifiable_id(self, self.sbo_id, event_result_id)
+        self.atomic_updates = atomic_updates
 
-        # A list of Odds IDs that are associated with the given Event Result ID.
-        associated_odds = []
 
-        # The only way to find Odds that relate to the given Event Result ID is to cycle round
-        # the whole Odds Dictionary looking for a matching Event Result ID.
-        for odds_id in self.odds_dictionary:
-            if self.odds_dictionary[odds_id]['odds_data'][ODDS_DICTIONARY_EVENT_RESULT_ID] == event_result_id:
-                associated_odds.append(odds_id)
+    def begin_update(self):
 
-        try:
-            # Use the Event Result ID to look-up all the required Event details from cache.
-            event_details = self._get_event_details(event_result_id)
+        """This public method starts a cache update that is applied one record at a time, as the raw data is decoded.
 
-            # Use the list of Odds IDs associated with the Event Result ID, to look-up all the required Odds details from cache.
-            event_odds = self._get_event_odds(associated_odds, FETCH_CREATED_EVENTS)
+        Records are passed to apply_record() in the order they are decoded, then end_update() completes the update.
+        If decoding fails part way through, abort_update() must be called instead of end_update().
 
-        except (KeyError, TypeError, IndexError) as exception_instance:
-            raise DataSourceBase.EventIndexError("fetch_event() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+        This simple method has no arguments or returns.
+        It raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "begin_update"))
 
-        # This tuple represents the required JamBlob match structure.
-        event = (sub_event_result_id, sbo_event_result_id, event_details, event_odds)
+        self._start_update()
+        self._start_undo_log()
 
-        return event
 
+    def apply_record(self, section, record):
 
-    def fetch_modified_event(self, event_result_id, modified_properties):
+        """This public method validates and applies a single record to the cache, during an update started by begin_update().
 
-        """This public method returns all modified event details for the given Event Result ID.
+        A record that does not match the expected layout of its section is quarantined rather than applied.
 
         Args:
-            event_result_id: An ID number used to look-up an Event Result.
-            modified_properties: A dictionary of Event IDs that have had their properties modified in the last cache update.
+            section: The index of the section of the frame cache data that holds the record, eg: ODDS_DICTIONARY.
+            record: A single record, or a single ID for the lists for deletion.
 
         Returns:
-            event: A Tuple made up of an Events IDs, details and odds.
-                eg: (sub_event_result_id, sbo_event_result_id, event_details, event_odds)
+            None
 
         Raises:
-            EventIndexError: Raised on an invalid event_result_id or
-                when the event_result_id provided does not match any record in the cache.
+            UnexpectedDataError: Raised if the section is unknown or the record can not be applied.
+                The update is aborted before the error is raised.
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "fetch_modified_event"))
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "apply_record"))
 
-        # The Sub-Event Result ID is based on the Event Result ID, prefixed with the frame type.
-        sub_event_result_id = self._get_sub_event_result_id(event_result_id)
+        if section not in self.record_appliers:
+            self.abort_update()
+            raise SboDataSourceCache.UnexpectedDataError("apply_record() was given an unknown section: %s" % section)
 
-        # Each data source class has a unique ID.
-        # Encode the unique ID into the Event Result ID so that its source can be identified.
-        sub_event_result_id = DataSourceBase.get_identifiable_id(self, self.sbo_id, sub_event_result_id)
-        sbo_event_result_id = DataSourceBase.get_identifiable_id(self, self.sbo_id, event_result_id)
+        # Odds received or deleted earlier in the same update have already been applied, so no record of their Odds IDs is needed.
+        record_error = self._get_record_error(section, record, (), ())
 
-        # These default states will be returned if there is no entry in the dictionary to indicate they have been modified.
-        event_details = (None, None, (None, None), None, None, (None, None), None, None, None, (None, None), (None, None))
-        event_odds = [[None, None, None, None], [None, None, None, None], [None, None, None, None]]
+        if record_error is not None:
+            debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "Quarantining record in section %s, %s: %s" % (section, record_error, record))
+            self.records_quarantined.append((section, record, record_error))
+            return
 
         try:
-            if 'event_details' in modified_properties:
+            self.record_appliers[section]([record])
 
-                # The dictionary will contain an 'event_details' key only if the event details have been modified.
-                # Note: The value of the key will be set to True, but it can be ignored.
-                event_details = self._get_event_details(event_result_id)
+        except (TypeError, IndexError, KeyError) as exception_instance:
+            self.abort_update()
+            raise SboDataSourceCache.UnexpectedDataError("apply_record() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
 
-        except (KeyError, TypeError, IndexError) as exception_instance:
-            raise DataSourceBase.EventIndexError("fetch_modified_event() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
-            #debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "fetch_modified_event() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
 
-        try:
-            if 'event_odds' in modified_properties:
+    def end_update(self):
 
-                # The dictionary will contain an 'event_odds' key only if the event odds have been modified.
-                # The value of the key is a list of all the Odds IDs that have been modified.
-                modified_odds = modified_properties['event_odds']
+        """This public method completes a cache update started by begin_update().
 
-                event_odds = self._get_event_odds(modified_odds, FETCH_MODIFIED_EVENTS)
+        Returns:
+            A tuple of the record of what was changed, in the same form as returned by update_cache():
 
-        except (KeyError, TypeError, IndexError) as exception_instance:
-            raise DataSourceBase.EventIndexError("fetch_modified_event() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
-            #debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "fetch_modified_event() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+            (Events Created, Events Updated, Events Deleted)
 
-        # This tuple represents the required JabBlob match structure.
-        event = (sub_event_result_id, sbo_event_result_id, event_details, event_odds)
+        This simple method has no arguments and raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "end_update"))
 
-        return event
+        # Events that have not received a value for current minutes during the update have it simulated.
+        self._simulate_current_minutes()
+
+        return self._complete_update()
+
+
+    def abort_update(self):
+
+        """This public method abandons a cache update that has failed.
+
+        In atomic mode, every change made during the update is rolled back.
+        Otherwise the records applied before the failure are kept, and the indexes and board view are brought in step with them.
+
+        This simple method has no arguments or returns.
+        It raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceCache.__name__, "abort_update"))
+
+        if self.undo_log is not None:
+            self._rollback_undo_log()
+        else:
+            self._complete_update()
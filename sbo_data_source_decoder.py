@@ -0,0 +1,399 @@
+#!/usr/local/bin/python3.2
+# coding: utf-8
+
+"""This module implements the SboDataSourceDecoder class."""
+
+import debug
+import debug_flags
+import re
+
+# Token types.
+OPEN_LIST_TOKEN = 0
+CLOSE_LIST_TOKEN = 1
+SEPARATOR_TOKEN = 2
+STRING_TOKEN = 3
+NUMBER_TOKEN = 4
+LITERAL_TOKEN = 5
+
+# Token indexes.
+TOKEN_TYPE = 0
+TOKEN_VALUE = 1
+
+# The raw data holds the sections of the frame cache data in order, from TOURNAMENT_DICTIONARY to MARKET_GROUP_DICTIONARY.
+NUMBER_OF_SECTIONS = 8
+
+# The lists for deletion, which update_cache() applies before any other section.
+EVENT_RESULT_LIST_FOR_DELETION = 4
+ODDS_LIST_FOR_DELETION = 6
+DELETION_SECTIONS = frozenset([EVENT_RESULT_LIST_FOR_DELETION, ODDS_LIST_FOR_DELETION])
+UPDATE_SECTIONS = frozenset(range(NUMBER_OF_SECTIONS)) - DELETION_SECTIONS
+
+# JavaScript literals and their Python equivalents.
+LITERAL_VALUES = {'null': None, 'undefined': None, 'true': True, 'false': False}
+
+# String escape sequences and their Python equivalents.
+ESCAPE_SEQUENCES = {'n': '\n', 'r': '\r', 't': '\t', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+
+# Regular Expression Objects.
+REGEX_TOKEN = re.compile(r'''\s*(?:(?P<open>\[)|(?P<close>\])|(?P<separator>,)|'(?P<single_quoted>(?:[^'\\]|\\.)*)'|"(?P<double_quoted>(?:[^"\\]|\\.)*)"|(?P<number>-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)|(?P<literal>null|undefined|true|false))''', re.DOTALL)
+REGEX_ESCAPE = re.compile(r'\\(?:u(?P<unicode>[0-9a-fA-F]{4})|x(?P<hex>[0-9a-fA-F]{2})|(?P<character>.))', re.DOTALL)
+
+
+class SboDataSourceDecoder(object):
+
+    """This class decodes raw data from the SBO server straight into an SboDataSourceCache.
+
+    Notes:
+      The raw data holds a JavaScript array literal of the frame cache data, which may be wrapped in a function call.
+      Each record is applied to the cache as soon as it has been decoded, so the frame cache data is never built in full.
+      The raw data is read twice: first for the small lists for deletion, then for the other sections, matching the order of update_cache().
+    """
+
+    # Exceptions that this class may raise.
+    class DecodeError(Exception):
+
+        """Raised when the raw data from the SBO server can not be decoded."""
+        pass
+
+
+    # Class methods
+    def __init__(self, sbo_data_source_cache):
+
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceDecoder.__name__, "__init__"))
+
+        self.sbo_data_source_cache = sbo_data_source_cache
+
+
+    @staticmethod
+    def _unescape(escaped_string):
+
+        """This private method replaces the escape sequences in a quoted string with the characters they represent.
+
+        Args: escaped_string(string)
+        Returns: unescaped_string(string)
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceDecoder.__name__, "_unescape"))
+
+        # Most strings hold no escape sequences, so avoid the substitution when it isn't needed.
+        if '\\' not in escaped_string:
+            return escaped_string
+
+        def replace_escape(match):
+
+            if match.group('unicode') is not None:
+                return chr(int(match.group('unicode'), 16))
+
+            if match.group('hex') is not None:
+                return chr(int(match.group('hex'), 16))
+
+            return ESCAPE_SEQUENCES.get(match.group('character'), match.group('character'))
+
+        return REGEX_ESCAPE.sub(replace_escape, escaped_string)
+
+
+    def _tokenize(self, raw_data, position):
+
+        """This private method yields the tokens of the raw data, one at a time, starting at the given position.
+
+        Args: raw_data(string), position(integer)
+        Returns: tokens(generator), eg: yielding (token_type, token_value)
+        Raises: DecodeError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceDecoder.__name__, "_tokenize"))
+
+        raw_data_length = len(raw_data)
+
+        while position < raw_data_length:
+
+            match = REGEX_TOKEN.match(raw_data, position)
+
+            if match is None:
+
+                # Anything after the last token, such as the end of a function call, is ignored.
+                if not raw_data[position:].strip():
+                    return
+
+                raise SboDataSourceDecoder.DecodeError("Unexpected character at position %s: %r" % (position, raw_data[position:position + 20]))
+
+            position = match.end()
+            token_kind = match.lastgroup
+
+            if token_kind == 'open':
+                yield (OPEN_LIST_TOKEN, None)
+
+            elif token_kind == 'close':
+                yield (CLOSE_LIST_TOKEN, None)
+
+            elif token_kind == 'separator':
+                yield (SEPARATOR_TOKEN, None)
+
+            elif token_kind == 'single_quoted' or token_kind == 'double_quoted':
+                yield (STRING_TOKEN, self._unescape(match.group(token_kind)))
+
+            elif token_kind == 'number':
+
+                number = match.group(token_kind)
+
+                if '.' in number or 'e' in number or 'E' in number:
+                    yield (NUMBER_TOKEN, float(number))
+                else:
+                    yield (NUMBER_TOKEN, int(number))
+
+            else:
+                yield (LITERAL_TOKEN, LITERAL_VALUES[match.group(token_kind)])
+
+
+    def _decode_value(self, token, tokens):
+
+        """This private method decodes a single value, reading further tokens if the value is a list.
+
+        Args: token(tuple), tokens(generator)
+        Returns: value(object)
+        Raises: DecodeError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceDecoder.__name__, "_decode_value"))
+
+        if token[TOKEN_TYPE] == OPEN_LIST_TOKEN:
+            return self._decode_list(tokens)
+
+        if token[TOKEN_TYPE] in (STRING_TOKEN, NUMBER_TOKEN, LITERAL_TOKEN):
+            return token[TOKEN_VALUE]
+
+        raise SboDataSourceDecoder.DecodeError("A value was expected.")
+
+
+    def _decode_list(self, tokens):
+
+        """This private method decodes a list, once its opening bracket has been read.
+
+        Empty elements, eg: [1,,3], are decoded as None.
+
+        Args: tokens(generator)
+        Returns: values(list)
+        Raises: DecodeError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceDecoder.__name__, "_decode_list"))
+
+        values = []
+        value_expected = True
+
+        for token in tokens:
+
+            if token[TOKEN_TYPE] == CLOSE_LIST_TOKEN:
+                return values
+
+            if token[TOKEN_TYPE] == SEPARATOR_TOKEN:
+
+                if value_expected:
+                    values.append(None)
+
+                value_expected = True
+                continue
+
+            if not value_expected:
+                raise SboDataSourceDecoder.DecodeError("A separator was expected between values.")
+
+            values.append(self._decode_value(token, tokens))
+            value_expected = False
+
+        raise SboDataSourceDecoder.DecodeError("The raw data ended inside a list.")
+
+
+    def _skip_list(self, tokens):
+
+        """This private method reads past a list without decoding its values, once its opening bracket has been read.
+
+        Args: tokens(generator)
+        Returns: None
+        Raises: DecodeError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceDecoder.__name__, "_skip_list"))
+
+        depth = 0
+
+        for token in tokens:
+
+            if token[TOKEN_TYPE] == OPEN_LIST_TOKEN:
+                depth += 1
+
+            elif token[TOKEN_TYPE] == CLOSE_LIST_TOKEN:
+
+                if depth == 0:
+                    return
+
+                depth -= 1
+
+        raise SboDataSourceDecoder.DecodeError("The raw data ended inside a list.")
+
+
+    def _decode_section(self, section, tokens):
+
+        """This private method decodes a section of the raw data, applying each record to the cache as soon as it is decoded.
+
+        Args: section(integer), tokens(generator)
+        Returns: None
+        Raises: DecodeError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceDecoder.__name__, "_decode_section"))
+
+        value_expected = True
+
+        for token in tokens:
+
+            if token[TOKEN_TYPE] == CLOSE_LIST_TOKEN:
+                return
+
+            if token[TOKEN_TYPE] == SEPARATOR_TOKEN:
+                value_expected = True
+                continue
+
+            if not value_expected:
+                raise SboDataSourceDecoder.DecodeError("A separator was expected between records.")
+
+            self.sbo_data_source_cache.apply_record(section, self._decode_value(token, tokens))
+            value_expected = False
+
+        raise SboDataSourceDecoder.DecodeError("The raw data ended inside section %s." % section)
+
+
+    def _decode_sections(self, tokens, sections_to_apply):
+
+        """This private method decodes the given sections of the frame cache data, once the opening bracket has been read.
+
+        The other sections are read past without being decoded.
+
+        Args: tokens(generator), sections_to_apply(frozenset), eg: DELETION_SECTIONS
+        Returns: None
+        Raises: DecodeError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceDecoder.__name__, "_decode_sections"))
+
+        section = 0
+        value_expected = True
+
+        for token in tokens:
+
+            if token[TOKEN_TYPE] == CLOSE_LIST_TOKEN:
+
+                # As in JavaScript, a trailing separator does not start another section.
+                number_of_sections = section if value_expected else section + 1
+
+                if number_of_sections < NUMBER_OF_SECTIONS:
+                    raise SboDataSourceDecoder.DecodeError("The raw data holds %s sections, %s were expected." % (number_of_sections, NUMBER_OF_SECTIONS))
+
+                return
+
+            if token[TOKEN_TYPE] == SEPARATOR_TOKEN:
+                section += 1
+                value_expected = True
+                continue
+
+            if not value_expected:
+                raise SboDataSourceDecoder.DecodeError("A separator was expected between sections.")
+
+            value_expected = False
+
+            # A section without data is sent as null.
+            if token[TOKEN_TYPE] == LITERAL_TOKEN and token[TOKEN_VALUE] is None:
+                continue
+
+            if token[TOKEN_TYPE] != OPEN_LIST_TOKEN:
+                raise SboDataSourceDecoder.DecodeError("Section %s is not a list." % section)
+
+            if section in sections_to_apply:
+                self._decode_section(section, tokens)
+            else:
+                self._skip_list(tokens)
+
+        raise SboDataSourceDecoder.DecodeError("The raw data ended before the last section.")
+
+
+    def _tokenize_raw_data(self, raw_data):
+
+        """This private method returns the tokens of the raw data, after the opening bracket of the frame cache data.
+
+        Args: raw_data(string)
+        Returns: tokens(generator)
+        Raises: DecodeError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceDecoder.__name__, "_tokenize_raw_data"))
+
+        try:
+            # Anything before the frame cache data, such as the start of a function call, is skipped.
+            position = raw_data.index('[')
+
+        except (AttributeError, TypeError, ValueError) as exception_instance:
+            raise SboDataSourceDecoder.DecodeError("_tokenize_raw_data() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        return self._tokenize(raw_data, position + 1)
+
+
+    def decode_frame_cache_data(self, raw_data):
+
+        """This public method decodes raw data from the SBO server into frame cache data, without applying it to the cache.
+
+        This is used where the frame cache data must be passed elsewhere before it is applied, eg: back from a worker process.
+
+        Args:
+            raw_data: A string of raw data from the SBO server, eg: as returned by SboDataSourceReplay.playback().
+
+        Returns:
+            frame_cache_data: A list of the sections of frame cache data, as expected by update_cache().
+
+        Raises:
+            DecodeError: Raised if the raw data can not be decoded.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceDecoder.__name__, "decode_frame_cache_data"))
+
+        frame_cache_data = self._decode_list(self._tokenize_raw_data(raw_data))
+
+        if len(frame_cache_data) < NUMBER_OF_SECTIONS:
+            raise SboDataSourceDecoder.DecodeError("The raw data holds %s sections, %s were expected." % (len(frame_cache_data), NUMBER_OF_SECTIONS))
+
+        for section, records in enumerate(frame_cache_data[:NUMBER_OF_SECTIONS]):
+
+            if records is not None and not isinstance(records, list):
+                raise SboDataSourceDecoder.DecodeError("Section %s is not a list." % section)
+
+        return frame_cache_data[:NUMBER_OF_SECTIONS]
+
+
+    def decode(self, raw_data):
+
+        """This public method decodes raw data from the SBO server and applies it to the cache, one record at a time.
+
+        This method can be used in place of decoding the raw data into frame cache data and passing it to update_cache().
+        As in update_cache(), the lists for deletion are applied first, then the other records in the order they appear in the raw data.
+        Records that do not match their expected layout are quarantined by the cache rather than applied.
+
+        Args:
+            raw_data: A string of raw data from the SBO server, eg: as returned by SboDataSourceReplay.playback().
+
+        Returns:
+            A tuple of the record of what was changed, in the same form as returned by update_cache():
+
+            (Events Created, Events Updated, Events Deleted)
+
+        Raises:
+            DecodeError: Raised if the raw data can not be decoded.
+                The cache update is aborted, which in atomic mode rolls back any records already applied.
+            UnexpectedDataError: Raised by the cache if a record can not be applied.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourceDecoder.__name__, "decode"))
+
+        deletion_tokens = self._tokenize_raw_data(raw_data)
+        update_tokens = self._tokenize_raw_data(raw_data)
+
+        self.sbo_data_source_cache.begin_update()
+
+        try:
+            # Records re-sent in the same frame as their deletion must be cached again, so the deletions are applied first.
+            self._decode_sections(deletion_tokens, DELETION_SECTIONS)
+            self._decode_sections(update_tokens, UPDATE_SECTIONS)
+
+        except SboDataSourceDecoder.DecodeError:
+            self.sbo_data_source_cache.abort_update()
+            raise
+
+        return self.sbo_data_source_cache.end_update()
@@ -0,0 +1,149 @@
+#!/usr/local/bin/python3.2
+# coding: utf-8
+
+"""This module implements the SboDataSourceMultiReplay class."""
+
+import heapq
+import datetime
+import debug
+import debug_flags
+from sbo_data_source_replay import SboDataSourceReplay
+
+# Replay modes.
+FAST_REPLAY_MODE = 1
+
+# Merged frame indexes.
+MERGED_SOURCE = 0
+MERGED_FRAME_TYPE = 1
+MERGED_CAPTURE_TIME = 2
+MERGED_RAW_DATA = 3
+
+# Merge heap entry indexes.
+HEAP_CAPTURE_TIME = 0
+HEAP_SOURCE_INDEX = 1
+HEAP_FRAME_TYPE = 2
+HEAP_RAW_DATA = 3
+
+# Initial states.
+NO_SOURCE_TO_REFILL = None
+
+
+class SboDataSourceMultiReplay(object):
+
+    """This class plays back several capture folders together, merged into a single sequence in order of capture time.
+
+    Notes:
+      Each capture folder, or archive bundle, is read by its own SboDataSourceReplay object.
+      The merge heap holds no more than the next frame of each capture folder, so memory does not grow with the length of the replays.
+      Frames with the same capture time are returned in the order their capture folders were given.
+      Frames captured while the connection to the SBO server was lost are returned with the NO_DATA_FRAME frame type, and the merge carries on.
+    """
+
+    # Class methods
+    def __init__(self, replay_folder_paths, base_directory=None):
+
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceMultiReplay.__name__, "__init__"))
+
+        # The capture folders to be merged, which also identify the source of each frame.
+        self.replay_folder_paths = list(replay_folder_paths)
+        self.sbo_data_source_replays = []
+
+        # The frames are read as fast as possible, leaving any pacing to the caller.
+        minimum_request_period = [datetime.timedelta(0), datetime.timedelta(0)]
+
+        for replay_folder_path in self.replay_folder_paths:
+
+            sbo_data_source_replay = SboDataSourceReplay()
+
+            if base_directory is not None:
+                sbo_data_source_replay.base_directory = base_directory
+
+            sbo_data_source_replay.initalise_playback(replay_folder_path, FAST_REPLAY_MODE, minimum_request_period)
+            self.sbo_data_source_replays.append(sbo_data_source_replay)
+
+        # The next frame of each capture folder, ordered by capture time, eg: (capture_time, source_index, frame_type, raw_data).
+        self.merge_heap = []
+
+        # The capture folder of the last frame returned, whose next frame is read on the following call.
+        self.source_to_refill = NO_SOURCE_TO_REFILL
+
+        for source_index in range(len(self.sbo_data_source_replays)):
+            self._push_next_frame(source_index)
+
+
+    def _push_next_frame(self, source_index):
+
+        """This private method reads the next frame of a capture folder onto the merge heap, unless its replay has ended.
+
+        Args: source_index(integer)
+        Returns: None
+        Raises: FileReadError, PlaybackError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceMultiReplay.__name__, "_push_next_frame"))
+
+        try:
+            frame_type, capture_time, raw_data = self.sbo_data_source_replays[source_index].read_frame()
+
+        except SboDataSourceReplay.EndOfReplay:
+            debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Reached the end of replay: '%s'" % self.replay_folder_paths[source_index])
+            return
+
+        # The source index breaks ties between equal capture times, so the raw data is never compared.
+        heapq.heappush(self.merge_heap, (capture_time, source_index, frame_type, raw_data))
+
+
+    def read_frame(self):
+
+        """This public method returns the next frame, in capture time order, from across all of the capture folders.
+
+        Returns:
+            frame: A tuple holding (source, frame_type, capture_time, raw_data), where the source is the capture folder path given for the frame.
+                The frame type is NO_DATA_FRAME for a frame captured while the connection to the SBO server was lost.
+
+        Raises:
+            EndOfReplay: Raised when every frame in every capture folder has been returned.
+            FileReadError: Raised if an error is encountered while attempting to read a capture folder.
+            PlaybackError: Raised when a frame with an unknown data identifier is discovered, after which that capture folder is not read any further.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceMultiReplay.__name__, "read_frame"))
+
+        # The capture folder of the last frame is only read now, so that an error reading it does not lose the frame that was returned.
+        if self.source_to_refill is not NO_SOURCE_TO_REFILL:
+
+            source_index = self.source_to_refill
+            self.source_to_refill = NO_SOURCE_TO_REFILL
+            self._push_next_frame(source_index)
+
+        if not self.merge_heap:
+            raise SboDataSourceReplay.EndOfReplay("Reached the end of all %s replays." % len(self.sbo_data_source_replays))
+
+        merge_heap_entry = heapq.heappop(self.merge_heap)
+        self.source_to_refill = merge_heap_entry[HEAP_SOURCE_INDEX]
+
+        return (
+            self.replay_folder_paths[merge_heap_entry[HEAP_SOURCE_INDEX]],
+            merge_heap_entry[HEAP_FRAME_TYPE],
+            merge_heap_entry[HEAP_CAPTURE_TIME],
+            merge_heap_entry[HEAP_RAW_DATA]
+        )
+
+
+    def __iter__(self):
+
+        """This public method yields every remaining frame, in capture time order, as returned by the read_frame() method.
+
+        This simple method has no arguments.
+        It raises the same errors as the read_frame() method, other than EndOfReplay.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceMultiReplay.__name__, "__iter__"))
+
+        while True:
+
+            try:
+                frame = self.read_frame()
+
+            except SboDataSourceReplay.EndOfReplay:
+                return
+
+            yield frame
+
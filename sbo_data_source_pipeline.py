@@ -0,0 +1,329 @@
+#!/usr/local/bin/python3.2
+# coding: utf-8
+
+"""This module implements the SboDataSourcePipeline class."""
+
+import debug
+import debug_flags
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from sbo_data_source_decoder import SboDataSourceDecoder
+
+# Data frames.
+LIVE_DATA_FRAME = 0
+NON_LIVE_DATA_FRAME = 1
+FRAME_TYPES = (LIVE_DATA_FRAME, NON_LIVE_DATA_FRAME)
+
+# Applied frame indexes.
+APPLIED_FRAME_TYPE = 0
+APPLIED_SEQUENCE_NUMBER = 1
+APPLIED_RESULT = 2
+APPLIED_SOURCE = 3
+
+# Initial states.
+INITIAL_SEQUENCE_NUMBER = 0
+
+# Default settings.
+DEFAULT_MAX_WORKERS = None
+DEFAULT_SOURCE = None
+
+
+def decode_raw_data(raw_data):
+
+    """This function decodes raw data into frame cache data.
+
+    It is run in a worker process, so it is defined at module level where the process pool can find it.
+    The source, frame type and sequence number of the raw data are kept with its future by the pipeline.
+
+    Args: raw_data(string)
+    Returns: frame_cache_data(list)
+    Raises: DecodeError
+    """
+    debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (__name__, "decode_raw_data"))
+
+    return SboDataSourceDecoder(None).decode_frame_cache_data(raw_data)
+
+
+class SboDataSourcePipeline(object):
+
+    """This class decodes raw data from the SBO server in a pool of worker processes and applies it to the cache in order.
+
+    Notes:
+      Raw data from several SBO sources may be submitted together, each source having a cache for each frame type.
+      Each source and frame type has its own cache, sequence numbers and reorder buffer.
+      Frames may finish decoding in any order, but each cache is only updated with the next frame in its sequence.
+      A frame that can not be decoded is skipped, as the cache has not been touched.
+      A frame that fails to apply may leave the cache half updated, so no further frames are applied to that cache until resume() is called.
+      Caches in atomic mode have each failed update rolled back, so their later frames are still applied.
+    """
+
+    # Exceptions that this class may raise.
+    class PipelineClosedError(Exception):
+
+        """Raised when raw data is submitted after the pipeline has been shut down."""
+        pass
+
+    class InvalidSubmissionError(Exception):
+
+        """Raised when raw data is submitted with an unknown source or frame type."""
+        pass
+
+    class CacheHaltedError(Exception):
+
+        """Returned in place of the result of a frame that was not applied, as an earlier frame failed to apply to the same cache."""
+        pass
+
+
+    # Class methods
+    def __init__(self, sbo_data_source_caches, max_workers=DEFAULT_MAX_WORKERS):
+
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourcePipeline.__name__, "__init__"))
+
+        # A cache for each frame type of each source, eg: {source: [live_cache, non_live_cache]}.
+        # A single source may be given as a list of caches, eg: [live_cache, non_live_cache], and submitted without a source.
+        if isinstance(sbo_data_source_caches, dict):
+            self.sbo_data_source_caches = dict(sbo_data_source_caches)
+        else:
+            self.sbo_data_source_caches = {DEFAULT_SOURCE: sbo_data_source_caches}
+
+        # Decoding is spread over a pool of worker processes, one per core by default.
+        self.executor = ProcessPoolExecutor(max_workers=max_workers)
+        self.closed = False
+
+        # The next sequence number to give to submitted raw data, and the next to apply to the cache, for each source and frame type.
+        self.next_sequence_number = {}
+        self.next_sequence_number_to_apply = {}
+
+        # The raw data still being decoded, and the decoded frames waiting for earlier frames in their sequence.
+        self.pending_futures = {}
+        self.reorder_buffers = {}
+
+        # The sources and frame types whose cache may have been left half updated by a frame that failed to apply.
+        self.halted_caches = set()
+
+        for source in self.sbo_data_source_caches:
+
+            for frame_type in FRAME_TYPES:
+                self.next_sequence_number[(source, frame_type)] = INITIAL_SEQUENCE_NUMBER
+                self.next_sequence_number_to_apply[(source, frame_type)] = INITIAL_SEQUENCE_NUMBER
+                self.reorder_buffers[(source, frame_type)] = {}
+
+
+    def _collect_decoded_frames(self, timeout):
+
+        """This private method moves the frames that have finished decoding into the reorder buffer of their source and frame type.
+
+        A frame that could not be decoded is stored as the exception that was raised.
+
+        Args: timeout(float), eg: None to wait for at least one frame to finish decoding.
+        Returns: None
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourcePipeline.__name__, "_collect_decoded_frames"))
+
+        if not self.pending_futures:
+            return
+
+        done_futures, _ = wait(list(self.pending_futures), timeout=timeout, return_when=FIRST_COMPLETED)
+
+        for future in done_futures:
+
+            source, frame_type, sequence_number = self.pending_futures.pop(future)
+
+            try:
+                self.reorder_buffers[(source, frame_type)][sequence_number] = future.result()
+
+            except Exception as exception_instance: # pylint: disable-msg=W0703
+                debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "_collect_decoded_frames() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+                self.reorder_buffers[(source, frame_type)][sequence_number] = exception_instance
+
+
+    def _apply_in_order(self):
+
+        """This private method applies each decoded frame to the cache of its source and frame type, as long as every earlier frame in its sequence has been applied.
+
+        Args: None
+        Returns: applied_frames(list)
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourcePipeline.__name__, "_apply_in_order"))
+
+        applied_frames = []
+
+        for (source, frame_type), reorder_buffer in self.reorder_buffers.items():
+
+            while self.next_sequence_number_to_apply[(source, frame_type)] in reorder_buffer:
+
+                sequence_number = self.next_sequence_number_to_apply[(source, frame_type)]
+                frame_cache_data = reorder_buffer.pop(sequence_number)
+                sbo_data_source_cache = self.sbo_data_source_caches[source][frame_type]
+
+                # The frames of a halted cache are deltas on top of a half updated cache, so they are not applied.
+                if (source, frame_type) in self.halted_caches:
+                    update_result = SboDataSourcePipeline.CacheHaltedError("Frame %s of source %s, frame type %s was not applied, as an earlier frame failed to apply." % (sequence_number, source, frame_type))
+
+                # A frame that could not be decoded is skipped, and the exception is returned in place of its result.
+                elif isinstance(frame_cache_data, Exception):
+                    update_result = frame_cache_data
+
+                else:
+                    try:
+                        update_result = sbo_data_source_cache.update_cache(frame_cache_data)
+
+                    except Exception as exception_instance: # pylint: disable-msg=W0703
+                        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "_apply_in_order() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+                        update_result = exception_instance
+
+                        if not sbo_data_source_cache.atomic_updates:
+                            debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_WARNINGS, debug.WARNING, "Halting the cache of source %s, frame type %s." % (source, frame_type))
+                            self.halted_caches.add((source, frame_type))
+
+                applied_frames.append((frame_type, sequence_number, update_result, source))
+                self.next_sequence_number_to_apply[(source, frame_type)] = sequence_number + 1
+
+        return applied_frames
+
+
+    def _check_cache_key(self, frame_type, source):
+
+        """This private method checks that the given frame type and source identify one of the caches of the pipeline.
+
+        Args: frame_type(integer), source(object)
+        Returns: None
+        Raises: InvalidSubmissionError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourcePipeline.__name__, "_check_cache_key"))
+
+        if frame_type not in FRAME_TYPES or isinstance(frame_type, bool):
+            raise SboDataSourcePipeline.InvalidSubmissionError("An unknown frame type was given: %s" % (frame_type,))
+
+        if source not in self.sbo_data_source_caches:
+            raise SboDataSourcePipeline.InvalidSubmissionError("An unknown source was given: %s" % (source,))
+
+
+    def submit(self, raw_data, frame_type, source=DEFAULT_SOURCE):
+
+        """This public method submits raw data from the SBO server to be decoded by the pool of worker processes.
+
+        Args:
+            raw_data: A string of raw data, eg: as returned by SboDataSourceReplay.playback() or the SBO server.
+            frame_type: An integer which specifies if the raw data represents live or non-live betting data.
+            source: The SBO source of the raw data, as given when the pipeline was created, eg: None if only one source was given.
+
+        Returns:
+            sequence_number: The position of the raw data in the sequence of its source and frame type.
+
+        Raises:
+            PipelineClosedError: Raised if the pipeline has been shut down.
+            InvalidSubmissionError: Raised if the source or frame type is unknown.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourcePipeline.__name__, "submit"))
+
+        if self.closed:
+            raise SboDataSourcePipeline.PipelineClosedError("submit() was called after the pipeline was shut down.")
+
+        self._check_cache_key(frame_type, source)
+
+        sequence_number = self.next_sequence_number[(source, frame_type)]
+        self.next_sequence_number[(source, frame_type)] = sequence_number + 1
+
+        future = self.executor.submit(decode_raw_data, raw_data)
+        self.pending_futures[future] = (source, frame_type, sequence_number)
+
+        return sequence_number
+
+
+    def apply_decoded_frames(self, timeout=0):
+
+        """This public method applies the frames that have finished decoding to the cache, strictly in the order they were submitted.
+
+        Args:
+            timeout: The number of seconds to wait for a frame to finish decoding, eg: 0 to return straight away or None to wait.
+
+        Returns:
+            applied_frames: A list of tuples, each holding (frame_type, sequence_number, update_result, source).
+                The update result is the tuple returned by update_cache(), or the exception raised if the frame could not be decoded or applied.
+                Frames not applied because their cache has halted have a CacheHaltedError as their update result.
+
+        This simple method raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourcePipeline.__name__, "apply_decoded_frames"))
+
+        self._collect_decoded_frames(timeout)
+
+        return self._apply_in_order()
+
+
+    def flush(self):
+
+        """This public method waits for every submitted frame to be decoded, then applies them to the cache in order.
+
+        Returns:
+            applied_frames: A list of tuples, each holding (frame_type, sequence_number, update_result, source), as returned by apply_decoded_frames().
+
+        This simple method has no arguments and raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourcePipeline.__name__, "flush"))
+
+        applied_frames = []
+
+        while self.pending_futures:
+            applied_frames.extend(self.apply_decoded_frames(None))
+
+        applied_frames.extend(self._apply_in_order())
+
+        return applied_frames
+
+
+    def resume(self, frame_type, source=DEFAULT_SOURCE):
+
+        """This public method applies frames to a cache again, after it was halted by a frame that failed to apply.
+
+        The cache should be brought back to a consistent state first, eg: by clearing it and re-fetching the full data set.
+
+        Args:
+            frame_type: An integer which specifies the live or non-live cache to resume.
+            source: The SBO source of the cache, as given when the pipeline was created.
+
+        Returns:
+            None
+
+        Raises:
+            InvalidSubmissionError: Raised if the source or frame type is unknown.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourcePipeline.__name__, "resume"))
+
+        self._check_cache_key(frame_type, source)
+        self.halted_caches.discard((source, frame_type))
+
+
+    def get_backlog(self):
+
+        """This public method returns the number of frames that have been submitted but not yet applied to the cache.
+
+        Returns:
+            backlog: The number of frames that are being decoded or are waiting in a reorder buffer.
+
+        This simple method has no arguments and raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourcePipeline.__name__, "get_backlog"))
+
+        return len(self.pending_futures) + sum(len(reorder_buffer) for reorder_buffer in self.reorder_buffers.values())
+
+
+    def shutdown(self):
+
+        """This public method applies any frames still being decoded and then shuts down the pool of worker processes.
+
+        Returns:
+            applied_frames: A list of the frames applied while shutting down, as returned by apply_decoded_frames().
+
+        This simple method has no arguments and raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_CACHE_INFOS, debug.INFO, "%s: %s" % (SboDataSourcePipeline.__name__, "shutdown"))
+
+        applied_frames = self.flush()
+
+        self.closed = True
+        self.executor.shutdown(wait=True)
+
+        return applied_frames
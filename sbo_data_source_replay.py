@@ -7,28 +7,105 @@ import debug
 import debug_flags
 import os
 import re
+import mmap
+import time
+import shutil
+import zlib
+import queue
+import bisect
+import asyncio
+import struct
 import datetime
+import threading
+import collections
 
 # Capture folder paths and filenames.
 CAPTURE_FOLDER = 'sbo_data_captured'
 CAPTURE_CURRENT_SUBFOLDER = 'current'
 CAPTURE_ARCHIVE_SUBFOLDER_PREFIX = 'up_to_restart_at_'
 CAPTURE_FILENAME_TEMPLATE = 'today-double-data-nnnnn.dat'
+CAPTURE_SEGMENT_FILENAME_TEMPLATE = 'today-double-segment-nnnnn.log'
+CAPTURE_SEGMENT_INDEX_FILENAME_TEMPLATE = 'today-double-segment-nnnnn.idx'
+CAPTURE_DICTIONARY_FILENAME = 'today-double-dictionary.zdict'
+CAPTURE_BUNDLE_EXTENSION = '.bundle'
+CAPTURE_ARCHIVE_DATESTAMP_FORMAT = '%Y-%m-%d-%H-%M-%S'
+
+# Capture formats.
+FILE_CAPTURE_FORMAT = 0
+SEGMENT_CAPTURE_FORMAT = 1
+BUNDLE_CAPTURE_FORMAT = 2
+DEFAULT_CAPTURE_FORMAT = FILE_CAPTURE_FORMAT
+CAPTURE_FORMAT_DESCRIPTION = ['File Capture Format', 'Segment Capture Format', 'Archive Bundle Format']
+
+# Segment files are rotated once they reach this size in bytes.
+DEFAULT_SEGMENT_SIZE_LIMIT = 16 * 1024 * 1024
+
+# Each segment record is a header followed by the UTF-8 encoded raw data.
+# The header holds the length of the raw data, the data identifier code, the record flags and a POSIX timestamp.
+SEGMENT_RECORD_HEADER = struct.Struct('<IBBd')
+
+# Segment record flags.
+NO_RECORD_FLAGS = 0
+COMPRESSED_RECORD_FLAG = 1
+DICTIONARY_RECORD_FLAG = 2
+DELTA_RECORD_FLAG = 4
+KEYFRAME_RECORD_FLAG = 8
+
+# Each segment index entry holds the offset of a record within the segment and its POSIX timestamp.
+SEGMENT_INDEX_ENTRY = struct.Struct('<Qd')
+
+# An archive bundle holds compressed segment records, followed by their preset dictionary, their index and a trailer.
+# The trailer holds the offsets of the dictionary and the index, the number of records and the bundle magic.
+BUNDLE_TRAILER = struct.Struct('<QQI4s')
+BUNDLE_MAGIC = b'SBOB'
+
+# Retention limits.
+NO_RETENTION_LIMIT = None
+
+# Compressed segment records use a preset dictionary trained on the first frames to be captured.
+NO_COMPRESSION = None
+DEFAULT_COMPRESSION_LEVEL = 6
+DEFAULT_DICTIONARY_SAMPLE_SIZE = 16
+DICTIONARY_SIZE_LIMIT = 32 * 1024
+REGEX_DICTIONARY_TOKEN = re.compile(b"'[^']*'|[^,\\[\\]()]+")
+
+# Delta encoded segment records hold the differences from the previous frame with the same data identifier.
+# A keyframe holding the whole frame is stored periodically and at the start of each segment.
+# Frames are split into records after each closing bracket, so that a change of price only changes the record holding the prices.
+NO_DELTA_ENCODING = None
+DEFAULT_KEYFRAME_INTERVAL = 100
+REGEX_DELTA_TOKEN = re.compile(b"[^\\]]*\\],?|[^\\]]+")
+
+# Delta instructions either copy a run of records from the previous frame or insert new bytes.
+DELTA_COPY = 0
+DELTA_INSERT = 1
+DELTA_COPY_INSTRUCTION = struct.Struct('<BII')
+DELTA_INSERT_INSTRUCTION = struct.Struct('<BI')
 
 # Data frames.
 LIVE_DATA_FRAME = 0
 NON_LIVE_DATA_FRAME = 1
 
+# The frame type returned by read_frame() for a frame captured while the connection to the SBO server was lost.
+NO_DATA_FRAME = 2
+
 # Data identifiers.
 NO_DATA = 'CONNECTION TO SERVER LOST'
 LIVE_DATA = 'IN PLAY DATA'
 NON_LIVE_DATA = 'NOT IN PLAY DATA'
 
+# Data identifier codes, as stored in segment records.
+DATA_IDENTIFIER_CODES = [NO_DATA, LIVE_DATA, NON_LIVE_DATA]
+
 # Replay modes.
 NORMAL_REPLAY_MODE = 0
 FAST_REPLAY_MODE = 1
+TIMED_REPLAY_MODE = 2
 DEFAULT_REPLAY_MODE = FAST_REPLAY_MODE
-REPLAY_MODE_DESCRIPTION = ['Normal Replay Mode', 'Fast Replay Mode']
+REPLAY_MODE_DESCRIPTION = ['Normal Replay Mode', 'Fast Replay Mode', 'Timed Replay Mode']
+
+# Replay speeds, as multiples of the speed the raw data was captured at.
+DEFAULT_REPLAY_SPEED = 1.0
 
 # File types.
 CAPTURE_FILE = 0
@@ -46,6 +123,16 @@ INITIAL_LAST_NON_LIVE_FILE_PLAYED_BACK = None
 INITIAL_DATA_IDENTIFIER = None
 INITIAL_RAW_DATA = None
 
+# Capture writer settings.
+DEFAULT_CAPTURE_QUEUE_SIZE = 1024
+DEFAULT_CAPTURE_BATCH_SIZE = 64
+CAPTURE_WRITER_POLL_PERIOD = 0.1
+
+# Prefetch settings.
+NO_PREFETCH = None
+DEFAULT_PREFETCH_DEPTH = 32
+PREFETCH_POLL_PERIOD = 0.1
+
 # General constants.
 FILE_NUMBER_DIGITS = 5
 FILE_NUMBER_MAX = (10 ** FILE_NUMBER_DIGITS) - 1
@@ -105,10 +192,92 @@ class SboDataSourceReplay(object): # pylint: disable-msg=R0902
 
         self.replay_file_number = [INITIAL_CAPTURE_FILE_NUMBER, INITIAL_PLAYBACK_FILE_NUMBER]
         self.replay_folder_path = None
+
+        # Raw data is either captured to a file per frame or appended to size rotated segment files.
+        self.capture_format = DEFAULT_CAPTURE_FORMAT
+        self.segment_size_limit = DEFAULT_SEGMENT_SIZE_LIMIT
+        self.capture_segment_handle = None
+        self.capture_segment_index_handle = None
+
+        # Frames can be handed to a capture writer thread, so that capture() never waits on the disk.
+        self.capture_queue = None
+        self.capture_batch_size = DEFAULT_CAPTURE_BATCH_SIZE
+        self.capture_writer_thread = None
+        self.capture_writer_stop_event = threading.Event()
+
+        # Counters for the capture writer statistics.
+        self.captured_frames_queued = 0
+        self.captured_frames_dropped = 0
+        self.captured_frames_written = 0
+        self.capture_batches_written = 0
+        self.capture_writer_errors = 0
+        self.capture_writer_last_error = None
+
+        # Segment records may be compressed, once enough frames have been sampled to train the preset dictionary.
+        self.compression_level = NO_COMPRESSION
+        self.dictionary_sample_size = DEFAULT_DICTIONARY_SAMPLE_SIZE
+        self.dictionary_samples = []
+        self.compression_dictionary = None
+        self.playback_compression_dictionary = None
+
+        # Segment records may be delta encoded against the tokens of the previous frame with the same data identifier code.
+        self.keyframe_interval = NO_DELTA_ENCODING
+        self.capture_delta_bases = {}
+        self.frames_since_keyframe = {}
+        self.playback_delta_bases = {}
+
+        # Counters for the compression statistics.
+        self.captured_raw_bytes = 0
+        self.captured_stored_bytes = 0
+        self.played_back_stored_bytes = 0
+        self.played_back_raw_bytes = 0
+        self.played_back_decode_seconds = 0.0
+
+        # The capture format of the replay folder is detected when playback is initialised.
+        self.playback_format = None
+        self.playback_segment_handle = None
+
+        # Memory mapped playback hands out memoryview slices of the mapped segment files, rather than decoded strings.
+        self.memory_mapped_playback = False
+        self.playback_segment_view = None
+        self.playback_segment_offset = 0
+
+        # Playback of an archive bundle stops at the end of its records, where its dictionary and index begin.
+        self.playback_segment_end = None
+        self.bundle_records_end = None
+
+        # Archive folders can be compacted into bundles and removed under a retention policy, by an archive maintenance thread.
+        self.retention_policy = None
+        self.archive_maintenance_thread = None
+
+        # The timestamp index of the replay folder is built the first time playback seeks within it.
+        # It holds the capture time of each frame as a datetime, to the same microsecond as its date stamp, alongside the position it can be read from.
+        self.timestamp_index_timestamps = None
+        self.timestamp_index_positions = None
+
+        # Frames can be read ahead into a bounded queue by a prefetch thread, so that playback() returns from memory.
+        self.prefetch_depth = NO_PREFETCH
+        self.prefetch_queue = None
+        self.prefetch_thread = None
+        self.prefetch_stop_event = threading.Event()
+        self.prefetch_held_frame = None
+        self.prefetched_frames = collections.deque()
+
+        # Counters for the prefetch statistics.
+        self.prefetch_gets = 0
+        self.prefetch_queue_depth_total = 0
+        self.prefetch_stalls = 0
+        self.prefetch_stall_seconds = 0.0
         self.replay_mode = None
         self.minimum_request_period_live = None
         self.minimum_request_period_non_live = None
 
+        # Timed replay reproduces the gaps between the capture times of the frames, divided by the replay speed.
+        # The origin pairs the capture time of the first frame played back with the monotonic clock time it was loaded at.
+        self.replay_speed = DEFAULT_REPLAY_SPEED
+        self.timed_replay_origin = None
+        self.file_capture_time = None
+
         self.playback_previously_initialised_flag = False
         self.playback_initialised_flag = False
         self.last_file_played_back = [INITIAL_LAST_LIVE_FILE_PLAYED_BACK, INITIAL_LAST_NON_LIVE_FILE_PLAYED_BACK]
@@ -116,6 +285,11 @@ class SboDataSourceReplay(object): # pylint: disable-msg=R0902
         self.file_contents = [INITIAL_DATA_IDENTIFIER, INITIAL_RAW_DATA]
         self.last_datestamp = None
 
+        # Playback of a single frame type reads the replay once, keeping the frames of the other frame type for its own cursor.
+        # Each cursor holds the frames read ahead for it, and the frame waiting for its minimum request period or capture time, if any.
+        self.demultiplexed_frames = [collections.deque(), collections.deque()]
+        self.frame_type_contents = [None, None]
+
 
     def _create_new_capture_folder(self):
 
@@ -140,7 +314,7 @@ class SboDataSourceReplay(object): # pylint: disable-msg=R0902
         if os.path.exists(capture_current_path):
 
             # If any raw data has previously been captured, the folder needs to be date stamped and archived.
-            datestamp = datetime.datetime.now().strftime('%Y-%m-%d-%H-%M-%S')
+            datestamp = datetime.datetime.now().strftime(CAPTURE_ARCHIVE_DATESTAMP_FORMAT)
             capture_archive_subfolder = CAPTURE_ARCHIVE_SUBFOLDER_PREFIX + datestamp
 
             capture_archive_path = os.path.join(capture_folder_path, capture_archive_subfolder)
@@ -150,349 +324,2196 @@ class SboDataSourceReplay(object): # pylint: disable-msg=R0902
             # Archive the previous folder.
             os.rename(capture_current_path, capture_archive_path)
 
+            # The archives are compacted and pruned in the background, so that capture is not delayed.
+            if self.retention_policy is not None:
+                self._start_archive_maintenance_thread()
+
         # Either the capture folder doesn't exist yet or it has just been archived.
         os.mkdir(capture_current_path)
 
         self.first_capture = False
 
 
-    def _get_next_filename(self, file_type):
+    @staticmethod
+    def _parse_datestamp(datestamp):
 
-        """This private method keeps track of and returns the file name of the next capture or playback file that can be written to.
+        """This private method converts a date stamp written by the capture() method into a POSIX timestamp.
 
-        Args: file_type(integer), eg: either CAPTURE_FILE or PLAYBACK_FILE.
-        Returns: filename(string)
-        Raises: EndOfReplay
+        Args: datestamp(string), eg: '2013-02-19 22:00:00.123456'
+        Returns: timestamp(float)
+        Raises: ValueError
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_get_next_filename"))
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_parse_datestamp"))
 
-        # Capture and Playback files are numbered sequentially starting at One.
-        self.replay_file_number[file_type] = self.replay_file_number[file_type] + 1
+        # A date stamp taken on an exact second has no microseconds.
+        try:
+            date_time = datetime.datetime.strptime(datestamp, '%Y-%m-%d %H:%M:%S.%f')
 
-        # Once the file number for a Capture file has reached the maximum allowed, set a flag.
-        # With the flag is set, this method will return the last Capture filename to be used.
-        if file_type == CAPTURE_FILE and self.replay_file_number[file_type] == FILE_NUMBER_MAX:
-            self.capture_limit = True
+        except ValueError:
+            date_time = datetime.datetime.strptime(datestamp, '%Y-%m-%d %H:%M:%S')
 
-        # Once the file number for a Playback file has gone over the maximum allowed, raise an exception.
-        if file_type == PLAYBACK_FILE and self.replay_file_number[file_type] > FILE_NUMBER_MAX:
-            raise SboDataSourceReplay.EndOfReplay("Can not playback more than %s files." % FILE_NUMBER_MAX)
+        return time.mktime(date_time.timetuple()) + date_time.microsecond / 1000000.0
 
-        formatted_capture_file_number = str(self.replay_file_number[file_type]).zfill(FILE_NUMBER_DIGITS)
 
-        # The capture filename template holds the filename of the capture data files with a dummy file number.
-        # This statement replaces the 'nnnnn' in the dummy file with the real number, calculated above.
-        filename = re.sub(r'n{5}', formatted_capture_file_number, CAPTURE_FILENAME_TEMPLATE)
+    @staticmethod
+    def _read_bundle_trailer(bundle_file_path):
 
-        return filename
+        """This private method reads the trailer of an archive bundle, along with the preset dictionary it locates.
 
+        Args: bundle_file_path(string)
+        Returns: bundle_trailer(tuple), eg: (records_end, index_offset, record_count, compression_dictionary)
+        Raises: IOError, struct.error
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_read_bundle_trailer"))
 
-    def capture(self, raw_data, frame_type):
+        file_handle = open(bundle_file_path, mode='rb')
 
-        """This public method writes the given raw data to a file.
+        try:
+            file_handle.seek(-BUNDLE_TRAILER.size, os.SEEK_END)
+            dictionary_offset, index_offset, record_count, bundle_magic = BUNDLE_TRAILER.unpack(file_handle.read(BUNDLE_TRAILER.size))
 
-        The next available capture file number is determined and the file is created.
-        The raw data passed to this method is identified and a data identifier code is written to the file.
-        After that, the current date and time is written and then the raw data its self.
+            if bundle_magic != BUNDLE_MAGIC:
+                raise IOError("'%s' is not an archive bundle." % bundle_file_path)
 
-        Args:
-            raw_data: A string of raw data to be captured.
-            frame_type: An integer which specifies if the raw data represents live or non-live betting data.
+            file_handle.seek(dictionary_offset)
+            compression_dictionary = file_handle.read(index_offset - dictionary_offset)
 
-        Returns:
-            None
+        finally:
+            file_handle.close()
 
-        Raises:
-            DataCaptureError: Raised on an error creating a new capture folder,
-                an inability to identify the incoming raw data,
-                the detection of invalid raw data
-                or the failure to write a file to the server.
+        return (dictionary_offset, index_offset, record_count, compression_dictionary)
+
+
+    def _write_bundle(self, bundle_file_path, archive_reader, compression_dictionary):
+
+        """This private method writes every frame played back by an archive reader to an archive bundle.
+
+        Args: bundle_file_path(string), archive_reader(SboDataSourceReplay), compression_dictionary(bytes)
+        Returns: None
+        Raises: FileReadError, IOError, ValueError
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "capture"))
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_write_bundle"))
 
-        # The number of files captures has reached the limit.
-        if self.capture_limit:
-            debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_WARNINGS, debug.WARNING, "%s: Can not capture more than %s files." % (SboDataSourceReplay.__name__, FILE_NUMBER_MAX))
-            return
+        index_entries = []
+        file_handle = open(bundle_file_path, mode='wb')
 
-        # The first capture flag is set on instantiation of this class.
-        # After the new capture folder is created the flag is cleared.
-        if self.first_capture:
-            try:
-                self._create_new_capture_folder()
+        try:
+            while True:
 
-            except OSError as exception_instance:
-                raise SboDataSourceReplay.DataCaptureError("capture() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+                try:
+                    data_identifier, datestamp, raw_data = archive_reader._load_next_frame() # pylint: disable-msg=W0212
 
-        # The data identifier is useful when analysing the data files.
-        if raw_data == '':
-            data_identifier = NO_DATA
+                except SboDataSourceReplay.EndOfReplay:
+                    break
 
-        elif frame_type == LIVE_DATA_FRAME:
-            data_identifier = LIVE_DATA
+                timestamp = self._parse_datestamp(datestamp)
 
-        elif frame_type == NON_LIVE_DATA_FRAME:
-            data_identifier = NON_LIVE_DATA
+                compressor = zlib.compressobj(DEFAULT_COMPRESSION_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS, zlib.DEF_MEM_LEVEL, zlib.Z_DEFAULT_STRATEGY, compression_dictionary)
+                payload = compressor.compress(raw_data.encode('utf-8')) + compressor.flush()
+                record_flags = COMPRESSED_RECORD_FLAG | DICTIONARY_RECORD_FLAG
 
-        else:
-            raise SboDataSourceReplay.DataCaptureError("Unable to identify raw data.")
+                index_entries.append(SEGMENT_INDEX_ENTRY.pack(file_handle.tell(), timestamp))
+                file_handle.write(SEGMENT_RECORD_HEADER.pack(len(payload), DATA_IDENTIFIER_CODES.index(data_identifier), record_flags, timestamp) + payload)
 
-        # The date stamp is useful when analysing the data files.
-        datestamp = str(datetime.datetime.now())
+            dictionary_offset = file_handle.tell()
+            file_handle.write(compression_dictionary)
 
-        try:
-            file_contents = data_identifier + '\n' + datestamp + '\n' + raw_data
+            index_offset = file_handle.tell()
+            file_handle.write(b''.join(index_entries))
+            file_handle.write(BUNDLE_TRAILER.pack(dictionary_offset, index_offset, len(index_entries), BUNDLE_MAGIC))
 
-        except TypeError as exception_instance:
-            raise SboDataSourceReplay.DataCaptureError("capture() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+        finally:
+            file_handle.close()
 
-        capture_filename = self._get_next_filename(CAPTURE_FILE)
-        capture_file_path = os.path.join(self.base_directory, CAPTURE_FOLDER, CAPTURE_CURRENT_SUBFOLDER, capture_filename)
+
+    def _compact_archive(self, capture_archive_path):
+
+        """This private method compacts an archive folder into a single archive bundle and then removes the folder.
+
+        Every record in the bundle is compressed with a preset dictionary trained on the first frames of the archive,
+        but none are delta encoded, so that each record can be read without the records before it.
+
+        Args: capture_archive_path(string)
+        Returns: bundle_file_path(string)
+        Raises: FileReadError, PlaybackInitialisationError, IOError, ValueError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_compact_archive"))
+
+        # The archive is read by a separate object, so that any playback in progress is not disturbed.
+        archive_reader = SboDataSourceReplay()
+        archive_reader.base_directory = self.base_directory
+        archive_reader.initalise_playback(capture_archive_path, FAST_REPLAY_MODE, [datetime.timedelta(0), datetime.timedelta(0)])
 
         try:
-            file_handle = open(capture_file_path, mode='w', encoding='utf-8')
+            dictionary_samples = []
 
-            debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Writing raw data to: '%s/%s'" % (CAPTURE_CURRENT_SUBFOLDER, capture_filename))
+            try:
+                while len(dictionary_samples) < DEFAULT_DICTIONARY_SAMPLE_SIZE:
+                    _, _, raw_data = archive_reader._load_next_frame() # pylint: disable-msg=W0212
+                    dictionary_samples.append(raw_data.encode('utf-8'))
+
+            except SboDataSourceReplay.EndOfReplay:
+                pass
+
+            compression_dictionary = self._train_compression_dictionary(dictionary_samples)
+            archive_reader.reinitialise_playback()
+
+            bundle_file_path = capture_archive_path + CAPTURE_BUNDLE_EXTENSION
+            temporary_file_path = bundle_file_path + '.tmp'
 
             try:
-                # Any failure here will be caught by the outer except.
-                file_handle.write(file_contents)
+                self._write_bundle(temporary_file_path, archive_reader, compression_dictionary)
 
-            finally:
-                # The file will get closed even if the above try causes an exception.
-                file_handle.close()
+            except (SboDataSourceReplay.FileReadError, IOError, ValueError):
+                os.remove(temporary_file_path)
+                raise
 
-        except IOError as exception_instance:
-            raise SboDataSourceReplay.DataCaptureError("capture() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+        finally:
+            archive_reader._close_playback_segment() # pylint: disable-msg=W0212
 
+        # The bundle only replaces the archive folder once it is complete.
+        os.rename(temporary_file_path, bundle_file_path)
+        shutil.rmtree(capture_archive_path)
 
-    def playback_initialised(self):
+        return bundle_file_path
 
-        """This public method returns the playback initialised flag which is set only when playback is initialised.
 
-        Returns:
-            playback_initialised_flag: A boolean representation of the initialised state of playback.
+    def _get_capture_archive_paths(self):
 
-        This simple method has no arguments and raises no errors.
+        """This private method returns the paths of the archive folders and archive bundles, oldest first.
+
+        Args: None
+        Returns: capture_archive_paths(list)
+        Raises: None
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s (%s)" % (SboDataSourceReplay.__name__, "playback_initialised", self.playback_initialised_flag))
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_get_capture_archive_paths"))
 
-        return self.playback_initialised_flag
+        capture_folder_path = os.path.join(self.base_directory, CAPTURE_FOLDER)
 
+        if not os.path.isdir(capture_folder_path):
+            return []
 
-    def playback_previously_initalised(self):
+        # The archives are named after the time they were archived, so they sort oldest first.
+        capture_archive_names = sorted(name for name in os.listdir(capture_folder_path) if name.startswith(CAPTURE_ARCHIVE_SUBFOLDER_PREFIX) and not name.endswith('.tmp'))
 
-        """This public method returns a flag which indicates weather playback has been successfully initialised at least once.
+        return [os.path.join(capture_folder_path, name) for name in capture_archive_names]
 
-        Returns:
-            playback_previously_initialised_flag: A boolean representation of the former initialisation of playback.
 
-        This simple method has no arguments and raises no errors.
+    @staticmethod
+    def _get_capture_archive_size(capture_archive_path):
+
+        """This private method returns the number of bytes used by an archive folder or archive bundle.
+
+        Args: capture_archive_path(string)
+        Returns: capture_archive_size(integer)
+        Raises: None
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s (%s)" % (SboDataSourceReplay.__name__, "playback_previously_initalised", self.playback_previously_initialised_flag))
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_get_capture_archive_size"))
 
-        return self.playback_previously_initialised_flag
+        if os.path.isfile(capture_archive_path):
+            return os.path.getsize(capture_archive_path)
 
+        capture_archive_size = 0
 
-    def initalise_playback(self, replay_folder_path, replay_mode, minimum_request_period):
+        for folder_path, _, filenames in os.walk(capture_archive_path):
+            for filename in filenames:
+                capture_archive_size = capture_archive_size + os.path.getsize(os.path.join(folder_path, filename))
 
-        """This public method ensures that the object is initialised ready for the playback() method to be called.
+        return capture_archive_size
 
-        This method initialises the replay folder path, establishes the replay mode and stores the minimum request periods
-        ready to the playback function to be called.
 
-        Args:
-            replay_folder_path: A string representing the path of the folder containing files to be replayed.
-            replay_mode: An integer representing either Normal or Fast replay mode.
-            minimum_request_period: A list of minimum request periods used during normal playback to limit the frequency in which the data is played back.
+    def _run_archive_maintenance(self):
 
-        Returns:
-            None
+        """This private method is run by the archive maintenance thread to compact the archive folders and apply the retention policy.
 
-        Raises:
-            PlaybackInitialisationError: Raised if invalid arguments are passed to this method,
-                preventing it from initialising the required parameters ready for playback.
+        This simple method has no arguments or returns.
+        It raises no errors.
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "initalise_playback"))
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_run_archive_maintenance"))
 
         try:
-            # If the replay folder path does not exist then playback can not be initialised.
-            replay_folder_path = os.path.join(self.base_directory, replay_folder_path)
+            if self.retention_policy['compact_archives']:
+                self.compact_archives()
 
-        except AttributeError as exception_instance:
-            raise SboDataSourceReplay.PlaybackInitialisationError("initalise_playback() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+            self.apply_retention_policy()
 
-        if not os.path.exists(replay_folder_path):
-            self.playback_initialised_flag = False
-            raise SboDataSourceReplay.PlaybackInitialisationError("Can not initialise playback, invalid replay folder given. '%s'" % replay_folder_path)
+        except (OSError, IOError) as exception_instance:
+            debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_WARNINGS, debug.WARNING, "_run_archive_maintenance() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
 
-        # This folder specifies the path of the files to be played back.
-        self.replay_folder_path = replay_folder_path
-        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Specified replay folder: '%s'" % self.replay_folder_path)
 
-        # Fast replay mode allows the minimum request periods to be ignored during playback.
-        if replay_mode == NORMAL_REPLAY_MODE:
-            self.replay_mode = NORMAL_REPLAY_MODE
+    def _start_archive_maintenance_thread(self):
 
-        elif replay_mode == FAST_REPLAY_MODE:
-            self.replay_mode = FAST_REPLAY_MODE
+        """This private method starts an archive maintenance thread, once any previous one has finished.
 
-        else:
-            self.replay_mode = DEFAULT_REPLAY_MODE
+        This simple method has no arguments or returns.
+        It raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_start_archive_maintenance_thread"))
 
-        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s specified." % REPLAY_MODE_DESCRIPTION[self.replay_mode])
+        self.wait_for_archive_maintenance()
 
-        try:
-            # The minimum request periods are used during normal playback to limit the frequency in which the data can be played back.
-            self.minimum_request_period_live = minimum_request_period[LIVE_DATA_FRAME]
-            self.minimum_request_period_non_live = minimum_request_period[NON_LIVE_DATA_FRAME]
+        self.archive_maintenance_thread = threading.Thread(target=self._run_archive_maintenance, name="%s archive maintenance" % SboDataSourceReplay.__name__)
+        self.archive_maintenance_thread.daemon = True
+        self.archive_maintenance_thread.start()
 
-        except (TypeError, IndexError, KeyError) as exception_instance:
-            raise SboDataSourceReplay.PlaybackInitialisationError("initalise_playback() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
 
-        try:
-            # Ensure that the minimum request periods are valid timedelta objects.
-            # Attempt to call the total_seconds() attribute as this will only succeed on a timedelta object.
-            self.minimum_request_period_live.total_seconds()
-            self.minimum_request_period_non_live.total_seconds()
+    def _get_next_filename(self, file_type, filename_template=CAPTURE_FILENAME_TEMPLATE):
 
-        except AttributeError as exception_instance:
-            raise SboDataSourceReplay.PlaybackInitialisationError("initalise_playback() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+        """This private method keeps track of and returns the file name of the next capture or playback file that can be written to.
 
-        self.playback_initialised_flag = True
-        self.playback_previously_initialised_flag = True
+        Args: file_type(integer), eg: either CAPTURE_FILE or PLAYBACK_FILE.
+              filename_template(string), eg: CAPTURE_FILENAME_TEMPLATE or CAPTURE_SEGMENT_FILENAME_TEMPLATE.
+        Returns: filename(string)
+        Raises: EndOfReplay
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_get_next_filename"))
 
+        # Capture and Playback files are numbered sequentially starting at One.
+        self.replay_file_number[file_type] = self.replay_file_number[file_type] + 1
 
-    def reinitialise_playback(self):
+        # Once the file number for a Capture file has reached the maximum allowed, set a flag.
+        # With the flag is set, this method will return the last Capture filename to be used.
+        if file_type == CAPTURE_FILE and self.replay_file_number[file_type] == FILE_NUMBER_MAX:
+            self.capture_limit = True
 
-        """This public method is called to re-initialise certain attributes ready for the playback() method to be called again.
+        # Once the file number for a Playback file has gone over the maximum allowed, raise an exception.
+        if file_type == PLAYBACK_FILE and self.replay_file_number[file_type] > FILE_NUMBER_MAX:
+            raise SboDataSourceReplay.EndOfReplay("Can not playback more than %s files." % FILE_NUMBER_MAX)
 
-        Raises:
-            CallOrderError: Raised if playback has not previously been initialised.
+        return self._format_filename(self.replay_file_number[file_type], filename_template)
 
-        This simple method has no arguments and no returns.
-        """
-        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "reinitialise_playback"))
 
-        if not self.playback_previously_initialised_flag:
-            raise SboDataSourceReplay.CallOrderError("The reinitalise_playback() method was called before the initialise_playback() method.")
+    @staticmethod
+    def _format_filename(file_number, filename_template):
 
-        # Re-initialise the playback attributes.
-        self.last_file_played_back = [INITIAL_LAST_LIVE_FILE_PLAYED_BACK, INITIAL_LAST_NON_LIVE_FILE_PLAYED_BACK]
-        self.replay_file_number[PLAYBACK_FILE] = INITIAL_PLAYBACK_FILE_NUMBER
-        self.load_next_file_for_playback = True
-        self.file_contents = [INITIAL_DATA_IDENTIFIER, INITIAL_RAW_DATA]
+        """This private method returns the file name of a numbered capture or playback file.
 
-        self.playback_initialised_flag = True
+        Args: file_number(integer), filename_template(string), eg: CAPTURE_FILENAME_TEMPLATE or CAPTURE_SEGMENT_FILENAME_TEMPLATE.
+        Returns: filename(string)
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_format_filename"))
 
+        formatted_capture_file_number = str(file_number).zfill(FILE_NUMBER_DIGITS)
 
-    def playback(self):
+        # The capture filename template holds the filename of the capture data files with a dummy file number.
+        # This statement replaces the 'nnnnn' in the dummy file with the real number.
+        filename = re.sub(r'n{5}', formatted_capture_file_number, filename_template)
 
-        """This public method returns the contents of the next available replay file.
+        return filename
 
-        The method looks in the replay folder setup during playback initialisation and attempts to read data from
-        each file in turn. On reading the file data the data identifier that was encoded into the file during capture is
-        read and the data is handled accordingly.
-        The replay mode and minimum request periods specified during initialisation are observed.
 
-        Args: None
+    @staticmethod
+    def _get_segment_index_filename(segment_filename):
 
-        Returns:
-            raw_data: A string of raw data retrieved from the replay file.
+        """This private method returns the file name of the sidecar offset index that belongs to a segment file.
 
-        Raises:
-            CallOrderError: Raised if playback has not previously been initialised.
-            EndOfReplay: Raised when all the replay files in the specified folder have been played back.
-            FileReadError: Raised if an error is encountered while attempting to read the file contents of a replay file.
-            SimulatedConnectionError: Raised when the data identifier of a replay file indicated no data. Used only during testing.
-            PlaybackError: Raised when a reply file with an unknown data identifier is discovered.
+        Args: segment_filename(string)
+        Returns: segment_index_filename(string)
+        Raises: None
         """
-        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "playback"))
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_get_segment_index_filename"))
 
-        if not self.playback_initialised_flag:
-            raise SboDataSourceReplay.CallOrderError("The playback() method was called before the initialise_playback() method.")
+        return os.path.splitext(segment_filename)[0] + os.path.splitext(CAPTURE_SEGMENT_INDEX_FILENAME_TEMPLATE)[1]
 
-        if self.load_next_file_for_playback:
 
-            playback_filename = self._get_next_filename(PLAYBACK_FILE)
-            replay_file_path = os.path.join(self.replay_folder_path, playback_filename)
+    def _close_capture_segment(self):
 
-            if not os.path.exists(replay_file_path):
+        """This private method closes the segment file and the segment index file currently being captured to.
 
-                self.playback_initialised_flag = False
-                raise SboDataSourceReplay.EndOfReplay("Can not find file '%s' in folder '%s'" % (playback_filename, self.replay_folder_path))
+        This simple method has no arguments or returns.
+        It raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_close_capture_segment"))
 
-            try:
-                file_handle = open(replay_file_path, mode='r', encoding='utf-8')
+        if self.capture_segment_handle is not None:
+            self.capture_segment_handle.close()
+            self.capture_segment_handle = None
 
-                debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Opening file for playback: '%s'" % replay_file_path)
+        if self.capture_segment_index_handle is not None:
+            self.capture_segment_index_handle.close()
+            self.capture_segment_index_handle = None
 
-                try:
-                    # Any failure here will be caught by the outer except.
 
-                    data_identifier = file_handle.readline().rstrip('\n')
-                    datestamp = file_handle.readline().rstrip('\n')
-                    captured_raw_data = file_handle.readline()
+    def _flush_capture_segment(self):
 
-                    # If the file was captured with no raw data it should already have the No Data identifier.
-                    # But if it has been modified it may not.
-                    if captured_raw_data == '':
-                        data_identifier = NO_DATA
+        """This private method flushes the segment file and then the segment index file currently being captured to.
 
-                    # Raw data will only be returned form this function if certain conditions are met.
-                    # If these conditions are not met this time, they may be met on future calls to this function.
-                    # Store the data identifier and captured raw data until the next file is loaded.
-                    self.file_contents = [data_identifier, captured_raw_data]
+        The segment is flushed before its index, so the index never points past the end of the segment.
 
-                finally:
-                    # The file will get closed even if the above try causes an exception.
-                    file_handle.close()
+        Args: None
+        Returns: None
+        Raises: IOError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_flush_capture_segment"))
 
-            except IOError as exception_instance:
-                raise SboDataSourceReplay.FileReadError("playback() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+        if self.capture_segment_handle is not None:
+            self.capture_segment_handle.flush()
+            self.capture_segment_index_handle.flush()
 
-            debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Data Identifier: %s" % data_identifier)
-            debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Date stamp: %s" % datestamp)
 
-            # Keep track of the date stamp of the last valid raw data file to be opened.
-            if data_identifier == LIVE_DATA or data_identifier == NON_LIVE_DATA:
-                self.last_datestamp = datestamp
+    def _open_next_capture_segment(self):
 
-            self.load_next_file_for_playback = False
+        """This private method closes the current segment file and opens the next one, along with its sidecar offset index.
 
-        # If non of the following conditions are met then raw data will be returned as None.
-        raw_data = None
+        Args: None
+        Returns: opened(boolean), eg: False once the segment file numbers have run out.
+        Raises: IOError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_open_next_capture_segment"))
 
-        # In Fast Replay Mode, data can be read at any time.
-        # In Normal Replay Mode, data can not be read more frequent than the minimum request period.
+        self._close_capture_segment()
 
-        if self.file_contents[DATA_IDENTIFIER] == LIVE_DATA:
+        # The segment file numbers share the capture limit of the file capture format.
+        if self.capture_limit:
+            return False
 
-            if (self.replay_mode == FAST_REPLAY_MODE or
-                self.replay_mode == NORMAL_REPLAY_MODE and
-                (self.last_file_played_back[LIVE_DATA_FRAME] is None or
-                 (datetime.datetime.now() - self.last_file_played_back[LIVE_DATA_FRAME]) > self.minimum_request_period_live)):
+        segment_filename = self._get_next_filename(CAPTURE_FILE, CAPTURE_SEGMENT_FILENAME_TEMPLATE)
+        capture_current_path = os.path.join(self.base_directory, CAPTURE_FOLDER, CAPTURE_CURRENT_SUBFOLDER)
 
-                raw_data = self.file_contents[RAW_DATA]
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Appending raw data to: '%s/%s'" % (CAPTURE_CURRENT_SUBFOLDER, segment_filename))
 
-                # The date stamp makes it possible for the class to know when live raw data was last returned.
-                self.last_file_played_back[LIVE_DATA_FRAME] = datetime.datetime.now()
-                self.load_next_file_for_playback = True
+        self.capture_segment_handle = open(os.path.join(capture_current_path, segment_filename), mode='ab')
 
-            else:
-                debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Tried to playback live replay data file before minimum request period expired.")
+        # Each segment starts with keyframes, so that it can be played back without the segments before it.
+        self.capture_delta_bases = {}
+        self.capture_segment_index_handle = open(os.path.join(capture_current_path, self._get_segment_index_filename(segment_filename)), mode='ab')
 
-        elif self.file_contents[DATA_IDENTIFIER] == NON_LIVE_DATA:
+        return True
 
-            if (self.replay_mode == FAST_REPLAY_MODE or
-                self.replay_mode == NORMAL_REPLAY_MODE and
-                (self.last_file_played_back[NON_LIVE_DATA_FRAME] is None or
-                 (datetime.datetime.now() - self.last_file_played_back[NON_LIVE_DATA_FRAME]) > self.minimum_request_period_non_live)):
 
-                raw_data = self.file_contents[RAW_DATA]
+    def _capture_file(self, data_identifier, timestamp, raw_data):
 
-                # The date stamp makes it possible for the class to know when non-live raw data was last returned.
-                self.last_file_played_back[NON_LIVE_DATA_FRAME] = datetime.datetime.now()
+        """This private method writes a frame of raw data to its own capture file.
+
+        Args: data_identifier(string), timestamp(float), raw_data(string)
+        Returns: None
+        Raises: DataCaptureError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_capture_file"))
+
+        # The date stamp is useful when analysing the data files.
+        datestamp = str(datetime.datetime.fromtimestamp(timestamp))
+
+        try:
+            file_contents = data_identifier + '\n' + datestamp + '\n' + raw_data
+
+        except TypeError as exception_instance:
+            raise SboDataSourceReplay.DataCaptureError("capture() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        capture_filename = self._get_next_filename(CAPTURE_FILE)
+        capture_file_path = os.path.join(self.base_directory, CAPTURE_FOLDER, CAPTURE_CURRENT_SUBFOLDER, capture_filename)
+
+        try:
+            file_handle = open(capture_file_path, mode='w', encoding='utf-8')
+
+            debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Writing raw data to: '%s/%s'" % (CAPTURE_CURRENT_SUBFOLDER, capture_filename))
+
+            try:
+                # Any failure here will be caught by the outer except.
+                file_handle.write(file_contents)
+
+            finally:
+                # The file will get closed even if the above try causes an exception.
+                file_handle.close()
+
+        except IOError as exception_instance:
+            raise SboDataSourceReplay.DataCaptureError("capture() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+
+    @staticmethod
+    def _train_compression_dictionary(dictionary_samples):
+
+        """This private method builds a preset compression dictionary from a sample of frames.
+
+        The dictionary holds the team names, tournament names and other tokens that appear in more than one sampled frame.
+        Zlib finds matches nearer the end of the dictionary more cheaply, so the most common tokens are placed last.
+
+        Args: dictionary_samples(list), eg: a list of UTF-8 encoded frames.
+        Returns: compression_dictionary(bytes)
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_train_compression_dictionary"))
+
+        # Count the number of sampled frames each token appears in.
+        token_counts = {}
+
+        for dictionary_sample in dictionary_samples:
+            for token in set(REGEX_DICTIONARY_TOKEN.findall(dictionary_sample)):
+                token_counts[token] = token_counts.get(token, 0) + 1
+
+        common_tokens = sorted((count, len(token), token) for token, count in token_counts.items() if count > 1 and len(token) > 2)
+
+        # Fill the dictionary from its end, starting with the most common and longest tokens.
+        dictionary_tokens = []
+        dictionary_size = 0
+
+        for _, _, token in reversed(common_tokens):
+
+            if dictionary_size + len(token) + 1 > DICTIONARY_SIZE_LIMIT:
+                break
+
+            dictionary_tokens.append(token)
+            dictionary_size = dictionary_size + len(token) + 1
+
+        dictionary_tokens.reverse()
+
+        return b','.join(dictionary_tokens)
+
+
+    def _compress_payload(self, payload, dictionary_sample):
+
+        """This private method compresses the payload of a segment record, using the preset dictionary once it has been trained.
+
+        Until the dictionary has been trained, each payload is compressed without it and its frame is kept as a sample.
+        The trained dictionary is saved alongside the segment files, so that it is available during playback.
+
+        Args: payload(bytes), dictionary_sample(bytes), eg: the whole frame, even if the payload is delta encoded.
+        Returns: compressed_payload(tuple), eg: (record_flags, stored_payload)
+        Raises: IOError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_compress_payload"))
+
+        if self.compression_dictionary is None:
+
+            self.dictionary_samples.append(dictionary_sample)
+
+            if len(self.dictionary_samples) >= self.dictionary_sample_size:
+
+                compression_dictionary = self._train_compression_dictionary(self.dictionary_samples)
+                dictionary_file_path = os.path.join(self.base_directory, CAPTURE_FOLDER, CAPTURE_CURRENT_SUBFOLDER, CAPTURE_DICTIONARY_FILENAME)
+
+                file_handle = open(dictionary_file_path, mode='wb')
+
+                try:
+                    file_handle.write(compression_dictionary)
+
+                finally:
+                    file_handle.close()
+
+                debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Trained a %s byte compression dictionary from %s frames." % (len(compression_dictionary), len(self.dictionary_samples)))
+
+                self.compression_dictionary = compression_dictionary
+                self.dictionary_samples = []
+
+            return (COMPRESSED_RECORD_FLAG, zlib.compress(payload, self.compression_level))
+
+        compressor = zlib.compressobj(self.compression_level, zlib.DEFLATED, zlib.MAX_WBITS, zlib.DEF_MEM_LEVEL, zlib.Z_DEFAULT_STRATEGY, self.compression_dictionary)
+
+        return (COMPRESSED_RECORD_FLAG | DICTIONARY_RECORD_FLAG, compressor.compress(payload) + compressor.flush())
+
+
+    def _decompress_payload(self, record_flags, payload):
+
+        """This private method restores the payload of a segment record that was compressed during capture.
+
+        Args: record_flags(integer), payload(bytes)
+        Returns: payload(bytes)
+        Raises: zlib.error, FileReadError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_decompress_payload"))
+
+        if not record_flags & COMPRESSED_RECORD_FLAG:
+            return payload
+
+        if not record_flags & DICTIONARY_RECORD_FLAG:
+            return zlib.decompress(payload)
+
+        if self.playback_compression_dictionary is None:
+            raise SboDataSourceReplay.FileReadError("Can not find the compression dictionary '%s' in folder '%s'" % (CAPTURE_DICTIONARY_FILENAME, self.replay_folder_path))
+
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS, self.playback_compression_dictionary)
+
+        return decompressor.decompress(payload) + decompressor.flush()
+
+
+    def _delta_encode_payload(self, data_identifier_code, payload):
+
+        """This private method encodes the payload of a segment record as the differences from the previous frame with the same data identifier.
+
+        Each record of the frame is looked-up in the previous frame, first at the position following the last record matched,
+        so the differences are found in a single pass over the frame, however many records it holds.
+        A keyframe is stored instead when there is no previous frame in the segment, when the keyframe interval has been reached,
+        or when the differences would be no smaller than the frame its self.
+
+        Args: data_identifier_code(integer), payload(bytes)
+        Returns: delta_encoded_payload(tuple), eg: (record_flags, stored_payload)
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_delta_encode_payload"))
+
+        tokens = REGEX_DELTA_TOKEN.findall(payload)
+        base_tokens = self.capture_delta_bases.get(data_identifier_code)
+
+        self.capture_delta_bases[data_identifier_code] = tokens
+
+        if base_tokens is None or self.frames_since_keyframe.get(data_identifier_code, 0) >= self.keyframe_interval:
+            self.frames_since_keyframe[data_identifier_code] = 0
+            return (KEYFRAME_RECORD_FLAG, payload)
+
+        # The first position of each record in the previous frame.
+        base_positions = {}
+
+        for base_position, base_token in enumerate(base_tokens):
+            base_positions.setdefault(base_token, base_position)
+
+        instructions = []
+        inserted_tokens = []
+        copy_start = 0
+        copy_count = 0
+        expected_position = 0
+
+        for token in tokens:
+
+            # Records that are unchanged usually follow on from the last record matched, otherwise the record is looked-up.
+            if expected_position < len(base_tokens) and base_tokens[expected_position] == token:
+                base_position = expected_position
+            else:
+                base_position = base_positions.get(token)
+
+            if base_position is None:
+
+                if copy_count:
+                    instructions.append(DELTA_COPY_INSTRUCTION.pack(DELTA_COPY, copy_start, copy_count))
+                    copy_count = 0
+
+                # A changed record is assumed to replace the record at the same position in the previous frame.
+                inserted_tokens.append(token)
+                expected_position = expected_position + 1
+                continue
+
+            if copy_count and base_position == copy_start + copy_count:
+                copy_count = copy_count + 1
+
+            else:
+                if copy_count:
+                    instructions.append(DELTA_COPY_INSTRUCTION.pack(DELTA_COPY, copy_start, copy_count))
+
+                if inserted_tokens:
+                    inserted_bytes = b''.join(inserted_tokens)
+                    instructions.append(DELTA_INSERT_INSTRUCTION.pack(DELTA_INSERT, len(inserted_bytes)) + inserted_bytes)
+                    inserted_tokens = []
+
+                copy_start = base_position
+                copy_count = 1
+
+            expected_position = base_position + 1
+
+        if copy_count:
+            instructions.append(DELTA_COPY_INSTRUCTION.pack(DELTA_COPY, copy_start, copy_count))
+
+        if inserted_tokens:
+            inserted_bytes = b''.join(inserted_tokens)
+            instructions.append(DELTA_INSERT_INSTRUCTION.pack(DELTA_INSERT, len(inserted_bytes)) + inserted_bytes)
+
+        delta_payload = b''.join(instructions)
+
+        if len(delta_payload) >= len(payload):
+            self.frames_since_keyframe[data_identifier_code] = 0
+            return (KEYFRAME_RECORD_FLAG, payload)
+
+        self.frames_since_keyframe[data_identifier_code] = self.frames_since_keyframe.get(data_identifier_code, 0) + 1
+
+        return (DELTA_RECORD_FLAG, delta_payload)
+
+
+    def _delta_decode_payload(self, data_identifier_code, record_flags, payload):
+
+        """This private method rebuilds a frame from a delta encoded payload and the previous frame with the same data identifier.
+
+        Every frame played back becomes the base for the next delta encoded frame with its data identifier.
+
+        Args: data_identifier_code(integer), record_flags(integer), payload(bytes)
+        Returns: payload(bytes)
+        Raises: FileReadError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_delta_decode_payload"))
+
+        if record_flags & DELTA_RECORD_FLAG:
+
+            base_tokens = self.playback_delta_bases.get(data_identifier_code)
+
+            if base_tokens is None:
+                raise SboDataSourceReplay.FileReadError("Delta encoded record found without a keyframe in segment %s." % self.replay_file_number[PLAYBACK_FILE])
+
+            frame_parts = []
+            position = 0
+
+            try:
+                while position < len(payload):
+
+                    if payload[position] == DELTA_COPY:
+                        _, base_start, count = DELTA_COPY_INSTRUCTION.unpack_from(payload, position)
+                        frame_parts.extend(base_tokens[base_start:base_start + count])
+                        position = position + DELTA_COPY_INSTRUCTION.size
+
+                    else:
+                        _, length = DELTA_INSERT_INSTRUCTION.unpack_from(payload, position)
+                        position = position + DELTA_INSERT_INSTRUCTION.size
+                        frame_parts.append(payload[position:position + length])
+                        position = position + length
+
+            except struct.error as exception_instance:
+                raise SboDataSourceReplay.FileReadError("playback() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+            payload = b''.join(frame_parts)
+
+        # Only frames captured with delta encoding are tokenised, so plain segment records are not slowed down.
+        if record_flags & (KEYFRAME_RECORD_FLAG | DELTA_RECORD_FLAG):
+            self.playback_delta_bases[data_identifier_code] = REGEX_DELTA_TOKEN.findall(payload)
+
+        return payload
+
+
+    def _capture_segment_record(self, data_identifier, timestamp, raw_data, flush=True):
+
+        """This private method appends a frame of raw data to the current segment file as a length prefixed record.
+
+        The offset of the record is added to the sidecar index of the segment.
+        The segment is rotated before the record is written, once it has reached the segment size limit.
+        The payload is delta encoded and then compressed, when either has been selected.
+
+        Args: data_identifier(string), timestamp(float), raw_data(string), flush(boolean), eg: False while writing a batch of frames.
+        Returns: None
+        Raises: DataCaptureError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_capture_segment_record"))
+
+        try:
+            payload = raw_data.encode('utf-8')
+
+        except AttributeError as exception_instance:
+            raise SboDataSourceReplay.DataCaptureError("capture() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        try:
+            if self.capture_segment_handle is None or self.capture_segment_handle.tell() >= self.segment_size_limit:
+
+                if not self._open_next_capture_segment():
+                    debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_WARNINGS, debug.WARNING, "%s: Can not capture more than %s segments." % (SboDataSourceReplay.__name__, FILE_NUMBER_MAX))
+                    return
+
+            data_identifier_code = DATA_IDENTIFIER_CODES.index(data_identifier)
+            raw_payload = payload
+            record_flags = NO_RECORD_FLAGS
+
+            if self.keyframe_interval is not NO_DELTA_ENCODING:
+                record_flags, payload = self._delta_encode_payload(data_identifier_code, payload)
+
+            if self.compression_level is not NO_COMPRESSION:
+                compression_flags, payload = self._compress_payload(payload, raw_payload)
+                record_flags = record_flags | compression_flags
+
+            record_header = SEGMENT_RECORD_HEADER.pack(len(payload), data_identifier_code, record_flags, timestamp)
+
+            record_offset = self.capture_segment_handle.tell()
+
+            self.capture_segment_handle.write(record_header + payload)
+            self.capture_segment_index_handle.write(SEGMENT_INDEX_ENTRY.pack(record_offset, timestamp))
+
+            if flush:
+                self._flush_capture_segment()
+
+            self.captured_raw_bytes = self.captured_raw_bytes + len(raw_payload)
+            self.captured_stored_bytes = self.captured_stored_bytes + len(record_header) + len(payload)
+
+        except IOError as exception_instance:
+            raise SboDataSourceReplay.DataCaptureError("capture() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+
+    def _write_captured_frames(self, captured_frames):
+
+        """This private method writes a batch of captured frames in the selected capture format.
+
+        Segment records in a batch are flushed together once the whole batch has been written.
+
+        Args: captured_frames(list), eg: [(data_identifier, timestamp, raw_data), ...]
+        Returns: None
+        Raises: DataCaptureError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_write_captured_frames"))
+
+        if self.capture_format == SEGMENT_CAPTURE_FORMAT:
+
+            try:
+                for data_identifier, timestamp, raw_data in captured_frames:
+                    self._capture_segment_record(data_identifier, timestamp, raw_data, False)
+
+            finally:
+                try:
+                    self._flush_capture_segment()
+
+                except IOError as exception_instance:
+                    raise SboDataSourceReplay.DataCaptureError("capture() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        else:
+            for data_identifier, timestamp, raw_data in captured_frames:
+                self._capture_file(data_identifier, timestamp, raw_data)
+
+
+    def _run_capture_writer(self):
+
+        """This private method is run by the capture writer thread to write the queued frames in batches.
+
+        An error while writing a batch is recorded in the capture writer statistics and the thread carries on with the next batch.
+        Once the thread is asked to stop, it writes every frame still queued before returning.
+
+        This simple method has no arguments or returns.
+        It raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_run_capture_writer"))
+
+        while not (self.capture_writer_stop_event.is_set() and self.capture_queue.empty()):
+
+            try:
+                captured_frames = [self.capture_queue.get(timeout=CAPTURE_WRITER_POLL_PERIOD)]
+
+            except queue.Empty:
+                continue
+
+            # Gather whatever else has been queued, up to the batch size.
+            while len(captured_frames) < self.capture_batch_size:
+
+                try:
+                    captured_frames.append(self.capture_queue.get_nowait())
+
+                except queue.Empty:
+                    break
+
+            try:
+                self._write_captured_frames(captured_frames)
+                self.captured_frames_written = self.captured_frames_written + len(captured_frames)
+                self.capture_batches_written = self.capture_batches_written + 1
+
+            except SboDataSourceReplay.DataCaptureError as exception_instance:
+                self.capture_writer_errors = self.capture_writer_errors + 1
+                self.capture_writer_last_error = exception_instance
+                debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_WARNINGS, debug.WARNING, "_run_capture_writer() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+
+    def capture(self, raw_data, frame_type):
+
+        """This public method writes the given raw data to a file.
+
+        The next available capture file number is determined and the file is created.
+        The raw data passed to this method is identified and a data identifier code is written to the file.
+        After that, the current date and time is written and then the raw data its self.
+        In the segment capture format, the same details are instead appended to the current segment file as a single record.
+        While the capture writer thread is running, the frame is queued to be written by it instead.
+
+        Args:
+            raw_data: A string of raw data to be captured.
+            frame_type: An integer which specifies if the raw data represents live or non-live betting data.
+
+        Returns:
+            None
+
+        Raises:
+            DataCaptureError: Raised on an error creating a new capture folder,
+                an inability to identify the incoming raw data,
+                the detection of invalid raw data
+                or the failure to write a file to the server, unless the capture writer thread is running.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "capture"))
+
+        # The number of files captures has reached the limit.
+        if self.capture_limit and self.capture_format == FILE_CAPTURE_FORMAT:
+            debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_WARNINGS, debug.WARNING, "%s: Can not capture more than %s files." % (SboDataSourceReplay.__name__, FILE_NUMBER_MAX))
+            return
+
+        # Raw data is checked here, as a capture writer thread would be unable to report it.
+        if not isinstance(raw_data, str):
+            raise SboDataSourceReplay.DataCaptureError("Invalid raw data: %s" % type(raw_data).__name__)
+
+        # The first capture flag is set on instantiation of this class.
+        # After the new capture folder is created the flag is cleared.
+        if self.first_capture:
+            try:
+                self._create_new_capture_folder()
+
+            except OSError as exception_instance:
+                raise SboDataSourceReplay.DataCaptureError("capture() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        # The data identifier is useful when analysing the data files.
+        if raw_data == '':
+            data_identifier = NO_DATA
+
+        elif frame_type == LIVE_DATA_FRAME:
+            data_identifier = LIVE_DATA
+
+        elif frame_type == NON_LIVE_DATA_FRAME:
+            data_identifier = NON_LIVE_DATA
+
+        else:
+            raise SboDataSourceReplay.DataCaptureError("Unable to identify raw data.")
+
+        # The frame is time stamped when it is received, even if it is written later by the capture writer thread.
+        captured_frame = (data_identifier, time.time(), raw_data)
+
+        if self.capture_writer_thread is None:
+            self._write_captured_frames([captured_frame])
+            return
+
+        try:
+            self.capture_queue.put_nowait(captured_frame)
+            self.captured_frames_queued = self.captured_frames_queued + 1
+
+        except queue.Full:
+            # The frame is dropped rather than adding latency to the caller.
+            self.captured_frames_dropped = self.captured_frames_dropped + 1
+            debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_WARNINGS, debug.WARNING, "%s: The capture queue is full, %s frames have been dropped." % (SboDataSourceReplay.__name__, self.captured_frames_dropped))
+
+
+    def set_capture_format(self, capture_format, segment_size_limit=DEFAULT_SEGMENT_SIZE_LIMIT):
+
+        """This public method selects the format that raw data is captured in.
+
+        The file capture format writes each frame to its own file and is limited to FILE_NUMBER_MAX frames.
+        The segment capture format appends each frame to a segment file as a length prefixed record,
+        along with a sidecar index of the record offsets, and starts a new segment once the size limit is reached.
+
+        Args:
+            capture_format: An integer representing either the file or the segment capture format.
+            segment_size_limit: The size in bytes at which a segment file is rotated.
+
+        Returns:
+            None
+
+        Raises:
+            DataCaptureError: Raised if an unknown capture format or an invalid segment size limit is given,
+                or if raw data has already been captured by this object.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "set_capture_format"))
+
+        # Mixing capture formats in the same capture folder would prevent it being played back.
+        if not self.first_capture:
+            raise SboDataSourceReplay.DataCaptureError("The capture format can not be changed after raw data has been captured.")
+
+        if capture_format not in (FILE_CAPTURE_FORMAT, SEGMENT_CAPTURE_FORMAT):
+            raise SboDataSourceReplay.DataCaptureError("Unknown capture format: '%s'" % capture_format)
+
+        if not isinstance(segment_size_limit, int) or isinstance(segment_size_limit, bool) or segment_size_limit <= 0:
+            raise SboDataSourceReplay.DataCaptureError("Invalid segment size limit: '%s'" % segment_size_limit)
+
+        self.capture_format = capture_format
+        self.segment_size_limit = segment_size_limit
+
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s specified." % CAPTURE_FORMAT_DESCRIPTION[self.capture_format])
+
+
+    def close_capture(self):
+
+        """This public method closes any segment file that is open for capture.
+
+        Captured raw data is flushed as each frame is written, so this method only needs to be called before the object is discarded.
+        If the capture writer thread is running, it is stopped once it has written every queued frame.
+
+        This simple method has no arguments or returns and raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "close_capture"))
+
+        self.stop_capture_writer()
+        self._close_capture_segment()
+
+
+    def start_capture_writer(self, queue_size=DEFAULT_CAPTURE_QUEUE_SIZE, batch_size=DEFAULT_CAPTURE_BATCH_SIZE):
+
+        """This public method starts a capture writer thread, so that capture() queues each frame instead of writing it.
+
+        The capture writer thread writes the queued frames in batches.
+        If the queue is full, capture() drops the frame rather than waiting, and the drop is reported in the capture writer statistics.
+        Errors while writing are also reported there, rather than being raised by capture().
+
+        Args:
+            queue_size: The maximum number of frames that can be waiting to be written.
+            batch_size: The maximum number of frames to write at a time.
+
+        Returns:
+            None
+
+        Raises:
+            DataCaptureError: Raised if an invalid queue size or batch size is given.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "start_capture_writer"))
+
+        for setting in (queue_size, batch_size):
+            if not isinstance(setting, int) or isinstance(setting, bool) or setting <= 0:
+                raise SboDataSourceReplay.DataCaptureError("Invalid capture writer setting: '%s'" % setting)
+
+        self.stop_capture_writer()
+
+        self.capture_queue = queue.Queue(queue_size)
+        self.capture_batch_size = batch_size
+        self.capture_writer_stop_event.clear()
+
+        self.capture_writer_thread = threading.Thread(target=self._run_capture_writer, name="%s capture writer" % SboDataSourceReplay.__name__)
+        self.capture_writer_thread.daemon = True
+        self.capture_writer_thread.start()
+
+
+    def stop_capture_writer(self):
+
+        """This public method stops the capture writer thread once it has written every queued frame.
+
+        Afterwards, capture() goes back to writing each frame as it is received.
+
+        This simple method has no arguments or returns and raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "stop_capture_writer"))
+
+        if self.capture_writer_thread is None:
+            return
+
+        self.capture_writer_stop_event.set()
+        self.capture_writer_thread.join()
+
+        self.capture_writer_thread = None
+        self.capture_queue = None
+
+
+    def get_capture_writer_statistics(self):
+
+        """This public method reports the backlog, drops and errors of the capture writer thread.
+
+        Returns:
+            capture_writer_statistics: A dictionary holding the current 'queue_depth', the number of 'frames_queued',
+                'frames_dropped' because the queue was full and 'frames_written', the number of 'batches_written',
+                the number of write 'errors' and the 'last_error' to have been experienced.
+
+        This simple method has no arguments and raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "get_capture_writer_statistics"))
+
+        capture_writer_statistics = {
+            'queue_depth': 0,
+            'frames_queued': self.captured_frames_queued,
+            'frames_dropped': self.captured_frames_dropped,
+            'frames_written': self.captured_frames_written,
+            'batches_written': self.capture_batches_written,
+            'errors': self.capture_writer_errors,
+            'last_error': self.capture_writer_last_error
+        }
+
+        # Take a reference first, as the queue is removed when the capture writer thread is stopped.
+        capture_queue = self.capture_queue
+
+        if capture_queue is not None:
+            capture_writer_statistics['queue_depth'] = capture_queue.qsize()
+
+        return capture_writer_statistics
+
+
+    def set_capture_compression(self, compression_level=DEFAULT_COMPRESSION_LEVEL, dictionary_sample_size=DEFAULT_DICTIONARY_SAMPLE_SIZE):
+
+        """This public method compresses the segment records that are captured, using a preset dictionary trained on the first frames.
+
+        Consecutive frames share most of their team names, tournament names and odds layouts,
+        so a dictionary trained on a sample of them lets even a single frame be compressed well.
+        Playback decompresses the records transparently.
+
+        Args:
+            compression_level: An integer from 1 to 9 giving the zlib compression level, or None to stop compressing.
+            dictionary_sample_size: The number of frames to sample before the preset dictionary is trained.
+
+        Returns:
+            None
+
+        Raises:
+            DataCaptureError: Raised if the segment capture format has not been selected, raw data has already been captured,
+                or an invalid compression level or dictionary sample size is given.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "set_capture_compression"))
+
+        if self.capture_format != SEGMENT_CAPTURE_FORMAT:
+            raise SboDataSourceReplay.DataCaptureError("Compression is only available in the segment capture format.")
+
+        # A dictionary trained part way through a capture would not match the frames already sampled.
+        if not self.first_capture:
+            raise SboDataSourceReplay.DataCaptureError("Compression can not be changed after raw data has been captured.")
+
+        if compression_level is not NO_COMPRESSION and compression_level not in range(1, 10):
+            raise SboDataSourceReplay.DataCaptureError("Invalid compression level: '%s'" % compression_level)
+
+        if not isinstance(dictionary_sample_size, int) or isinstance(dictionary_sample_size, bool) or dictionary_sample_size <= 0:
+            raise SboDataSourceReplay.DataCaptureError("Invalid dictionary sample size: '%s'" % dictionary_sample_size)
+
+        self.compression_level = compression_level
+        self.dictionary_sample_size = dictionary_sample_size
+
+
+    def set_capture_delta_encoding(self, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+
+        """This public method stores most segment records as the differences from the previous frame with the same data identifier.
+
+        Consecutive live or non-live frames usually differ by only a few odds, so a delta encoded frame is a fraction of the size of the frame.
+        A keyframe holding the whole frame is stored after every keyframe interval frames and at the start of each segment.
+        Playback rebuilds the frames on the fly. Delta encoding can be combined with compression.
+
+        Args:
+            keyframe_interval: The number of delta encoded frames between keyframes, or None to stop delta encoding.
+
+        Returns:
+            None
+
+        Raises:
+            DataCaptureError: Raised if the segment capture format has not been selected, raw data has already been captured,
+                or an invalid keyframe interval is given.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "set_capture_delta_encoding"))
+
+        if self.capture_format != SEGMENT_CAPTURE_FORMAT:
+            raise SboDataSourceReplay.DataCaptureError("Delta encoding is only available in the segment capture format.")
+
+        if not self.first_capture:
+            raise SboDataSourceReplay.DataCaptureError("Delta encoding can not be changed after raw data has been captured.")
+
+        if keyframe_interval is not NO_DELTA_ENCODING and (not isinstance(keyframe_interval, int) or isinstance(keyframe_interval, bool) or keyframe_interval <= 0):
+            raise SboDataSourceReplay.DataCaptureError("Invalid keyframe interval: '%s'" % keyframe_interval)
+
+        self.keyframe_interval = keyframe_interval
+
+
+    def get_compression_statistics(self):
+
+        """This public method reports how well the captured raw data has been compressed and how quickly it is decoded during playback.
+
+        Returns:
+            compression_statistics: A dictionary holding the 'captured_raw_bytes' and 'captured_stored_bytes' of the segment records
+                and their 'compression_ratio', along with the 'played_back_stored_bytes', 'played_back_raw_bytes', 'decode_seconds'
+                and 'decode_throughput' in raw bytes per second during playback.
+                Ratios and throughputs are None until there is data to calculate them from.
+
+        This simple method has no arguments and raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "get_compression_statistics"))
+
+        compression_statistics = {
+            'captured_raw_bytes': self.captured_raw_bytes,
+            'captured_stored_bytes': self.captured_stored_bytes,
+            'compression_ratio': None,
+            'played_back_stored_bytes': self.played_back_stored_bytes,
+            'played_back_raw_bytes': self.played_back_raw_bytes,
+            'decode_seconds': self.played_back_decode_seconds,
+            'decode_throughput': None
+        }
+
+        if self.captured_stored_bytes:
+            compression_statistics['compression_ratio'] = float(self.captured_raw_bytes) / self.captured_stored_bytes
+
+        if self.played_back_decode_seconds:
+            compression_statistics['decode_throughput'] = self.played_back_raw_bytes / self.played_back_decode_seconds
+
+        return compression_statistics
+
+
+    def _read_next_file(self):
+
+        """This private method reads the data identifier, date stamp and raw data from the next replay file.
+
+        Args: None
+        Returns: file_contents(tuple), eg: (data_identifier, datestamp, raw_data)
+        Raises: EndOfReplay, FileReadError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_read_next_file"))
+
+        playback_filename = self._get_next_filename(PLAYBACK_FILE)
+        replay_file_path = os.path.join(self.replay_folder_path, playback_filename)
+
+        if not os.path.exists(replay_file_path):
+            raise SboDataSourceReplay.EndOfReplay("Can not find file '%s' in folder '%s'" % (playback_filename, self.replay_folder_path))
+
+        try:
+            file_handle = open(replay_file_path, mode='r', encoding='utf-8')
+
+            debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Opening file for playback: '%s'" % replay_file_path)
+
+            try:
+                # Any failure here will be caught by the outer except.
+                data_identifier = file_handle.readline().rstrip('\n')
+                datestamp = file_handle.readline().rstrip('\n')
+
+                # The raw data is the remainder of the file, so that any new lines it contains are preserved.
+                captured_raw_data = file_handle.read()
+
+                # The file capture format can not be memory mapped, but hands out the same type of raw data.
+                if self.memory_mapped_playback:
+                    captured_raw_data = memoryview(captured_raw_data.encode('utf-8'))
+
+            finally:
+                # The file will get closed even if the above try causes an exception.
+                file_handle.close()
+
+        except IOError as exception_instance:
+            raise SboDataSourceReplay.FileReadError("playback() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        return (data_identifier, datestamp, captured_raw_data)
+
+
+    def _close_playback_segment(self):
+
+        """This private method closes the segment file currently being played back.
+
+        A memory mapped segment stays mapped until the consumer has released every memoryview slice of it.
+
+        This simple method has no arguments or returns.
+        It raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_close_playback_segment"))
+
+        if self.playback_segment_view is not None:
+            self.playback_segment_view.release()
+            self.playback_segment_view = None
+
+        if self.playback_segment_handle is not None:
+
+            try:
+                self.playback_segment_handle.close()
+
+            except BufferError:
+                # Slices of the memory map are still held, so it will be closed once they are garbage collected.
+                pass
+
+            self.playback_segment_handle = None
+
+
+    def _read_segment_bytes(self, length):
+
+        """This private method reads the next bytes from the segment file being played back.
+
+        A memory mapped segment is sliced without copying, otherwise the bytes are read from the open segment file.
+
+        Args: length(integer)
+        Returns: segment_bytes(bytes or memoryview), eg: fewer bytes than the length requested at the end of the segment.
+        Raises: IOError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_read_segment_bytes"))
+
+        if self.playback_segment_end is not None:
+
+            if self.playback_segment_view is None:
+                position = self.playback_segment_handle.tell()
+
+            else:
+                position = self.playback_segment_offset
+
+            length = max(0, min(length, self.playback_segment_end - position))
+
+        if self.playback_segment_view is None:
+            return self.playback_segment_handle.read(length)
+
+        segment_bytes = self.playback_segment_view[self.playback_segment_offset:self.playback_segment_offset + length]
+        self.playback_segment_offset = self.playback_segment_offset + len(segment_bytes)
+
+        return segment_bytes
+
+
+    def _open_next_playback_segment(self):
+
+        """This private method closes the current segment file and opens the next one for playback.
+
+        Args: None
+        Returns: None
+        Raises: EndOfReplay, FileReadError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_open_next_playback_segment"))
+
+        self._close_playback_segment()
+
+        # An archive bundle is played back as a single segment, which ends where its dictionary begins.
+        if self.playback_format == BUNDLE_CAPTURE_FORMAT:
+
+            if self.replay_file_number[PLAYBACK_FILE] != INITIAL_PLAYBACK_FILE_NUMBER:
+                raise SboDataSourceReplay.EndOfReplay("Reached the end of bundle '%s'" % self.replay_folder_path)
+
+            self.replay_file_number[PLAYBACK_FILE] = self.replay_file_number[PLAYBACK_FILE] + 1
+            segment_file_path = self.replay_folder_path
+            self.playback_segment_end = self.bundle_records_end
+
+        else:
+            segment_filename = self._get_next_filename(PLAYBACK_FILE, CAPTURE_SEGMENT_FILENAME_TEMPLATE)
+            segment_file_path = os.path.join(self.replay_folder_path, segment_filename)
+            self.playback_segment_end = None
+
+            if not os.path.exists(segment_file_path):
+                raise SboDataSourceReplay.EndOfReplay("Can not find segment '%s' in folder '%s'" % (segment_filename, self.replay_folder_path))
+
+        self.playback_delta_bases = {}
+
+        try:
+            self.playback_segment_handle = open(segment_file_path, mode='rb')
+
+            # An empty segment can not be memory mapped, but it is read in the same way as the end of any other segment.
+            if self.memory_mapped_playback and os.fstat(self.playback_segment_handle.fileno()).st_size > 0:
+
+                file_handle = self.playback_segment_handle
+
+                try:
+                    self.playback_segment_handle = mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+                finally:
+                    # The memory map holds its own reference to the file.
+                    file_handle.close()
+
+                self.playback_segment_view = memoryview(self.playback_segment_handle)
+                self.playback_segment_offset = 0
+
+        except (IOError, ValueError) as exception_instance:
+            raise SboDataSourceReplay.FileReadError("playback() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Opening segment for playback: '%s'" % segment_file_path)
+
+
+    def _read_next_segment_record(self):
+
+        """This private method reads the next record from the segment files, moving on to the next segment at the end of each one.
+
+        The segment file stays open between calls, so the records are read sequentially.
+
+        Args: None
+        Returns: record_contents(tuple), eg: (data_identifier, datestamp, raw_data), where the raw data is a memoryview during memory mapped playback.
+        Raises: EndOfReplay, FileReadError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_read_next_segment_record"))
+
+        try:
+            while True:
+
+                if self.playback_segment_handle is None:
+                    self._open_next_playback_segment()
+
+                record_header = self._read_segment_bytes(SEGMENT_RECORD_HEADER.size)
+
+                if record_header:
+                    break
+
+                # The end of the current segment has been reached.
+                self._close_playback_segment()
+
+            if len(record_header) < SEGMENT_RECORD_HEADER.size:
+                raise SboDataSourceReplay.FileReadError("Truncated record header in segment %s." % self.replay_file_number[PLAYBACK_FILE])
+
+            payload_length, data_identifier_code, record_flags, timestamp = SEGMENT_RECORD_HEADER.unpack(record_header)
+            payload = self._read_segment_bytes(payload_length)
+
+            if len(payload) < payload_length:
+                raise SboDataSourceReplay.FileReadError("Truncated record in segment %s." % self.replay_file_number[PLAYBACK_FILE])
+
+            data_identifier = DATA_IDENTIFIER_CODES[data_identifier_code]
+
+            decode_start_time = time.time()
+            payload = self._decompress_payload(record_flags, payload)
+            payload = self._delta_decode_payload(data_identifier_code, record_flags, payload)
+
+            # Memory mapped raw data is left undecoded, so the consumer only pays for decoding the frames it needs as text.
+            if self.memory_mapped_playback:
+                captured_raw_data = memoryview(payload)
+
+            else:
+                captured_raw_data = payload.decode('utf-8')
+
+            self.played_back_decode_seconds = self.played_back_decode_seconds + time.time() - decode_start_time
+            self.played_back_stored_bytes = self.played_back_stored_bytes + SEGMENT_RECORD_HEADER.size + payload_length
+            self.played_back_raw_bytes = self.played_back_raw_bytes + len(payload)
+
+        except (IOError, IndexError, UnicodeDecodeError, zlib.error) as exception_instance:
+            raise SboDataSourceReplay.FileReadError("playback() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        return (data_identifier, str(datetime.datetime.fromtimestamp(timestamp)), captured_raw_data)
+
+
+    def _load_next_frame(self):
+
+        """This private method reads the next frame from the replay folder, in whichever capture format it was captured in.
+
+        Args: None
+        Returns: frame(tuple), eg: (data_identifier, datestamp, raw_data)
+        Raises: EndOfReplay, FileReadError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_load_next_frame"))
+
+        if self.playback_format in (SEGMENT_CAPTURE_FORMAT, BUNDLE_CAPTURE_FORMAT):
+            return self._read_next_segment_record()
+
+        return self._read_next_file()
+
+
+    def _prefetch_frames(self):
+
+        """This private method is run by the prefetch thread to read frames ahead of playback into the prefetch queue.
+
+        The queue is bounded, so the thread waits while it is full.
+        An exception raised while reading a frame is queued in its place and the thread stops.
+        If the thread is asked to stop while waiting, the frame it is holding is kept for playback() to return.
+
+        This simple method has no arguments or returns.
+        It raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_prefetch_frames"))
+
+        while not self.prefetch_stop_event.is_set():
+
+            try:
+                frame = self._load_next_frame()
+
+            except Exception as exception_instance: # pylint: disable-msg=W0703
+                frame = exception_instance
+
+            while True:
+
+                try:
+                    self.prefetch_queue.put(frame, timeout=PREFETCH_POLL_PERIOD)
+                    break
+
+                except queue.Full:
+
+                    if self.prefetch_stop_event.is_set():
+                        self.prefetch_held_frame = frame
+                        return
+
+            if isinstance(frame, Exception):
+                return
+
+
+    def _start_prefetch_thread(self):
+
+        """This private method starts a prefetch thread reading ahead from the current playback position.
+
+        This simple method has no arguments or returns.
+        It raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_start_prefetch_thread"))
+
+        self.prefetch_queue = queue.Queue(self.prefetch_depth)
+        self.prefetch_stop_event.clear()
+
+        self.prefetch_thread = threading.Thread(target=self._prefetch_frames, name="%s prefetch" % SboDataSourceReplay.__name__)
+        self.prefetch_thread.daemon = True
+        self.prefetch_thread.start()
+
+
+    def _stop_prefetch_thread(self):
+
+        """This private method stops the prefetch thread and keeps the frames it has read ahead, in order, for playback() to return.
+
+        This simple method has no arguments or returns.
+        It raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_stop_prefetch_thread"))
+
+        if self.prefetch_thread is None:
+            return
+
+        self.prefetch_stop_event.set()
+        self.prefetch_thread.join()
+        self.prefetch_thread = None
+
+        while not self.prefetch_queue.empty():
+            self.prefetched_frames.append(self.prefetch_queue.get_nowait())
+
+        if self.prefetch_held_frame is not None:
+            self.prefetched_frames.append(self.prefetch_held_frame)
+            self.prefetch_held_frame = None
+
+        self.prefetch_queue = None
+
+
+    def _get_next_frame(self):
+
+        """This private method returns the next frame to be played back, from the prefetch queue if the prefetch thread is running.
+
+        The time spent waiting for the prefetch thread is recorded as a stall.
+
+        Args: None
+        Returns: frame(tuple), eg: (data_identifier, datestamp, raw_data)
+        Raises: EndOfReplay, FileReadError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_get_next_frame"))
+
+        if self.prefetched_frames:
+            frame = self.prefetched_frames.popleft()
+
+        # Once the prefetch thread has stopped on an exception and the queue is empty, frames are read directly again.
+        elif self.prefetch_thread is not None and (self.prefetch_thread.is_alive() or not self.prefetch_queue.empty()):
+
+            queue_depth = self.prefetch_queue.qsize()
+
+            self.prefetch_gets = self.prefetch_gets + 1
+            self.prefetch_queue_depth_total = self.prefetch_queue_depth_total + queue_depth
+
+            if queue_depth == 0:
+
+                stall_start_time = time.time()
+                frame = self.prefetch_queue.get()
+
+                self.prefetch_stalls = self.prefetch_stalls + 1
+                self.prefetch_stall_seconds = self.prefetch_stall_seconds + time.time() - stall_start_time
+
+            else:
+                frame = self.prefetch_queue.get()
+
+        else:
+            frame = self._load_next_frame()
+
+        # An exception raised by the prefetch thread is raised in its place in the sequence of frames.
+        if isinstance(frame, Exception):
+            raise frame
+
+        return frame
+
+
+    @staticmethod
+    def _read_compression_dictionary(replay_folder_path):
+
+        """This private method reads the preset compression dictionary saved in a replay folder, if there is one.
+
+        Args: replay_folder_path(string)
+        Returns: compression_dictionary(bytes), eg: None if the segment records were captured without a dictionary.
+        Raises: IOError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_read_compression_dictionary"))
+
+        dictionary_file_path = os.path.join(replay_folder_path, CAPTURE_DICTIONARY_FILENAME)
+
+        if not os.path.exists(dictionary_file_path):
+            return None
+
+        file_handle = open(dictionary_file_path, mode='rb')
+
+        try:
+            compression_dictionary = file_handle.read()
+
+        finally:
+            file_handle.close()
+
+        return compression_dictionary
+
+
+    def set_memory_mapped_playback(self, memory_mapped_playback):
+
+        """This public method selects whether playback() returns decoded strings or memoryview slices of memory mapped segment files.
+
+        During memory mapped playback, uncompressed segment records are handed out without being copied or decoded.
+        The consumer decodes a frame only when it needs it as text, eg: str(raw_data, 'utf-8').
+        Compressed or delta encoded records are rebuilt into a new buffer before a memoryview of it is handed out.
+        Replay folders captured in the file capture format are read as before, but their raw data is also handed out as a memoryview.
+
+        Args:
+            memory_mapped_playback: A boolean which is True to hand out memoryview slices and False to hand out strings.
+
+        Returns:
+            None
+
+        Raises:
+            CallOrderError: Raised if a segment is part way through being played back.
+                The reinitialise_playback() method must be called first.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "set_memory_mapped_playback"))
+
+        if self.playback_segment_handle is not None or self.prefetch_thread is not None:
+            raise SboDataSourceReplay.CallOrderError("The set_memory_mapped_playback() method was called part way through playing back a segment.")
+
+        self.memory_mapped_playback = bool(memory_mapped_playback)
+
+
+    def _reset_playback_position(self):
+
+        """This private method moves playback back to the first frame in the replay folder.
+
+        This simple method has no arguments or returns.
+        It raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_reset_playback_position"))
+
+        # Any frames read ahead from the previous position are discarded.
+        self._stop_prefetch_thread()
+        self.prefetched_frames.clear()
+
+        # Re-initialise the playback attributes.
+        self.last_file_played_back = [INITIAL_LAST_LIVE_FILE_PLAYED_BACK, INITIAL_LAST_NON_LIVE_FILE_PLAYED_BACK]
+        self.replay_file_number[PLAYBACK_FILE] = INITIAL_PLAYBACK_FILE_NUMBER
+        self._close_playback_segment()
+        self.load_next_file_for_playback = True
+        self.file_contents = [INITIAL_DATA_IDENTIFIER, INITIAL_RAW_DATA]
+        self._clear_frame_type_cursors()
+
+        # Timed replay restarts its clock from the next frame played back.
+        self.timed_replay_origin = None
+
+
+    def _clear_frame_type_cursors(self):
+
+        """This private method discards the frames held by the cursor of each frame type.
+
+        This simple method has no arguments or returns.
+        It raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_clear_frame_type_cursors"))
+
+        for demultiplexed_frames in self.demultiplexed_frames:
+            demultiplexed_frames.clear()
+
+        self.frame_type_contents = [None, None]
+
+
+    def _load_frame_type(self, frame_type):
+
+        """This private method loads the next frame of a frame type for playback, reading ahead in the replay if needed.
+
+        The frames of the other frame type that are read on the way are kept for its own cursor.
+
+        Args: frame_type(integer)
+        Returns: None
+        Raises: EndOfReplay, FileReadError, SimulatedConnectionError, PlaybackError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_load_frame_type"))
+
+        while not self.demultiplexed_frames[frame_type]:
+
+            data_identifier, datestamp, captured_raw_data = self._get_next_frame()
+
+            if len(captured_raw_data) == 0:
+                data_identifier = NO_DATA
+
+            if data_identifier == LIVE_DATA:
+                frame_cursor = LIVE_DATA_FRAME
+
+            elif data_identifier == NON_LIVE_DATA:
+                frame_cursor = NON_LIVE_DATA_FRAME
+
+            elif data_identifier == NO_DATA:
+                # The simulated connection error interrupts both cursors.
+                self.playback_initialised_flag = False
+                raise SboDataSourceReplay.SimulatedConnectionError("Simulated SBO server connection error.")
+
+            else:
+                self.playback_initialised_flag = False
+                raise SboDataSourceReplay.PlaybackError("Unknown Data Identifier: '%s'" % data_identifier)
+
+            capture_time = None
+
+            # In Timed Replay Mode, the first frame read sets the time that the frames of both cursors are due relative to.
+            if self.replay_mode == TIMED_REPLAY_MODE:
+
+                try:
+                    capture_time = self._parse_datestamp(datestamp)
+
+                except ValueError:
+                    self.playback_initialised_flag = False
+                    raise SboDataSourceReplay.PlaybackError("Invalid date stamp: '%s'" % datestamp)
+
+                if self.timed_replay_origin is None:
+                    self.timed_replay_origin = (capture_time, time.monotonic())
+
+            self.demultiplexed_frames[frame_cursor].append((datestamp, capture_time, captured_raw_data))
+
+        datestamp, capture_time, captured_raw_data = self.demultiplexed_frames[frame_type].popleft()
+
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Date stamp: %s" % datestamp)
+
+        self.last_datestamp = datestamp
+        self.frame_type_contents[frame_type] = (capture_time, captured_raw_data)
+
+
+    def _playback_frame_type(self, frame_type):
+
+        """This private method returns the next frame of a frame type, once it is due, from the cursor of that frame type.
+
+        Args: frame_type(integer)
+        Returns: raw_data(string), eg: None if the next frame is not yet due.
+        Raises: EndOfReplay, FileReadError, SimulatedConnectionError, PlaybackError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_playback_frame_type"))
+
+        if self.frame_type_contents[frame_type] is None:
+
+            try:
+                self._load_frame_type(frame_type)
+
+            except SboDataSourceReplay.EndOfReplay:
+                # Playback has ended once the cursor of the other frame type has no frames left either.
+                other_frame_type = NON_LIVE_DATA_FRAME if frame_type == LIVE_DATA_FRAME else LIVE_DATA_FRAME
+
+                if not self.demultiplexed_frames[other_frame_type] and self.frame_type_contents[other_frame_type] is None:
+                    self.playback_initialised_flag = False
+
+                raise
+
+        if self._get_playback_delay(frame_type) > 0:
+            debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Tried to playback a replay data file before it was due.")
+            return None
+
+        raw_data = self.frame_type_contents[frame_type][RAW_DATA]
+
+        self.last_file_played_back[frame_type] = datetime.datetime.now()
+        self.frame_type_contents[frame_type] = None
+
+        return raw_data
+
+
+    def _get_timed_replay_delay(self, capture_time):
+
+        """This private method returns the time left until a frame with the given capture time is due during timed replay.
+
+        Args: capture_time(float), eg: a POSIX timestamp.
+        Returns: delay(float), eg: the number of seconds until the frame is due, or zero or less if it is already due.
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_get_timed_replay_delay"))
+
+        origin_capture_time, origin_clock_time = self.timed_replay_origin
+
+        due_clock_time = origin_clock_time + (capture_time - origin_capture_time) / self.replay_speed
+
+        return due_clock_time - time.monotonic()
+
+
+    def _get_playback_delay(self, frame_type=None):
+
+        """This private method returns the time left until the frame loaded for playback is due in the current replay mode.
+
+        Args: frame_type(integer), eg: None for the frame loaded by playback() without a frame type.
+        Returns: delay(float), eg: the number of seconds until the frame is due, or zero if it is already due.
+        Raises: None
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_get_playback_delay"))
+
+        delay = 0.0
+
+        if frame_type is not None:
+
+            if self.frame_type_contents[frame_type] is None:
+                return delay
+
+            capture_time = self.frame_type_contents[frame_type][0]
+
+        elif self.file_contents[DATA_IDENTIFIER] == LIVE_DATA:
+            frame_type = LIVE_DATA_FRAME
+            capture_time = self.file_capture_time
+
+        elif self.file_contents[DATA_IDENTIFIER] == NON_LIVE_DATA:
+            frame_type = NON_LIVE_DATA_FRAME
+            capture_time = self.file_capture_time
+
+        else:
+            # Any other frame raises an exception from playback() straight away.
+            return delay
+
+        if frame_type == LIVE_DATA_FRAME:
+            minimum_request_period = self.minimum_request_period_live
+
+        else:
+            minimum_request_period = self.minimum_request_period_non_live
+
+        if self.replay_mode == TIMED_REPLAY_MODE and self.timed_replay_origin is not None:
+            delay = self._get_timed_replay_delay(capture_time)
+
+        elif self.replay_mode == NORMAL_REPLAY_MODE and self.last_file_played_back[frame_type] is not None:
+            delay = (self.last_file_played_back[frame_type] + minimum_request_period - datetime.datetime.now()).total_seconds()
+
+        return max(delay, 0.0)
+
+
+    def _build_timestamp_index(self):
+
+        """This private method builds the timestamp index of the replay folder from the timestamps written during capture.
+
+        The segment capture format and archive bundles already hold an index of record offsets and timestamps.
+        The file capture format has its date stamps read from each file in turn.
+
+        Args: None
+        Returns: None
+        Raises: IOError, ValueError, struct.error
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_build_timestamp_index"))
+
+        timestamps = []
+        positions = []
+
+        if self.playback_format == BUNDLE_CAPTURE_FORMAT:
+
+            _, index_offset, record_count, _ = self._read_bundle_trailer(self.replay_folder_path)
+            index_files = [(INITIAL_PLAYBACK_FILE_NUMBER + 1, self.replay_folder_path, index_offset, record_count)]
+
+        elif self.playback_format == SEGMENT_CAPTURE_FORMAT:
+
+            index_files = []
+            segment_number = INITIAL_PLAYBACK_FILE_NUMBER + 1
+
+            while segment_number <= FILE_NUMBER_MAX:
+
+                segment_filename = self._format_filename(segment_number, CAPTURE_SEGMENT_FILENAME_TEMPLATE)
+                index_file_path = os.path.join(self.replay_folder_path, self._get_segment_index_filename(segment_filename))
+
+                if not os.path.exists(index_file_path):
+                    break
+
+                index_files.append((segment_number, index_file_path, 0, os.path.getsize(index_file_path) // SEGMENT_INDEX_ENTRY.size))
+                segment_number = segment_number + 1
+
+        else:
+            index_files = []
+            file_number = INITIAL_PLAYBACK_FILE_NUMBER + 1
+
+            while file_number <= FILE_NUMBER_MAX:
+
+                replay_file_path = os.path.join(self.replay_folder_path, self._format_filename(file_number, CAPTURE_FILENAME_TEMPLATE))
+
+                if not os.path.exists(replay_file_path):
+                    break
+
+                file_handle = open(replay_file_path, mode='r', encoding='utf-8')
+
+                try:
+                    file_handle.readline()
+                    datestamp = file_handle.readline().rstrip('\n')
+
+                finally:
+                    file_handle.close()
+
+                timestamps.append(datetime.datetime.fromtimestamp(self._parse_datestamp(datestamp)))
+                positions.append((file_number, 0))
+                file_number = file_number + 1
+
+        for file_number, index_file_path, index_offset, record_count in index_files:
+
+            file_handle = open(index_file_path, mode='rb')
+
+            try:
+                file_handle.seek(index_offset)
+                index_entries = file_handle.read(record_count * SEGMENT_INDEX_ENTRY.size)
+
+            finally:
+                file_handle.close()
+
+            for entry_number in range(record_count):
+                record_offset, timestamp = SEGMENT_INDEX_ENTRY.unpack_from(index_entries, entry_number * SEGMENT_INDEX_ENTRY.size)
+                timestamps.append(datetime.datetime.fromtimestamp(timestamp))
+                positions.append((file_number, record_offset))
+
+        self.timestamp_index_timestamps = timestamps
+        self.timestamp_index_positions = positions
+
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Built a timestamp index of %s frames." % len(timestamps))
+
+
+    def _move_to_position(self, position):
+
+        """This private method moves playback to the frame at a position taken from the timestamp index.
+
+        A delta encoded segment is read from its start up to the position, so that the frames before it are available to rebuild the frames after it.
+        Otherwise the segment is read from the position straight away.
+
+        Args: position(tuple), eg: (file_number, record_offset)
+        Returns: None
+        Raises: FileReadError
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "_move_to_position"))
+
+        file_number, record_offset = position
+
+        # The next file or segment to be opened is the one at the position.
+        self.replay_file_number[PLAYBACK_FILE] = file_number - 1
+
+        if self.playback_format == FILE_CAPTURE_FORMAT or record_offset == 0:
+            return
+
+        try:
+            self._open_next_playback_segment()
+
+        except SboDataSourceReplay.EndOfReplay:
+            # Playback will reach the end of the replay again on the next call.
+            return
+
+        try:
+            if self.playback_segment_view is None:
+                self.playback_segment_handle.seek(record_offset)
+                record_flags = SEGMENT_RECORD_HEADER.unpack(self.playback_segment_handle.read(SEGMENT_RECORD_HEADER.size))[2]
+                self.playback_segment_handle.seek(0)
+
+            else:
+                record_flags = SEGMENT_RECORD_HEADER.unpack_from(self.playback_segment_view, record_offset)[2]
+
+        except (IOError, struct.error) as exception_instance:
+            raise SboDataSourceReplay.FileReadError("seek() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        if record_flags & (KEYFRAME_RECORD_FLAG | DELTA_RECORD_FLAG):
+
+            # The records before the position are decoded and discarded, leaving the delta bases ready for it.
+            while True:
+
+                if self.playback_segment_view is None:
+                    segment_position = self.playback_segment_handle.tell()
+
+                else:
+                    segment_position = self.playback_segment_offset
+
+                if segment_position >= record_offset:
+                    break
+
+                self._read_next_segment_record()
+
+        elif self.playback_segment_view is None:
+            self.playback_segment_handle.seek(record_offset)
+
+        else:
+            self.playback_segment_offset = record_offset
+
+
+    def playback_initialised(self):
+
+        """This public method returns the playback initialised flag which is set only when playback is initialised.
+
+        Returns:
+            playback_initialised_flag: A boolean representation of the initialised state of playback.
+
+        This simple method has no arguments and raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s (%s)" % (SboDataSourceReplay.__name__, "playback_initialised", self.playback_initialised_flag))
+
+        return self.playback_initialised_flag
+
+
+    def playback_previously_initalised(self):
+
+        """This public method returns a flag which indicates weather playback has been successfully initialised at least once.
+
+        Returns:
+            playback_previously_initialised_flag: A boolean representation of the former initialisation of playback.
+
+        This simple method has no arguments and raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s (%s)" % (SboDataSourceReplay.__name__, "playback_previously_initalised", self.playback_previously_initialised_flag))
+
+        return self.playback_previously_initialised_flag
+
+
+    def initalise_playback(self, replay_folder_path, replay_mode, minimum_request_period, start_at=None, replay_speed=DEFAULT_REPLAY_SPEED):
+
+        """This public method ensures that the object is initialised ready for the playback() method to be called.
+
+        This method initialises the replay folder path, establishes the replay mode and stores the minimum request periods
+        ready to the playback function to be called.
+
+        Args:
+            replay_folder_path: A string representing the path of the folder containing files to be replayed, or of an archive bundle.
+            replay_mode: An integer representing either Normal, Fast or Timed replay mode.
+            minimum_request_period: A list of minimum request periods used during normal playback to limit the frequency in which the data is played back.
+            start_at: An optional datetime; playback starts from the first frame captured at or after it, as if seek() had been called.
+            replay_speed: A multiple of the capture speed used during timed playback, eg: 10 to reproduce the gaps between frames ten times faster.
+
+        Returns:
+            None
+
+        Raises:
+            PlaybackInitialisationError: Raised if invalid arguments are passed to this method,
+                preventing it from initialising the required parameters ready for playback,
+                or if the replay folder can not be searched for the start time.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "initalise_playback"))
+
+        try:
+            # If the replay folder path does not exist then playback can not be initialised.
+            replay_folder_path = os.path.join(self.base_directory, replay_folder_path)
+
+        except AttributeError as exception_instance:
+            raise SboDataSourceReplay.PlaybackInitialisationError("initalise_playback() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        if not os.path.exists(replay_folder_path):
+            self.playback_initialised_flag = False
+            raise SboDataSourceReplay.PlaybackInitialisationError("Can not initialise playback, invalid replay folder given. '%s'" % replay_folder_path)
+
+        # The prefetch thread must not be reading from the previous replay folder while it is replaced.
+        self._stop_prefetch_thread()
+        self.prefetched_frames.clear()
+        self._clear_frame_type_cursors()
+
+        # This folder specifies the path of the files to be played back.
+        self.replay_folder_path = replay_folder_path
+        self.timestamp_index_timestamps = None
+        self.timestamp_index_positions = None
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Specified replay folder: '%s'" % self.replay_folder_path)
+
+        # An archive bundle is given in place of a replay folder.
+        # A replay folder that starts with a segment file was captured in the segment capture format.
+        first_segment_filename = self._format_filename(INITIAL_PLAYBACK_FILE_NUMBER + 1, CAPTURE_SEGMENT_FILENAME_TEMPLATE)
+
+        if os.path.isfile(self.replay_folder_path) and self.replay_folder_path.endswith(CAPTURE_BUNDLE_EXTENSION):
+            self.playback_format = BUNDLE_CAPTURE_FORMAT
+
+            try:
+                self.bundle_records_end, _, _, self.playback_compression_dictionary = self._read_bundle_trailer(self.replay_folder_path)
+
+            except (IOError, struct.error) as exception_instance:
+                raise SboDataSourceReplay.PlaybackInitialisationError("initalise_playback() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        elif os.path.exists(os.path.join(self.replay_folder_path, first_segment_filename)):
+            self.playback_format = SEGMENT_CAPTURE_FORMAT
+
+            try:
+                self.playback_compression_dictionary = self._read_compression_dictionary(self.replay_folder_path)
+
+            except IOError as exception_instance:
+                raise SboDataSourceReplay.PlaybackInitialisationError("initalise_playback() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        else:
+            self.playback_format = FILE_CAPTURE_FORMAT
+
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s detected." % CAPTURE_FORMAT_DESCRIPTION[self.playback_format])
+
+        # Fast replay mode allows the minimum request periods to be ignored during playback.
+        if replay_mode == NORMAL_REPLAY_MODE:
+            self.replay_mode = NORMAL_REPLAY_MODE
+
+        elif replay_mode == FAST_REPLAY_MODE:
+            self.replay_mode = FAST_REPLAY_MODE
+
+        elif replay_mode == TIMED_REPLAY_MODE:
+            self.replay_mode = TIMED_REPLAY_MODE
+
+        else:
+            self.replay_mode = DEFAULT_REPLAY_MODE
+
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s specified." % REPLAY_MODE_DESCRIPTION[self.replay_mode])
+
+        try:
+            # The minimum request periods are used during normal playback to limit the frequency in which the data can be played back.
+            self.minimum_request_period_live = minimum_request_period[LIVE_DATA_FRAME]
+            self.minimum_request_period_non_live = minimum_request_period[NON_LIVE_DATA_FRAME]
+
+        except (TypeError, IndexError, KeyError) as exception_instance:
+            raise SboDataSourceReplay.PlaybackInitialisationError("initalise_playback() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        try:
+            # Ensure that the minimum request periods are valid timedelta objects.
+            # Attempt to call the total_seconds() attribute as this will only succeed on a timedelta object.
+            self.minimum_request_period_live.total_seconds()
+            self.minimum_request_period_non_live.total_seconds()
+
+        except AttributeError as exception_instance:
+            raise SboDataSourceReplay.PlaybackInitialisationError("initalise_playback() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        try:
+            # The replay speed is only used during timed playback, but it must still be a positive number.
+            if replay_speed <= 0:
+                raise SboDataSourceReplay.PlaybackInitialisationError("Invalid replay speed: '%s'" % replay_speed)
+
+            self.replay_speed = float(replay_speed)
+
+        except TypeError as exception_instance:
+            raise SboDataSourceReplay.PlaybackInitialisationError("initalise_playback() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        self.timed_replay_origin = None
+
+        self.playback_initialised_flag = True
+        self.playback_previously_initialised_flag = True
+
+        if start_at is not None:
+
+            try:
+                self.seek(start_at)
+
+            except (SboDataSourceReplay.PlaybackError, SboDataSourceReplay.FileReadError) as exception_instance:
+                self.playback_initialised_flag = False
+                raise SboDataSourceReplay.PlaybackInitialisationError("initalise_playback() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        elif self.prefetch_depth is not NO_PREFETCH:
+            self._start_prefetch_thread()
+
+
+    def reinitialise_playback(self):
+
+        """This public method is called to re-initialise certain attributes ready for the playback() method to be called again.
+
+        Raises:
+            CallOrderError: Raised if playback has not previously been initialised.
+
+        This simple method has no arguments and no returns.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "reinitialise_playback"))
+
+        if not self.playback_previously_initialised_flag:
+            raise SboDataSourceReplay.CallOrderError("The reinitalise_playback() method was called before the initialise_playback() method.")
+
+        self._reset_playback_position()
+
+        self.playback_initialised_flag = True
+
+        if self.prefetch_depth is not NO_PREFETCH:
+            self._start_prefetch_thread()
+
+
+    def seek(self, start_at):
+
+        """This public method moves playback to the first frame captured at or after the given time.
+
+        The timestamp index of the replay folder is built on the first seek, after which each seek is a binary search of it.
+        Seeking past the last frame leaves playback at the end of the replay.
+
+        Args:
+            start_at: A datetime giving the time to start playback from.
+
+        Returns:
+            frames_skipped: The number of frames in the replay folder before the new position.
+
+        Raises:
+            CallOrderError: Raised if playback has not previously been initialised.
+            PlaybackError: Raised if the start time is not a datetime or the timestamp index can not be built.
+            FileReadError: Raised if an error is encountered while reading up to the new position.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "seek"))
+
+        if not self.playback_previously_initialised_flag:
+            raise SboDataSourceReplay.CallOrderError("The seek() method was called before the initialise_playback() method.")
+
+        if not isinstance(start_at, datetime.datetime):
+            raise SboDataSourceReplay.PlaybackError("Invalid start time: '%s'" % start_at)
+
+        if self.timestamp_index_timestamps is None:
+
+            try:
+                self._build_timestamp_index()
+
+            except (IOError, ValueError, struct.error) as exception_instance:
+                raise SboDataSourceReplay.PlaybackError("seek() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        frames_skipped = bisect.bisect_left(self.timestamp_index_timestamps, start_at)
+
+        self._reset_playback_position()
+
+        if frames_skipped < len(self.timestamp_index_positions):
+            self._move_to_position(self.timestamp_index_positions[frames_skipped])
+
+        elif self.timestamp_index_positions:
+            # Position playback after the last file or segment, so that the next call reaches the end of the replay.
+            self._move_to_position((self.timestamp_index_positions[-1][0] + 1, 0))
+
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Skipped %s frames to reach %s." % (frames_skipped, start_at))
+
+        self.playback_initialised_flag = True
+
+        if self.prefetch_depth is not NO_PREFETCH:
+            self._start_prefetch_thread()
+
+        return frames_skipped
+
+
+    def playback(self, frame_type=None):
+
+        """This public method returns the contents of the next available replay file.
+
+        The method looks in the replay folder setup during playback initialisation and attempts to read data from
+        each file in turn. On reading the file data the data identifier that was encoded into the file during capture is
+        read and the data is handled accordingly.
+        The replay mode and minimum request periods specified during initialisation are observed.
+
+        When a frame type is given, live and non-live frames are played back from separate cursors, so that a frame
+        of one type waiting for its minimum request period does not hold up the frames of the other type.
+        The replay is still read once, with the frames of the other type kept in memory until they are played back.
+        Playback should use the cursors, or not, consistently between initialisations.
+
+        Args:
+            frame_type: An optional integer which specifies whether to play back the next live or non-live frame.
+
+        Returns:
+            raw_data: A string of raw data retrieved from the replay file, or a memoryview of its UTF-8 encoding during memory mapped playback.
+
+        Raises:
+            CallOrderError: Raised if playback has not previously been initialised.
+            EndOfReplay: Raised when all the replay files in the specified folder have been played back.
+            FileReadError: Raised if an error is encountered while attempting to read the file contents of a replay file.
+            SimulatedConnectionError: Raised when the data identifier of a replay file indicated no data. Used only during testing.
+            PlaybackError: Raised when a reply file with an unknown data identifier is discovered, or an invalid frame type is given.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "playback"))
+
+        if not self.playback_initialised_flag:
+            raise SboDataSourceReplay.CallOrderError("The playback() method was called before the initialise_playback() method.")
+
+        if frame_type is not None:
+
+            if frame_type not in (LIVE_DATA_FRAME, NON_LIVE_DATA_FRAME):
+                raise SboDataSourceReplay.PlaybackError("Invalid frame type: '%s'" % frame_type)
+
+            return self._playback_frame_type(frame_type)
+
+        if self.load_next_file_for_playback:
+
+            try:
+                data_identifier, datestamp, captured_raw_data = self._get_next_frame()
+
+            except SboDataSourceReplay.EndOfReplay:
+                self.playback_initialised_flag = False
+                raise
+
+            # If the file was captured with no raw data it should already have the No Data identifier.
+            # But if it has been modified it may not.
+            if len(captured_raw_data) == 0:
+                data_identifier = NO_DATA
+
+            # Raw data will only be returned form this function if certain conditions are met.
+            # If these conditions are not met this time, they may be met on future calls to this function.
+            # Store the data identifier and captured raw data until the next file is loaded.
+            self.file_contents = [data_identifier, captured_raw_data]
+
+            debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Data Identifier: %s" % data_identifier)
+            debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Date stamp: %s" % datestamp)
+
+            # Keep track of the date stamp of the last valid raw data file to be opened.
+            if data_identifier == LIVE_DATA or data_identifier == NON_LIVE_DATA:
+                self.last_datestamp = datestamp
+
+                # In Timed Replay Mode, the first frame played back sets the time that each following frame is due relative to.
+                if self.replay_mode == TIMED_REPLAY_MODE:
+
+                    try:
+                        self.file_capture_time = self._parse_datestamp(datestamp)
+
+                    except ValueError:
+                        self.playback_initialised_flag = False
+                        raise SboDataSourceReplay.PlaybackError("Invalid date stamp: '%s'" % datestamp)
+
+                    if self.timed_replay_origin is None:
+                        self.timed_replay_origin = (self.file_capture_time, time.monotonic())
+
+            self.load_next_file_for_playback = False
+
+        # If non of the following conditions are met then raw data will be returned as None.
+        raw_data = None
+
+        # In Fast Replay Mode, data can be read at any time.
+        # In Normal Replay Mode, data can not be read more frequent than the minimum request period.
+        # In Timed Replay Mode, data can not be read until the gap since the first frame, divided by the replay speed, has passed.
+
+        if self.file_contents[DATA_IDENTIFIER] == LIVE_DATA:
+
+            if (self.replay_mode == FAST_REPLAY_MODE or
+                self.replay_mode == NORMAL_REPLAY_MODE and
+                (self.last_file_played_back[LIVE_DATA_FRAME] is None or
+                 (datetime.datetime.now() - self.last_file_played_back[LIVE_DATA_FRAME]) > self.minimum_request_period_live) or
+                self.replay_mode == TIMED_REPLAY_MODE and
+                self._get_timed_replay_delay(self.file_capture_time) <= 0):
+
+                raw_data = self.file_contents[RAW_DATA]
+
+                # The date stamp makes it possible for the class to know when live raw data was last returned.
+                self.last_file_played_back[LIVE_DATA_FRAME] = datetime.datetime.now()
+                self.load_next_file_for_playback = True
+
+            else:
+                debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Tried to playback live replay data file before minimum request period expired.")
+
+        elif self.file_contents[DATA_IDENTIFIER] == NON_LIVE_DATA:
+
+            if (self.replay_mode == FAST_REPLAY_MODE or
+                self.replay_mode == NORMAL_REPLAY_MODE and
+                (self.last_file_played_back[NON_LIVE_DATA_FRAME] is None or
+                 (datetime.datetime.now() - self.last_file_played_back[NON_LIVE_DATA_FRAME]) > self.minimum_request_period_non_live) or
+                self.replay_mode == TIMED_REPLAY_MODE and
+                self._get_timed_replay_delay(self.file_capture_time) <= 0):
+
+                raw_data = self.file_contents[RAW_DATA]
+
+                # The date stamp makes it possible for the class to know when non-live raw data was last returned.
+                self.last_file_played_back[NON_LIVE_DATA_FRAME] = datetime.datetime.now()
                 self.load_next_file_for_playback = True
 
             else:
@@ -517,6 +2538,148 @@ class SboDataSourceReplay(object): # pylint: disable-msg=R0902
         return raw_data
 
 
+    def playback_wait(self, timeout=None, frame_type=None):
+
+        """This public method sleeps until the next frame is due in the current replay mode, and then returns it.
+
+        It takes the place of calling the playback() method in a loop until it stops returning None.
+
+        Args:
+            timeout: The maximum number of seconds to wait for the next frame, eg: None to wait until it is due.
+            frame_type: An optional integer which specifies whether to wait for the next live or non-live frame, as for the playback() method.
+
+        Returns:
+            raw_data: The raw data returned by the playback() method, or None if the timeout expired before the next frame was due.
+
+        Raises:
+            The exceptions raised by the playback() method.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "playback_wait"))
+
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+
+        while True:
+
+            raw_data = self.playback(frame_type)
+
+            if raw_data is not None:
+                return raw_data
+
+            delay = self._get_playback_delay(frame_type)
+
+            if timeout is not None:
+
+                remaining_time = deadline - time.monotonic()
+
+                if remaining_time <= 0:
+                    return None
+
+                delay = min(delay, remaining_time)
+
+            time.sleep(delay)
+
+
+    async def playback_wait_async(self, timeout=None, frame_type=None):
+
+        """This public coroutine waits until the next frame is due in the current replay mode, and then returns it.
+
+        It behaves in the same way as the playback_wait() method, but yields to the event loop while it waits.
+        The frames are still read from the disk within the event loop, unless the prefetch thread has been started.
+
+        Args:
+            timeout: The maximum number of seconds to wait for the next frame, eg: None to wait until it is due.
+            frame_type: An optional integer which specifies whether to wait for the next live or non-live frame, as for the playback() method.
+
+        Returns:
+            raw_data: The raw data returned by the playback() method, or None if the timeout expired before the next frame was due.
+
+        Raises:
+            The exceptions raised by the playback() method.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "playback_wait_async"))
+
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+
+        while True:
+
+            raw_data = self.playback(frame_type)
+
+            if raw_data is not None:
+                return raw_data
+
+            delay = self._get_playback_delay(frame_type)
+
+            if timeout is not None:
+
+                remaining_time = deadline - time.monotonic()
+
+                if remaining_time <= 0:
+                    return None
+
+                delay = min(delay, remaining_time)
+
+            await asyncio.sleep(delay)
+
+
+    def read_frame(self):
+
+        """This public method returns the next frame in the replay, with its frame type and capture time, without waiting for it to be due.
+
+        The replay mode and minimum request periods are ignored, so that the frames of several replays can be merged by capture time.
+        A frame captured while the connection to the SBO server was lost is returned with the NO_DATA_FRAME frame type,
+        rather than ending the replay, so that the frames captured once the connection was restored can still be read.
+
+        Returns:
+            frame: A tuple holding (frame_type, capture_time, raw_data), where the capture time is a datetime.
+
+        Raises:
+            CallOrderError: Raised if playback has not previously been initialised.
+            EndOfReplay: Raised when all the frames in the replay have been read.
+            FileReadError: Raised if an error is encountered while attempting to read the next frame.
+            PlaybackError: Raised when a frame with an unknown data identifier or an invalid date stamp is discovered.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "read_frame"))
+
+        if not self.playback_initialised_flag:
+            raise SboDataSourceReplay.CallOrderError("The read_frame() method was called before the initialise_playback() method.")
+
+        try:
+            data_identifier, datestamp, raw_data = self._get_next_frame()
+
+        except SboDataSourceReplay.EndOfReplay:
+            self.playback_initialised_flag = False
+            raise
+
+        if len(raw_data) == 0:
+            data_identifier = NO_DATA
+
+        if data_identifier == LIVE_DATA:
+            frame_type = LIVE_DATA_FRAME
+
+        elif data_identifier == NON_LIVE_DATA:
+            frame_type = NON_LIVE_DATA_FRAME
+
+        elif data_identifier == NO_DATA:
+            frame_type = NO_DATA_FRAME
+
+        else:
+            self.playback_initialised_flag = False
+            raise SboDataSourceReplay.PlaybackError("Unknown Data Identifier: '%s'" % data_identifier)
+
+        try:
+            capture_time = datetime.datetime.fromtimestamp(self._parse_datestamp(datestamp))
+
+        except ValueError:
+            self.playback_initialised_flag = False
+            raise SboDataSourceReplay.PlaybackError("Invalid date stamp: '%s'" % datestamp)
+
+        self.last_datestamp = datestamp
+
+        return (frame_type, capture_time, raw_data)
+
+
     def get_last_datestamp(self):
 
         """This public method returns the date stamp of the last raw data replay file to be loaded for playback.
@@ -529,3 +2692,229 @@ class SboDataSourceReplay(object): # pylint: disable-msg=R0902
         debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s (%s)" % (SboDataSourceReplay.__name__, "get_last_datestamp", self.last_datestamp))
 
         return self.last_datestamp
+
+
+    def start_prefetch(self, prefetch_depth=DEFAULT_PREFETCH_DEPTH):
+
+        """This public method starts a prefetch thread which reads frames ahead of playback into a bounded queue.
+
+        The playback() method then returns frames from memory, rather than waiting on the disk for each one.
+        The prefetch thread is restarted from the new position whenever playback is initialised or re-initialised.
+
+        Args:
+            prefetch_depth: The maximum number of frames to read ahead.
+
+        Returns:
+            None
+
+        Raises:
+            CallOrderError: Raised if playback has not been initialised.
+            PlaybackInitialisationError: Raised if an invalid prefetch depth is given.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "start_prefetch"))
+
+        if not self.playback_initialised_flag:
+            raise SboDataSourceReplay.CallOrderError("The start_prefetch() method was called before the initialise_playback() method.")
+
+        if not isinstance(prefetch_depth, int) or isinstance(prefetch_depth, bool) or prefetch_depth <= 0:
+            raise SboDataSourceReplay.PlaybackInitialisationError("Invalid prefetch depth: '%s'" % prefetch_depth)
+
+        self._stop_prefetch_thread()
+
+        self.prefetch_depth = prefetch_depth
+        self._start_prefetch_thread()
+
+
+    def stop_prefetch(self):
+
+        """This public method stops the prefetch thread.
+
+        Any frames that have already been read ahead are still returned by playback(), before it goes back to reading from the disk.
+
+        This simple method has no arguments or returns and raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "stop_prefetch"))
+
+        self._stop_prefetch_thread()
+        self.prefetch_depth = NO_PREFETCH
+
+
+    def get_prefetch_statistics(self):
+
+        """This public method reports how far the prefetch thread is reading ahead of playback and how long playback has waited for it.
+
+        Returns:
+            prefetch_statistics: A dictionary holding the current 'queue_depth', the 'prefetch_depth' limit,
+                the 'average_queue_depth' seen by playback, the number of 'stalls' where playback found the queue empty
+                and the total 'stall_seconds' spent waiting for the prefetch thread.
+                The average queue depth is None until playback has taken a frame from the queue.
+
+        This simple method has no arguments and raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "get_prefetch_statistics"))
+
+        prefetch_statistics = {
+            'queue_depth': 0,
+            'prefetch_depth': self.prefetch_depth,
+            'average_queue_depth': None,
+            'stalls': self.prefetch_stalls,
+            'stall_seconds': self.prefetch_stall_seconds
+        }
+
+        if self.prefetch_queue is not None:
+            prefetch_statistics['queue_depth'] = self.prefetch_queue.qsize()
+
+        if self.prefetch_gets:
+            prefetch_statistics['average_queue_depth'] = float(self.prefetch_queue_depth_total) / self.prefetch_gets
+
+        return prefetch_statistics
+
+
+    def set_retention_policy(self, max_age=NO_RETENTION_LIMIT, max_total_bytes=NO_RETENTION_LIMIT, max_archives=NO_RETENTION_LIMIT, compact_archives=True):
+
+        """This public method sets the retention policy for the capture archives, which is applied each time the capture folder is archived.
+
+        Each time the current capture folder is archived on restart, an archive maintenance thread compacts the archive folders
+        into archive bundles and then removes the oldest archives until the policy is met. The current capture folder is never removed.
+
+        Args:
+            max_age: A timedelta giving the age beyond which an archive is removed, or None for no limit.
+            max_total_bytes: The number of bytes the archives may use in total, or None for no limit.
+            max_archives: The number of archives to keep, or None for no limit.
+            compact_archives: A boolean which is True to compact the archive folders into archive bundles.
+
+        Returns:
+            None
+
+        Raises:
+            DataCaptureError: Raised if an invalid limit is given.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "set_retention_policy"))
+
+        if max_age is not NO_RETENTION_LIMIT and not isinstance(max_age, datetime.timedelta):
+            raise SboDataSourceReplay.DataCaptureError("Invalid maximum archive age: '%s'" % max_age)
+
+        for limit in (max_total_bytes, max_archives):
+            if limit is not NO_RETENTION_LIMIT and (not isinstance(limit, int) or isinstance(limit, bool) or limit < 0):
+                raise SboDataSourceReplay.DataCaptureError("Invalid retention limit: '%s'" % limit)
+
+        self.retention_policy = {
+            'max_age': max_age,
+            'max_total_bytes': max_total_bytes,
+            'max_archives': max_archives,
+            'compact_archives': bool(compact_archives)
+        }
+
+
+    def compact_archives(self):
+
+        """This public method compacts each archive folder into a single compressed and indexed archive bundle.
+
+        An archive bundle can be played back by passing its path to the initalise_playback() method in place of a replay folder.
+        An archive folder that can not be read is left as it is.
+
+        Returns:
+            bundle_file_paths: A list of the paths of the archive bundles that have been created.
+
+        This simple method has no arguments and raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "compact_archives"))
+
+        bundle_file_paths = []
+
+        for capture_archive_path in self._get_capture_archive_paths():
+
+            if not os.path.isdir(capture_archive_path):
+                continue
+
+            try:
+                bundle_file_paths.append(self._compact_archive(capture_archive_path))
+
+            except (SboDataSourceReplay.PlaybackInitialisationError, SboDataSourceReplay.FileReadError, IOError, OSError, ValueError) as exception_instance:
+                debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_WARNINGS, debug.WARNING, "compact_archives() experienced %s: %s" % (type(exception_instance).__name__, exception_instance))
+
+        return bundle_file_paths
+
+
+    def apply_retention_policy(self):
+
+        """This public method removes the oldest capture archives until the retention policy is met.
+
+        Returns:
+            removed_archive_paths: A list of the paths of the archive folders and archive bundles that have been removed.
+
+        Raises:
+            OSError: Raised if an archive can not be removed.
+
+        This simple method has no arguments.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "apply_retention_policy"))
+
+        if self.retention_policy is None:
+            return []
+
+        capture_archive_paths = self._get_capture_archive_paths()
+        capture_archive_sizes = [self._get_capture_archive_size(capture_archive_path) for capture_archive_path in capture_archive_paths]
+        removed_archive_paths = []
+
+        now = datetime.datetime.now()
+
+        while capture_archive_paths:
+
+            # Archive bundles are named after the archive folder they were compacted from.
+            capture_archive_name = os.path.splitext(os.path.basename(capture_archive_paths[0]))[0]
+            archive_datestamp = capture_archive_name[len(CAPTURE_ARCHIVE_SUBFOLDER_PREFIX):]
+
+            try:
+                archive_age = now - datetime.datetime.strptime(archive_datestamp, CAPTURE_ARCHIVE_DATESTAMP_FORMAT)
+
+            except ValueError:
+                archive_age = None
+
+            too_old = self.retention_policy['max_age'] is not NO_RETENTION_LIMIT and archive_age is not None and archive_age > self.retention_policy['max_age']
+            too_many = self.retention_policy['max_archives'] is not NO_RETENTION_LIMIT and len(capture_archive_paths) > self.retention_policy['max_archives']
+            too_big = self.retention_policy['max_total_bytes'] is not NO_RETENTION_LIMIT and sum(capture_archive_sizes) > self.retention_policy['max_total_bytes']
+
+            if not (too_old or too_many or too_big):
+                break
+
+            capture_archive_path = capture_archive_paths.pop(0)
+            capture_archive_sizes.pop(0)
+
+            debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "Removing capture archive: '%s'" % capture_archive_path)
+
+            if os.path.isdir(capture_archive_path):
+                shutil.rmtree(capture_archive_path)
+
+            else:
+                os.remove(capture_archive_path)
+
+            removed_archive_paths.append(capture_archive_path)
+
+        return removed_archive_paths
+
+
+    def wait_for_archive_maintenance(self, timeout=None):
+
+        """This public method waits for the archive maintenance thread to finish compacting and pruning the capture archives.
+
+        Args:
+            timeout: The number of seconds to wait, or None to wait until it has finished.
+
+        Returns:
+            finished: A boolean which is True if no archive maintenance is still running.
+
+        This simple method raises no errors.
+        """
+        debug.message(debug_flags.SBO_DATA_SOURCE_REPLAY_INFOS, debug.INFO, "%s: %s" % (SboDataSourceReplay.__name__, "wait_for_archive_maintenance"))
+
+        if self.archive_maintenance_thread is not None:
+
+            self.archive_maintenance_thread.join(timeout)
+
+            if self.archive_maintenance_thread.is_alive():
+                return False
+
+            self.archive_maintenance_thread = None
+
+        return True
@@ -9,9 +9,14 @@ import debug
 import debug_flags
 
 # Test specific imports.
+import copy
 import datetime
+import time
 from data_source_base import DataSourceBase
 
+# Import the module of the class under test to access its constants.
+import sbo_data_source_cache
+
 # The class under test.
 from sbo_data_source_cache import SboDataSourceCache
 
@@ -30,6 +35,17 @@ SKIP_TEST_11 = False
 SKIP_TEST_12 = False
 SKIP_TEST_13 = False
 SKIP_TEST_14 = False
+SKIP_TEST_15 = False
+SKIP_TEST_16 = False
+SKIP_TEST_17 = False
+SKIP_TEST_18 = False
+SKIP_TEST_19 = False
+SKIP_TEST_20 = False
+SKIP_TEST_21 = False
+SKIP_TEST_22 = False
+SKIP_TEST_23 = False
+SKIP_TEST_24 = False
+SKIP_TEST_25 = False
 
 # SBO betting site details.
 SBO_ID = 2
@@ -296,19 +312,25 @@ class TestSboDataSourceCache(unittest.TestCase): # pylint: disable-msg=R0904
             debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE_EXTRA, debug.TESTUNIT, "Testing tournament data with invalid type %s of %s." % (number, len(self.test_types)))
             self.assertRaises(SboDataSourceCache.UnexpectedDataError, self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache, frame_cache_data)
 
-        # B: Test that the method can cope with invalid Tournament data types by raising an exception.
+        # B: Test that the method can cope with invalid Tournament data types by quarantining the records.
         invalid_tournament_data = [None, None, None]
         frame_cache_data = [invalid_tournament_data, None, None, None, None, None, None, None]
-        self.assertRaises(SboDataSourceCache.UnexpectedDataError, self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache, frame_cache_data)
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+        actual_result = len(self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_quarantined_records())
+        expected_result = len(invalid_tournament_data)
+        self.assertEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
 
-        # C: Test that the method can cope with invalid Tournament data types by raising an exception.
+        # C: Test that the method can cope with invalid Tournament data types by quarantining the records.
         invalid_tournament_data = [
             [307],
             [3868],
             [0]
         ]
         frame_cache_data = [invalid_tournament_data, None, None, None, None, None, None, None]
-        self.assertRaises(SboDataSourceCache.UnexpectedDataError, self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache, frame_cache_data)
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+        actual_result = len(self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_quarantined_records())
+        expected_result = len(invalid_tournament_data)
+        self.assertEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
 
         # D: Test that the Tournament Dictionary is empty.
         actual_result = self.sbo_data_source_cache[LIVE_DATA_FRAME].tournament_dictionary
@@ -348,19 +370,25 @@ class TestSboDataSourceCache(unittest.TestCase): # pylint: disable-msg=R0904
             debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE_EXTRA, debug.TESTUNIT, "Testing event data with invalid type %s of %s." % (number, len(self.test_types)))
             self.assertRaises(SboDataSourceCache.UnexpectedDataError, self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache, frame_cache_data)
 
-        # B: Test that the method can cope with invalid Event data types by raising an exception.
+        # B: Test that the method can cope with invalid Event data types by quarantining the records.
         invalid_event_data = [None, None, None]
         frame_cache_data = [None, invalid_event_data, None, None, None, None, None, None]
-        self.assertRaises(SboDataSourceCache.UnexpectedDataError, self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache, frame_cache_data)
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+        actual_result = len(self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_quarantined_records())
+        expected_result = len(invalid_event_data)
+        self.assertEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
 
-        # C: Test that the method can cope with invalid Event data types by raising an exception.
+        # C: Test that the method can cope with invalid Event data types by quarantining the records.
         invalid_event_data = [
             [1193897],
             [1193898],
             [0]
         ]
         frame_cache_data = [None, invalid_event_data, None, None, None, None, None, None]
-        self.assertRaises(SboDataSourceCache.UnexpectedDataError, self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache, frame_cache_data)
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+        actual_result = len(self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_quarantined_records())
+        expected_result = len(invalid_event_data)
+        self.assertEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
 
         # D: Test that the Event Dictionary is empty.
         actual_result = self.sbo_data_source_cache[LIVE_DATA_FRAME].event_dictionary
@@ -407,19 +435,25 @@ class TestSboDataSourceCache(unittest.TestCase): # pylint: disable-msg=R0904
             debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE_EXTRA, debug.TESTUNIT, "Testing event result data with invalid type %s of %s." % (number, len(self.test_types)))
             self.assertRaises(SboDataSourceCache.UnexpectedDataError, self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache, frame_cache_data)
 
-        # B: Test that the method can cope with invalid Event Result data types by raising an exception.
+        # B: Test that the method can cope with invalid Event Result data types by quarantining the records.
         invalid_event_result_data = [None, None, None]
         frame_cache_data = [None, None, invalid_event_result_data, None, None, None, None, None]
-        self.assertRaises(SboDataSourceCache.UnexpectedDataError, self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache, frame_cache_data)
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+        actual_result = len(self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_quarantined_records())
+        expected_result = len(invalid_event_result_data)
+        self.assertEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
 
-        # C: Test that the method can cope with invalid Event Result data types by raising an exception.
+        # C: Test that the method can cope with invalid Event Result data types by quarantining the records.
         invalid_event_result_data = [
             [189006],
             [189007],
             [0]
         ]
         frame_cache_data = [None, None, invalid_event_result_data, None, None, None, None, None]
-        self.assertRaises(SboDataSourceCache.UnexpectedDataError, self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache, frame_cache_data)
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+        actual_result = len(self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_quarantined_records())
+        expected_result = len(invalid_event_result_data)
+        self.assertEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
 
         # D: Test that the method can cope with invalid Event Result for deletion data types by raising an exception.
         for number, invalid_event_result_for_deletion_data in enumerate(self.test_types, start=1):
@@ -518,19 +552,25 @@ class TestSboDataSourceCache(unittest.TestCase): # pylint: disable-msg=R0904
             debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE_EXTRA, debug.TESTUNIT, "Testing event result extra data with invalid type %s of %s." % (number, len(self.test_types)))
             self.assertRaises(SboDataSourceCache.UnexpectedDataError, self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache, frame_cache_data)
 
-        # B: Test that the method can cope with invalid Event Result Extra data types by raising an exception.
+        # B: Test that the method can cope with invalid Event Result Extra data types by quarantining the records.
         invalid_event_result_extra_data = [None, None, None]
         frame_cache_data = [None, None, None, invalid_event_result_extra_data, None, None, None, None]
-        self.assertRaises(SboDataSourceCache.UnexpectedDataError, self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache, frame_cache_data)
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+        actual_result = len(self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_quarantined_records())
+        expected_result = len(invalid_event_result_extra_data)
+        self.assertEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
 
-        # C: Test that the method can cope with invalid Event Result Extra data types by raising an exception.
+        # C: Test that the method can cope with invalid Event Result Extra data types by quarantining the records.
         invalid_event_result_extra_data = [
             [189006],
             [189007],
             [0]
         ]
         frame_cache_data = [None, None, None, invalid_event_result_extra_data, None, None, None, None]
-        self.assertRaises(SboDataSourceCache.UnexpectedDataError, self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache, frame_cache_data)
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+        actual_result = len(self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_quarantined_records())
+        expected_result = len(invalid_event_result_extra_data)
+        self.assertEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
 
         # D: Test that the Event Result Extra Dictionary is empty.
         actual_result = self.sbo_data_source_cache[LIVE_DATA_FRAME].event_result_extra_dictionary
@@ -578,20 +618,29 @@ class TestSboDataSourceCache(unittest.TestCase): # pylint: disable-msg=R0904
             debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE_EXTRA, debug.TESTUNIT, "Testing odds data with invalid type %s of %s." % (number, len(self.test_types)))
             self.assertRaises(SboDataSourceCache.UnexpectedDataError, self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache, frame_cache_data)
 
-        # B: Test that the method can cope with invalid Odds data types by raising an exception.
+        # B: Test that the method can cope with invalid Odds data types by quarantining the records.
         invalid_odds_data = [None, None, None]
         frame_cache_data = [None, None, None, None, None, invalid_odds_data, None, None]
-        self.assertRaises(SboDataSourceCache.UnexpectedDataError, self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache, frame_cache_data)
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+        actual_result = len(self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_quarantined_records())
+        expected_result = len(invalid_odds_data)
+        self.assertEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
 
-        # C: Test that the method can cope with invalid Odds data types by raising an exception.
+        # C: Test that the method can cope with invalid Odds data types by quarantining the records.
         invalid_odds_data = [12800915, None, None]
         frame_cache_data = [None, None, None, None, None, invalid_odds_data, None, None]
-        self.assertRaises(SboDataSourceCache.UnexpectedDataError, self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache, frame_cache_data)
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+        actual_result = len(self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_quarantined_records())
+        expected_result = len(invalid_odds_data)
+        self.assertEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
 
-        # D: Test that the method can cope with invalid Odds data types by raising an exception.
+        # D: Test that the method can cope with invalid Odds data types by quarantining the records.
         invalid_odds_data = [12800915, [0], [0]]
         frame_cache_data = [None, None, None, None, None, invalid_odds_data, None, None]
-        self.assertRaises(SboDataSourceCache.UnexpectedDataError, self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache, frame_cache_data)
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+        actual_result = len(self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_quarantined_records())
+        expected_result = len(invalid_odds_data)
+        self.assertEqual(actual_result, expected_result, "[D] The actual result doesn't match the expected result.")
 
         # E: Test that the method can cope with invalid Odds data for deletion types by raising an exception.
         for number, invalid_odds_data_for_deletion in enumerate(self.test_types, start=1):
@@ -710,19 +759,25 @@ class TestSboDataSourceCache(unittest.TestCase): # pylint: disable-msg=R0904
             debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE_EXTRA, debug.TESTUNIT, "Testing market group data with invalid type %s of %s." % (number, len(self.test_types)))
             self.assertRaises(SboDataSourceCache.UnexpectedDataError, self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache, frame_cache_data)
 
-        # B: Test that the method can cope with invalid Market Group data types by raising an exception.
+        # B: Test that the method can cope with invalid Market Group data types by quarantining the records.
         invalid_market_group_data = [None, None, None]
         frame_cache_data = [None, None, None, None, None, None, None, invalid_market_group_data]
-        self.assertRaises(SboDataSourceCache.UnexpectedDataError, self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache, frame_cache_data)
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+        actual_result = len(self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_quarantined_records())
+        expected_result = len(invalid_market_group_data)
+        self.assertEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
 
-        # C: Test that the method can cope with invalid Market Group data types by raising an exception.
+        # C: Test that the method can cope with invalid Market Group data types by quarantining the records.
         invalid_market_group_data = [
             [126],
             [128],
             [0]
         ]
         frame_cache_data = [None, None, None, None, None, None, None, invalid_market_group_data]
-        self.assertRaises(SboDataSourceCache.UnexpectedDataError, self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache, frame_cache_data)
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+        actual_result = len(self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_quarantined_records())
+        expected_result = len(invalid_market_group_data)
+        self.assertEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
 
         # D: Test that the Market Group Dictionary is empty.
         actual_result = self.sbo_data_source_cache[LIVE_DATA_FRAME].market_group_dictionary
@@ -982,7 +1037,7 @@ class TestSboDataSourceCache(unittest.TestCase): # pylint: disable-msg=R0904
             12800934: {'prices': [2.09, 1.75], 'line_number': 1, 'odds_data': [189007, 1, 1, 2000.0, 0.25]},
             12800936: {'prices': [1.72, 2.11], 'line_number': 1, 'odds_data': [189007, 3, 1, 2000.0, 1.75]},
             12800938: {'prices': [9.5, 2.9, 1.5], 'line_number': 1, 'odds_data': [189007, 5, 1, 500.0, 0]},
-            12816840: {'prices': [3.22, 5.76], 'line_number': 1, 'odds_data': [189006, 3, 1, 800.0, 1.75]},
+            12816840: {'prices': [3.22, 5.76], 'line_number': 2, 'odds_data': [189006, 3, 1, 800.0, 1.75]},
             12801010: {'prices': [3.42, 1.7], 'line_number': 1, 'odds_data': [189011, 1, 1, 2000.0, 0.25]},
             12800915: {'prices': [3.5, 2.87], 'line_number': 1, 'odds_data': [189006, 1, 1, 1000.0, 0.25]},
             12801012: {'prices': [2.07, 1.75], 'line_number': 1, 'odds_data': [189011, 3, 1, 2000.0, 1.25]},
@@ -1428,5 +1483,713 @@ class TestSboDataSourceCache(unittest.TestCase): # pylint: disable-msg=R0904
                 self.assertRaises(DataSourceBase.EventIndexError, self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_modified_event, event_result_id, modified_properties)
 
 
+    @unittest.skipIf(SKIP_TEST_15, "in development")
+    def test_15_query_events(self):
+
+        """Test that Event Results can be queried from the maintained indexes."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s:" % "test_15_query_events")
+
+        # Populating the cache with the default data set.
+        self._populate_cache(LIVE_DATA_FRAME)
+
+        # A: Test that the Event Results can be queried by Tournament.
+        actual_result = sorted(self.sbo_data_source_cache[LIVE_DATA_FRAME].query_by_tournament(307))
+        expected_result = [189006, 189007, 189011, 190850]
+        self.assertListEqual(actual_result, expected_result, "[A] The actual result doesn't match the expected result.")
+
+        # B: Test that the Event Results can be queried by Match Stage.
+        actual_result = sorted(self.sbo_data_source_cache[LIVE_DATA_FRAME].query_by_match_stage(sbo_data_source_cache.FIRST_HALF))
+        expected_result = [190800]
+        self.assertListEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        # C: Test that the Event Results can be queried by the Betting Available In Play flag.
+        actual_result = sorted(self.sbo_data_source_cache[LIVE_DATA_FRAME].query_by_betting_available_in_play(1))
+        expected_result = [189006, 189007, 189011, 190800, 190850]
+        self.assertListEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+        # D: Test that the Event Results can be queried by Market Group.
+        actual_result = sorted(self.sbo_data_source_cache[LIVE_DATA_FRAME].query_by_market_group(126))
+        expected_result = [190850]
+        self.assertListEqual(actual_result, expected_result, "[D] The actual result doesn't match the expected result.")
+
+        # Move one match to half time, move one event to a different tournament and delete an event result.
+        events = [[1193902, 1, 3868, 'Lazio U19', 'Anderlecht U19', '1.389', 1, '02/19/2013 22:00', 1, '', 3]]
+        event_result_extra = [[190800, 1, 5, 45, 45, 0, 0, 0]]
+        event_results_to_delete = [189006]
+        frame_cache_data = [None, events, None, event_result_extra, event_results_to_delete, None, None, None]
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+
+        # E: Test that the indexes reflect the modified and deleted data.
+        actual_result = sorted(self.sbo_data_source_cache[LIVE_DATA_FRAME].query_by_tournament(307))
+        expected_result = [189007, 190850]
+        self.assertListEqual(actual_result, expected_result, "[E] The actual result doesn't match the expected result.")
+
+        # F: Test that the match stage index has followed the change of period.
+        actual_result = sorted(self.sbo_data_source_cache[LIVE_DATA_FRAME].query_by_match_stage(sbo_data_source_cache.HALF_TIME))
+        expected_result = [190800]
+        self.assertListEqual(actual_result, expected_result, "[F] The actual result doesn't match the expected result.")
+
+        # G: Test that the criteria can be combined.
+        actual_result = sorted(self.sbo_data_source_cache[LIVE_DATA_FRAME].query_events(tournament_id=3868, betting_available_in_play=1))
+        expected_result = [190800]
+        self.assertListEqual(actual_result, expected_result, "[G] The actual result doesn't match the expected result.")
+
+        # H: Test that a query with no matches returns an empty list.
+        actual_result = self.sbo_data_source_cache[LIVE_DATA_FRAME].query_by_tournament(123)
+        expected_result = []
+        self.assertListEqual(actual_result, expected_result, "[H] The actual result doesn't match the expected result.")
+
+        # Receive an Event Result before its Event, then its Event, then its first extras, each in a separate frame.
+        event_results = [[190900, 1196000, 0, 0, 0, 2]]
+        frame_cache_data = [None, None, event_results, None, None, None, None, None]
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+
+        events = [[1196000, 1, 3868, 'Riffa', 'Hidd', '1.410', 10, '02/19/2013 23:30', 1, '', 2]]
+        frame_cache_data = [None, events, None, None, None, None, None, None]
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+
+        # I: Test that the Event Result has been re-indexed once its Event has arrived.
+        actual_result = [190900 in self.sbo_data_source_cache[LIVE_DATA_FRAME].query_by_tournament(3868), 190900 in self.sbo_data_source_cache[LIVE_DATA_FRAME].query_by_betting_available_in_play(1)]
+        expected_result = [True, True]
+        self.assertListEqual(actual_result, expected_result, "[I] The actual result doesn't match the expected result.")
+
+        event_result_extra = [[190900, 1, 1, 5, 45, 0, 0, 0]]
+        frame_cache_data = [None, None, None, event_result_extra, None, None, None, None]
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+
+        # J: Test that the match stage index has followed the first extras received for the Event Result.
+        actual_result = sorted(self.sbo_data_source_cache[LIVE_DATA_FRAME].query_by_match_stage(sbo_data_source_cache.FIRST_HALF))
+        expected_result = [190900]
+        self.assertListEqual(actual_result, expected_result, "[J] The actual result doesn't match the expected result.")
+
+
+    @unittest.skipIf(SKIP_TEST_16, "in development")
+    def test_16_board_view(self):
+
+        """Test that the sorted board view is maintained as the cache is updated."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s:" % "test_16_board_view")
+
+        # Populating the cache with the default data set.
+        self._populate_cache(LIVE_DATA_FRAME)
+
+        # A: Test that the board is ordered by Tournament Name, then Event Sort Code, then Show Time.
+        actual_result = self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_board_rows(0, 10)
+        expected_result = [190800, 189006, 189007, 189011, 190850]
+        self.assertListEqual(actual_result, expected_result, "[A] The actual result doesn't match the expected result.")
+
+        # B: Test that a range of rows can be fetched.
+        actual_result = self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_board_rows(1, 3)
+        expected_result = [189006, 189007]
+        self.assertListEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        # Modify the Event Sort Code of an Event so that it moves up the board.
+        events = [[1193902, 1, 307, 'Lazio U19', 'Anderlecht U19', '1.300', 10, '02/19/2013 22:00', 1, '', 3]]
+        frame_cache_data = [None, events, None, None, None, None, None, None]
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+
+        # C: Test that the board has been re-ordered.
+        actual_result = self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_board_rows(0, 10)
+        expected_result = [190800, 189011, 189006, 189007, 190850]
+        self.assertListEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+        # D: Test that only the row whose sort key changed is reported as moved.
+        actual_result = self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_board_moves()
+        expected_result = {189011: (3, 1)}
+        self.assertDictEqual(actual_result, expected_result, "[D] The actual result doesn't match the expected result.")
+
+        # Delete an Event Result.
+        event_results_to_delete = [190800]
+        frame_cache_data = [None, None, None, None, event_results_to_delete, None, None, None]
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+
+        # E: Test that the deleted Event Result has been removed from the board.
+        actual_result = self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_board_rows(0, 10)
+        expected_result = [189011, 189006, 189007, 190850]
+        self.assertListEqual(actual_result, expected_result, "[E] The actual result doesn't match the expected result.")
+
+        # F: Test that the row of an Event Result can be looked-up.
+        actual_result = self.sbo_data_source_cache[LIVE_DATA_FRAME].get_board_row(190850)
+        expected_result = 3
+        self.assertEqual(actual_result, expected_result, "[F] The actual result doesn't match the expected result.")
+
+        # Receive two Event Results before their Event, Tournament and Market Group, then each of those in a separate frame.
+        event_results = [[190901, 1196001, 0, 0, 0, 2], [190902, 1196001, 130, 0, 0, 1]]
+        frame_cache_data = [None, None, event_results, None, None, None, None, None]
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+
+        events = [[1196001, 1, 4000, 'Riffa', 'Hidd', '1.410', 10, '02/19/2013 23:30', 1, '', 2]]
+        frame_cache_data = [None, events, None, None, None, None, None, None]
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+
+        # G: Test that the Event Results are not placed on the board while their Tournament is missing.
+        actual_result = self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_board_rows(0, 10)
+        expected_result = [189011, 189006, 189007, 190850]
+        self.assertListEqual(actual_result, expected_result, "[G] The actual result doesn't match the expected result.")
+
+        tournaments = [[4000, 'Bahrain Kings Cup', '', '']]
+        frame_cache_data = [tournaments, None, None, None, None, None, None, None]
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+
+        # H: Test that the Event Result has been placed on the board once its Tournament has arrived.
+        actual_result = self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_board_rows(0, 10)
+        expected_result = [190901, 189011, 189006, 189007, 190850]
+        self.assertListEqual(actual_result, expected_result, "[H] The actual result doesn't match the expected result.")
+
+        market_groups = [[130, 'Total Bookings', '_{home}_', '_{away}_', 1, 0, 0]]
+        frame_cache_data = [None, None, None, None, None, None, None, market_groups]
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+
+        # I: Test that the Event Result in a special Market Group has been placed on the board once its Market Group has arrived.
+        actual_result = self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_board_rows(0, 10)
+        expected_result = [190901, 190902, 189011, 189006, 189007, 190850]
+        self.assertListEqual(actual_result, expected_result, "[I] The actual result doesn't match the expected result.")
+
+
+    @unittest.skipIf(SKIP_TEST_17, "in development")
+    def test_17_line_numbers(self):
+
+        """Test that line numbers are allocated persistently and reused once freed."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s:" % "test_17_line_numbers")
+
+        # Populating the cache with the default data set.
+        self._populate_cache(LIVE_DATA_FRAME)
+
+        # Add two more Full Time HDP lines to an existing Event in a later update.
+        odds = [
+            [12816840,[190800,1,1,1000.00,0.50],[1.9,1.95]],
+            [12816842,[190800,1,1,1000.00,0.75],[2.1,1.75]]
+        ]
+        frame_cache_data = [None, None, None, None, None, odds, None, None]
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+
+        odds_dictionary = self.sbo_data_source_cache[LIVE_DATA_FRAME].odds_dictionary
+
+        # A: Test that the new lines follow on from the line already cached, rather than restarting at line one.
+        actual_result = [odds_dictionary[odds_id]['line_number'] for odds_id in (12816830, 12816840, 12816842)]
+        expected_result = [1, 2, 3]
+        self.assertListEqual(actual_result, expected_result, "[A] The actual result doesn't match the expected result.")
+
+        # Delete the second line and add a replacement.
+        odds_to_delete = [12816840]
+        frame_cache_data = [None, None, None, None, None, None, odds_to_delete, None]
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+
+        odds = [[12816844,[190800,1,1,1000.00,1.00],[2.3,1.6]]]
+        frame_cache_data = [None, None, None, None, None, odds, None, None]
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+
+        # B: Test that the freed line number has been reused.
+        actual_result = odds_dictionary[12816844]['line_number']
+        expected_result = 2
+        self.assertEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        # C: Test that the allocated line numbers are keyed by Event Result ID and Market Display ID.
+        actual_result = self.sbo_data_source_cache[LIVE_DATA_FRAME].line_number_dictionary[(190800, 1)]
+        expected_result = {1, 2, 3}
+        self.assertSetEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+
+    @unittest.skipIf(SKIP_TEST_18, "in development")
+    def test_18_event_odds_grid(self):
+
+        """Test that the odds grid of each Event Result is patched as the Odds are updated."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s:" % "test_18_event_odds_grid")
+
+        # Populating the cache with the default data set.
+        self._populate_cache(LIVE_DATA_FRAME)
+
+        # A: Test that the odds grid has been built as the Odds were received.
+        actual_result = self.sbo_data_source_cache[LIVE_DATA_FRAME].event_odds_grids[190800]
+        expected_result = [
+            [('0.0', 1.77, 2.12, 0), ('0.0', 1.68, 2.25, 0), ('0.5-1', 1.8, 2.06), ('2-2.5', 2.01, 1.85)],
+            [None, None, None, None],
+            [None, None, None, None]
+        ]
+        self.assertListEqual(actual_result, expected_result, "[A] The actual result doesn't match the expected result.")
+
+        # Update the prices of one set of Odds and delete another.
+        odds = [[12816832, None, [1.6, 2.33]]]
+        odds_to_delete = [12816833]
+        frame_cache_data = [None, None, None, None, None, odds, odds_to_delete, None]
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+
+        # B: Test that only the affected cells have been patched.
+        actual_result = self.sbo_data_source_cache[LIVE_DATA_FRAME].event_odds_grids[190800]
+        expected_result = [
+            [('0.0', 1.77, 2.12, 0), ('0.0', 1.68, 2.25, 0), None, ('2-2.5', 1.6, 2.33)],
+            [None, None, None, None],
+            [None, None, None, None]
+        ]
+        self.assertListEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        # C: Test that fetching the event reads the grid, substituting fillers for the missing cell.
+        actual_result = self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_event(190800)[3]
+        expected_result = [
+            [('0.0', 1.77, 2.12, 0), ('0.0', 1.68, 2.25, 0), (0.0, 0.0, 0.0), ('2-2.5', 1.6, 2.33)],
+            [None, None, None, None],
+            [None, None, None, None]
+        ]
+        self.assertListEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+        # Receive a set of Odds whose Point can not be formatted.
+        odds = [[12816850, [190800, 7, 1, 500.00, 'x'], [1.7, 2.1]]]
+        frame_cache_data = [None, None, None, None, None, odds, None, None]
+        self.sbo_data_source_cache[LIVE_DATA_FRAME].update_cache(frame_cache_data)
+
+        # D: Test that the grid cell is marked rather than holding an exception.
+        actual_result = self.sbo_data_source_cache[LIVE_DATA_FRAME].event_odds_grids[190800][1][0]
+        expected_result = sbo_data_source_cache.ODDS_GRID_UNFORMATTABLE
+        self.assertEqual(actual_result, expected_result, "[D] The actual result doesn't match the expected result.")
+
+        # E: Test that fetching the event raises a fresh exception each time.
+        exception_instances = []
+
+        for _ in range(2):
+
+            with self.assertRaises(DataSourceBase.EventIndexError) as context_manager:
+                self.sbo_data_source_cache[LIVE_DATA_FRAME].fetch_event(190800)
+
+            exception_instances.append(context_manager.exception)
+
+        self.assertIsNot(exception_instances[0], exception_instances[1], "[E] The actual result doesn't match the expected result.")
+
+
+    @unittest.skipIf(SKIP_TEST_19, "in development")
+    def test_19_price_history(self):
+
+        """Test that the price history of each set of Odds is recorded in a bounded ring buffer."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s:" % "test_19_price_history")
+
+        # Create a temporary instance of the class, with price history enabled.
+        price_history_length = 3
+        temp_sbo_data_source_cache = SboDataSourceCache(LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET, price_history_length)
+
+        # A: Test that no history is available for unknown Odds.
+        actual_result = temp_sbo_data_source_cache.fetch_price_history(12816832)
+        expected_result = []
+        self.assertListEqual(actual_result, expected_result, "[A] The actual result doesn't match the expected result.")
+
+        # Create a set of Odds, then update its prices four times so that the ring buffer wraps around.
+        odds = [[12816832, [190800, 3, 1, 1000.00, 2.25], [2.01, 1.85]]]
+        frame_cache_data = [None, None, None, None, None, odds, None, None]
+        temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        for price_1 in (2.02, 2.03, 2.04, 2.05):
+
+            odds = [[12816832, None, [price_1, None]]]
+            frame_cache_data = [None, None, None, None, None, odds, None, None]
+            temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        price_history = temp_sbo_data_source_cache.fetch_price_history(12816832)
+
+        # B: Test that only the most recent entries are kept, oldest first.
+        actual_result = [row[sbo_data_source_cache.PRICE_HISTORY_PRICE_1] for segment in price_history for row in segment.tolist()]
+        expected_result = [2.03, 2.04, 2.05]
+        self.assertListEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        # C: Test that unchanged values are carried into each entry.
+        actual_result = [row[sbo_data_source_cache.PRICE_HISTORY_POINT] for segment in price_history for row in segment.tolist()]
+        expected_result = [2.25, 2.25, 2.25]
+        self.assertListEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+        # D: Test that the returned segments are views of the ring buffer rather than copies.
+        actual_result = [isinstance(segment, memoryview) for segment in price_history]
+        expected_result = [True] * len(price_history)
+        self.assertListEqual(actual_result, expected_result, "[D] The actual result doesn't match the expected result.")
+
+        # E: Test that a window can be requested.
+        actual_result = [row[sbo_data_source_cache.PRICE_HISTORY_PRICE_1] for segment in temp_sbo_data_source_cache.fetch_price_history(12816832, 2) for row in segment.tolist()]
+        expected_result = [2.04, 2.05]
+        self.assertListEqual(actual_result, expected_result, "[E] The actual result doesn't match the expected result.")
+
+
+    @unittest.skipIf(SKIP_TEST_20 or sbo_data_source_cache.numpy is None, "in development or NumPy not available")
+    def test_20_price_movement_scanner(self):
+
+        """Test that sharp price and point movements are flagged after each cache update."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s:" % "test_20_price_movement_scanner")
+
+        # Create a temporary instance of the class, with the scanner enabled over a window of two updates.
+        temp_sbo_data_source_cache = SboDataSourceCache(LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET)
+        temp_sbo_data_source_cache.enable_price_movement_scanner(0.25, 0.5, 2)
+
+        odds = [
+            [12816830, [190800, 1, 1, 1000.00, 0.00], [1.68, 2.25]],
+            [12816832, [190800, 3, 1, 1000.00, 2.25], [2.01, 1.85]]
+        ]
+        frame_cache_data = [None, None, None, None, None, odds, None, None]
+        temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        # A: Test that newly received Odds are not flagged.
+        actual_result = temp_sbo_data_source_cache.fetch_price_movements()
+        expected_result = []
+        self.assertListEqual(actual_result, expected_result, "[A] The actual result doesn't match the expected result.")
+
+        # Move a price in two small steps, which only add up to a sharp move across the window.
+        for price_1 in (1.83, 1.98):
+
+            odds = [[12816830, None, [price_1, None]]]
+            frame_cache_data = [None, None, None, None, None, odds, None, None]
+            temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        # B: Test that the move across the window has been flagged.
+        actual_result = temp_sbo_data_source_cache.fetch_price_movements()
+        expected_result = [(190800, 1, 1)]
+        self.assertListEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        # Move a point sharply.
+        odds = [[12816832, [190800, 3, 1, 1000.00, 3.25], None]]
+        frame_cache_data = [None, None, None, None, None, odds, None, None]
+        temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        # C: Test that the point move has been flagged, and that the earlier price move has left the window.
+        actual_result = temp_sbo_data_source_cache.fetch_price_movements()
+        expected_result = [(190800, 3, 1)]
+        self.assertListEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+
+    @unittest.skipIf(SKIP_TEST_21, "in development")
+    def test_21_memory_limits(self):
+
+        """Test that the memory report counts the cached records and that the least recently updated non-live events are evicted."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s:" % "test_21_memory_limits")
+
+        # Create a temporary instance of the class.
+        temp_sbo_data_source_cache = SboDataSourceCache(LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET)
+
+        tournaments = [[307, 'Torneo Viareggio', '', '']]
+        events = [
+            [1193897, 1, 307, 'Torino U19', 'AS Roma U19', '1.374', 10, '02/19/2013 22:00', 1, '', 5],
+            [1193898, 1, 307, 'Juventus U19', 'Juve Stabia U19', '1.377', 10, '02/19/2013 22:00', 1, '', 3]
+        ]
+        event_results = [
+            [189006, 1193897, 0, 1, 1, 4],
+            [189007, 1193898, 0, 0, 1, 3],
+            [189011, 1193898, 0, 0, 0, 3]
+        ]
+        event_result_extra = [[189006, 1, 2, 20, 45, 0, 0, 0]]
+        odds = [
+            [12800915, [189006, 1, 1, 1000.00, 0.25], [2.2, 1.67]],
+            [12800934, [189007, 1, 1, 2000.00, 0.25], [2.09, 1.75]],
+            [12801010, [189011, 1, 1, 2000.00, 0.25], [2.16, 1.7]]
+        ]
+        frame_cache_data = [tournaments, events, event_results, event_result_extra, None, odds, None, None]
+        temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        # A: Test that the memory report counts the records in each table.
+        memory_report = temp_sbo_data_source_cache.memory_report()
+        actual_result = [memory_report[table_name]['records'] for table_name in ('tournaments', 'events', 'event_results', 'event_result_extras', 'odds')]
+        expected_result = [1, 2, 3, 1, 3]
+        self.assertListEqual(actual_result, expected_result, "[A] The actual result doesn't match the expected result.")
+
+        # B: Test that the total is the sum of the estimates for each table.
+        actual_result = memory_report['total']['bytes']
+        expected_result = sum(memory_report[table_name]['bytes'] for table_name in memory_report if table_name != 'total')
+        self.assertEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        # Update the Odds of an Event Result, making 189011 the least recently updated.
+        odds = [[12800934, None, [2.10, 1.74]]]
+        frame_cache_data = [None, None, None, None, None, odds, None, None]
+        temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        # Set a soft limit that the cache can never be within, then update the cache.
+        temp_sbo_data_source_cache.set_memory_limits(1, None)
+        frame_cache_data = [None, None, None, None, None, None, None, None]
+        events_created, events_updated, events_deleted = temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        # C: Test that the non-live Event Results have been evicted, least recently updated first, and reported as deleted.
+        actual_result = events_deleted
+        expected_result = [189011, 189007]
+        self.assertListEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+        # D: Test that the live Event Result and its Odds remain, and that the Odds of the evicted Event Results are gone.
+        actual_result = [sorted(temp_sbo_data_source_cache.event_result_dictionary), sorted(temp_sbo_data_source_cache.odds_dictionary)]
+        expected_result = [[189006], [12800915]]
+        self.assertListEqual(actual_result, expected_result, "[D] The actual result doesn't match the expected result.")
+
+
+    @unittest.skipIf(SKIP_TEST_22, "in development")
+    def test_22_time_to_live(self):
+
+        """Test that Event Results which are no longer received are evicted once their time to live has expired."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s:" % "test_22_time_to_live")
+
+        # Create a temporary instance of the class, where Event Results expire after one update without data.
+        temp_sbo_data_source_cache = SboDataSourceCache(LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET)
+        temp_sbo_data_source_cache.set_time_to_live(1, None)
+
+        event_results = [
+            [189006, 1193897, 0, 1, 1, 4],
+            [189007, 1193898, 0, 0, 1, 3]
+        ]
+        event_result_extra = [[189007, 1, 2, 12, 45, 1, 0, 0]]
+        odds = [
+            [12800915, [189006, 1, 1, 1000.00, 0.25], [2.2, 1.67]],
+            [12800934, [189007, 1, 1, 2000.00, 0.25], [2.09, 1.75]]
+        ]
+        frame_cache_data = [None, None, event_results, event_result_extra, None, odds, None, None]
+        temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        # Only receive the Odds of one of the Event Results.
+        odds = [[12800915, None, [2.21, 1.66]]]
+        frame_cache_data = [None, None, None, None, None, odds, None, None]
+        events_created, events_updated, events_deleted = temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        # A: Test that nothing has expired within the time to live.
+        actual_result = events_deleted
+        expected_result = []
+        self.assertListEqual(actual_result, expected_result, "[A] The actual result doesn't match the expected result.")
+
+        frame_cache_data = [None, None, None, None, None, None, None, None]
+        events_created, events_updated, events_deleted = temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        # B: Test that the Event Result which is no longer received has expired and been reported as deleted.
+        actual_result = events_deleted
+        expected_result = [189007]
+        self.assertListEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        # C: Test that the expiry has cascaded to the Event Result Extra data, the current minutes cache and the Odds.
+        actual_result = [
+            sorted(temp_sbo_data_source_cache.event_result_extra_dictionary),
+            sorted(temp_sbo_data_source_cache.current_minutes_cache),
+            sorted(temp_sbo_data_source_cache.odds_dictionary)
+        ]
+        expected_result = [[], [], [12800915]]
+        self.assertListEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+        # Expire Event Results after a minute without data, then step the wall clock forward by a day.
+        temp_sbo_data_source_cache.set_time_to_live(None, 60)
+        wall_clock = time.time
+
+        try:
+            time.time = lambda: wall_clock() + 86400
+            events_created, events_updated, events_deleted = temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        finally:
+            time.time = wall_clock
+
+        # D: Test that a step in the wall clock does not expire the Event Results.
+        actual_result = events_deleted
+        expected_result = []
+        self.assertListEqual(actual_result, expected_result, "[D] The actual result doesn't match the expected result.")
+
+
+    @unittest.skipIf(SKIP_TEST_23, "in development")
+    def test_23_cascading_delete(self):
+
+        """Test that deleting an Event Result deletes its Odds and any Events, Tournaments and Market Groups no longer referenced."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s:" % "test_23_cascading_delete")
+
+        # Create a temporary instance of the class.
+        temp_sbo_data_source_cache = SboDataSourceCache(LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET)
+
+        tournaments = [
+            [307, 'Torneo Viareggio', '', ''],
+            [3868, 'Bahrain Premier League', '', '']
+        ]
+        events = [
+            [1193897, 1, 307, 'Torino U19', 'AS Roma U19', '1.374', 10, '02/19/2013 22:00', 1, '', 5],
+            [1193898, 1, 307, 'Juventus U19', 'Juve Stabia U19', '1.377', 10, '02/19/2013 22:00', 1, '', 3]
+        ]
+        event_results = [
+            [189006, 1193897, 0, 1, 1, 4],
+            [190850, 1193897, 126, 2, 3, 1],
+            [189007, 1193898, 0, 0, 1, 3]
+        ]
+        odds = [
+            [12800915, [189006, 1, 1, 1000.00, 0.25], [2.2, 1.67]],
+            [12800920, [190850, 3, 1, 400.00, 12.00], [3.55, 6.65]],
+            [12800934, [189007, 1, 1, 2000.00, 0.25], [2.09, 1.75]]
+        ]
+        market_groups = [[126, 'Total Corners', '_{home}_', '_{away}_', 1, 0, 0]]
+        frame_cache_data = [tournaments, events, event_results, None, None, odds, None, market_groups]
+        temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        # Delete the only Event Result in a Market Group.
+        frame_cache_data = [None, None, None, None, [190850], None, None, None]
+        temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        # A: Test that the Odds and Market Group have been deleted, while the Event that is still referenced remains.
+        actual_result = [
+            sorted(temp_sbo_data_source_cache.odds_dictionary),
+            sorted(temp_sbo_data_source_cache.market_group_dictionary),
+            sorted(temp_sbo_data_source_cache.event_dictionary)
+        ]
+        expected_result = [[12800915, 12800934], [], [1193897, 1193898]]
+        self.assertListEqual(actual_result, expected_result, "[A] The actual result doesn't match the expected result.")
+
+        # Delete an Event Result in the same frame as a partial update to one of its Odds.
+        odds = [[12800915, None, [2.3, 1.6]], [12800934, None, [2.1, 1.7]]]
+        frame_cache_data = [None, None, None, None, [189006], odds, None, None]
+        temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        # B: Test that the partial update to the deleted Odds has been quarantined, while the other update has been applied.
+        actual_result = [
+            sorted(temp_sbo_data_source_cache.odds_dictionary),
+            temp_sbo_data_source_cache.odds_dictionary[12800934]['prices'],
+            [record for section, record, reason in temp_sbo_data_source_cache.fetch_quarantined_records()]
+        ]
+        expected_result = [[12800934], [2.1, 1.7], [[12800915, None, [2.3, 1.6]]]]
+        self.assertListEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        # Delete the remaining Event Results.
+        frame_cache_data = [None, None, None, None, [189006, 189007], None, None, None]
+        temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        # C: Test that the orphaned Events and Tournament have been deleted, while the Tournament that was never referenced remains.
+        actual_result = [
+            sorted(temp_sbo_data_source_cache.odds_dictionary),
+            sorted(temp_sbo_data_source_cache.event_dictionary),
+            sorted(temp_sbo_data_source_cache.tournament_dictionary)
+        ]
+        expected_result = [[], [], [3868]]
+        self.assertListEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+
+    @unittest.skipIf(SKIP_TEST_24, "in development")
+    def test_24_quarantined_records(self):
+
+        """Test that valid records are applied and malformed records are quarantined rather than failing the whole update."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s:" % "test_24_quarantined_records")
+
+        # Create a temporary instance of the class.
+        temp_sbo_data_source_cache = SboDataSourceCache(LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET)
+
+        event_results = [
+            [189006, 1193897, 0, 1, 1, 4],
+            [189007],
+            [189011, 1193902, 0, 0, 0, 3]
+        ]
+        odds = [
+            [12800915, [189006, 1, 1, 1000.00, 0.25], [2.2, 1.67]],
+            [12800934, None, [2.09, 1.75]],
+            [12800915, None, [2.21, None]]
+        ]
+        frame_cache_data = [None, None, event_results, None, None, odds, None, None]
+        events_created, events_updated, events_deleted = temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        # A: Test that the valid records have been applied, including an update to Odds created earlier in the same frame.
+        actual_result = [events_created, temp_sbo_data_source_cache.odds_dictionary[12800915]['prices']]
+        expected_result = [[189006, 189011], [2.21, 1.67]]
+        self.assertListEqual(actual_result, expected_result, "[A] The actual result doesn't match the expected result.")
+
+        # B: Test that the malformed records have been quarantined.
+        actual_result = [(section, record) for section, record, reason in temp_sbo_data_source_cache.fetch_quarantined_records()]
+        expected_result = [
+            (sbo_data_source_cache.EVENT_RESULT_DICTIONARY, [189007]),
+            (sbo_data_source_cache.ODDS_DICTIONARY, [12800934, None, [2.09, 1.75]])
+        ]
+        self.assertListEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        frame_cache_data = [None, None, None, None, None, None, None, None]
+        temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        # C: Test that the quarantined records are only reported for the update in which they were received.
+        actual_result = temp_sbo_data_source_cache.fetch_quarantined_records()
+        expected_result = []
+        self.assertListEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+        # A section holding a single malformed Odds update, alongside a valid Event Result update.
+        event_results = [[189006, 1193897, 0, 2, 1, 4]]
+        odds = [[99999999, None, [2.0, 1.8]]]
+        frame_cache_data = [None, None, event_results, None, None, odds, None, None]
+        events_created, events_updated, events_deleted = temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        # D: Test that the single malformed record is quarantined and the rest of the frame applied, with the empty section counted.
+        actual_result = [
+            sorted(events_updated),
+            [record for section, record, reason in temp_sbo_data_source_cache.fetch_quarantined_records()],
+            temp_sbo_data_source_cache.sections_without_valid_records
+        ]
+        expected_result = [[189006], [[99999999, None, [2.0, 1.8]]], 1]
+        self.assertListEqual(actual_result, expected_result, "[D] The actual result doesn't match the expected result.")
+
+        # An update to cached Odds with an empty Prices Array.
+        odds = [[12800915, None, []]]
+        frame_cache_data = [None, None, None, None, None, odds, None, None]
+        temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        # E: Test that the update with the empty Prices Array is quarantined, leaving the cached prices unchanged.
+        actual_result = [
+            [record for section, record, reason in temp_sbo_data_source_cache.fetch_quarantined_records()],
+            temp_sbo_data_source_cache.odds_dictionary[12800915]['prices']
+        ]
+        expected_result = [[[12800915, None, []]], [2.21, 1.67]]
+        self.assertListEqual(actual_result, expected_result, "[E] The actual result doesn't match the expected result.")
+
+        # List cached Odds for deletion in the same frame as a partial update to them.
+        odds = [[12800915, None, [2.3, 1.6]]]
+        frame_cache_data = [None, None, None, None, None, odds, [12800915], None]
+        temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        # F: Test that the partial update to the deleted Odds is quarantined rather than failing the frame.
+        actual_result = [
+            [record for section, record, reason in temp_sbo_data_source_cache.fetch_quarantined_records()],
+            12800915 in temp_sbo_data_source_cache.odds_dictionary
+        ]
+        expected_result = [[[12800915, None, [2.3, 1.6]]], False]
+        self.assertListEqual(actual_result, expected_result, "[F] The actual result doesn't match the expected result.")
+
+
+    @unittest.skipIf(SKIP_TEST_25, "in development")
+    def test_25_atomic_updates(self):
+
+        """Test that a cache update which fails in atomic mode is rolled back."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s:" % "test_25_atomic_updates")
+
+        # Create a temporary instance of the class, in atomic mode.
+        temp_sbo_data_source_cache = SboDataSourceCache(LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET)
+        temp_sbo_data_source_cache.set_atomic_updates(True)
+
+        # The current minutes of 189007 can not be simulated on the next update, which will cause it to fail.
+        event_results = [
+            [189006, 1193897, 0, 1, 1, 4],
+            [189007, 1193898, 0, 0, 1, 3]
+        ]
+        event_result_extra = [[189007, 1, 2, 'unknown', 45, 1, 0, 0]]
+        odds = [
+            [12800915, [189006, 1, 1, 1000.00, 0.25], [2.2, 1.67]],
+            [12800934, [189007, 1, 1, 2000.00, 0.25], [2.09, 1.75]]
+        ]
+        frame_cache_data = [None, None, event_results, event_result_extra, None, odds, None, None]
+        temp_sbo_data_source_cache.update_cache(frame_cache_data)
+
+        cache_state = copy.deepcopy([
+            temp_sbo_data_source_cache.event_result_dictionary,
+            temp_sbo_data_source_cache.odds_dictionary,
+            temp_sbo_data_source_cache.event_odds_grids,
+            list(temp_sbo_data_source_cache.event_result_last_seen)
+        ])
+
+        # Delete one Event Result, create another and update some Odds, before the update fails.
+        event_results = [[189011, 1193902, 0, 0, 0, 3]]
+        odds = [[12800934, None, [2.10, 1.74]]]
+        frame_cache_data = [None, None, event_results, None, [189006], odds, None, None]
+
+        # A: Test that the failure is still raised.
+        self.assertRaises(SboDataSourceCache.UnexpectedDataError, temp_sbo_data_source_cache.update_cache, frame_cache_data)
+
+        # B: Test that every change made before the failure has been rolled back.
+        actual_result = [
+            temp_sbo_data_source_cache.event_result_dictionary,
+            temp_sbo_data_source_cache.odds_dictionary,
+            temp_sbo_data_source_cache.event_odds_grids,
+            list(temp_sbo_data_source_cache.event_result_last_seen)
+        ]
+        expected_result = cache_state
+        self.assertListEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+
 if __name__ == "__main__":
     unittest.main()
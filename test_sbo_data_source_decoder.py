@@ -0,0 +1,203 @@
+#!/usr/local/bin/python3.2
+# coding: utf-8
+
+"""This module tests the sbo_data_source_decoder module."""
+
+import unittest
+import debug
+import debug_flags
+
+# Test specific imports.
+import sbo_data_source_cache
+from sbo_data_source_cache import SboDataSourceCache
+
+# The class under test.
+from sbo_data_source_decoder import SboDataSourceDecoder
+
+# Individual tests can be skipped by setting the appropriate flag.
+SKIP_TEST_01 = False
+SKIP_TEST_02 = False
+SKIP_TEST_03 = False
+SKIP_TEST_04 = False
+
+# SBO betting site details.
+SBO_ID = 2
+GMT_OFFSET = 8
+
+# Data frames.
+LIVE_DATA_FRAME = 0
+
+# Raw data from the SBO server, wrapped in a function call.
+RAW_DATA = (
+    "onUpdate('od',["
+    "[[307,'Torneo Viareggio','',''],[3868,'Bahrain Premier League','','']],"
+    "[[1193897,1,307,'Torino U19','AS Roma U19','1.374',10,'02/19/2013 22:00',1,'',5],"
+    "[1195114,1,3868,'Muharraq','Busaiteen','1.407',10,'02/19/2013 23:00',1,'',6]],"
+    "[[189006,1193897,0,1,1,4],[190800,1195114,0,0,0,6]],"
+    "[[189006,1,2,20,45,0,0,0],[190800,1,1,12,45,0,0,0]],"
+    "null,"
+    "[[12800915,[189006,1,1,1000.00,0.25],[2.2,1.67]],[12816830,[190800,1,1,1000.00,0.00],[1.68,2.25]]],"
+    ","
+    "[]"
+    "]);"
+)
+
+# The frame cache data that the raw data above represents.
+FRAME_CACHE_DATA = [
+    [[307, 'Torneo Viareggio', '', ''], [3868, 'Bahrain Premier League', '', '']],
+    [
+        [1193897, 1, 307, 'Torino U19', 'AS Roma U19', '1.374', 10, '02/19/2013 22:00', 1, '', 5],
+        [1195114, 1, 3868, 'Muharraq', 'Busaiteen', '1.407', 10, '02/19/2013 23:00', 1, '', 6]
+    ],
+    [[189006, 1193897, 0, 1, 1, 4], [190800, 1195114, 0, 0, 0, 6]],
+    [[189006, 1, 2, 20, 45, 0, 0, 0], [190800, 1, 1, 12, 45, 0, 0, 0]],
+    None,
+    [[12800915, [189006, 1, 1, 1000.00, 0.25], [2.2, 1.67]], [12816830, [190800, 1, 1, 1000.00, 0.00], [1.68, 2.25]]],
+    None,
+    []
+]
+
+
+class TestSboDataSourceDecoder(unittest.TestCase): # pylint: disable-msg=R0904
+
+    """This class tests the SboDataSourceDecoder class."""
+
+    @classmethod
+    def setUpClass(cls): # pylint: disable-msg=C0103
+
+        """This method is executed once at the start of this Unit Test."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s..." % TestSboDataSourceDecoder.__name__)
+
+
+    @unittest.skipIf(SKIP_TEST_01, "in development")
+    def test_01_decode(self):
+
+        """Test that decoding raw data updates the cache in the same way as the equivalent frame cache data."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s:" % "test_01_decode")
+
+        decoded_cache = SboDataSourceCache(LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET)
+        sbo_data_source_decoder = SboDataSourceDecoder(decoded_cache)
+        decode_result = sbo_data_source_decoder.decode(RAW_DATA)
+
+        updated_cache = SboDataSourceCache(LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET)
+        update_cache_result = updated_cache.update_cache(FRAME_CACHE_DATA)
+
+        # A: Test that the same record of what changed is returned.
+        actual_result = decode_result
+        expected_result = update_cache_result
+        self.assertTupleEqual(actual_result, expected_result, "[A] The actual result doesn't match the expected result.")
+
+        # B: Test that the cached data is the same.
+        actual_result = [
+            decoded_cache.tournament_dictionary,
+            decoded_cache.event_dictionary,
+            decoded_cache.event_result_dictionary,
+            decoded_cache.odds_dictionary
+        ]
+        expected_result = [
+            updated_cache.tournament_dictionary,
+            updated_cache.event_dictionary,
+            updated_cache.event_result_dictionary,
+            updated_cache.odds_dictionary
+        ]
+        self.assertListEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        # C: Test that the events can be fetched from the decoded cache.
+        actual_result = decoded_cache.fetch_event(190800)
+        expected_result = updated_cache.fetch_event(190800)
+        self.assertTupleEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+
+    @unittest.skipIf(SKIP_TEST_02, "in development")
+    def test_02_decode_strings(self):
+
+        """Test that quoted strings, escape sequences and empty elements are decoded."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s:" % "test_02_decode_strings")
+
+        temp_sbo_data_source_cache = SboDataSourceCache(LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET)
+        sbo_data_source_decoder = SboDataSourceDecoder(temp_sbo_data_source_cache)
+
+        raw_data = r'''[[[307,"Torneo \"Viareggio\"",,''],[3868,'Bahrain Premier\x20League','','']],,,,,,,null]'''
+        sbo_data_source_decoder.decode(raw_data)
+
+        # A: Test that the Tournament names have been decoded.
+        actual_result = temp_sbo_data_source_cache.tournament_dictionary
+        expected_result = {307: 'Torneo "Viareggio"', 3868: 'Bahrain Premier League'}
+        self.assertDictEqual(actual_result, expected_result, "[A] The actual result doesn't match the expected result.")
+
+
+    @unittest.skipIf(SKIP_TEST_03, "in development")
+    def test_03_decode_errors(self):
+
+        """Test that malformed raw data raises an exception and that malformed records are quarantined."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s:" % "test_03_decode_errors")
+
+        temp_sbo_data_source_cache = SboDataSourceCache(LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET)
+        temp_sbo_data_source_cache.set_atomic_updates(True)
+        sbo_data_source_decoder = SboDataSourceDecoder(temp_sbo_data_source_cache)
+
+        # A: Test that raw data that can not be decoded raises an exception.
+        for invalid_raw_data in (None, '', 'no data', '[[],[]]', "[[[307,'Torneo Viareggio','','']],[[1193897 1]]"):
+            self.assertRaises(SboDataSourceDecoder.DecodeError, sbo_data_source_decoder.decode, invalid_raw_data)
+
+        # B: Test that the records decoded before the failure have been rolled back.
+        actual_result = temp_sbo_data_source_cache.tournament_dictionary
+        expected_result = {}
+        self.assertDictEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        raw_data = "[null,null,[[189006,1193897,0,1,1,4],[189007]],null,null,null,null,null]"
+        events_created, events_updated, events_deleted = sbo_data_source_decoder.decode(raw_data)
+
+        # C: Test that the valid record has been applied and the malformed record quarantined.
+        actual_result = [events_created, [record for section, record, reason in temp_sbo_data_source_cache.fetch_quarantined_records()]]
+        expected_result = [[189006], [[189007]]]
+        self.assertListEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+        # D: Test that the quarantined record is reported in the section it was received in.
+        actual_result = temp_sbo_data_source_cache.fetch_quarantined_records()[0][0]
+        expected_result = sbo_data_source_cache.EVENT_RESULT_DICTIONARY
+        self.assertEqual(actual_result, expected_result, "[D] The actual result doesn't match the expected result.")
+
+
+    @unittest.skipIf(SKIP_TEST_04, "in development")
+    def test_04_decode_deletions_first(self):
+
+        """Test that records deleted and re-sent in the same frame are applied in the same order as update_cache()."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s:" % "test_04_decode_deletions_first")
+
+        decoded_cache = SboDataSourceCache(LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET)
+        SboDataSourceDecoder(decoded_cache).decode(RAW_DATA)
+
+        updated_cache = SboDataSourceCache(LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET)
+        updated_cache.update_cache(FRAME_CACHE_DATA)
+
+        # The second frame re-sends Event Result 189006 and Odds 12800915, and also lists both for deletion.
+        raw_data = "[null,null,[[189006,1193897,0,1,1,4]],null,[189006],[[12800915,[189006,1,1,1000.00,0.25],[2.3,1.6]]],[12800915],null]"
+        frame_cache_data = [None, None, [[189006, 1193897, 0, 1, 1, 4]], None, [189006], [[12800915, [189006, 1, 1, 1000.00, 0.25], [2.3, 1.6]]], [12800915], None]
+
+        decode_result = SboDataSourceDecoder(decoded_cache).decode(raw_data)
+        update_cache_result = updated_cache.update_cache(frame_cache_data)
+
+        # A: Test that the same record of what changed is returned.
+        actual_result = decode_result
+        expected_result = update_cache_result
+        self.assertTupleEqual(actual_result, expected_result, "[A] The actual result doesn't match the expected result.")
+
+        # B: Test that the cached data is the same.
+        actual_result = [decoded_cache.event_result_dictionary, decoded_cache.odds_dictionary]
+        expected_result = [updated_cache.event_result_dictionary, updated_cache.odds_dictionary]
+        self.assertListEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        # C: Test that the re-sent records are cached.
+        actual_result = [189006 in decoded_cache.event_result_dictionary, decoded_cache.odds_dictionary[12800915]['prices']]
+        expected_result = [True, [2.3, 1.6]]
+        self.assertListEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+
+if __name__ == "__main__":
+    unittest.main()
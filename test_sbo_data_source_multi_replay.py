@@ -0,0 +1,181 @@
+#!/usr/local/bin/python3.2
+# coding: utf-8
+
+"""This module tests the sbo_data_source_multi_replay module."""
+
+import unittest
+import debug
+import debug_flags
+
+# Test specific imports.
+import os
+import time
+import shutil
+import tempfile
+import sbo_data_source_replay
+from sbo_data_source_replay import SboDataSourceReplay
+
+# The class under test.
+from sbo_data_source_multi_replay import SboDataSourceMultiReplay
+
+# Individual tests can be skipped by setting the appropriate flag.
+SKIP_TEST_01 = False
+SKIP_TEST_02 = False
+SKIP_TEST_03 = False
+
+# General constants.
+LIVE_DATA_FRAME = 0
+NON_LIVE_DATA_FRAME = 1
+NO_DATA_FRAME = 2
+SEGMENT_CAPTURE_FORMAT = 1
+
+# Merged frame indexes.
+MERGED_SOURCE = 0
+MERGED_FRAME_TYPE = 1
+MERGED_CAPTURE_TIME = 2
+MERGED_RAW_DATA = 3
+
+# Raw data frames, each captured by one of two SBO sources, in the order they were captured.
+CAPTURED_RAW_DATA = [
+    (0, LIVE_DATA_FRAME, "$Page.onUpdate([35210,0,1,[[[3,'TEST LEAGUE 1','','']],0],[[],[],[]]]);"),
+    (1, NON_LIVE_DATA_FRAME, "$Page.onUpdate([45210,0,1,[[[5,'TEST LEAGUE 5','','']],0],[[],[],[]]]);"),
+    (1, LIVE_DATA_FRAME, "$Page.onUpdate([45211,0,1,[[[5,'TEST LEAGUE 6','','']],0],[[],[],[]]]);"),
+    (0, NON_LIVE_DATA_FRAME, "$Page.onUpdate([35211,0,1,[[[3,'TEST LEAGUE 2','','']],0],[[],[],[]]]);"),
+    (1, LIVE_DATA_FRAME, "$Page.onUpdate([45212,0,1,[[[5,'TEST LEAGUE 7','','']],0],[[],[],[]]]);"),
+    (0, LIVE_DATA_FRAME, "$Page.onUpdate([35212,0,1,[[[3,'TEST LEAGUE 3','','']],0],[[],[],[]]]);")
+]
+
+# Raw data frames, where the first SBO source lost its connection to the server for one frame part way through the capture.
+CONNECTION_LOST_RAW_DATA = [
+    (0, LIVE_DATA_FRAME, "$Page.onUpdate([35210,0,1,[[[3,'TEST LEAGUE 1','','']],0],[[],[],[]]]);"),
+    (1, LIVE_DATA_FRAME, "$Page.onUpdate([45210,0,1,[[[5,'TEST LEAGUE 5','','']],0],[[],[],[]]]);"),
+    (0, LIVE_DATA_FRAME, ""),
+    (1, NON_LIVE_DATA_FRAME, "$Page.onUpdate([45211,0,1,[[[5,'TEST LEAGUE 6','','']],0],[[],[],[]]]);"),
+    (0, LIVE_DATA_FRAME, "$Page.onUpdate([35211,0,1,[[[3,'TEST LEAGUE 2','','']],0],[[],[],[]]]);"),
+    (0, NON_LIVE_DATA_FRAME, "$Page.onUpdate([35212,0,1,[[[3,'TEST LEAGUE 3','','']],0],[[],[],[]]]);")
+]
+
+
+class TestSboDataSourceMultiReplay(unittest.TestCase): # pylint: disable-msg=R0904
+
+    """This class tests the SboDataSourceMultiReplay class."""
+
+    @classmethod
+    def setUpClass(cls): # pylint: disable-msg=C0103
+
+        """This method is executed once at the start of this Unit Test."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_REPLAY, debug.TESTUNIT, "STARTING %s..." % TestSboDataSourceMultiReplay.__name__)
+
+
+    @staticmethod
+    def capture_sources(temp_directory, capture_formats, captured_raw_data=CAPTURED_RAW_DATA):
+
+        """Capture the raw data of each SBO source into its own capture folder, returning the capture folder paths."""
+
+        sbo_data_source_replays = []
+
+        for source_index, capture_format in enumerate(capture_formats):
+
+            temp_sbo_data_source_replay = SboDataSourceReplay()
+            temp_sbo_data_source_replay.base_directory = os.path.join(temp_directory, 'source_%s' % source_index)
+            os.mkdir(temp_sbo_data_source_replay.base_directory)
+            temp_sbo_data_source_replay.set_capture_format(capture_format)
+            sbo_data_source_replays.append(temp_sbo_data_source_replay)
+
+        # Leave a gap between the frames, so that each one has a later capture time than the one before.
+        for source_index, frame_type, raw_data in captured_raw_data:
+            sbo_data_source_replays[source_index].capture(raw_data, frame_type)
+            time.sleep(0.002)
+
+        for temp_sbo_data_source_replay in sbo_data_source_replays:
+            temp_sbo_data_source_replay.close_capture()
+
+        return [os.path.join(temp_sbo_data_source_replay.base_directory, sbo_data_source_replay.CAPTURE_FOLDER, sbo_data_source_replay.CAPTURE_CURRENT_SUBFOLDER) for temp_sbo_data_source_replay in sbo_data_source_replays]
+
+
+    @unittest.skipIf(SKIP_TEST_01, "in development")
+    def test_01_merge(self):
+
+        """Test that the frames of several capture folders are merged into a single sequence in order of capture time."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_REPLAY, debug.TESTUNIT, "STARTING %s:" % "test_01_merge")
+
+        temp_directory = tempfile.mkdtemp()
+
+        # Capture one SBO source in the file capture format and the other in the segment capture format.
+        capture_folder_paths = self.capture_sources(temp_directory, [sbo_data_source_replay.FILE_CAPTURE_FORMAT, SEGMENT_CAPTURE_FORMAT])
+        sbo_data_source_multi_replay = SboDataSourceMultiReplay(capture_folder_paths)
+        merged_frames = list(sbo_data_source_multi_replay)
+
+        # A: Test that each frame is returned with its source and frame type, in the order it was captured.
+        actual_result = [(merged_frame[MERGED_SOURCE], merged_frame[MERGED_FRAME_TYPE], merged_frame[MERGED_RAW_DATA]) for merged_frame in merged_frames]
+        expected_result = [(capture_folder_paths[source_index], frame_type, raw_data) for source_index, frame_type, raw_data in CAPTURED_RAW_DATA]
+        self.assertListEqual(actual_result, expected_result, "[A] The actual result doesn't match the expected result.")
+
+        # B: Test that the capture times never go backwards.
+        actual_result = [merged_frame[MERGED_CAPTURE_TIME] for merged_frame in merged_frames]
+        expected_result = sorted(actual_result)
+        self.assertListEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        # C: Test that the end of the replay is raised once every frame has been returned.
+        self.assertRaises(SboDataSourceReplay.EndOfReplay, sbo_data_source_multi_replay.read_frame)
+
+        shutil.rmtree(temp_directory)
+
+
+    @unittest.skipIf(SKIP_TEST_02, "in development")
+    def test_02_merge_memory(self):
+
+        """Test that no more than the next frame of each capture folder is held while merging, and that invalid capture folders are rejected."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_REPLAY, debug.TESTUNIT, "STARTING %s:" % "test_02_merge_memory")
+
+        temp_directory = tempfile.mkdtemp()
+        capture_folder_paths = self.capture_sources(temp_directory, [SEGMENT_CAPTURE_FORMAT, SEGMENT_CAPTURE_FORMAT])
+
+        # A: Test that an invalid capture folder raises an exception.
+        self.assertRaises(SboDataSourceReplay.PlaybackInitialisationError, SboDataSourceMultiReplay, capture_folder_paths + [os.path.join(temp_directory, 'missing')])
+
+        sbo_data_source_multi_replay = SboDataSourceMultiReplay(capture_folder_paths)
+        merge_heap_sizes = [len(sbo_data_source_multi_replay.merge_heap)]
+
+        for _ in sbo_data_source_multi_replay:
+            merge_heap_sizes.append(len(sbo_data_source_multi_replay.merge_heap))
+
+        # B: Test that the merge heap never holds more than one frame for each capture folder.
+        actual_result = max(merge_heap_sizes)
+        expected_result = len(capture_folder_paths)
+        self.assertEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        shutil.rmtree(temp_directory)
+
+
+    @unittest.skipIf(SKIP_TEST_03, "in development")
+    def test_03_merge_connection_lost(self):
+
+        """Test that a frame captured while the connection to the SBO server was lost does not end the replay of its capture folder."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_REPLAY, debug.TESTUNIT, "STARTING %s:" % "test_03_merge_connection_lost")
+
+        temp_directory = tempfile.mkdtemp()
+
+        # The connection is lost in the capture folder in the file capture format, as well as in a separate capture in the segment capture format.
+        for capture_format in (sbo_data_source_replay.FILE_CAPTURE_FORMAT, SEGMENT_CAPTURE_FORMAT):
+
+            capture_directory = os.path.join(temp_directory, 'format_%s' % capture_format)
+            os.mkdir(capture_directory)
+
+            capture_folder_paths = self.capture_sources(capture_directory, [capture_format, SEGMENT_CAPTURE_FORMAT], CONNECTION_LOST_RAW_DATA)
+            merged_frames = list(SboDataSourceMultiReplay(capture_folder_paths))
+
+            # A: Test that every frame is returned, with the frame captured while the connection was lost marked by its frame type.
+            actual_result = [(merged_frame[MERGED_SOURCE], merged_frame[MERGED_FRAME_TYPE], merged_frame[MERGED_RAW_DATA]) for merged_frame in merged_frames]
+            expected_result = [(capture_folder_paths[source_index], NO_DATA_FRAME if raw_data == "" else frame_type, raw_data) for source_index, frame_type, raw_data in CONNECTION_LOST_RAW_DATA]
+            self.assertListEqual(actual_result, expected_result, "[A] The actual result doesn't match the expected result.")
+
+        shutil.rmtree(temp_directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
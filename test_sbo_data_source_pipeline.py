@@ -0,0 +1,232 @@
+#!/usr/local/bin/python3.2
+# coding: utf-8
+
+"""This module tests the sbo_data_source_pipeline module."""
+
+import unittest
+import debug
+import debug_flags
+
+# Test specific imports.
+from sbo_data_source_cache import SboDataSourceCache
+from sbo_data_source_decoder import SboDataSourceDecoder
+
+# The class under test.
+from sbo_data_source_pipeline import SboDataSourcePipeline
+
+# Individual tests can be skipped by setting the appropriate flag.
+SKIP_TEST_01 = False
+SKIP_TEST_02 = False
+SKIP_TEST_03 = False
+SKIP_TEST_04 = False
+
+# SBO betting site details.
+SBO_ID = 2
+GMT_OFFSET = 8
+
+# Data frames.
+LIVE_DATA_FRAME = 0
+NON_LIVE_DATA_FRAME = 1
+
+# Applied frame indexes.
+APPLIED_FRAME_TYPE = 0
+APPLIED_SEQUENCE_NUMBER = 1
+APPLIED_RESULT = 2
+APPLIED_SOURCE = 3
+
+# Update Cache result indexes.
+CREATED_EVENTS = 0
+UPDATED_EVENTS = 1
+DELETED_EVENTS = 2
+
+# Raw data frames, where each frame depends on the one before it being applied first.
+LIVE_RAW_DATA = [
+    "[null,null,[[189006,1193897,0,1,1,4]],null,null,[[12800915,[189006,1,1,1000.00,0.25],[2.2,1.67]]],null,null]",
+    "[null,null,null,null,null,[[12800915,null,[2.21,1.66]]],null,null]",
+    "[null,null,null,null,null,[[12800915,null,[2.22,1.65]]],null,null]",
+    "[null,null,null,null,[189006],null,null,null]"
+]
+# Raw data frames, where the current minutes received in the first frame can not be simulated when the second frame is applied.
+FAILING_RAW_DATA = [
+    "[null,null,[[189007,1193898,0,0,1,3]],[[189007,1,2,'unknown',45,1,0,0]],null,null,null,null]",
+    "[null,null,[[189006,1193897,0,1,1,4]],null,null,null,null,null]",
+    "[null,null,[[189011,1193902,0,0,0,3]],null,null,null,null,null]",
+    "[null,null,null,[[189007,1,2,12,45,1,0,0]],null,null,null,null]"
+]
+NON_LIVE_RAW_DATA = [
+    "[null,null,[[190800,1195114,0,0,0,6]],null,null,null,null,null]",
+    "[null,null,[[190800,1195114,0,1,0,6]],null,null,null,null,null]"
+]
+
+
+class TestSboDataSourcePipeline(unittest.TestCase): # pylint: disable-msg=R0904
+
+    """This class tests the SboDataSourcePipeline class."""
+
+    @classmethod
+    def setUpClass(cls): # pylint: disable-msg=C0103
+
+        """This method is executed once at the start of this Unit Test."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s..." % TestSboDataSourcePipeline.__name__)
+
+
+    @unittest.skipIf(SKIP_TEST_01, "in development")
+    def test_01_apply_in_order(self):
+
+        """Test that frames decoded in the worker processes are applied to the cache of their frame type in the order they were submitted."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s:" % "test_01_apply_in_order")
+
+        sbo_data_source_caches = [SboDataSourceCache(LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET), SboDataSourceCache(NON_LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET)]
+        sbo_data_source_pipeline = SboDataSourcePipeline(sbo_data_source_caches, 4)
+
+        # Interleave the live and non-live frames, as they would arrive from the SBO server.
+        for raw_data_index in range(len(LIVE_RAW_DATA)):
+
+            sbo_data_source_pipeline.submit(LIVE_RAW_DATA[raw_data_index], LIVE_DATA_FRAME)
+
+            if raw_data_index < len(NON_LIVE_RAW_DATA):
+                sbo_data_source_pipeline.submit(NON_LIVE_RAW_DATA[raw_data_index], NON_LIVE_DATA_FRAME)
+
+        applied_frames = sbo_data_source_pipeline.shutdown()
+
+        # A: Test that the frames of each frame type have been applied in sequence.
+        actual_result = [[applied_frame[APPLIED_SEQUENCE_NUMBER] for applied_frame in applied_frames if applied_frame[APPLIED_FRAME_TYPE] == frame_type] for frame_type in (LIVE_DATA_FRAME, NON_LIVE_DATA_FRAME)]
+        expected_result = [[0, 1, 2, 3], [0, 1]]
+        self.assertListEqual(actual_result, expected_result, "[A] The actual result doesn't match the expected result.")
+
+        # B: Test that the result of each update is returned.
+        live_results = [applied_frame[APPLIED_RESULT] for applied_frame in applied_frames if applied_frame[APPLIED_FRAME_TYPE] == LIVE_DATA_FRAME]
+        actual_result = [live_results[0][CREATED_EVENTS], live_results[1][UPDATED_EVENTS], live_results[3][DELETED_EVENTS]]
+        expected_result = [[189006], {189006: {'event_odds': [12800915]}}, [189006]]
+        self.assertListEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        # C: Test that each cache holds the result of applying its frames in order.
+        actual_result = [sbo_data_source_caches[LIVE_DATA_FRAME].odds_dictionary, sbo_data_source_caches[NON_LIVE_DATA_FRAME].event_result_dictionary[190800]['home_score']]
+        expected_result = [{}, 1]
+        self.assertListEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+        # D: Test that no frames are left in the pipeline.
+        actual_result = sbo_data_source_pipeline.get_backlog()
+        expected_result = 0
+        self.assertEqual(actual_result, expected_result, "[D] The actual result doesn't match the expected result.")
+
+
+    @unittest.skipIf(SKIP_TEST_02, "in development")
+    def test_02_decode_errors(self):
+
+        """Test that a frame which can not be decoded is reported in sequence without holding up the frames after it."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s:" % "test_02_decode_errors")
+
+        sbo_data_source_caches = [SboDataSourceCache(LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET), SboDataSourceCache(NON_LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET)]
+        sbo_data_source_pipeline = SboDataSourcePipeline(sbo_data_source_caches, 2)
+
+        sbo_data_source_pipeline.submit(LIVE_RAW_DATA[0], LIVE_DATA_FRAME)
+        sbo_data_source_pipeline.submit('CONNECTION TO SERVER LOST', LIVE_DATA_FRAME)
+        sbo_data_source_pipeline.submit(LIVE_RAW_DATA[1], LIVE_DATA_FRAME)
+
+        applied_frames = sbo_data_source_pipeline.shutdown()
+
+        # A: Test that the frame which could not be decoded is returned as an exception, in sequence.
+        actual_result = [type(applied_frame[APPLIED_RESULT]) for applied_frame in applied_frames]
+        expected_result = [tuple, SboDataSourceDecoder.DecodeError, tuple]
+        self.assertListEqual(actual_result, expected_result, "[A] The actual result doesn't match the expected result.")
+
+        # B: Test that raw data can not be submitted once the pipeline has been shut down.
+        self.assertRaises(SboDataSourcePipeline.PipelineClosedError, sbo_data_source_pipeline.submit, LIVE_RAW_DATA[2], LIVE_DATA_FRAME)
+
+
+    @unittest.skipIf(SKIP_TEST_03, "in development")
+    def test_03_multiple_sources(self):
+
+        """Test that frames from several SBO sources are applied to the caches of their own source, and that unknown sources or frame types are rejected."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s:" % "test_03_multiple_sources")
+
+        sbo_data_source_caches = {
+            'source_a': [SboDataSourceCache(LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET), SboDataSourceCache(NON_LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET)],
+            'source_b': [SboDataSourceCache(LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET), SboDataSourceCache(NON_LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET)]
+        }
+        sbo_data_source_pipeline = SboDataSourcePipeline(sbo_data_source_caches, 2)
+
+        # A: Test that an unknown frame type or source raises an exception.
+        for frame_type in (-1, None, 2, True):
+            self.assertRaises(SboDataSourcePipeline.InvalidSubmissionError, sbo_data_source_pipeline.submit, LIVE_RAW_DATA[0], frame_type, 'source_a')
+
+        self.assertRaises(SboDataSourcePipeline.InvalidSubmissionError, sbo_data_source_pipeline.submit, LIVE_RAW_DATA[0], LIVE_DATA_FRAME, 'source_c')
+        self.assertRaises(SboDataSourcePipeline.InvalidSubmissionError, sbo_data_source_pipeline.submit, LIVE_RAW_DATA[0], LIVE_DATA_FRAME)
+
+        # Interleave the frames of both sources, where only source_b receives the later odds updates.
+        sbo_data_source_pipeline.submit(LIVE_RAW_DATA[0], LIVE_DATA_FRAME, 'source_a')
+        sbo_data_source_pipeline.submit(LIVE_RAW_DATA[0], LIVE_DATA_FRAME, 'source_b')
+        sbo_data_source_pipeline.submit(LIVE_RAW_DATA[1], LIVE_DATA_FRAME, 'source_b')
+        sbo_data_source_pipeline.submit(LIVE_RAW_DATA[2], LIVE_DATA_FRAME, 'source_b')
+
+        applied_frames = sbo_data_source_pipeline.shutdown()
+
+        # B: Test that each source has its own sequence of frames.
+        actual_result = [[applied_frame[APPLIED_SEQUENCE_NUMBER] for applied_frame in applied_frames if applied_frame[APPLIED_SOURCE] == source] for source in ('source_a', 'source_b')]
+        expected_result = [[0], [0, 1, 2]]
+        self.assertListEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        # C: Test that each cache only holds the frames of its own source.
+        actual_result = [sbo_data_source_caches[source][LIVE_DATA_FRAME].odds_dictionary[12800915]['prices'] for source in ('source_a', 'source_b')]
+        expected_result = [[2.2, 1.67], [2.22, 1.65]]
+        self.assertListEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+
+    @unittest.skipIf(SKIP_TEST_04, "in development")
+    def test_04_halt_on_failed_apply(self):
+
+        """Test that no further frames are applied to a cache once a frame fails to apply, unless the cache is in atomic mode."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_CACHE, debug.TESTUNIT, "STARTING %s:" % "test_04_halt_on_failed_apply")
+
+        sbo_data_source_caches = [SboDataSourceCache(LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET), SboDataSourceCache(NON_LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET)]
+        sbo_data_source_pipeline = SboDataSourcePipeline(sbo_data_source_caches, 2)
+
+        for raw_data in FAILING_RAW_DATA[:3]:
+            sbo_data_source_pipeline.submit(raw_data, LIVE_DATA_FRAME)
+
+        sbo_data_source_pipeline.submit(NON_LIVE_RAW_DATA[0], NON_LIVE_DATA_FRAME)
+
+        applied_frames = sbo_data_source_pipeline.flush()
+
+        # A: Test that the frame after the one that failed to apply has not been applied, while the other cache is unaffected.
+        actual_result = [[type(applied_frame[APPLIED_RESULT]) for applied_frame in applied_frames if applied_frame[APPLIED_FRAME_TYPE] == frame_type] for frame_type in (LIVE_DATA_FRAME, NON_LIVE_DATA_FRAME)]
+        expected_result = [[tuple, SboDataSourceCache.UnexpectedDataError, SboDataSourcePipeline.CacheHaltedError], [tuple]]
+        self.assertListEqual(actual_result, expected_result, "[A] The actual result doesn't match the expected result.")
+
+        # B: Test that the halted cache has not received the frame.
+        actual_result = 189011 in sbo_data_source_caches[LIVE_DATA_FRAME].event_result_dictionary
+        expected_result = False
+        self.assertEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        # C: Test that frames are applied again once the cache has been resumed.
+        sbo_data_source_pipeline.resume(LIVE_DATA_FRAME)
+        sbo_data_source_pipeline.submit(FAILING_RAW_DATA[3], LIVE_DATA_FRAME)
+        applied_frames = sbo_data_source_pipeline.shutdown()
+
+        actual_result = [type(applied_frame[APPLIED_RESULT]) for applied_frame in applied_frames]
+        expected_result = [tuple]
+        self.assertListEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+        # D: Test that a cache in atomic mode is not halted, as its failed update has been rolled back.
+        sbo_data_source_caches = [SboDataSourceCache(LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET), SboDataSourceCache(NON_LIVE_DATA_FRAME, SBO_ID, GMT_OFFSET)]
+        sbo_data_source_caches[LIVE_DATA_FRAME].set_atomic_updates(True)
+        sbo_data_source_pipeline = SboDataSourcePipeline(sbo_data_source_caches, 2)
+
+        for raw_data in FAILING_RAW_DATA:
+            sbo_data_source_pipeline.submit(raw_data, LIVE_DATA_FRAME)
+
+        applied_frames = sbo_data_source_pipeline.shutdown()
+
+        actual_result = [type(applied_frame[APPLIED_RESULT]) for applied_frame in applied_frames]
+        expected_result = [tuple, SboDataSourceCache.UnexpectedDataError, SboDataSourceCache.UnexpectedDataError, tuple]
+        self.assertListEqual(actual_result, expected_result, "[D] The actual result doesn't match the expected result.")
+
+
+if __name__ == "__main__":
+    unittest.main()
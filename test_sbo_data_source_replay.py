@@ -9,8 +9,12 @@ import debug_flags
 
 # Test specific imports.
 import os
+import mmap
 import time
+import shutil
+import asyncio
 import datetime
+import tempfile
 
 # Import the module of the class under test to access its constants.
 import sbo_data_source_replay
@@ -24,6 +28,18 @@ SKIP_TEST_02 = False
 SKIP_TEST_03 = False
 SKIP_TEST_04 = False
 SKIP_TEST_05 = False
+SKIP_TEST_06 = False
+SKIP_TEST_07 = False
+SKIP_TEST_08 = False
+SKIP_TEST_09 = False
+SKIP_TEST_10 = False
+SKIP_TEST_11 = False
+SKIP_TEST_12 = False
+SKIP_TEST_13 = False
+SKIP_TEST_14 = False
+SKIP_TEST_15 = False
+SKIP_TEST_16 = False
+SKIP_TEST_17 = False
 
 # General constants.
 CAPTURE_FILE = 0
@@ -32,10 +48,34 @@ LIVE_DATA_FRAME = 0
 NON_LIVE_DATA_FRAME = 1
 NORMAL_REPLAY_MODE = 0
 FAST_REPLAY_MODE = 1
+TIMED_REPLAY_MODE = 2
 DEFAULT_REPLAY_MODE = FAST_REPLAY_MODE
 MINIMUM_REQUEST_PERIOD_LIVE = 2
 MINIMUM_REQUEST_PERIOD_NON_LIVE = 6
 SAFETY_MARGIN = 0.1
+SEGMENT_CAPTURE_FORMAT = 1
+
+# Raw data frames for the capture formats, including one containing new lines.
+CAPTURED_RAW_DATA = [
+    (LIVE_DATA_FRAME, "$Page.onUpdate([35210,0,1,[[[3,'TEST LEAGUE 1','','']],0],[[1158696,1158767],[],[1158767,1162975,1164090],0],[[],[],[]]]);"),
+    (NON_LIVE_DATA_FRAME, "$Page.onUpdate([35211,0,1,[[[3,'TEST LEAGUE 1','','']],0],[[1158696],[],[1158767],0],[[],[],[]]]);"),
+    (LIVE_DATA_FRAME, "$Page.onUpdate([35212,0,1,\n[[[3,'TEST LEAGUE 2','','']],0],\n[[],[],[]]]);\n"),
+    (NON_LIVE_DATA_FRAME, "$Page.onUpdate([35213,0,1,[[[4,'TEST LEAGUE \u00e9','','']],0],[[],[],[]]]);")
+]
+
+# A template for a sequence of similar frames, where only the odds change from one frame to the next.
+SIMILAR_RAW_DATA_TEMPLATE = (
+    "onUpdate('od',[[[307,'Torneo Viareggio','',''],[3868,'Bahrain Premier League','','']],"
+    "[[1193897,1,307,'Torino U19','AS Roma U19','1.374',10,'02/19/2013 22:00',1,'',5],"
+    "[1195114,1,3868,'Muharraq','Busaiteen','1.407',10,'02/19/2013 23:00',1,'',6]],"
+    "[[189006,1193897,0,1,1,4],[190800,1195114,0,0,0,6]],null,null,"
+    "[[12800915,[189006,1,1,1000.00,0.25],[%s,1.67]],[12816830,[190800,1,1,1000.00,0.00],[1.68,%s]]],null,[]]);"
+)
+
+# A template for a full frame of odds, as received when the SBO server is first polled, and a template for each of its odds rows.
+LARGE_RAW_DATA_TEMPLATE = "onUpdate('od',[null,null,null,null,null,[%s],null,[]]);"
+LARGE_RAW_DATA_ODDS_TEMPLATE = "[%s,[%s,%s,1,1000.00,0.25],[%.2f,%.2f]]"
+LARGE_RAW_DATA_ODDS_ROWS = 4000
 
 
 class TestSboDataSourceReplay(unittest.TestCase): # pylint: disable-msg=R0904
@@ -95,6 +135,44 @@ class TestSboDataSourceReplay(unittest.TestCase): # pylint: disable-msg=R0904
         return (data_identifier, datestamp, raw_data)
 
 
+    @staticmethod
+    def play_back_all(temp_sbo_data_source_replay):
+
+        """This method plays back raw data until the end of the replay is reached."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_REPLAY_EXTRA, debug.TESTUNIT, "playing back all raw data...")
+
+        played_back_raw_data = []
+
+        try:
+            while True:
+                played_back_raw_data.append(temp_sbo_data_source_replay.playback())
+
+        except SboDataSourceReplay.EndOfReplay:
+            pass
+
+        return played_back_raw_data
+
+
+    @staticmethod
+    def capture_similar_raw_data(temp_sbo_data_source_replay, number_of_frames):
+
+        """This method captures a sequence of similar non-live frames in the segment capture format."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_REPLAY_EXTRA, debug.TESTUNIT, "capturing similar raw data...")
+
+        similar_raw_data = [SIMILAR_RAW_DATA_TEMPLATE % (2.2 + number / 100.0, 2.25 - number / 100.0) for number in range(number_of_frames)]
+
+        for raw_data in similar_raw_data:
+            temp_sbo_data_source_replay.capture(raw_data, NON_LIVE_DATA_FRAME)
+
+        temp_sbo_data_source_replay.close_capture()
+
+        capture_current_path = os.path.join(temp_sbo_data_source_replay.base_directory, sbo_data_source_replay.CAPTURE_FOLDER, sbo_data_source_replay.CAPTURE_CURRENT_SUBFOLDER)
+
+        return (capture_current_path, similar_raw_data)
+
+
     def reset_playback(self, replay_folder_path, replay_mode, minimum_request_period):
 
         """This method allows playback to be reset during testing.
@@ -535,5 +613,629 @@ class TestSboDataSourceReplay(unittest.TestCase): # pylint: disable-msg=R0904
         self.assertRaises(SboDataSourceReplay.EndOfReplay, temp_sbo_data_source_replay.playback)
 
 
+    @unittest.skipIf(SKIP_TEST_06, "in development")
+    def test_06_segment_capture(self):
+
+        """Test the capturing of raw data to size rotated segment files and its playback."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_REPLAY, debug.TESTUNIT, "STARTING %s:" % "test_06_segment_capture")
+
+        # Capture to a temporary base directory, with a segment size limit small enough to rotate after every two frames.
+        temp_sbo_data_source_replay = SboDataSourceReplay()
+        temp_sbo_data_source_replay.base_directory = tempfile.mkdtemp()
+
+        # A: Test that an unknown capture format raises an exception.
+        self.assertRaises(SboDataSourceReplay.DataCaptureError, temp_sbo_data_source_replay.set_capture_format, None)
+
+        temp_sbo_data_source_replay.set_capture_format(SEGMENT_CAPTURE_FORMAT, 200)
+
+        for frame_type, raw_data in CAPTURED_RAW_DATA:
+            temp_sbo_data_source_replay.capture(raw_data, frame_type)
+
+        temp_sbo_data_source_replay.close_capture()
+
+        # B: Test that the capture format can not be changed once raw data has been captured.
+        self.assertRaises(SboDataSourceReplay.DataCaptureError, temp_sbo_data_source_replay.set_capture_format, SEGMENT_CAPTURE_FORMAT)
+
+        # C: Test that the segment files and their sidecar indexes have been created.
+        capture_current_path = os.path.join(temp_sbo_data_source_replay.base_directory, sbo_data_source_replay.CAPTURE_FOLDER, sbo_data_source_replay.CAPTURE_CURRENT_SUBFOLDER)
+        actual_result = sorted(os.listdir(capture_current_path))
+        expected_result = ['today-double-segment-00001.idx', 'today-double-segment-00001.log', 'today-double-segment-00002.idx', 'today-double-segment-00002.log']
+        self.assertListEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+        # D: Test that each sidecar index holds an entry for each record in its segment.
+        actual_result = [os.path.getsize(os.path.join(capture_current_path, filename)) for filename in expected_result if filename.endswith('.idx')]
+        expected_result = [2 * sbo_data_source_replay.SEGMENT_INDEX_ENTRY.size] * 2
+        self.assertListEqual(actual_result, expected_result, "[D] The actual result doesn't match the expected result.")
+
+        # Play back the segment files.
+        minimum_request_period = [datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_LIVE), datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_NON_LIVE)]
+        temp_sbo_data_source_replay.initalise_playback(capture_current_path, FAST_REPLAY_MODE, minimum_request_period)
+
+        # E: Test that the raw data is played back unchanged, including new lines.
+        actual_result = self.play_back_all(temp_sbo_data_source_replay)
+        expected_result = [raw_data for frame_type, raw_data in CAPTURED_RAW_DATA]
+        self.assertListEqual(actual_result, expected_result, "[E] The actual result doesn't match the expected result.")
+
+        # F: Test that the date stamp of the last frame is in the same format as the file capture format.
+        actual_result = len(temp_sbo_data_source_replay.get_last_datestamp())
+        expected_result = 26
+        self.assertEqual(actual_result, expected_result, "[F] The actual result doesn't match the expected result.")
+
+        shutil.rmtree(temp_sbo_data_source_replay.base_directory)
+
+
+    @unittest.skipIf(SKIP_TEST_07, "in development")
+    def test_07_compressed_capture(self):
+
+        """Test the capturing of compressed segment records and their transparent decompression during playback."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_REPLAY, debug.TESTUNIT, "STARTING %s:" % "test_07_compressed_capture")
+
+        temp_sbo_data_source_replay = SboDataSourceReplay()
+        temp_sbo_data_source_replay.base_directory = tempfile.mkdtemp()
+
+        # A: Test that compression is only available in the segment capture format.
+        self.assertRaises(SboDataSourceReplay.DataCaptureError, temp_sbo_data_source_replay.set_capture_compression)
+
+        temp_sbo_data_source_replay.set_capture_format(SEGMENT_CAPTURE_FORMAT)
+
+        # B: Test that an invalid compression level raises an exception.
+        self.assertRaises(SboDataSourceReplay.DataCaptureError, temp_sbo_data_source_replay.set_capture_compression, 10)
+
+        temp_sbo_data_source_replay.set_capture_compression(9, 4)
+
+        similar_raw_data = [SIMILAR_RAW_DATA_TEMPLATE % (2.2 + number / 100.0, 2.25 - number / 100.0) for number in range(20)]
+
+        for raw_data in similar_raw_data:
+            temp_sbo_data_source_replay.capture(raw_data, NON_LIVE_DATA_FRAME)
+
+        temp_sbo_data_source_replay.close_capture()
+
+        # C: Test that the preset dictionary has been saved alongside the segment files.
+        capture_current_path = os.path.join(temp_sbo_data_source_replay.base_directory, sbo_data_source_replay.CAPTURE_FOLDER, sbo_data_source_replay.CAPTURE_CURRENT_SUBFOLDER)
+        actual_result = os.path.exists(os.path.join(capture_current_path, sbo_data_source_replay.CAPTURE_DICTIONARY_FILENAME))
+        self.assertTrue(actual_result, "[C] The compression dictionary does not exist.")
+
+        # D: Test that the captured raw data has been compressed to less than half of its size.
+        actual_result = temp_sbo_data_source_replay.get_compression_statistics()['compression_ratio']
+        self.assertGreater(actual_result, 2, "[D] The raw data has not been compressed as expected.")
+
+        # Play back the compressed segment records.
+        minimum_request_period = [datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_LIVE), datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_NON_LIVE)]
+        temp_sbo_data_source_replay.initalise_playback(capture_current_path, FAST_REPLAY_MODE, minimum_request_period)
+
+        # E: Test that the raw data is decompressed transparently.
+        actual_result = self.play_back_all(temp_sbo_data_source_replay)
+        expected_result = similar_raw_data
+        self.assertListEqual(actual_result, expected_result, "[E] The actual result doesn't match the expected result.")
+
+        # F: Test that the decode statistics have been recorded.
+        compression_statistics = temp_sbo_data_source_replay.get_compression_statistics()
+        actual_result = compression_statistics['played_back_raw_bytes']
+        expected_result = compression_statistics['captured_raw_bytes']
+        self.assertEqual(actual_result, expected_result, "[F] The actual result doesn't match the expected result.")
+
+        shutil.rmtree(temp_sbo_data_source_replay.base_directory)
+
+
+    @unittest.skipIf(SKIP_TEST_08, "in development")
+    def test_08_delta_capture(self):
+
+        """Test the capturing of delta encoded segment records and the rebuilding of the frames during playback."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_REPLAY, debug.TESTUNIT, "STARTING %s:" % "test_08_delta_capture")
+
+        temp_sbo_data_source_replay = SboDataSourceReplay()
+        temp_sbo_data_source_replay.base_directory = tempfile.mkdtemp()
+
+        # A: Test that delta encoding is only available in the segment capture format.
+        self.assertRaises(SboDataSourceReplay.DataCaptureError, temp_sbo_data_source_replay.set_capture_delta_encoding)
+
+        # Rotate the segments part way through the capture, so that keyframes are needed at the start of the second segment.
+        temp_sbo_data_source_replay.set_capture_format(SEGMENT_CAPTURE_FORMAT, 4096)
+
+        # B: Test that an invalid keyframe interval raises an exception.
+        self.assertRaises(SboDataSourceReplay.DataCaptureError, temp_sbo_data_source_replay.set_capture_delta_encoding, 0)
+
+        temp_sbo_data_source_replay.set_capture_delta_encoding(5)
+
+        # Interleave live and non-live frames, each of which differs from the previous frame of its type by a few odds.
+        interleaved_raw_data = []
+
+        for number in range(20):
+            interleaved_raw_data.append((LIVE_DATA_FRAME, SIMILAR_RAW_DATA_TEMPLATE % (2.2 + number / 100.0, 2.25)))
+            interleaved_raw_data.append((NON_LIVE_DATA_FRAME, SIMILAR_RAW_DATA_TEMPLATE % (1.9, 2.25 - number / 100.0)))
+
+        for frame_type, raw_data in interleaved_raw_data:
+            temp_sbo_data_source_replay.capture(raw_data, frame_type)
+
+        temp_sbo_data_source_replay.close_capture()
+
+        # C: Test that the delta encoded raw data takes less than a third of the space of the raw data.
+        actual_result = temp_sbo_data_source_replay.get_compression_statistics()['compression_ratio']
+        self.assertGreater(actual_result, 3, "[C] The raw data has not been delta encoded as expected.")
+
+        # D: Test that the capture was spread over more than one segment.
+        capture_current_path = os.path.join(temp_sbo_data_source_replay.base_directory, sbo_data_source_replay.CAPTURE_FOLDER, sbo_data_source_replay.CAPTURE_CURRENT_SUBFOLDER)
+        actual_result = len([filename for filename in os.listdir(capture_current_path) if filename.endswith('.log')])
+        self.assertGreater(actual_result, 1, "[D] The capture has not been spread over more than one segment.")
+
+        # Play back the delta encoded segment records.
+        minimum_request_period = [datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_LIVE), datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_NON_LIVE)]
+        temp_sbo_data_source_replay.initalise_playback(capture_current_path, FAST_REPLAY_MODE, minimum_request_period)
+
+        # E: Test that every frame is rebuilt exactly.
+        actual_result = self.play_back_all(temp_sbo_data_source_replay)
+        expected_result = [raw_data for frame_type, raw_data in interleaved_raw_data]
+        self.assertListEqual(actual_result, expected_result, "[E] The actual result doesn't match the expected result.")
+
+        shutil.rmtree(temp_sbo_data_source_replay.base_directory)
+
+
+    @unittest.skipIf(SKIP_TEST_09, "in development")
+    def test_09_memory_mapped_playback(self):
+
+        """Test the playback of memoryview slices of memory mapped segment files."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_REPLAY, debug.TESTUNIT, "STARTING %s:" % "test_09_memory_mapped_playback")
+
+        temp_sbo_data_source_replay = SboDataSourceReplay()
+        temp_sbo_data_source_replay.base_directory = tempfile.mkdtemp()
+        temp_sbo_data_source_replay.set_capture_format(SEGMENT_CAPTURE_FORMAT, 200)
+
+        for frame_type, raw_data in CAPTURED_RAW_DATA:
+            temp_sbo_data_source_replay.capture(raw_data, frame_type)
+
+        temp_sbo_data_source_replay.close_capture()
+
+        # Play back the segment files with memory mapping.
+        capture_current_path = os.path.join(temp_sbo_data_source_replay.base_directory, sbo_data_source_replay.CAPTURE_FOLDER, sbo_data_source_replay.CAPTURE_CURRENT_SUBFOLDER)
+        minimum_request_period = [datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_LIVE), datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_NON_LIVE)]
+        temp_sbo_data_source_replay.set_memory_mapped_playback(True)
+        temp_sbo_data_source_replay.initalise_playback(capture_current_path, FAST_REPLAY_MODE, minimum_request_period)
+
+        played_back_raw_data = self.play_back_all(temp_sbo_data_source_replay)
+
+        # A: Test that the raw data is handed out as slices of the memory mapped segment files, without being copied.
+        actual_result = [type(raw_data.obj) for raw_data in played_back_raw_data]
+        expected_result = [mmap.mmap] * len(CAPTURED_RAW_DATA)
+        self.assertListEqual(actual_result, expected_result, "[A] The actual result doesn't match the expected result.")
+
+        # B: Test that the raw data decodes to the raw data that was captured.
+        actual_result = [str(raw_data, 'utf-8') for raw_data in played_back_raw_data]
+        expected_result = [raw_data for frame_type, raw_data in CAPTURED_RAW_DATA]
+        self.assertListEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        # Release the slices, so that the memory maps can be closed.
+        for raw_data in played_back_raw_data:
+            raw_data.release()
+
+        shutil.rmtree(temp_sbo_data_source_replay.base_directory)
+
+
+    @unittest.skipIf(SKIP_TEST_10, "in development")
+    def test_10_prefetch(self):
+
+        """Test the reading ahead of frames by the prefetch thread."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_REPLAY, debug.TESTUNIT, "STARTING %s:" % "test_10_prefetch")
+
+        temp_sbo_data_source_replay = SboDataSourceReplay()
+        temp_sbo_data_source_replay.base_directory = tempfile.mkdtemp()
+
+        # A: Test that the prefetch thread can not be started before playback is initialised.
+        self.assertRaises(SboDataSourceReplay.CallOrderError, temp_sbo_data_source_replay.start_prefetch)
+
+        temp_sbo_data_source_replay.set_capture_format(SEGMENT_CAPTURE_FORMAT, 1024)
+        capture_current_path, similar_raw_data = self.capture_similar_raw_data(temp_sbo_data_source_replay, 20)
+
+        minimum_request_period = [datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_LIVE), datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_NON_LIVE)]
+        temp_sbo_data_source_replay.initalise_playback(capture_current_path, FAST_REPLAY_MODE, minimum_request_period)
+        temp_sbo_data_source_replay.start_prefetch(4)
+
+        # Allow the prefetch thread time to fill its queue.
+        for _ in range(50):
+            if temp_sbo_data_source_replay.get_prefetch_statistics()['queue_depth'] == 4:
+                break
+            time.sleep(SAFETY_MARGIN)
+
+        # B: Test that the prefetch thread reads no further ahead than the prefetch depth.
+        actual_result = temp_sbo_data_source_replay.get_prefetch_statistics()['queue_depth']
+        expected_result = 4
+        self.assertEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        played_back_raw_data = [temp_sbo_data_source_replay.playback(), temp_sbo_data_source_replay.playback()]
+
+        # Stopping the prefetch thread part way through should not lose any of the frames it has read ahead.
+        temp_sbo_data_source_replay.stop_prefetch()
+        played_back_raw_data.extend(self.play_back_all(temp_sbo_data_source_replay))
+
+        # C: Test that every frame is played back in order.
+        actual_result = played_back_raw_data
+        expected_result = similar_raw_data
+        self.assertListEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+        # Play back the frames again, entirely from the prefetch queue.
+        temp_sbo_data_source_replay.reinitialise_playback()
+        temp_sbo_data_source_replay.start_prefetch(4)
+        temp_sbo_data_source_replay.reinitialise_playback()
+
+        # D: Test that the prefetch thread is restarted from the beginning when playback is re-initialised.
+        actual_result = self.play_back_all(temp_sbo_data_source_replay)
+        expected_result = similar_raw_data
+        self.assertListEqual(actual_result, expected_result, "[D] The actual result doesn't match the expected result.")
+
+        # E: Test that the queue depth seen by playback is reported.
+        prefetch_statistics = temp_sbo_data_source_replay.get_prefetch_statistics()
+        actual_result = [prefetch_statistics['average_queue_depth'] is not None, prefetch_statistics['stall_seconds'] >= 0]
+        expected_result = [True, True]
+        self.assertListEqual(actual_result, expected_result, "[E] The actual result doesn't match the expected result.")
+
+        temp_sbo_data_source_replay.stop_prefetch()
+        shutil.rmtree(temp_sbo_data_source_replay.base_directory)
+
+
+    @unittest.skipIf(SKIP_TEST_11, "in development")
+    def test_11_capture_writer(self):
+
+        """Test the queueing of frames to the capture writer thread."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_REPLAY, debug.TESTUNIT, "STARTING %s:" % "test_11_capture_writer")
+
+        temp_sbo_data_source_replay = SboDataSourceReplay()
+        temp_sbo_data_source_replay.base_directory = tempfile.mkdtemp()
+        temp_sbo_data_source_replay.set_capture_format(SEGMENT_CAPTURE_FORMAT)
+
+        # A: Test that an invalid queue size raises an exception.
+        self.assertRaises(SboDataSourceReplay.DataCaptureError, temp_sbo_data_source_replay.start_capture_writer, 0)
+
+        temp_sbo_data_source_replay.start_capture_writer(100, 8)
+
+        # B: Test that invalid raw data is still reported by the capture() method.
+        self.assertRaises(SboDataSourceReplay.DataCaptureError, temp_sbo_data_source_replay.capture, None, LIVE_DATA_FRAME)
+
+        # Closing the capture waits for the capture writer thread to write every queued frame.
+        capture_current_path, similar_raw_data = self.capture_similar_raw_data(temp_sbo_data_source_replay, 50)
+        capture_writer_statistics = temp_sbo_data_source_replay.get_capture_writer_statistics()
+
+        # C: Test that every frame has been written, in batches.
+        actual_result = [capture_writer_statistics['frames_written'], capture_writer_statistics['frames_dropped'], capture_writer_statistics['batches_written'] >= 50 / 8]
+        expected_result = [50, 0, True]
+        self.assertListEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+        # D: Test that the frames have been written in order.
+        minimum_request_period = [datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_LIVE), datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_NON_LIVE)]
+        temp_sbo_data_source_replay.initalise_playback(capture_current_path, FAST_REPLAY_MODE, minimum_request_period)
+        actual_result = self.play_back_all(temp_sbo_data_source_replay)
+        expected_result = similar_raw_data
+        self.assertListEqual(actual_result, expected_result, "[D] The actual result doesn't match the expected result.")
+
+        shutil.rmtree(temp_sbo_data_source_replay.base_directory)
+
+        # Capture to a folder that is removed after it has been created, so that every write fails.
+        temp_sbo_data_source_replay = SboDataSourceReplay()
+        temp_sbo_data_source_replay.base_directory = tempfile.mkdtemp()
+        temp_sbo_data_source_replay.start_capture_writer(1, 1)
+        temp_sbo_data_source_replay.capture(CAPTURED_RAW_DATA[0][1], LIVE_DATA_FRAME)
+        shutil.rmtree(temp_sbo_data_source_replay.base_directory)
+
+        for frame_type, raw_data in CAPTURED_RAW_DATA * 50:
+            temp_sbo_data_source_replay.capture(raw_data, frame_type)
+
+        temp_sbo_data_source_replay.stop_capture_writer()
+        capture_writer_statistics = temp_sbo_data_source_replay.get_capture_writer_statistics()
+
+        # E: Test that the write errors and any dropped frames are reported instead of being raised.
+        actual_result = [capture_writer_statistics['errors'] > 0, capture_writer_statistics['frames_queued'] + capture_writer_statistics['frames_dropped']]
+        expected_result = [True, 201]
+        self.assertListEqual(actual_result, expected_result, "[E] The actual result doesn't match the expected result.")
+
+
+    @unittest.skipIf(SKIP_TEST_12, "in development")
+    def test_12_archive_maintenance(self):
+
+        """Test the compaction of capture archives into bundles, their playback and the retention policy."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_REPLAY, debug.TESTUNIT, "STARTING %s:" % "test_12_archive_maintenance")
+
+        temp_sbo_data_source_replay = SboDataSourceReplay()
+        temp_sbo_data_source_replay.base_directory = tempfile.mkdtemp()
+        temp_sbo_data_source_replay.set_capture_format(SEGMENT_CAPTURE_FORMAT)
+        temp_sbo_data_source_replay.set_capture_delta_encoding(5)
+        _, similar_raw_data = self.capture_similar_raw_data(temp_sbo_data_source_replay, 10)
+
+        # Add an old, empty archive folder alongside the capture folder.
+        capture_folder_path = os.path.join(temp_sbo_data_source_replay.base_directory, sbo_data_source_replay.CAPTURE_FOLDER)
+        os.mkdir(os.path.join(capture_folder_path, 'up_to_restart_at_2000-01-01-00-00-00'))
+
+        # A: Test that an invalid retention policy raises an exception.
+        self.assertRaises(SboDataSourceReplay.DataCaptureError, temp_sbo_data_source_replay.set_retention_policy, 1)
+
+        # Restart capturing, keeping only the latest archive.
+        restarted_sbo_data_source_replay = SboDataSourceReplay()
+        restarted_sbo_data_source_replay.base_directory = temp_sbo_data_source_replay.base_directory
+        restarted_sbo_data_source_replay.set_retention_policy(max_archives=1)
+        restarted_sbo_data_source_replay.capture(CAPTURED_RAW_DATA[0][1], LIVE_DATA_FRAME)
+        restarted_sbo_data_source_replay.wait_for_archive_maintenance()
+
+        # B: Test that the capture folder has been archived and compacted into a bundle, and the oldest archive removed.
+        capture_folder_names = sorted(os.listdir(capture_folder_path))
+        actual_result = [len(capture_folder_names), capture_folder_names[0], capture_folder_names[1].endswith('.bundle')]
+        expected_result = [2, 'current', True]
+        self.assertListEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        # C: Test that the bundle plays back the frames of the archived capture folder.
+        bundle_file_path = os.path.join(capture_folder_path, capture_folder_names[1])
+        minimum_request_period = [datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_LIVE), datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_NON_LIVE)]
+        temp_sbo_data_source_replay.initalise_playback(bundle_file_path, FAST_REPLAY_MODE, minimum_request_period)
+        actual_result = self.play_back_all(temp_sbo_data_source_replay)
+        expected_result = similar_raw_data
+        self.assertListEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+        # D: Test that the bundle is removed once it no longer fits within the retention policy.
+        restarted_sbo_data_source_replay.set_retention_policy(max_total_bytes=0)
+        actual_result = restarted_sbo_data_source_replay.apply_retention_policy()
+        expected_result = [bundle_file_path]
+        self.assertListEqual(actual_result, expected_result, "[D] The actual result doesn't match the expected result.")
+
+        restarted_sbo_data_source_replay.close_capture()
+        shutil.rmtree(temp_sbo_data_source_replay.base_directory)
+
+
+    @unittest.skipIf(SKIP_TEST_13, "in development")
+    def test_13_seek(self):
+
+        """Test that playback can start from, or seek to, the first frame captured at or after a given time."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_REPLAY, debug.TESTUNIT, "STARTING %s:" % "test_13_seek")
+
+        temp_sbo_data_source_replay = SboDataSourceReplay()
+        temp_sbo_data_source_replay.base_directory = tempfile.mkdtemp()
+
+        # Spread the delta encoded frames over several segments, so that seeking has to rebuild frames part way through a segment.
+        temp_sbo_data_source_replay.set_capture_format(SEGMENT_CAPTURE_FORMAT, 1024)
+        temp_sbo_data_source_replay.set_capture_delta_encoding(5)
+        similar_raw_data = []
+
+        for number in range(30):
+            raw_data = SIMILAR_RAW_DATA_TEMPLATE % (2.2 + number / 100.0, 2.25)
+            temp_sbo_data_source_replay.capture(raw_data, NON_LIVE_DATA_FRAME)
+            similar_raw_data.append(raw_data)
+            time.sleep(0.002)
+
+        temp_sbo_data_source_replay.close_capture()
+
+        # Read the capture time of each frame from the segment indexes.
+        capture_current_path = os.path.join(temp_sbo_data_source_replay.base_directory, sbo_data_source_replay.CAPTURE_FOLDER, sbo_data_source_replay.CAPTURE_CURRENT_SUBFOLDER)
+        timestamps = []
+
+        for filename in sorted(os.listdir(capture_current_path)):
+
+            if filename.endswith('.idx'):
+
+                with open(os.path.join(capture_current_path, filename), mode='rb') as file_handle:
+                    index_entries = file_handle.read()
+
+                timestamps.extend(timestamp for _, timestamp in sbo_data_source_replay.SEGMENT_INDEX_ENTRY.iter_unpack(index_entries))
+
+        minimum_request_period = [datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_LIVE), datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_NON_LIVE)]
+
+        # A: Test that seeking before playback has been initialised raises an exception.
+        self.assertRaises(SboDataSourceReplay.CallOrderError, temp_sbo_data_source_replay.seek, datetime.datetime.now())
+
+        # B: Test that playback starts from the first frame captured at or after the start time.
+        start_at = datetime.datetime.fromtimestamp((timestamps[12] + timestamps[13]) / 2)
+        temp_sbo_data_source_replay.initalise_playback(capture_current_path, FAST_REPLAY_MODE, minimum_request_period, start_at=start_at)
+        actual_result = self.play_back_all(temp_sbo_data_source_replay)
+        expected_result = similar_raw_data[13:]
+        self.assertListEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        # C: Test that seeking backwards, with memory mapped playback, returns the number of frames skipped and rebuilds the frames that follow.
+        temp_sbo_data_source_replay.set_memory_mapped_playback(True)
+        actual_result = temp_sbo_data_source_replay.seek(datetime.datetime.fromtimestamp(timestamps[7]))
+        expected_result = 7
+        self.assertEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+        played_back_raw_data = self.play_back_all(temp_sbo_data_source_replay)
+        actual_result = [str(raw_data, 'utf-8') for raw_data in played_back_raw_data]
+        expected_result = similar_raw_data[7:]
+        self.assertListEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+        for raw_data in played_back_raw_data:
+            raw_data.release()
+
+        # D: Test that seeking past the last frame reaches the end of the replay.
+        temp_sbo_data_source_replay.seek(datetime.datetime.fromtimestamp(timestamps[-1] + 1))
+        self.assertRaises(SboDataSourceReplay.EndOfReplay, temp_sbo_data_source_replay.playback)
+
+        # E: Test that an invalid start time raises an exception.
+        self.assertRaises(SboDataSourceReplay.PlaybackInitialisationError, temp_sbo_data_source_replay.initalise_playback, capture_current_path, FAST_REPLAY_MODE, minimum_request_period, 'yesterday')
+
+        shutil.rmtree(temp_sbo_data_source_replay.base_directory)
+
+
+    @unittest.skipIf(SKIP_TEST_14, "in development")
+    def test_14_timed_playback(self):
+
+        """Test that timed playback reproduces the gaps between the capture times of the frames at the replay speed."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_REPLAY, debug.TESTUNIT, "STARTING %s:" % "test_14_timed_playback")
+
+        temp_sbo_data_source_replay = SboDataSourceReplay()
+        temp_sbo_data_source_replay.base_directory = tempfile.mkdtemp()
+        temp_sbo_data_source_replay.set_capture_format(SEGMENT_CAPTURE_FORMAT)
+
+        # Capture a burst of two frames, followed by a gap and a third frame.
+        for capture_gap in (0, 0, 0.4):
+            time.sleep(capture_gap)
+            temp_sbo_data_source_replay.capture(CAPTURED_RAW_DATA[0][1], LIVE_DATA_FRAME)
+
+        temp_sbo_data_source_replay.close_capture()
+
+        capture_current_path = os.path.join(temp_sbo_data_source_replay.base_directory, sbo_data_source_replay.CAPTURE_FOLDER, sbo_data_source_replay.CAPTURE_CURRENT_SUBFOLDER)
+        minimum_request_period = [datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_LIVE), datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_NON_LIVE)]
+
+        # A: Test that an invalid replay speed raises an exception.
+        for invalid_replay_speed in (0, -10, 'fast'):
+            self.assertRaises(SboDataSourceReplay.PlaybackInitialisationError, temp_sbo_data_source_replay.initalise_playback, capture_current_path, TIMED_REPLAY_MODE, minimum_request_period, None, invalid_replay_speed)
+
+        # Play back the frames at twice the capture speed, noting when each one is returned.
+        temp_sbo_data_source_replay.initalise_playback(capture_current_path, TIMED_REPLAY_MODE, minimum_request_period, replay_speed=2)
+        playback_start_time = time.monotonic()
+        playback_times = []
+        polls_returning_none = 0
+
+        while len(playback_times) < 3:
+
+            if temp_sbo_data_source_replay.playback() is None:
+                polls_returning_none += 1
+                time.sleep(0.005)
+
+            else:
+                playback_times.append(time.monotonic() - playback_start_time)
+
+        # B: Test that the burst is played back straight away, ignoring the minimum request period.
+        self.assertLess(playback_times[1], SAFETY_MARGIN, "[B] The burst of frames was not played back straight away.")
+
+        # C: Test that the frame after the gap is held back until half the gap has passed.
+        self.assertGreater(polls_returning_none, 0, "[C] The frame after the gap was not held back.")
+        self.assertGreaterEqual(playback_times[2], 0.2, "[C] The frame after the gap was played back too soon.")
+        self.assertLess(playback_times[2], 0.2 + SAFETY_MARGIN, "[C] The frame after the gap was played back too late.")
+
+        shutil.rmtree(temp_sbo_data_source_replay.base_directory)
+
+
+    @unittest.skipIf(SKIP_TEST_15, "in development")
+    def test_15_playback_wait(self):
+
+        """Test that waiting for playback sleeps until the next frame is due, both while blocking and in an event loop."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_REPLAY, debug.TESTUNIT, "STARTING %s:" % "test_15_playback_wait")
+
+        temp_sbo_data_source_replay = SboDataSourceReplay()
+        temp_sbo_data_source_replay.base_directory = tempfile.mkdtemp()
+        temp_sbo_data_source_replay.set_capture_format(SEGMENT_CAPTURE_FORMAT)
+
+        for frame_type, raw_data in CAPTURED_RAW_DATA:
+            temp_sbo_data_source_replay.capture(raw_data, frame_type)
+
+        temp_sbo_data_source_replay.close_capture()
+
+        # Limit live frames to one every 0.2 seconds in normal replay mode.
+        capture_current_path = os.path.join(temp_sbo_data_source_replay.base_directory, sbo_data_source_replay.CAPTURE_FOLDER, sbo_data_source_replay.CAPTURE_CURRENT_SUBFOLDER)
+        minimum_request_period = [datetime.timedelta(seconds = 0.2), datetime.timedelta(seconds = 0)]
+        temp_sbo_data_source_replay.initalise_playback(capture_current_path, NORMAL_REPLAY_MODE, minimum_request_period)
+
+        playback_start_time = time.monotonic()
+        played_back_raw_data = [temp_sbo_data_source_replay.playback_wait(), temp_sbo_data_source_replay.playback_wait()]
+
+        # A: Test that the second live frame is held back by a timeout shorter than the minimum request period.
+        actual_result = temp_sbo_data_source_replay.playback_wait(0.05)
+        self.assertIsNone(actual_result, "[A] The live frame was played back before the minimum request period expired.")
+
+        # B: Test that the second live frame is returned once the minimum request period has expired.
+        played_back_raw_data.append(temp_sbo_data_source_replay.playback_wait())
+        playback_time = time.monotonic() - playback_start_time
+        self.assertGreaterEqual(playback_time, 0.2, "[B] The live frame was played back too soon.")
+        self.assertLess(playback_time, 0.2 + SAFETY_MARGIN, "[B] The live frame was played back too late.")
+
+        # C: Test that the last frame is returned by the coroutine, and that the end of the replay is raised from it.
+        played_back_raw_data.append(asyncio.run(temp_sbo_data_source_replay.playback_wait_async()))
+        self.assertRaises(SboDataSourceReplay.EndOfReplay, asyncio.run, temp_sbo_data_source_replay.playback_wait_async())
+
+        # D: Test that every frame was played back in order.
+        actual_result = played_back_raw_data
+        expected_result = [raw_data for frame_type, raw_data in CAPTURED_RAW_DATA]
+        self.assertListEqual(actual_result, expected_result, "[D] The actual result doesn't match the expected result.")
+
+        shutil.rmtree(temp_sbo_data_source_replay.base_directory)
+
+
+    @unittest.skipIf(SKIP_TEST_16, "in development")
+    def test_16_frame_type_cursors(self):
+
+        """Test that live and non-live frames are played back from separate cursors, each paced by its own minimum request period."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_REPLAY, debug.TESTUNIT, "STARTING %s:" % "test_16_frame_type_cursors")
+
+        temp_sbo_data_source_replay = SboDataSourceReplay()
+        temp_sbo_data_source_replay.base_directory = tempfile.mkdtemp()
+        temp_sbo_data_source_replay.set_capture_format(SEGMENT_CAPTURE_FORMAT)
+
+        for frame_type, raw_data in CAPTURED_RAW_DATA:
+            temp_sbo_data_source_replay.capture(raw_data, frame_type)
+
+        temp_sbo_data_source_replay.close_capture()
+
+        # Live frames may be played back at any time, but non-live frames only every few seconds.
+        capture_current_path = os.path.join(temp_sbo_data_source_replay.base_directory, sbo_data_source_replay.CAPTURE_FOLDER, sbo_data_source_replay.CAPTURE_CURRENT_SUBFOLDER)
+        minimum_request_period = [datetime.timedelta(seconds = 0), datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_NON_LIVE)]
+        temp_sbo_data_source_replay.initalise_playback(capture_current_path, NORMAL_REPLAY_MODE, minimum_request_period)
+
+        # A: Test that an invalid frame type raises an exception.
+        self.assertRaises(SboDataSourceReplay.PlaybackError, temp_sbo_data_source_replay.playback, 2)
+
+        # B: Test that the second non-live frame waits for the minimum request period, without holding up the live frames captured before it.
+        actual_result = [temp_sbo_data_source_replay.playback(frame_type) for frame_type in (NON_LIVE_DATA_FRAME, NON_LIVE_DATA_FRAME, LIVE_DATA_FRAME, LIVE_DATA_FRAME)]
+        expected_result = [CAPTURED_RAW_DATA[1][1], None, CAPTURED_RAW_DATA[0][1], CAPTURED_RAW_DATA[2][1]]
+        self.assertListEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        # C: Test that the live cursor reaches the end of the replay, while the non-live frame is still waiting to be played back.
+        self.assertRaises(SboDataSourceReplay.EndOfReplay, temp_sbo_data_source_replay.playback, LIVE_DATA_FRAME)
+
+        actual_result = temp_sbo_data_source_replay.playback_initialised()
+        expected_result = True
+        self.assertEqual(actual_result, expected_result, "[C] The actual result doesn't match the expected result.")
+
+        shutil.rmtree(temp_sbo_data_source_replay.base_directory)
+
+
+    @unittest.skipIf(SKIP_TEST_17, "in development")
+    def test_17_delta_capture_large_frame(self):
+
+        """Test that large frames, in which only a handful of odds change from one frame to the next, are delta encoded to a fraction of their size."""
+
+        debug.message(debug_flags.TEST_SBO_DATA_SOURCE_REPLAY, debug.TESTUNIT, "STARTING %s:" % "test_17_delta_capture_large_frame")
+
+        temp_sbo_data_source_replay = SboDataSourceReplay()
+        temp_sbo_data_source_replay.base_directory = tempfile.mkdtemp()
+        temp_sbo_data_source_replay.set_capture_format(SEGMENT_CAPTURE_FORMAT)
+        temp_sbo_data_source_replay.set_capture_delta_encoding()
+
+        # Change the prices of five sets of odds in each frame, spread throughout the frame.
+        prices = [[1.5 + (row % 100) / 100.0, 2.5 - (row % 100) / 100.0] for row in range(LARGE_RAW_DATA_ODDS_ROWS)]
+        large_raw_data = []
+
+        for number in range(20):
+
+            for change in range(5):
+                prices[(number * 37 + change * 811) % LARGE_RAW_DATA_ODDS_ROWS][0] += 0.01
+
+            odds_rows = [LARGE_RAW_DATA_ODDS_TEMPLATE % (12800000 + row, 189000 + row // 8, row % 9 + 1, prices[row][0], prices[row][1]) for row in range(LARGE_RAW_DATA_ODDS_ROWS)]
+            large_raw_data.append(LARGE_RAW_DATA_TEMPLATE % ",".join(odds_rows))
+
+        for raw_data in large_raw_data:
+            temp_sbo_data_source_replay.capture(raw_data, LIVE_DATA_FRAME)
+
+        temp_sbo_data_source_replay.close_capture()
+
+        # A: Test that, apart from the keyframe, each frame takes a small fraction of the space of the raw data.
+        actual_result = temp_sbo_data_source_replay.get_compression_statistics()['compression_ratio']
+        self.assertGreater(actual_result, 15, "[A] The raw data has not been delta encoded as expected.")
+
+        # Play back the delta encoded segment records.
+        capture_current_path = os.path.join(temp_sbo_data_source_replay.base_directory, sbo_data_source_replay.CAPTURE_FOLDER, sbo_data_source_replay.CAPTURE_CURRENT_SUBFOLDER)
+        minimum_request_period = [datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_LIVE), datetime.timedelta(seconds = MINIMUM_REQUEST_PERIOD_NON_LIVE)]
+        temp_sbo_data_source_replay.initalise_playback(capture_current_path, FAST_REPLAY_MODE, minimum_request_period)
+
+        # B: Test that every frame is rebuilt exactly.
+        actual_result = self.play_back_all(temp_sbo_data_source_replay)
+        expected_result = large_raw_data
+        self.assertListEqual(actual_result, expected_result, "[B] The actual result doesn't match the expected result.")
+
+        shutil.rmtree(temp_sbo_data_source_replay.base_directory)
+
+
 if __name__ == "__main__":
     unittest.main()